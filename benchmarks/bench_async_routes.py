@@ -0,0 +1,117 @@
+# backend/benchmarks/bench_async_routes.py
+# ----------------------------------------------------------------------------------------------------
+# مقارنة عدد الطلبات في الثانية لمسارَي تسجيل الدخول وقائمة المنتجات العامة بين:
+#   1. المسار المتزامن (get_db + الخدمات المتزامنة) بنفس شكل نقاط النهاية قبل التحويل.
+#   2. المسار غير المتزامن (get_async_db + الخدمات غير المتزامنة).
+# يتم استدعاء تطبيق ASGI مباشرةً داخل العملية (بدون شبكة) مع عدد من الطلبات المتزامنة (CONCURRENCY)
+# لقياس قدرة عامل (Worker) واحد على تداخل الطلبات. القيمة الافتراضية أقل من حجم المجمع (5 + 10)، لأن
+# المسار المتزامن يستنفد المجمع عند تزامن أعلى (حلقة الأحداث المحجوبة لا تُغلق الجلسات في وقتها).
+# يستخدم قاعدة البيانات المحددة في DATABASE_URL، ويحتاج إلى مستخدم نشط لتسجيل الدخول:
+#   BENCH_PHONE=+9665... BENCH_PASSWORD=... python -m benchmarks.bench_async_routes
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+import json
+import os
+import time
+
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.core.schemas_bootstrap import rebuild_all_schemas
+from src.db.session import get_async_db, get_db
+from src.products.schemas.product_schemas import ProductRead
+from src.products.services import product_service
+from src.users.services import core_service
+
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "10"))
+REQUESTS_PER_ROUTE = int(os.getenv("BENCH_REQUESTS", "200"))
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/sync/login")
+    async def sync_login(body: dict, db: Session = Depends(get_db)):
+        # نفس شكل login_endpoint قبل التحويل: async def يستدعي خدمة متزامنة
+        return core_service.authenticate_user(db=db, phone_number=body["phone_number"], password=body["password"])
+
+    @app.post("/async/login")
+    async def async_login(body: dict, db: AsyncSession = Depends(get_async_db)):
+        return await core_service.authenticate_user_async(db=db, phone_number=body["phone_number"], password=body["password"])
+
+    @app.get("/sync/products", response_model=list[ProductRead])
+    def sync_products(db: Session = Depends(get_db)):
+        return product_service.get_public_active_products(db)
+
+    @app.get("/async/products", response_model=list[ProductRead])
+    async def async_products(db: AsyncSession = Depends(get_async_db)):
+        return await product_service.get_public_active_products_async(db)
+
+    return app
+
+
+async def call(app, method: str, path: str, body: bytes = b"") -> int:
+    """يرسل طلب HTTP واحدًا إلى تطبيق ASGI ويعيد رمز الحالة."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "scheme": "http", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    received = False
+    status_code = 0
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.sleep(3600)
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def measure(app, method: str, path: str, body: bytes = b"") -> float:
+    """يعيد عدد الطلبات في الثانية، ويتحقق من نجاح جميع الطلبات."""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            return await call(app, method, path, body)
+
+    await call(app, method, path, body) # إحماء (اتصالات المجمع، الـ Caches)
+    started = time.perf_counter()
+    codes = await asyncio.gather(*(one() for _ in range(REQUESTS_PER_ROUTE)))
+    elapsed = time.perf_counter() - started
+    failed = [code for code in codes if code != 200]
+    if failed:
+        raise SystemExit(f"{path}: {len(failed)} requests failed (status {failed[0]}).")
+    return REQUESTS_PER_ROUTE / elapsed
+
+
+async def main():
+    rebuild_all_schemas()
+    app = build_app()
+    login_body = json.dumps({
+        "phone_number": os.environ.get("BENCH_PHONE", ""),
+        "password": os.environ.get("BENCH_PASSWORD", ""),
+    }).encode()
+
+    print(f"concurrency={CONCURRENCY} requests/route={REQUESTS_PER_ROUTE}")
+    for route, method, body in (("login", "POST", login_body), ("products", "GET", b"")):
+        sync_rps = await measure(app, method, f"/sync/{route}", body)
+        async_rps = await measure(app, method, f"/async/{route}", body)
+        print(f"{route:<9} sync={sync_rps:8.1f} req/s  async={async_rps:8.1f} req/s  ratio={async_rps / sync_rps:5.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+# backend/benchmarks/bench_auction_browse.py
+# ----------------------------------------------------------------------------------------------------
+# قياس تصفح المزادات: الترقيم بـ skip/limit (get_all_auctions_async) مقابل ترقيم المؤشر (browse_auctions_async)
+# على عمق متزايد في قائمة عشرات آلاف المزادات النشطة.
+#   1. زمن الصفحة عند العمق 0 و 25% و 50% و 75% والأخيرة لكل طريقة.
+#   2. المرور على كل الصفحات بالمؤشر: كل مزاد يظهر مرة واحدة وبالترتيب، حتى مع تساوي مواعيد الانتهاء.
+# ينشئ الفهارس المطلوبة إذا لم تكن موجودة في قاعدة بيانات الاختبار.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_AUCTIONS=20000 BENCH_PAGE=20 python -m benchmarks.bench_auction_browse
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.core.schemas_bootstrap import rebuild_all_schemas
+from src.auctions.models.auctions_models import Auction
+from src.auctions.services import auctions_service
+from src.auctions.services.auction_lookups import auction_lookups
+from src.db.session import AsyncSessionLocal, SessionLocal
+from src.lookups.models.lookups_models import AuctionStatus, AuctionType
+
+AUCTIONS = int(os.getenv("BENCH_AUCTIONS", "20000"))
+PAGE = int(os.getenv("BENCH_PAGE", "20"))
+REPEAT = 5
+BROWSE_STATUS_KEY = "BROWSE_BENCH" # حالة مستقلة حتى لا تختلط بمزادات قاعدة الاختبار
+
+
+def create_auctions() -> str:
+    db = SessionLocal()
+    try:
+        for index in Auction.__table__.indexes:
+            index.create(db.get_bind(), checkfirst=True)
+        status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == BROWSE_STATUS_KEY))
+        if status_id is None:
+            status = AuctionStatus(status_name_key=BROWSE_STATUS_KEY)
+            db.add(status)
+            db.flush()
+            status_id = status.auction_status_id
+        db.query(Auction).filter(Auction.auction_status_id == status_id).delete()
+        template = db.scalars(select(Auction).limit(1)).first()
+        type_key = db.scalar(select(AuctionType.type_name_key).where(AuctionType.auction_type_id == template.auction_type_id))
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "auction_id": uuid.uuid4(),
+                "seller_user_id": template.seller_user_id,
+                "product_id": template.product_id,
+                "auction_type_id": template.auction_type_id,
+                "auction_status_id": status_id,
+                "start_timestamp": now,
+                # دقائق صحيحة فقط: مواعيد انتهاء متساوية كثيرة لاختبار كسر التعادل بـ auction_id
+                "end_timestamp": now + timedelta(minutes=random.randint(1, AUCTIONS // 10)),
+                "starting_price_per_unit": 10,
+                "minimum_bid_increment": 1,
+                "quantity_offered": template.quantity_offered,
+                "unit_of_measure_id_for_quantity": template.unit_of_measure_id_for_quantity,
+                "total_bids_count": 0,
+                "is_private_auction": False,
+            }
+            for _ in range(AUCTIONS)
+        ]
+        db.execute(insert(Auction), rows)
+        db.commit()
+        return type_key
+    finally:
+        db.close()
+
+
+async def timed(fn) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        await fn()
+    return (time.perf_counter() - started) * 1000 / REPEAT
+
+
+async def bench() -> None:
+    type_key = create_auctions()
+    async with AsyncSessionLocal() as db:
+        # مفاتيح الصفحات عند كل عمق من المرور الكامل بالمؤشر
+        walked, cursor, cursors = [], None, [None]
+        started = time.perf_counter()
+        while True:
+            page = await auctions_service.browse_auctions_async(db, status_name_key=BROWSE_STATUS_KEY, type_name_key=type_key, cursor=cursor, limit=PAGE)
+            walked.extend((item["end_timestamp"], item["auction_id"]) for item in page["items"])
+            if page["next_cursor"] is None:
+                break
+            cursor = page["next_cursor"]
+            cursors.append(cursor)
+        walk_seconds = time.perf_counter() - started
+
+        pages = len(cursors)
+        print(f"auctions / page size / pages   : {AUCTIONS} / {PAGE} / {pages}")
+        print(f"walk all pages with cursor     : {walk_seconds * 1000:8.1f} ms  ({walk_seconds * 1000 / pages:6.2f} ms/page)")
+        print(f"{'depth':>6} {'offset ms':>10} {'cursor ms':>10}")
+        timings = []
+        for fraction in (0, 0.25, 0.5, 0.75, 1):
+            page_index = min(int(pages * fraction), pages - 1)
+            offset_ms = await timed(lambda: auctions_service.get_all_auctions_async(db, status_name_key=BROWSE_STATUS_KEY, type_name_key=type_key, skip=page_index * PAGE, limit=PAGE))
+            db.expunge_all()
+            cursor_ms = await timed(lambda: auctions_service.browse_auctions_async(db, status_name_key=BROWSE_STATUS_KEY, type_name_key=type_key, cursor=cursors[page_index], limit=PAGE))
+            timings.append((offset_ms, cursor_ms))
+            print(f"{fraction:>6.0%} {offset_ms:10.2f} {cursor_ms:10.2f}")
+
+    normalized = [(end.replace(tzinfo=None), auction_id) for end, auction_id in walked]
+    assert len(walked) == AUCTIONS and len(set(a for _, a in walked)) == AUCTIONS, "cursor walk missed or repeated auctions"
+    assert normalized == sorted(normalized), "cursor walk out of order"
+    deepest, first = timings[-1][1], timings[0][1]
+    print(f"cursor deepest / first page    : {deepest / first:8.2f}x   (offset: {timings[-1][0] / timings[0][0]:.2f}x)")
+    print(f"lookup cache                   : {auction_lookups.stats()['hits']} hits / {auction_lookups.stats()['loads']} loads")
+    assert deepest < first * 3, "deep cursor page is much slower than the first page"
+    print("every auction once, in order   : ok")
+
+
+def main():
+    rebuild_all_schemas()
+    asyncio.run(bench())
+
+
+if __name__ == "__main__":
+    main()
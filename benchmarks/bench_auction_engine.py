@@ -0,0 +1,191 @@
+# backend/benchmarks/bench_auction_engine.py
+# ----------------------------------------------------------------------------------------------------
+# مقارنة مسار المزايدة عبر قاعدة البيانات (تحديث شرطي لكل مزايدة) بمحرك المزادات في الذاكرة
+# (تحقق في الذاكرة + حفظ مؤجل على دفعات)، بنفس نمط التزاحم: كل مزايد يزايد بالحد الأدنى فوق السعر الحالي.
+# بعد كل تشغيل يتحقق من اتساق جدول bids وصف المزاد، ثم يحاكي إعادة التشغيل بمحرك جديد
+# ويتحقق من أن الدفتر المستعاد من جدول bids يطابق الحالة قبل الإيقاف.
+# وأخيرًا يعزل فشل الحفظ: مزادان على نفس القسم وحفظ أحدهما يفشل (خطأ سلامة محقون في persist_bid_batch).
+#
+# التشغيل (من مجلد backend):
+#   BENCH_BIDS=2000 BENCH_THREADS=16 python -m benchmarks.bench_auction_engine
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from benchmarks.bench_bid_contention import create_auction
+from src.auctions.crud import bidding_crud
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import Bid
+from src.auctions.schemas.bidding_schemas import BidCreate
+from src.auctions.services import bidding_service
+from src.auctions.services.auction_engine import AuctionEngine
+from src.db.session import SessionLocal
+from src.users.models.core_models import User
+
+BIDS = int(os.getenv("BENCH_BIDS", "2000"))
+THREADS = int(os.getenv("BENCH_THREADS", "16"))
+
+
+def new_engine() -> AuctionEngine:
+    return AuctionEngine(shards=4, queue_size=BIDS, flush_interval_ms=50, flush_batch_size=500, ladder_depth=50)
+
+
+def setup():
+    db = SessionLocal()
+    try:
+        auction = create_auction(db)
+        bidders = [user for user in db.scalars(select(User)).all() if user.user_id != auction.seller_user_id]
+        db.expunge_all()
+        return auction.auction_id, bidders
+    finally:
+        db.close()
+
+
+def run(label: str, place, current_price) -> dict:
+    accepted = 0
+
+    def bid(i: int) -> bool:
+        bidder = bidders[i % len(bidders)]
+        amount = float(current_price() + 1)
+        try:
+            place(BidCreate(auction_id=auction_id, bidder_user_id=bidder.user_id, bid_amount_per_unit=amount), bidder)
+            return True
+        except HTTPException:
+            return False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        accepted = sum(pool.map(bid, range(BIDS)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22}: {BIDS / elapsed:8.0f} bids/s  accepted={accepted}")
+    return {"accepted": accepted}
+
+
+def check_consistency(accepted: int) -> None:
+    db = SessionLocal()
+    try:
+        final = db.get(Auction, auction_id)
+        bids = db.scalars(select(Bid).where(Bid.auction_id == auction_id).order_by(Bid.bid_id)).all()
+        amounts = [bid.bid_amount_per_unit for bid in bids]
+        active = [bid for bid in bids if bid.bid_status == "ACTIVE_HIGHEST"]
+        assert final.total_bids_count == len(bids) == accepted, "bid count mismatch"
+        assert final.current_highest_bid_amount_per_unit == max(amounts), "highest bid mismatch"
+        assert len(active) == 1 and active[0].bidder_user_id == final.current_highest_bidder_user_id, "ACTIVE_HIGHEST mismatch"
+        assert all(b > a for a, b in zip(amounts, amounts[1:])), "bid ladder not increasing"
+    finally:
+        db.close()
+
+
+def db_price() -> Decimal:
+    db = SessionLocal()
+    try:
+        state = bidding_crud.get_auction_bid_state(db, auction_id)
+        return state.current_highest_bid_amount_per_unit or state.starting_price_per_unit
+    finally:
+        db.close()
+
+
+def db_place(bid_in, bidder):
+    db = SessionLocal()
+    try:
+        return bidding_service.place_bid(db, bid_in, bidder)
+    finally:
+        db.close()
+
+
+def check_flush_isolation() -> None:
+    """
+    مزاد يفشل حفظه لا يوقف حفظ مزاد آخر على نفس القسم؛ بعد max_flush_failures يُرفض المزايدة عليه بـ 503،
+    والمزايدات غير المحفوظة في القسم لا تتجاوز max_pending_bids (429)، ثم يُحفظ عند زوال الخطأ ويقبل المزايدات مجددًا.
+    """
+    good_id, bidders = setup()
+    bad_id, _ = setup()
+    engine = AuctionEngine(shards=1, queue_size=100, flush_interval_ms=60_000, flush_batch_size=1000, ladder_depth=50, max_pending_bids=10, max_flush_failures=3)
+    persist = bidding_crud.persist_bid_batch
+
+    def failing_persist(db, auction_id, **kwargs):
+        if auction_id == bad_id:
+            raise IntegrityError("INSERT INTO bids", {}, Exception("injected check violation"))
+        return persist(db, auction_id=auction_id, **kwargs)
+
+    def bid(target, amount, i):
+        bidder = bidders[i % len(bidders)]
+        return engine.place_bid(BidCreate(auction_id=target, bidder_user_id=bidder.user_id, bid_amount_per_unit=amount))
+
+    def rejected_with(status_code, target, amount, i) -> bool:
+        try:
+            bid(target, amount, i)
+        except HTTPException as exc:
+            return exc.status_code == status_code
+        return False
+
+    engine_logger = logging.getLogger("src.auctions.services.auction_engine")
+    level = engine_logger.level
+    engine_logger.setLevel(logging.CRITICAL) # الإخفاقات هنا متوقعة
+    bidding_crud.persist_bid_batch = failing_persist
+    try:
+        bid(bad_id, 11, 0)
+        bid(good_id, 11, 0)
+        assert engine.flush() == 1, "a failing auction blocked the healthy one"
+        for _ in range(2):
+            engine.flush(bad_id) # الحفظ الصريح لمزاد يتجاهل مهلة إعادة المحاولة
+        assert rejected_with(503, bad_id, 12, 1), "stalled auction still accepts bids"
+        for i in range(9): # معلقات القسم: 1 (المزاد الفاشل) + 9 = الحد الأقصى
+            bid(good_id, 12 + i, i + 1)
+        assert rejected_with(429, good_id, 30, 0), "pending bids exceeded max_pending_bids"
+        stalled = engine.stats()
+        assert stalled["stalled_books"] == 1 and stalled["flush_failures"] == 3, stalled
+    finally:
+        bidding_crud.persist_bid_batch = persist
+        engine_logger.setLevel(level)
+
+    assert engine.flush(bad_id) == 1, "stalled auction not flushed once the error cleared"
+    bid(bad_id, 12, 1)
+    engine.shutdown()
+    db = SessionLocal()
+    try:
+        counts = {target: db.get(Auction, target).total_bids_count for target in (good_id, bad_id)}
+        persisted = {target: len(db.scalars(select(Bid.bid_id).where(Bid.auction_id == target)).all()) for target in (good_id, bad_id)}
+    finally:
+        db.close()
+    assert counts == persisted == {good_id: 10, bad_id: 2}, (counts, persisted)
+    print(f"flush isolation        : stalled_books={stalled['stalled_books']} rejected_unflushed={stalled['rejected_unflushed']} "
+          f"rejected_backlog={stalled['rejected_backlog']}")
+
+
+def main():
+    global auction_id, bidders
+
+    auction_id, bidders = setup()
+    db_result = run("database (CAS)", db_place, db_price)
+    check_consistency(db_result["accepted"])
+
+    auction_id, bidders = setup()
+    engine = new_engine()
+    engine_result = run("in-memory engine", lambda bid_in, bidder: engine.place_bid(bid_in), lambda: engine.snapshot(auction_id)["current_highest_bid_amount_per_unit"] or Decimal(10))
+    before = engine.snapshot(auction_id)
+    engine.shutdown() # يحفظ المعلقات
+    stats = engine.stats()
+    print(f"write-behind           : flushes={stats['flushes']} flushed_bids={stats['flushed_bids']}")
+    check_consistency(engine_result["accepted"])
+
+    recovered = new_engine()
+    after = recovered.snapshot(auction_id)
+    recovered.shutdown()
+    assert after["current_highest_bid_amount_per_unit"] == before["current_highest_bid_amount_per_unit"]
+    assert after["current_highest_bidder_user_id"] == before["current_highest_bidder_user_id"]
+    assert after["total_bids_count"] == before["total_bids_count"]
+    check_flush_isolation()
+    print("consistency + recovery + flush isolation checks: ok")
+
+
+if __name__ == "__main__":
+    main()
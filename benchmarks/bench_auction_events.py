@@ -0,0 +1,95 @@
+# backend/benchmarks/bench_auction_events.py
+# ----------------------------------------------------------------------------------------------------
+# قياس موزع التحديثات الحية للمزادات (auction_events):
+#   1. تكلفة الاستطلاع: get_auction_details (شجرة المزاد الكاملة) مقابل اللقطة المختصرة get_live_auction_state.
+#   2. التوزيع: آلاف المشتركين (نصفهم بطيء) ودفعة متتالية من تغييرات السعر من خيط ناشر.
+#      يتحقق من أن كل مشترك يصل إلى آخر حالة، وأن البطيء يستلم رسائل مدمجة أقل بدلاً من طابور متراكم.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_SUBSCRIBERS=2000 BENCH_UPDATES=5000 python -m benchmarks.bench_auction_events
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+
+from benchmarks.bench_bid_contention import create_auction
+from src.auctions.services import auctions_service, bidding_service
+from src.auctions.services.auction_events import AuctionEventHub
+from src.db.session import SessionLocal
+
+SUBSCRIBERS = int(os.getenv("BENCH_SUBSCRIBERS", "2000"))
+UPDATES = int(os.getenv("BENCH_UPDATES", "5000"))
+SLOW_CLIENT_DELAY_SECONDS = 0.01
+
+
+def per_call_ms(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def bench_polling() -> None:
+    db = SessionLocal()
+    try:
+        auction_id = create_auction(db).auction_id
+        full_ms = per_call_ms(lambda: (auctions_service.get_auction_details(db, auction_id), db.expire_all()), 200)
+        live_ms = per_call_ms(lambda: bidding_service.get_live_auction_state(db, auction_id), 200)
+    finally:
+        db.close()
+    print(f"poll get_auction_details     : {full_ms:8.3f} ms/request")
+    print(f"snapshot get_live_auction_state: {live_ms:8.3f} ms/request")
+
+
+async def bench_fan_out() -> None:
+    hub = AuctionEventHub(max_subscribers_per_auction=SUBSCRIBERS)
+    auction_id = uuid.uuid4()
+    subscriptions = [hub.subscribe(auction_id) for _ in range(SUBSCRIBERS)]
+    received = [0] * SUBSCRIBERS
+    last_seq = [0] * SUBSCRIBERS
+
+    async def consume(i: int) -> None:
+        slow = i % 2 == 1
+        while last_seq[i] < UPDATES:
+            state = await subscriptions[i].next(timeout=5)
+            assert state is not None, "subscriber starved"
+            received[i] += 1
+            last_seq[i] = state["seq"]
+            if slow:
+                await asyncio.sleep(SLOW_CLIENT_DELAY_SECONDS)
+
+    def publish() -> None:
+        for seq in range(1, UPDATES + 1):
+            hub.publish(auction_id, {"seq": seq, "current_highest_bid_amount_per_unit": 10 + seq, "total_bids_count": seq})
+
+    consumers = [asyncio.create_task(consume(i)) for i in range(SUBSCRIBERS)]
+    started = time.perf_counter()
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    await asyncio.get_running_loop().run_in_executor(None, publisher.join)
+    publish_seconds = time.perf_counter() - started
+    await asyncio.gather(*consumers)
+    total_seconds = time.perf_counter() - started
+
+    fast, slow = received[0::2], received[1::2]
+    stats = hub.stats()
+    print(f"subscribers x updates        : {SUBSCRIBERS} x {UPDATES}")
+    print(f"publish                      : {UPDATES / publish_seconds:8.0f} updates/s  ({stats['delivered'] / publish_seconds:10.0f} offers/s)")
+    print(f"all subscribers caught up in : {total_seconds * 1000:8.1f} ms")
+    print(f"messages per fast subscriber : {sum(fast) / len(fast):8.1f}")
+    print(f"messages per slow subscriber : {sum(slow) / max(len(slow), 1):8.1f}")
+    print(f"coalesced offers             : {stats['coalesced']}")
+    assert all(seq == UPDATES for seq in last_seq), "subscriber missed the final state"
+    print("final state on every subscriber: ok")
+
+
+def main():
+    bench_polling()
+    asyncio.run(bench_fan_out())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# backend/benchmarks/bench_auction_scheduler.py
+# ----------------------------------------------------------------------------------------------------
+# قياس مجدول دورة حياة المزادات (auction_scheduler):
+#   1. الكومة وحدها: جدولة وإطلاق عشرات آلاف المواعيد في الذاكرة.
+#   2. من البداية للنهاية على قاعدة البيانات: آلاف المزادات المجدولة تبدأ وتنتهي خلال ثوانٍ، بعضها بمزايدات.
+#      يتحقق من أن كل مزاد انتقل إلى ENDED، وأن تأخر الإطلاق أقل من ثانية، وأن التسويات أُنشئت للمزادات ذات الفائز،
+#      وأن مزايدة في اللحظات الأخيرة (منع القنص) أجلت الإغلاق إلى النهاية الجديدة.
+#   3. مزاد بقيت له مزايدات غير محفوظة في محرك المزادات (خطأ محقون في persist_bid_batch) لا يُغلق ولا يُسوى:
+#      يُؤجل إغلاقه ويُعاد جدولته، ثم يُغلق ويُسوى بمزايدته بعد زوال الخطأ.
+# ينشئ حالات المزاد SCHEDULED و ENDED والفهارس المطلوبة إذا لم تكن موجودة في قاعدة بيانات الاختبار.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_AUCTIONS=2000 BENCH_TIMERS=50000 python -m benchmarks.bench_auction_scheduler
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from benchmarks.bench_bid_contention import create_auction
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.finance.models import commissions_models, wallets_models # noqa: F401 - جداول مفاتيح auction_settlements الأجنبية
+from src.core.config import settings
+from src.auctions.crud import bidding_crud
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import Bid
+from src.auctions.models.settlements_models import AuctionSettlement
+from src.auctions.schemas.bidding_schemas import BidCreate
+from src.auctions.services import bidding_service
+from src.auctions.services.auction_engine import auction_engine
+from src.auctions.services.auction_scheduler import END, AuctionScheduler
+from src.lookups.models.lookups_models import AuctionStatus
+from src.db.session import SessionLocal
+from src.users.models.core_models import User
+
+AUCTIONS = int(os.getenv("BENCH_AUCTIONS", "2000"))
+TIMERS = int(os.getenv("BENCH_TIMERS", "50000"))
+WITH_BIDS_EVERY = 10 # مزاد من كل 10 له مزايدة (فائز يحتاج تسوية)
+
+
+def bench_heap() -> None:
+    scheduler = AuctionScheduler(horizon_seconds=3600, refresh_seconds=10, batch_size=500)
+    now = datetime.now(timezone.utc)
+    deadlines = [(uuid.uuid4(), now + timedelta(seconds=random.uniform(0, 600))) for _ in range(TIMERS)]
+    started = time.perf_counter()
+    for auction_id, deadline in deadlines:
+        scheduler.schedule(END, auction_id, deadline)
+    schedule_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    due = scheduler._pop_due(now.timestamp() + 600)
+    pop_seconds = time.perf_counter() - started
+    assert len(due) == TIMERS and all(kind == END for kind, _ in due)
+    print(f"heap schedule {TIMERS} timers     : {schedule_seconds * 1e6 / TIMERS:8.2f} µs/timer")
+    print(f"heap pop all due timers        : {pop_seconds * 1e6 / TIMERS:8.2f} µs/timer")
+
+
+def ensure_fixtures(db) -> None:
+    for key in ("SCHEDULED", "ACTIVE", "ENDED"):
+        if db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == key)) is None:
+            db.add(AuctionStatus(status_name_key=key))
+    db.commit()
+    for index in Auction.__table__.indexes:
+        index.create(db.get_bind(), checkfirst=True)
+    # مزادات فات موعدها من تشغيلات أو فحوص سابقة تُنقل أولاً بتمريرة لحاق واحدة، فلا يُحسب تأخرها في القياس
+    catch_up = AuctionScheduler(horizon_seconds=0, refresh_seconds=0, batch_size=500)
+    if catch_up.on_start():
+        catch_up.refresh()
+        catch_up.run_due()
+        catch_up.on_stop()
+
+
+def create_auctions(db, start_at: datetime):
+    template = db.scalars(select(Auction).limit(1)).first()
+    scheduled_status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == "SCHEDULED"))
+    bidder_id = db.scalar(select(User.user_id).where(User.user_id != template.seller_user_id))
+    auction_ids, with_bids = [], []
+    for i in range(AUCTIONS):
+        start = start_at + timedelta(milliseconds=random.randint(0, 2000))
+        auction = Auction(
+            auction_id=uuid.uuid4(),
+            seller_user_id=template.seller_user_id,
+            product_id=template.product_id,
+            auction_type_id=template.auction_type_id,
+            auction_status_id=scheduled_status_id,
+            start_timestamp=start,
+            end_timestamp=start + timedelta(milliseconds=random.randint(500, 2000)),
+            starting_price_per_unit=10,
+            minimum_bid_increment=1,
+            quantity_offered=template.quantity_offered,
+            unit_of_measure_id_for_quantity=template.unit_of_measure_id_for_quantity,
+            total_bids_count=0,
+        )
+        db.add(auction)
+        auction_ids.append(auction.auction_id)
+        if i % WITH_BIDS_EVERY == 0:
+            db.add(Bid(auction_id=auction.auction_id, bidder_user_id=bidder_id, bid_amount_per_unit=11, bid_timestamp=start_at, bid_status="ACTIVE_HIGHEST"))
+            with_bids.append(auction.auction_id)
+    db.commit()
+    return auction_ids, with_bids
+
+
+def bench_lifecycle() -> None:
+    db = SessionLocal()
+    try:
+        ensure_fixtures(db)
+        start_at = datetime.now(timezone.utc) + timedelta(seconds=2)
+        auction_ids, with_bids = create_auctions(db, start_at)
+        # مزاد لاختبار منع القنص: يبدأ فورًا وينتهي بعد ثانيتين
+        sniped_id, seller_id = auction_ids[1], db.get(Auction, auction_ids[1]).seller_user_id
+        sniper = db.scalars(select(User).where(User.user_id != seller_id)).first()
+        db.expunge(sniper)
+        sniped = db.get(Auction, sniped_id)
+        sniped.start_timestamp, sniped.end_timestamp = start_at, start_at + timedelta(seconds=2)
+        db.commit()
+    finally:
+        db.close()
+
+    settings.AUCTION_ANTI_SNIPING_SECONDS = 3.0
+    scheduler = AuctionScheduler(horizon_seconds=60, refresh_seconds=5, batch_size=500)
+    assert scheduler.start()
+    try:
+        # مزايدة قبل نهاية المزاد بنصف ثانية تمدده إلى (الآن + 3 ثوانٍ)
+        time.sleep(max((start_at + timedelta(seconds=1.5) - datetime.now(timezone.utc)).total_seconds(), 0))
+        db = SessionLocal()
+        try:
+            bidding_service.place_bid(db, BidCreate(auction_id=sniped_id, bidder_user_id=sniper.user_id, bid_amount_per_unit=20), sniper)
+        finally:
+            db.close()
+        sniped_bid_at = datetime.now(timezone.utc)
+
+        deadline = time.time() + 15
+        ended_status_id = scheduler._status_ids["ENDED"]
+        while time.time() < deadline:
+            db = SessionLocal()
+            try:
+                ended = db.scalar(select(func.count()).select_from(Auction).where(Auction.auction_id.in_(auction_ids), Auction.auction_status_id == ended_status_id))
+            finally:
+                db.close()
+            if ended == len(auction_ids):
+                break
+            time.sleep(0.2)
+    finally:
+        scheduler.stop()
+
+    stats = scheduler.stats()
+    db = SessionLocal()
+    try:
+        settled = db.scalar(select(func.count()).select_from(AuctionSettlement).where(AuctionSettlement.auction_id.in_(auction_ids)))
+        sniped = db.get(Auction, sniped_id)
+        sniped_end = sniped.end_timestamp.replace(tzinfo=timezone.utc) if sniped.end_timestamp.tzinfo is None else sniped.end_timestamp
+    finally:
+        db.close()
+    print(f"auctions started / ended       : {stats['started']} / {stats['ended']} of {len(auction_ids)}")
+    print(f"batches / last batch           : {stats['batches']} / {stats['last_batch_ms']:.1f} ms")
+    print(f"firing lag (max)               : {stats['max_lag_ms']:.1f} ms")
+    print(f"rescheduled (anti-sniping)     : {stats['rescheduled']}")
+    print(f"settlements created            : {settled} (expected {len(with_bids) + 1})")
+    print(f"sniped auction extended by     : {(sniped_end - (start_at + timedelta(seconds=2))).total_seconds():.2f} s past its original end")
+    assert ended == len(auction_ids), "not every auction ended"
+    assert stats["max_lag_ms"] < 1000, "firing lag above one second"
+    assert settled == len(with_bids) + 1, "missing settlements"
+    assert sniped_end > sniped_bid_at + timedelta(seconds=2.5), "anti-sniping did not extend the auction"
+    print("lifecycle checks               : ok")
+
+
+def check_unsaved_bids() -> None:
+    db = SessionLocal()
+    try:
+        auction = create_auction(db)
+        auction_id, seller_id = auction.auction_id, auction.seller_user_id
+        bidder_id = db.scalar(select(User.user_id).where(User.user_id != seller_id))
+        ended_status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == "ENDED"))
+    finally:
+        db.close()
+
+    persist = bidding_crud.persist_bid_batch
+
+    def failing_persist(db, auction_id, **kwargs):
+        raise IntegrityError("INSERT INTO bids", {}, Exception("injected check violation"))
+
+    loggers = [logging.getLogger(name) for name in ("src.auctions.services.auction_engine", "src.auctions.services.auction_scheduler")]
+    levels = [item.level for item in loggers]
+    engine_enabled, anti_sniping = settings.AUCTION_ENGINE_ENABLED, settings.AUCTION_ANTI_SNIPING_SECONDS
+    settings.AUCTION_ENGINE_ENABLED, settings.AUCTION_ANTI_SNIPING_SECONDS = True, 0
+    scheduler = AuctionScheduler(horizon_seconds=60, refresh_seconds=5, batch_size=500)
+    assert scheduler.on_start()
+    try:
+        for item in loggers:
+            item.setLevel(logging.CRITICAL) # الإخفاقات هنا متوقعة
+        bidding_crud.persist_bid_batch = failing_persist
+        try:
+            auction_engine.place_bid(BidCreate(auction_id=auction_id, bidder_user_id=bidder_id, bid_amount_per_unit=11))
+            db = SessionLocal()
+            try:
+                db.execute(update(Auction).where(Auction.auction_id == auction_id).values(end_timestamp=datetime.now(timezone.utc) - timedelta(seconds=1)))
+                db.commit()
+            finally:
+                db.close()
+            assert scheduler.fire([(END, auction_id)], time.time()) == 0, "auction ended with unsaved bids"
+            deferred = scheduler.stats()
+            assert deferred["deferred"] == 1 and deferred["pending_deadlines"] == 1, deferred
+        finally:
+            bidding_crud.persist_bid_batch = persist
+        ended = scheduler.fire([(END, auction_id)], time.time())
+    finally:
+        scheduler.on_stop() # ينتظر التسوية
+        auction_engine.shutdown()
+        for item, level in zip(loggers, levels):
+            item.setLevel(level)
+        settings.AUCTION_ENGINE_ENABLED, settings.AUCTION_ANTI_SNIPING_SECONDS = engine_enabled, anti_sniping
+
+    db = SessionLocal()
+    try:
+        status_id = db.get(Auction, auction_id).auction_status_id
+        bids = db.scalar(select(func.count()).select_from(Bid).where(Bid.auction_id == auction_id))
+        settled = db.scalar(select(func.count()).select_from(AuctionSettlement).where(AuctionSettlement.auction_id == auction_id))
+    finally:
+        db.close()
+    assert ended == 1 and status_id == ended_status_id, "auction not ended once its bids were saved"
+    assert bids == 1 and settled == 1, (bids, settled)
+    print("unsaved bids deferral          : ok")
+
+
+def main():
+    bench_heap()
+    bench_lifecycle()
+    check_unsaved_bids()
+
+
+if __name__ == "__main__":
+    main()
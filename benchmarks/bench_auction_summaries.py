@@ -0,0 +1,197 @@
+# backend/benchmarks/bench_auction_summaries.py
+# ----------------------------------------------------------------------------------------------------
+# قياس قوائم المزادات: كائنات ORM الكاملة مع AuctionRead (المسار القديم لـ GET /auctions/ و /me/created وقائمة المراقبة)
+# مقابل ملخصات AuctionSummary من استعلام أعمدة واحد مع fast_json_response، على 10 آلاف مزاد.
+#   1. لكل طريقة وحجم قائمة: زمن الطلب (الاستعلام + التحويل + ترميز JSON) وذروة الذاكرة المخصصة (tracemalloc) وحجم الرد.
+#   2. قائمة مراقبة مستخدم بمئات المزادات: إدخالات AuctionWatchlist مع مزاداتها مقابل get_my_auction_watchlists.
+# يتحقق من تطابق حقول المزادات بين الطريقتين، ومن العنوان المترجم (المخصص ثم لغة الطلب ثم اللغة الافتراضية ثم المفتاح).
+#
+# التشغيل (من مجلد backend):
+#   BENCH_AUCTIONS=10000 BENCH_WATCHLIST=500 python -m benchmarks.bench_auction_summaries
+# ----------------------------------------------------------------------------------------------------
+
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, insert, select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.core.config import settings
+from src.core.schemas_bootstrap import rebuild_all_schemas
+from src.api.v1.responses import fast_json_response
+from src.auctions.crud import auctions_crud, bidding_crud
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import AuctionWatchlist
+from src.auctions.schemas.auction_schemas import AuctionRead, AuctionSummary, AuctionWatchlistSummary
+from src.auctions.schemas.bidding_schemas import AuctionWatchlistRead
+from src.auctions.services import auctions_service, bidding_service
+from src.auctions.services.auction_lookups import auction_lookups
+from src.db.session import SessionLocal
+from src.lookups.models.lookups_models import AuctionStatus
+from src.products.models.products_models import ProductTranslation
+from src.users.models.core_models import User
+
+AUCTIONS = int(os.getenv("BENCH_AUCTIONS", "10000"))
+WATCHLIST = int(os.getenv("BENCH_WATCHLIST", "500"))
+REPEAT = 3
+SUMMARY_STATUS_KEY = "SUMMARY_BENCH" # حالة مستقلة حتى لا تختلط بمزادات قاعدة الاختبار
+OTHER_LANGUAGE = "en"
+
+
+def create_auctions(db):
+    """ينشئ AUCTIONS مزادًا في حالة مستقلة، ثلثها بعنوان مخصص، ويضيف أول WATCHLIST منها لقائمة مراقبة مستخدم."""
+    for index in Auction.__table__.indexes:
+        index.create(db.get_bind(), checkfirst=True)
+    status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == SUMMARY_STATUS_KEY))
+    if status_id is None:
+        status = AuctionStatus(status_name_key=SUMMARY_STATUS_KEY)
+        db.add(status)
+        db.flush()
+        status_id = status.auction_status_id
+    old_ids = select(Auction.auction_id).where(Auction.auction_status_id == status_id)
+    db.execute(delete(AuctionWatchlist).where(AuctionWatchlist.auction_id.in_(old_ids)))
+    db.execute(delete(Auction).where(Auction.auction_status_id == status_id))
+    template = db.scalars(select(Auction).where(Auction.auction_status_id != status_id).limit(1)).first()
+    watcher = db.scalar(select(User).where(User.user_id != template.seller_user_id).limit(1))
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "auction_id": uuid.uuid4(),
+            "seller_user_id": template.seller_user_id,
+            "product_id": template.product_id,
+            "auction_type_id": template.auction_type_id,
+            "auction_status_id": status_id,
+            "auction_title_key": f"AUCTION_{i}",
+            "custom_auction_title": f"مزاد رقم {i}" if i % 3 == 0 else None,
+            "start_timestamp": now,
+            "end_timestamp": now + timedelta(minutes=i + 1),
+            "starting_price_per_unit": 10,
+            "minimum_bid_increment": 1,
+            "quantity_offered": template.quantity_offered,
+            "unit_of_measure_id_for_quantity": template.unit_of_measure_id_for_quantity,
+            "total_bids_count": 0,
+            "is_private_auction": False,
+        }
+        for i in range(AUCTIONS)
+    ]
+    db.execute(insert(Auction), rows)
+    first_entry_id = (db.scalar(select(func.max(AuctionWatchlist.watchlist_entry_id))) or 0) + 1 # BigInteger بلا تزايد تلقائي في SQLite
+    db.execute(insert(AuctionWatchlist), [
+        {"watchlist_entry_id": first_entry_id + i, "user_id": watcher.user_id, "auction_id": row["auction_id"], "added_timestamp": now + timedelta(seconds=i)}
+        for i, row in enumerate(rows[:WATCHLIST])
+    ])
+    db.commit()
+    return status_id, template, watcher
+
+
+def measure(fn):
+    """يعيد (متوسط الزمن بالمللي ثانية، ذروة الذاكرة بالميغابايت، حجم الرد بالكيلوبايت) لطلب واحد بجلسة جديدة."""
+    elapsed, peak, size = 0.0, 0, 0
+    for _ in range(REPEAT):
+        db = SessionLocal()
+        try:
+            tracemalloc.start()
+            started = time.perf_counter()
+            body = fn(db)
+            elapsed += time.perf_counter() - started
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            size = len(body)
+        finally:
+            db.close()
+    return elapsed * 1000 / REPEAT, peak / 2**20, size / 1024
+
+
+def orm_list(status_id: int, limit: int):
+    """المسار القديم: get_all_auctions ثم تحقق AuctionRead وترميز FastAPI الافتراضي (jsonable_encoder + json)."""
+    def request(db) -> bytes:
+        auctions = auctions_crud.get_all_auctions(db, auction_status_id=status_id, limit=limit)
+        payload = [AuctionRead.model_validate(auction) for auction in auctions]
+        return json.dumps(jsonable_encoder(payload)).encode()
+    return request
+
+
+def summary_list(status_id: int, limit: int):
+    """المسار الجديد: ملخصات من استعلام أعمدة واحد ثم fast_json_response."""
+    def request(db) -> bytes:
+        rows = auctions_crud.get_auction_summaries(db, settings.DEFAULT_LANGUAGE, auction_status_id=status_id, limit=limit)
+        return fast_json_response(List[AuctionSummary], auctions_service.auction_summary_dicts(rows, auction_lookups.get(db))).body
+    return request
+
+
+def orm_watchlist(watcher):
+    """المسار القديم لقائمة المراقبة: إدخالات AuctionWatchlist ثم مزاد كل إدخال بـ AuctionRead."""
+    def request(db) -> bytes:
+        entries = bidding_crud.get_all_auction_watchlists_for_user(db, user_id=watcher.user_id)
+        payload = [dict(AuctionWatchlistRead.model_validate(entry).model_dump(), auction=AuctionRead.model_validate(entry.auction)) for entry in entries]
+        return json.dumps(jsonable_encoder(payload)).encode()
+    return request
+
+
+def summary_watchlist(watcher):
+    def request(db) -> bytes:
+        return fast_json_response(List[AuctionWatchlistSummary], bidding_service.get_my_auction_watchlists(db, current_user=watcher)).body
+    return request
+
+
+def check_titles(db, status_id: int, template) -> None:
+    """العنوان: المخصص، وإلا اسم المنتج بلغة الطلب، وإلا باللغة الافتراضية، وإلا مفتاح العنوان."""
+    translations = dict(db.execute(
+        select(ProductTranslation.language_code, ProductTranslation.translated_product_name).where(ProductTranslation.product_id == template.product_id)
+    ).all())
+    for language in (settings.DEFAULT_LANGUAGE, OTHER_LANGUAGE, "xx"):
+        rows = auctions_crud.get_auction_summaries(db, language, auction_status_id=status_id, limit=6)
+        product_name = translations.get(language) or translations.get(settings.DEFAULT_LANGUAGE)
+        for row in rows:
+            expected = row.custom_auction_title or product_name or row.auction_title_key
+            assert row.title == expected, f"title for {language}: {row.title!r} != {expected!r}"
+
+
+def main():
+    rebuild_all_schemas()
+    db = SessionLocal()
+    try:
+        status_id, template, watcher = create_auctions(db)
+        check_titles(db, status_id, template)
+
+        # تطابق الحقول المشتركة بين الطريقتين
+        full = [AuctionRead.model_validate(a).model_dump() for a in auctions_crud.get_all_auctions(db, auction_status_id=status_id, limit=50)]
+        summaries = auctions_service.auction_summary_dicts(auctions_crud.get_auction_summaries(db, settings.DEFAULT_LANGUAGE, auction_status_id=status_id, limit=50), auction_lookups.get(db))
+        for old, new in zip(full, summaries):
+            for field in AuctionSummary.model_fields:
+                if field in old:
+                    assert old[field] == new[field] or str(old[field]) == str(new[field]), f"{field}: {old[field]!r} != {new[field]!r}"
+            assert new["auction_status_key"] == SUMMARY_STATUS_KEY
+        watchlist = bidding_service.get_my_auction_watchlists(db, current_user=watcher)
+        assert len(watchlist) == WATCHLIST, "watchlist summaries missing entries"
+        assert [item["added_timestamp"] for item in watchlist] == sorted((item["added_timestamp"] for item in watchlist), reverse=True), "watchlist not newest first"
+    finally:
+        db.close()
+
+    print(f"auctions / watchlist entries   : {AUCTIONS} / {WATCHLIST}")
+    print(f"{'request':<24} {'path':<8} {'ms':>9} {'peak MB':>9} {'body KB':>9}")
+    results = {}
+    for label, old, new in (
+        ("list limit=100", orm_list(status_id, 100), summary_list(status_id, 100)),
+        (f"list limit={AUCTIONS}", orm_list(status_id, AUCTIONS), summary_list(status_id, AUCTIONS)),
+        (f"watchlist ({WATCHLIST})", orm_watchlist(watcher), summary_watchlist(watcher)),
+    ):
+        results[label] = (measure(old), measure(new))
+        for path, (ms, peak, size) in zip(("orm", "summary"), results[label]):
+            print(f"{label:<24} {path:<8} {ms:9.1f} {peak:9.2f} {size:9.1f}")
+        (old_ms, old_peak, _), (new_ms, new_peak, _) = results[label]
+        print(f"{'':<24} {'gain':<8} {old_ms / new_ms:8.1f}x {old_peak / new_peak:8.1f}x")
+
+    for label, ((old_ms, old_peak, _), (new_ms, new_peak, _)) in results.items():
+        assert new_ms < old_ms and new_peak < old_peak, f"summary path is not cheaper for {label}"
+    print("fields / titles / watchlist    : ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# backend/benchmarks/bench_auto_bid_resolver.py
+# ----------------------------------------------------------------------------------------------------
+# قياس حل المزايدات الآلية (auto_bid_resolver) في مرور واحد مقابل المحاكاة التكرارية
+# (كل إعداد يزايد بالحد الأدنى فوق السعر الحالي حتى لا يستطيع أحد التجاوز)، مع آلاف الإعدادات.
+# يتحقق من أن الفائز والسعر النهائي يطابقان المحاكاة على حالات عشوائية، ثم يتحقق على قاعدة البيانات
+# (المسار العادي ومحرك المزادات) من أن المزايدات المحفوظة متسقة مع صف المزاد.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_PROXIES=5000 python -m benchmarks.bench_auto_bid_resolver
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from benchmarks.bench_bid_contention import create_auction
+from src.auctions.crud import bidding_crud
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import Bid
+from src.auctions.schemas.bidding_schemas import AutoBidSettingCreate, BidCreate
+from src.auctions.services import bidding_service
+from src.auctions.services.auction_engine import AuctionEngine
+from src.auctions.services.auto_bid_resolver import ProxyBid, resolve_proxy_bids
+from src.db.session import SessionLocal
+from src.users.models.core_models import User
+
+PROXIES = int(os.getenv("BENCH_PROXIES", "5000"))
+SIMULATED_PROXIES = int(os.getenv("BENCH_SIMULATED_PROXIES", "500")) # المحاكاة التكرارية O(عدد المزايدات × عدد الإعدادات)
+INCREMENT = Decimal("1")
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def random_proxies(count: int, rng: random.Random):
+    # حدود مختلفة: عند التساوي تحسم المحاكاة التكرارية الفائز بزوجية الخطوات لا بالأسبقية
+    return [
+        ProxyBid(uuid.uuid4(), Decimal(max_amount), None, EPOCH + timedelta(seconds=i))
+        for i, max_amount in enumerate(rng.sample(range(20, 20 + count * 4), count))
+    ]
+
+
+def simulate(current_amount, current_leader, proxies):
+    """المحاكاة التكرارية: أعلى إعداد قادر على التجاوز يزايد بالحد الأدنى، حتى يستقر المزاد."""
+    bids = 0
+    while True:
+        required = current_amount + INCREMENT
+        challengers = [p for p in proxies if p.user_id != current_leader and p.max_bid_amount_per_unit >= required]
+        if not challengers:
+            return current_leader, current_amount, bids
+        challenger = min(challengers, key=lambda p: (-p.max_bid_amount_per_unit, p.created_at))
+        current_amount, current_leader = required, challenger.user_id
+        bids += 1
+
+
+def per_call_ms(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def bench_resolver() -> None:
+    rng = random.Random(7)
+    proxies = random_proxies(PROXIES, rng)
+    manual_bidder = uuid.uuid4()
+    for count in (SIMULATED_PROXIES, PROXIES):
+        subset = proxies[:count]
+        resolve = lambda: resolve_proxy_bids(Decimal(20), manual_bidder, Decimal(21), INCREMENT, subset)
+        print(f"{count:>6} proxies, single-pass resolver : {per_call_ms(resolve, 50):10.3f} ms  ({len(resolve())} bids)")
+    started = time.perf_counter()
+    _, _, simulated_bids = simulate(Decimal(20), manual_bidder, proxies[:SIMULATED_PROXIES])
+    simulation_ms = (time.perf_counter() - started) * 1000
+    print(f"{SIMULATED_PROXIES:>6} proxies, iterative simulation : {simulation_ms:10.1f} ms  ({simulated_bids} bids)")
+
+    # نفس الفائز، والسعر النهائي لا يقل عن حد المنافس الثاني ولا يتجاوزه بأكثر من زيادة واحدة
+    for _ in range(300):
+        proxies = random_proxies(rng.randint(1, 8), rng)
+        leader = rng.choice([manual_bidder, proxies[0].user_id])
+        resolved = resolve_proxy_bids(Decimal(20), leader, Decimal(21), INCREMENT, proxies)
+        winner, price, _ = simulate(Decimal(20), leader, proxies)
+        final_leader, final_price = (resolved[-1].bidder_user_id, resolved[-1].amount) if resolved else (leader, Decimal(20))
+        assert final_leader == winner, "winner mismatch"
+        assert abs(final_price - price) <= INCREMENT, "price mismatch"
+        assert len(resolved) <= 2
+    print("resolver vs simulation          : ok")
+
+
+def check_auction(auction_id) -> Auction:
+    db = SessionLocal()
+    try:
+        final = db.get(Auction, auction_id)
+        bids = db.scalars(select(Bid).where(Bid.auction_id == auction_id).order_by(Bid.bid_timestamp, Bid.bid_id)).all()
+        active = [bid for bid in bids if bid.bid_status == "ACTIVE_HIGHEST"]
+        assert final.total_bids_count == len(bids), "bid count mismatch"
+        assert len(active) == 1 and active[0] is bids[-1], "ACTIVE_HIGHEST mismatch"
+        assert (active[0].bidder_user_id, active[0].bid_amount_per_unit) == (
+            final.current_highest_bidder_user_id, final.current_highest_bid_amount_per_unit
+        ), "auction row mismatch"
+        db.expunge(final)
+        return final
+    finally:
+        db.close()
+
+
+def setup_auction(max_amounts):
+    """مزاد جديد وإعدادات آلية بالحدود المعطاة؛ يعيد (معرف المزاد، المزايد اليدوي، أصحاب الإعدادات)."""
+    db = SessionLocal()
+    try:
+        auction = create_auction(db)
+        auction_id = auction.auction_id
+        bidder_ids = db.scalars(select(User.user_id).where(User.user_id != auction.seller_user_id)).all()
+        proxy_user_ids = bidder_ids[: len(max_amounts)]
+        for user_id, max_amount in zip(proxy_user_ids, max_amounts):
+            bidding_crud.create_auto_bid_setting(db, AutoBidSettingCreate(
+                auction_id=auction_id, user_id=user_id, max_bid_amount_per_unit=max_amount,
+            ))
+        manual = db.get(User, bidder_ids[len(max_amounts)])
+        db.expunge_all()
+        return auction_id, manual, proxy_user_ids
+    finally:
+        db.close()
+
+
+def check_database() -> None:
+    # 1. مسار قاعدة البيانات: إعدادان آليان (40 و 55)، ثم مزايدة يدوية بـ 50
+    auction_id, manual, proxy_user_ids = setup_auction([40, 55])
+    db = SessionLocal()
+    try:
+        assert bidding_service.resolve_auto_bids(db, auction_id) == 2
+        final = check_auction(auction_id)
+        assert final.current_highest_bidder_user_id == proxy_user_ids[1] and final.current_highest_bid_amount_per_unit == 41
+
+        bid = bidding_service.place_bid(db, BidCreate(auction_id=auction_id, bidder_user_id=manual.user_id, bid_amount_per_unit=50), manual)
+        assert bid.bid_status == "OUTBID"
+        final = check_auction(auction_id)
+        assert final.current_highest_bidder_user_id == proxy_user_ids[1] and final.current_highest_bid_amount_per_unit == 51
+        assert final.total_bids_count == 4 # 40 و 41 (آلية)، 50 (يدوية)، 51 (آلية)
+    finally:
+        db.close()
+    print("database path                   : ok")
+
+    # 2. محرك المزادات: نفس الإعدادات عبر الدفتر في الذاكرة، ثم مزايدة يدوية تتجاوز كل الحدود
+    auction_id, manual, proxy_user_ids = setup_auction([40, 55])
+    engine = AuctionEngine(shards=2, queue_size=100, flush_interval_ms=50, flush_batch_size=500, ladder_depth=50)
+    try:
+        assert engine.resolve_auto_bids(auction_id) == 2
+        bid = engine.place_bid(BidCreate(auction_id=auction_id, bidder_user_id=manual.user_id, bid_amount_per_unit=60))
+        assert bid.bid_status == "ACTIVE_HIGHEST" # أعلى من كل الحدود
+        engine.flush()
+        final = check_auction(auction_id)
+        assert final.current_highest_bidder_user_id == manual.user_id and final.current_highest_bid_amount_per_unit == 60
+        assert final.total_bids_count == 3 # 40 و 41 (آلية)، 60 (يدوية)
+    finally:
+        engine.shutdown()
+    print("auction engine                  : ok")
+
+
+def main():
+    bench_resolver()
+    check_database()
+
+
+if __name__ == "__main__":
+    main()
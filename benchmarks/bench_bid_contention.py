@@ -0,0 +1,119 @@
+# backend/benchmarks/bench_bid_contention.py
+# ----------------------------------------------------------------------------------------------------
+# اختبار تزاحم المزايدات على مزاد واحد (bidding_service.place_bid):
+# عدد كبير من المزايدين المتوازيين، كل منهم يقرأ السعر الحالي ويزايد بالحد الأدنى للزيادة، فتتصادم
+# معظم المزايدات. يقيس معدل المعالجة، ثم يتحقق من اتساق الحالة النهائية:
+#   - أعلى مزايدة في المزاد = أعلى مزايدة في جدول bids، وصاحبها هو current_highest_bidder_user_id
+#   - total_bids_count = عدد المزايدات المقبولة = عدد صفوف bids
+#   - مزايدة واحدة فقط بحالة ACTIVE_HIGHEST، والمزايدات متزايدة بمقدار الحد الأدنى على الأقل
+# ينشئ مزادًا جديدًا نشطًا بنسخ أول مزاد موجود في قاعدة البيانات.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_BIDS=2000 BENCH_THREADS=16 python -m benchmarks.bench_bid_contention
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.auctions.crud import bidding_crud
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import Bid
+from src.auctions.schemas.bidding_schemas import BidCreate
+from src.auctions.services import bidding_service
+from src.lookups.models.lookups_models import AuctionStatus
+from src.db.session import SessionLocal
+from src.users.models.core_models import User
+
+BIDS = int(os.getenv("BENCH_BIDS", "2000"))
+THREADS = int(os.getenv("BENCH_THREADS", "16"))
+
+
+def create_auction(db) -> Auction:
+    template = db.scalars(select(Auction).limit(1)).first()
+    active_status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == "ACTIVE"))
+    now = datetime.now(timezone.utc)
+    auction = Auction(
+        auction_id=uuid.uuid4(),
+        seller_user_id=template.seller_user_id,
+        product_id=template.product_id,
+        auction_type_id=template.auction_type_id,
+        auction_status_id=active_status_id,
+        start_timestamp=now,
+        end_timestamp=now + timedelta(hours=1),
+        starting_price_per_unit=10,
+        minimum_bid_increment=1,
+        quantity_offered=template.quantity_offered,
+        unit_of_measure_id_for_quantity=template.unit_of_measure_id_for_quantity,
+        total_bids_count=0,
+    )
+    db.add(auction)
+    db.commit()
+    return auction
+
+
+def main():
+    db = SessionLocal()
+    auction = create_auction(db)
+    auction_id, seller_id = auction.auction_id, auction.seller_user_id
+    bidders = [user for user in db.scalars(select(User)).all() if user.user_id != seller_id]
+    db.expunge_all()
+    db.close()
+
+    counters = {"accepted": 0, "outbid": 0, "conflict": 0}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def bid(i: int):
+        if not hasattr(local, "db"):
+            local.db = SessionLocal()
+        session = local.db
+        bidder = bidders[i % len(bidders)]
+        state = bidding_crud.get_auction_bid_state(session, auction_id)
+        session.rollback()
+        amount = float((state.current_highest_bid_amount_per_unit or state.starting_price_per_unit) + state.minimum_bid_increment)
+        bid_in = BidCreate(auction_id=auction_id, bidder_user_id=bidder.user_id, bid_amount_per_unit=amount)
+        try:
+            bidding_service.place_bid(session, bid_in, bidder)
+            outcome = "accepted"
+        except HTTPException as exc:
+            outcome = "conflict" if exc.status_code == 409 else "outbid"
+        finally:
+            session.rollback() # إعادة الاتصال إلى المجمع (كما يفعل إغلاق الجلسة في نهاية الطلب)
+        with lock:
+            counters[outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(bid, range(BIDS)))
+    elapsed = time.perf_counter() - started
+
+    print(f"bids={BIDS} threads={THREADS} elapsed={elapsed:.2f}s -> {BIDS / elapsed:.0f} bids/s")
+    print(f"accepted={counters['accepted']} rejected_outbid={counters['outbid']} conflict_409={counters['conflict']}")
+
+    db = SessionLocal()
+    try:
+        final = db.get(Auction, auction_id)
+        bids = db.scalars(select(Bid).where(Bid.auction_id == auction_id).order_by(Bid.bid_id)).all()
+        amounts = [bid.bid_amount_per_unit for bid in bids]
+        active = [bid for bid in bids if bid.bid_status == "ACTIVE_HIGHEST"]
+        assert final.total_bids_count == len(bids) == counters["accepted"], "bid count mismatch"
+        assert final.current_highest_bid_amount_per_unit == max(amounts), "highest bid mismatch"
+        assert len(active) == 1 and active[0].bid_amount_per_unit == max(amounts), "ACTIVE_HIGHEST mismatch"
+        assert final.current_highest_bidder_user_id == active[0].bidder_user_id, "highest bidder mismatch"
+        assert all(b - a >= final.minimum_bid_increment for a, b in zip(amounts, amounts[1:])), "bid ladder not increasing"
+        print(f"final highest={final.current_highest_bid_amount_per_unit} total_bids_count={final.total_bids_count}")
+        print("consistency checks: ok")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
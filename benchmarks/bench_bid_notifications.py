@@ -0,0 +1,275 @@
+# backend/benchmarks/bench_bid_notifications.py
+# ----------------------------------------------------------------------------------------------------
+# قياس توزيع إشعارات المزايدات (bid_notifications) مقابل الإخطار المباشر لكل مزايدة:
+#   1. المباشر: لكل مزايدة استعلام المراقبين ولغة كل مستلم وقالبه، ثم تصيير و INSERT و commit وإرسال لكل إشعار.
+#   2. التوزيع: publish() في مسار المزايدة (زمنها بالميكروثانية)، ثم تفريغ واحد: استعلام مراقبين واحد، تصيير لكل (مزاد، لغة)،
+#      INSERT جماعي، وإرسال عبر قناة بطيئة بحد تزامن.
+# يتحقق من: إشعار واحد لكل (مستخدم، مزاد)، من تم تجاوزه يستلم AUCTION_OUTBID، المتصدر لا يُخطر، النص بلغة المستلم،
+# كل السجلات SENT، الإرسال المتزامن لا يتجاوز الحد، ومسار place_bid الفعلي يسجل المتصدر السابق كمن تم تجاوزه.
+# ينشئ حالات التسليم والقوالب والفهرس إذا لم تكن موجودة في قاعدة بيانات الاختبار.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_AUCTIONS=200 BENCH_WATCHERS=50 BENCH_BIDS=20 python -m benchmarks.bench_bid_notifications
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.core.schemas_bootstrap import rebuild_all_schemas
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import AuctionWatchlist
+from src.auctions.schemas.bidding_schemas import BidCreate
+from src.auctions.services import bidding_service
+from src.auctions.services.bid_notifications import OUTBID_TEMPLATE_KEY, WATCHLIST_TEMPLATE_KEY, BidNotificationFanout, bid_notifications
+from src.communications.models.notifications_models import (
+    NotificationChannel, NotificationDeliveryStatus, NotificationLog, NotificationTemplate, NotificationTemplateTranslation,
+)
+from src.communications.services.notification_channels import LocalNotificationChannel, OutgoingNotification, register_channel_backend
+from src.communications.services.notification_dispatcher import NotificationDispatcher, _render
+from src.db.session import SessionLocal
+from src.lookups.models.lookups_models import AuctionStatus
+from src.users.models.core_models import User
+
+AUCTIONS = int(os.getenv("BENCH_AUCTIONS", "200"))
+WATCHERS = int(os.getenv("BENCH_WATCHERS", "50"))
+BIDS = int(os.getenv("BENCH_BIDS", "20"))
+USERS = int(os.getenv("BENCH_USERS", "500"))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "8"))
+NAIVE_AUCTIONS = max(AUCTIONS // 10, 1) # المسار المباشر على عينة فقط (بطيء)
+SEND_MS = 2.0 # زمن الإرسال في القناة البطيئة
+CHANNEL_KEY = "BENCH_LOCAL"
+
+TEMPLATES = {
+    OUTBID_TEMPLATE_KEY: {"ar": ("تم تجاوز مزايدتك", "تم تجاوز مزايدتك في {auction_title}: {amount}"), "en": ("Outbid", "Outbid on {auction_title}: {amount}")},
+    WATCHLIST_TEMPLATE_KEY: {"ar": ("مزايدة جديدة", "مزايدة جديدة على {auction_title}: {amount}"), "en": ("New bid", "New bid on {auction_title}: {amount}")},
+}
+
+
+class SlowChannel(LocalNotificationChannel):
+    """قناة محلية تحاكي زمن بوابة خارجية وتقيس أقصى عدد إرسالات متزامنة."""
+
+    def __init__(self):
+        super().__init__(keep_last=100000)
+        self._flight_lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def send(self, notification):
+        with self._flight_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(SEND_MS / 1000)
+            return super().send(notification)
+        finally:
+            with self._flight_lock:
+                self.in_flight -= 1
+
+
+def next_id(db, column) -> int:
+    return (db.scalar(select(func.max(column))) or 0) + 1 # BigInteger بلا تزايد تلقائي في SQLite
+
+
+def ensure_fixtures(db) -> None:
+    for table in (AuctionWatchlist.__table__,):
+        for index in table.indexes:
+            index.create(db.get_bind(), checkfirst=True)
+    if db.scalar(select(NotificationChannel.channel_id).where(NotificationChannel.channel_name_key == CHANNEL_KEY)) is None:
+        db.add(NotificationChannel(channel_id=next_id(db, NotificationChannel.channel_id), channel_name_key=CHANNEL_KEY))
+    for key in ("PENDING", "SENT", "FAILED"):
+        if db.scalar(select(NotificationDeliveryStatus.delivery_status_id).where(NotificationDeliveryStatus.status_name_key == key)) is None:
+            db.add(NotificationDeliveryStatus(delivery_status_id=next_id(db, NotificationDeliveryStatus.delivery_status_id), status_name_key=key))
+            db.flush()
+    for key, languages in TEMPLATES.items():
+        template_id = db.scalar(select(NotificationTemplate.template_id).where(NotificationTemplate.template_name_key == key))
+        if template_id is None:
+            template_id = next_id(db, NotificationTemplate.template_id)
+            db.add(NotificationTemplate(template_id=template_id, template_name_key=key, default_language_code="ar"))
+            db.flush()
+            for language, (subject, body) in languages.items():
+                db.add(NotificationTemplateTranslation(
+                    template_translation_id=next_id(db, NotificationTemplateTranslation.template_translation_id),
+                    template_id=template_id, language_code=language, translated_subject=subject, translated_body=body,
+                ))
+                db.flush()
+    db.commit()
+
+
+def create_fixtures(db):
+    """مستخدمون (نصفهم بالإنجليزية)، ومزادات نشطة يراقب كل منها WATCHERS مستخدمًا."""
+    template_user = db.scalars(select(User).limit(1)).first()
+    run = uuid.uuid4().hex[:8]
+    users = [
+        {
+            "user_id": uuid.uuid4(), "phone_number": f"+9{run}{i:05d}", "password_hash": "x", "first_name": "Bench", "last_name": str(i),
+            "user_type_id": template_user.user_type_id, "account_status_id": template_user.account_status_id,
+            "preferred_language_code": "en" if i % 2 else "ar",
+        }
+        for i in range(USERS)
+    ]
+    db.execute(insert(User), users)
+    template = db.scalars(select(Auction).limit(1)).first()
+    active_status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == "ACTIVE"))
+    now = datetime.now(timezone.utc)
+    auctions = [
+        {
+            "auction_id": uuid.uuid4(), "seller_user_id": template.seller_user_id, "product_id": template.product_id,
+            "auction_type_id": template.auction_type_id, "auction_status_id": active_status_id,
+            "custom_auction_title": f"Bench auction {i}", "start_timestamp": now - timedelta(hours=1), "end_timestamp": now + timedelta(days=1),
+            "starting_price_per_unit": 10, "minimum_bid_increment": 1, "quantity_offered": template.quantity_offered,
+            "unit_of_measure_id_for_quantity": template.unit_of_measure_id_for_quantity, "total_bids_count": 0, "is_private_auction": False,
+        }
+        for i in range(AUCTIONS)
+    ]
+    db.execute(insert(Auction), auctions)
+    entry_id = next_id(db, AuctionWatchlist.watchlist_entry_id)
+    watchers, rows = {}, []
+    for auction in auctions:
+        watchers[auction["auction_id"]] = random.sample([u["user_id"] for u in users], WATCHERS)
+        for user_id in watchers[auction["auction_id"]]:
+            rows.append({"watchlist_entry_id": entry_id, "user_id": user_id, "auction_id": auction["auction_id"]})
+            entry_id += 1
+    db.execute(insert(AuctionWatchlist), rows)
+    db.commit()
+    return [a["auction_id"] for a in auctions], watchers, {u["user_id"]: u["preferred_language_code"] for u in users}
+
+
+def bid_storm(watchers):
+    """BIDS مزايدة لكل مزاد من مراقبيه: (المزاد، المبلغ، المتصدر، من تم تجاوزه)."""
+    events = []
+    for auction_id, users in watchers.items():
+        leader = None
+        for i in range(BIDS):
+            bidder = random.choice([u for u in users if u != leader])
+            events.append((auction_id, Decimal(11 + i), bidder, [leader] if leader else []))
+            leader = bidder
+    return events
+
+
+def notify_directly(db, events, channel) -> int:
+    """الإخطار المباشر: كل مزايدة بقراءاتها وتصييرها وحفظها وإرسالها مستقلة."""
+    channel_id = db.scalar(select(NotificationChannel.channel_id).where(NotificationChannel.channel_name_key == CHANNEL_KEY))
+    sent_id = db.scalar(select(NotificationDeliveryStatus.delivery_status_id).where(NotificationDeliveryStatus.status_name_key == "SENT"))
+    created = 0
+    for auction_id, amount, leader, outbid in events:
+        watcher_ids = db.scalars(select(AuctionWatchlist.user_id).where(AuctionWatchlist.auction_id == auction_id)).all()
+        title = db.scalar(select(Auction.custom_auction_title).where(Auction.auction_id == auction_id))
+        for user_id in set(watcher_ids) | set(outbid):
+            if user_id == leader:
+                continue
+            key = OUTBID_TEMPLATE_KEY if user_id in outbid else WATCHLIST_TEMPLATE_KEY
+            language = db.scalar(select(User.preferred_language_code).where(User.user_id == user_id))
+            translation = db.execute(
+                select(NotificationTemplateTranslation.template_id, NotificationTemplateTranslation.translated_subject, NotificationTemplateTranslation.translated_body)
+                .join(NotificationTemplate, NotificationTemplate.template_id == NotificationTemplateTranslation.template_id)
+                .where(NotificationTemplate.template_name_key == key, NotificationTemplateTranslation.language_code == language)
+            ).one()
+            params = {"auction_title": title, "amount": f"{amount:,.2f}"}
+            log = NotificationLog(
+                notification_log_id=uuid.uuid4(), user_id=user_id, template_id=translation.template_id, channel_id=channel_id,
+                recipient_address=str(user_id), subject_rendered=_render(translation.translated_subject, params),
+                body_rendered=_render(translation.translated_body, params), delivery_status_id=sent_id,
+            )
+            db.add(log)
+            db.commit()
+            channel.send(OutgoingNotification(log.notification_log_id, user_id, log.recipient_address, log.subject_rendered, log.body_rendered))
+            created += 1
+    return created
+
+
+def check_place_bid_wiring(db) -> None:
+    """مزايدتان فعليتان على مزاد واحد: الثانية تسجل صاحب الأولى كمن تم تجاوزه."""
+    auction = db.scalars(select(Auction).where(Auction.custom_auction_title == "Bench auction 0").order_by(Auction.created_at.desc())).first()
+    bidders = db.scalars(select(User).where(User.first_name == "Bench", User.user_id != auction.seller_user_id).limit(2)).all()
+    bid_notifications._pending.clear()
+    for i, bidder in enumerate(bidders):
+        bidding_service.place_bid(db, BidCreate(auction_id=auction.auction_id, bidder_user_id=bidder.user_id, bid_amount_per_unit=100 + i * 10), current_user=bidder)
+    pending = bid_notifications._pending[auction.auction_id]
+    assert pending.leader_user_id == bidders[1].user_id and bidders[0].user_id in pending.outbid_user_ids, "place_bid did not queue the outbid bidder"
+    assert pending.events == 2 and pending.amount == Decimal("110"), "place_bid events not coalesced"
+    bid_notifications._pending.clear()
+
+
+def main():
+    rebuild_all_schemas()
+    channel = SlowChannel()
+    register_channel_backend(CHANNEL_KEY, channel)
+    dispatcher = NotificationDispatcher(channel_name_key=CHANNEL_KEY, concurrency=CONCURRENCY)
+    fanout = BidNotificationFanout(window_seconds=3600, max_pending_auctions=AUCTIONS, dispatcher=dispatcher) # الخيط لا يفرغ أثناء القياس
+    bid_notifications.window_seconds = 3600
+
+    db = SessionLocal()
+    try:
+        ensure_fixtures(db)
+        auction_ids, watchers, languages = create_fixtures(db)
+        events = bid_storm(watchers)
+        check_place_bid_wiring(db)
+
+        naive_events = [event for event in events if event[0] in set(auction_ids[:NAIVE_AUCTIONS])]
+        started = time.perf_counter()
+        naive_created = notify_directly(db, naive_events, LocalNotificationChannel())
+        naive_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for auction_id, amount, leader, outbid in events:
+            fanout.publish(auction_id, amount, leader, outbid)
+        publish_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        report = fanout.flush(db)
+        flush_seconds = time.perf_counter() - started
+
+        logs = db.execute(
+            select(NotificationLog.user_id, NotificationLog.related_entity_id, NotificationTemplate.template_name_key, NotificationLog.body_rendered, NotificationDeliveryStatus.status_name_key)
+            .join(NotificationTemplate, NotificationTemplate.template_id == NotificationLog.template_id)
+            .join(NotificationDeliveryStatus, NotificationDeliveryStatus.delivery_status_id == NotificationLog.delivery_status_id)
+            .where(NotificationLog.related_entity_id.in_([str(a) for a in auction_ids]))
+        ).all()
+    finally:
+        db.close()
+
+    dispatch = report["dispatch"]
+    naive_per_event = naive_seconds / len(naive_events)
+    print(f"auctions / watchers / bids     : {AUCTIONS} / {WATCHERS} / {BIDS}  ({len(events)} bid events)")
+    print(f"direct (per bid)               : {naive_seconds * 1000:8.1f} ms for {len(naive_events)} bids  ({naive_per_event * 1000:6.2f} ms/bid, {naive_created} notifications)")
+    print(f"direct, extrapolated           : {naive_per_event * len(events) * 1000:8.1f} ms  ({naive_created * len(events) // len(naive_events)} notifications)")
+    print(f"fan-out publish (bid path)     : {publish_seconds * 1e6 / len(events):8.2f} µs/bid")
+    print(f"fan-out flush                  : {flush_seconds * 1000:8.1f} ms  ({report['notifications']} notifications, {dispatch['renders']} renders)")
+    print(f"delivery concurrency (max/lim) : {channel.max_in_flight} / {CONCURRENCY}  ({SEND_MS} ms per send)")
+
+    by_user_auction = {}
+    for row in logs:
+        by_user_auction.setdefault((row.user_id, row.related_entity_id), []).append(row)
+    final = {}
+    for auction_id, amount, leader, outbid in events:
+        state = final.setdefault(auction_id, {"leader": None, "outbid": set(), "amount": None})
+        state["leader"], state["amount"] = leader, amount
+        state["outbid"].update(outbid)
+    for auction_id, state in final.items():
+        outbid = state["outbid"] - {state["leader"]}
+        expected = {user_id: OUTBID_TEMPLATE_KEY for user_id in outbid}
+        expected.update({user_id: WATCHLIST_TEMPLATE_KEY for user_id in watchers[auction_id] if user_id not in outbid and user_id != state["leader"]})
+        got = {user_id: rows for (user_id, related), rows in by_user_auction.items() if related == str(auction_id)}
+        assert got.keys() == expected.keys(), "wrong recipients"
+        for user_id, rows in got.items():
+            assert len(rows) == 1, "more than one notification per user and auction"
+            row = rows[0]
+            assert row.template_name_key == expected[user_id], "wrong template"
+            assert row.status_name_key == "SENT", "not delivered"
+            assert f"{state['amount']:,.2f}" in row.body_rendered and row.body_rendered.startswith(("Outbid", "New bid") if languages[user_id] == "en" else ("تم", "مزايدة")), "wrong rendering"
+    assert dispatch["renders"] <= 2 * len(TEMPLATES) * AUCTIONS, "templates rendered per user"
+    assert 1 < channel.max_in_flight <= CONCURRENCY, "delivery concurrency limit not applied"
+    assert channel.sent == report["notifications"] == dispatch["sent"], "local channel did not receive every notification"
+    print("recipients / coalescing / SENT : ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_jwt_decode.py
+# ----------------------------------------------------------------------------------------------------
+# مقارنة تكلفة التحقق من Access Token لكل طلب:
+#   1. المسار السابق: jwt.decode + TokenPayload في كل مرة
+#   2. decode_access_token مع ذاكرة التوكنات المفكوكة (token_cache)
+# ويتحقق من أن الذاكرة لا تقبل توكنًا معدلاً، وأن الإبطال والإخلاء (LRU) يعملان.
+# لا يحتاج إلى قاعدة بيانات.
+#
+# التشغيل (من مجلد backend):
+#   python -m benchmarks.bench_jwt_decode
+# ----------------------------------------------------------------------------------------------------
+
+import time
+import uuid
+
+from fastapi import HTTPException
+from jose import jwt
+
+from src.core import security
+from src.core.config import settings
+from src.core.token_cache import DecodedTokenCache, token_cache
+
+ITERATIONS = 50_000
+DISTINCT_TOKENS = 100
+
+
+def per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - started) * 1_000_000 / iterations
+
+
+def main():
+    tokens = [security.create_access_token(uuid.uuid4(), session_id=uuid.uuid4()) for _ in range(DISTINCT_TOKENS)]
+
+    def uncached(i):
+        payload = jwt.decode(tokens[i % DISTINCT_TOKENS], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        security.TokenPayload(**payload)
+
+    def cached(i):
+        security.decode_access_token(tokens[i % DISTINCT_TOKENS])
+
+    token_cache.clear()
+    baseline = per_call_us(uncached, ITERATIONS)
+    fast = per_call_us(cached, ITERATIONS)
+    stats = token_cache.stats()
+    print(f"jwt.decode + TokenPayload : {baseline:8.2f} us/call")
+    print(f"decode_access_token (LRU) : {fast:8.2f} us/call  ({baseline / fast:4.1f}x)")
+    print(f"cache: size={stats['size']} hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']:.4f}")
+
+    # توكن بحمولة معدلة ونفس التوقيع يجب أن يُرفض
+    header, _, signature = tokens[0].split(".")
+    forged_body = jwt.encode({"sub": str(uuid.uuid4()), "exp": 4102444800}, "x", algorithm=settings.ALGORITHM).split(".")[1]
+    try:
+        security.decode_access_token(f"{header}.{forged_body}.{signature}")
+        raise AssertionError("forged token accepted")
+    except HTTPException:
+        pass
+
+    # الإبطال حسب الجلسة يجبر على إعادة التحقق (ودالة التحقق من الجلسة ترفض)
+    sid = security.decode_access_token(tokens[1]).sid
+    token_cache.invalidate_session(sid)
+    try:
+        security.decode_access_token(tokens[1], session_validator=lambda _sid: False)
+        raise AssertionError("revoked session accepted")
+    except HTTPException:
+        pass
+
+    small = DecodedTokenCache(max_entries=10, max_age_seconds=60)
+    for token in tokens[:25]:
+        small.put(token, object(), None)
+    assert small.stats()["size"] == 10 and small.stats()["evictions"] == 15
+    print("correctness checks        : ok")
+
+
+if __name__ == "__main__":
+    main()
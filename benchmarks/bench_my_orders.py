@@ -0,0 +1,175 @@
+# backend/benchmarks/bench_my_orders.py
+# ----------------------------------------------------------------------------------------------------
+# قياس "طلباتي" (GET /orders/me) لبائع لديه BENCH_ORDERS طلبًا: بائع الطلب، أو بائع لبنود في طلبات متعددة البائعين،
+# أو مشترٍ، بين طلبات مستخدمين آخرين.
+#   - القديم: get_all_orders مرتين (كمشتري وكبائع للطلب) بـ skip/limit لكل منهما ثم الدمج في Python.
+#   - الجديد: get_my_orders (UNION لثلاثة فروع مرتبة من فهارسها بـ (order_date, order_id)، وترقيم المؤشر).
+# زمن وعدد استعلامات الصفحة الأولى وصفحة عميقة (بعد 90% من الطلبات). يتحقق من أن صفحات المسار الجديد تطابق
+# الترتيب المتوقع بلا تكرار ولا نقص (بما فيها الطلبات التي يظهر فيها المستخدم كبائع لبند فقط)، وأن عدد الاستعلامات
+# ثابت مهما كان عمق الصفحة، ويعرض أخطاء المسار القديم (صفحة أكبر من limit، وطلبات متعددة البائعين مفقودة).
+#
+# التشغيل (من مجلد backend):
+#   BENCH_ORDERS=100000 python -m benchmarks.bench_my_orders
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, func, insert, select
+
+from benchmarks.bench_price_tables import count_queries
+from src.db.keyset import encode_cursor
+from src.db.session import SessionLocal
+from src.lookups.models import OrderStatus
+from src.market.crud import orders_crud
+from src.market.models.orders_models import Order, OrderItem
+from src.market.services import orders_service
+from src.products.models.units_models import ProductPackagingOption
+from src.users.models.core_models import User
+
+ORDERS = int(os.getenv("BENCH_ORDERS", "100000"))
+SMALL_ORDERS = 500
+PAGE = 20
+REFERENCE_PREFIX = "MYORDERS-BENCH-"
+CHUNK = 5000
+
+
+def create_orders(db, seller, small_user, others):
+    """
+    ينشئ ORDERS طلبًا للبائع (40% بائع الطلب، 40% بائع لبند في طلب متعدد البائعين، 20% مشترٍ)، و SMALL_ORDERS للمستخدم
+    الصغير بنفس التوزيع، و ORDERS/2 طلبًا لا يخصهما. تواريخ متكررة (كل 3 طلبات في نفس الثانية) لاختبار order_id كفاصل.
+    يعيد {user_id: [(order_date, order_id), ...]} للطلبات المتوقعة لكل من المستخدمين.
+    """
+    status_id = db.scalar(select(OrderStatus.order_status_id).limit(1))
+    option_id = db.scalar(select(ProductPackagingOption.packaging_option_id).limit(1))
+    base = datetime(2020, 1, 1)
+    expected = {seller: [], small_user: []}
+    orders, items = [], []
+    next_item_id = (db.scalar(select(func.max(OrderItem.order_item_id))) or 0) + 1 # BigInteger بلا تزايد تلقائي في SQLite
+
+    def add(n, user_id, role):
+        nonlocal next_item_id
+        order_id, order_date = uuid4(), base + timedelta(seconds=n // 3)
+        other = random.choice(others)
+        buyer, order_seller, item_sellers = other, None, [other]
+        if role == "seller":
+            order_seller, item_sellers = user_id, [user_id]
+        elif role == "item_seller":
+            item_sellers = [other, user_id, user_id] # بندان للمستخدم في نفس الطلب: يجب ألا يتكرر الطلب
+        elif role == "buyer":
+            buyer = user_id
+        orders.append({
+            "order_id": order_id, "buyer_user_id": buyer, "seller_user_id": order_seller, "order_reference_number": f"{REFERENCE_PREFIX}{n}",
+            "order_date": order_date, "order_status_id": status_id, "total_amount_before_discount": 1, "total_amount_after_discount": 1,
+            "final_total_amount": 1, "currency_code": "SAR",
+        })
+        for item_seller in item_sellers:
+            items.append({
+                "order_item_id": next_item_id, "order_id": order_id, "product_packaging_option_id": option_id, "seller_user_id": item_seller,
+                "quantity_ordered": 1, "unit_price_at_purchase": 1, "total_price_for_item": 1, "order_date": order_date,
+            })
+            next_item_id += 1
+        if user_id is not None:
+            expected[user_id].append((order_date, order_id))
+
+    roles = ["seller"] * 2 + ["item_seller"] * 2 + ["buyer"]
+    plan = [(seller, random.choice(roles)) for _ in range(ORDERS)]
+    plan += [(small_user, random.choice(roles)) for _ in range(SMALL_ORDERS)]
+    plan += [(None, None)] * (ORDERS // 2)
+    random.shuffle(plan)
+    for n, (user_id, role) in enumerate(plan):
+        add(n, user_id, role)
+        if len(orders) >= CHUNK:
+            db.execute(insert(Order), orders)
+            db.execute(insert(OrderItem), items)
+            orders, items = [], []
+    if orders:
+        db.execute(insert(Order), orders)
+        db.execute(insert(OrderItem), items)
+    db.commit()
+    for rows in expected.values():
+        rows.sort(reverse=True) # الأحدث أولاً، ثم order_id تنازليًا
+    return expected
+
+
+def cleanup(db):
+    order_ids = select(Order.order_id).where(Order.order_reference_number.like(f"{REFERENCE_PREFIX}%"))
+    db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+    db.execute(delete(Order).where(Order.order_reference_number.like(f"{REFERENCE_PREFIX}%")))
+    db.commit()
+
+
+def legacy_my_orders(db, user, skip, limit):
+    """نسخة من get_my_orders قبل UNION (للمقارنة)."""
+    orders_as_buyer = orders_crud.get_all_orders(db, buyer_user_id=user.user_id, skip=skip, limit=limit)
+    orders_as_seller = orders_crud.get_all_orders(db, seller_user_id=user.user_id, skip=skip, limit=limit)
+    all_orders = {order.order_id: order for order in orders_as_buyer}
+    all_orders.update({order.order_id: order for order in orders_as_seller})
+    return list(all_orders.values())
+
+
+def measure(db, fn):
+    db.expunge_all() # كل قياس يبدأ بجلسة باردة
+    counter, stop = count_queries(db)
+    try:
+        started = time.perf_counter()
+        result = fn()
+        return (time.perf_counter() - started) * 1000, counter.value, result
+    finally:
+        stop()
+
+
+def main():
+    random.seed(25)
+    db = SessionLocal()
+    try:
+        cleanup(db)
+        users = db.scalars(select(User).limit(5)).all()
+        seller, small_user = users[0], users[1]
+        started = time.perf_counter()
+        expected = create_orders(db, seller.user_id, small_user.user_id, [user.user_id for user in users[2:]])
+        setup_seconds = time.perf_counter() - started
+
+        # صفحات المستخدم الصغير كلها بالمؤشر: نفس الترتيب المتوقع، بلا تكرار ولا نقص
+        walked, cursor = [], None
+        while True:
+            page = orders_service.get_my_orders(db, small_user, cursor=cursor, limit=PAGE)
+            assert len(page["items"]) <= PAGE
+            walked += [(order.order_date, order.order_id) for order in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert walked == expected[small_user.user_id], "cursor pages do not match the expected orders"
+
+        # البائع الكبير: الصفحة الأولى وصفحة بعد 90% من طلباته
+        seller_orders = expected[seller.user_id]
+        depth = int(len(seller_orders) * 0.9)
+        deep_cursor = encode_cursor(*seller_orders[depth - 1])
+        rows = []
+        query_counts = set()
+        for label, cursor, skip in (("first", None, 0), ("90% deep", deep_cursor, depth)):
+            legacy_ms, legacy_queries, legacy_page = measure(db, lambda: legacy_my_orders(db, seller, skip, PAGE))
+            new_ms, new_queries, page = measure(db, lambda: orders_service.get_my_orders(db, seller, cursor=cursor, limit=PAGE))
+            assert [(order.order_date, order.order_id) for order in page["items"]] == seller_orders[skip:skip + PAGE], f"{label} page mismatch"
+            query_counts.add(new_queries)
+            rows.append((label, legacy_ms, legacy_queries, len(legacy_page), new_ms, new_queries, len(page["items"])))
+        assert len(query_counts) == 1, f"query count depends on page depth: {sorted(query_counts)}"
+        legacy_found = len({(order.order_date, order.order_id) for order in legacy_my_orders(db, small_user, 0, SMALL_ORDERS * 2)})
+    finally:
+        db.rollback()
+        cleanup(db)
+        db.close()
+
+    print(f"orders: seller {len(seller_orders)}, total inserted {ORDERS + SMALL_ORDERS + ORDERS // 2} (setup {setup_seconds:.1f} s)")
+    print(f"{'page':<9} {'legacy ms':>10} {'queries':>8} {'rows':>5} {'cursor ms':>10} {'queries':>8} {'rows':>5}")
+    for label, legacy_ms, legacy_queries, legacy_rows, new_ms, new_queries, new_rows in rows:
+        print(f"{label:<9} {legacy_ms:10.1f} {legacy_queries:>8} {legacy_rows:>5} {new_ms:10.2f} {new_queries:>8} {new_rows:>5}")
+    print(f"legacy sees {legacy_found} of {len(expected[small_user.user_id])} orders of the small user (multi-seller orders are missed)")
+    print("ordering / no duplicates / no gaps / flat round trips: ok")
+
+
+if __name__ == "__main__":
+    main()
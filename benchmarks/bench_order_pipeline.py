@@ -0,0 +1,239 @@
+# backend/benchmarks/bench_order_pipeline.py
+# ----------------------------------------------------------------------------------------------------
+# قياس إنشاء الطلب: المسار القديم لكل بند (get_packaging_option_details + get_user_profile + get_or_create_inventory_item
+# قبل الإنشاء، ثم خصم المخزون بند ببند مع commit لكل بند) مقابل create_new_order المجمّع (استعلام واحد لخيارات
+# التعبئة وواحد للبائعين، وحجز المخزون بعبارة UPDATE شرطية واحدة ودفعة INSERT للحركات، و commit واحد) لطلبات من 1 إلى 500 بند.
+#   - عدد الاستعلامات وزمن الطلب والتكلفة الإضافية لكل بند.
+# يتحقق من أن عدد استعلامات المسار المجمّع ثابت مهما كان عدد البنود، ومن خصم الكميات المجمّعة لكل بند مخزون
+# وتسجيل حركة واحدة له، ومن أن الطلب الذي يتجاوز المخزون لا يترك طلبًا ولا خصمًا (الذرية).
+#
+# التشغيل (من مجلد backend):
+#   BENCH_OPTIONS=200 python -m benchmarks.bench_order_pipeline
+# ----------------------------------------------------------------------------------------------------
+
+import itertools
+import random
+import time
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+
+from benchmarks.bench_price_tables import cleanup as cleanup_options, count_queries, create_options
+from src.db.session import SessionLocal
+from src.exceptions import ForbiddenException, NotFoundException
+from src.lookups.models import InventoryItemStatus, InventoryTransactionType, OrderItemStatus, OrderStatus
+from src.market.models.orders_models import Order, OrderItem, OrderStatusHistory
+from src.market.schemas import order_schemas
+from src.market.services import orders_service
+from src.pricing.services import pricing_service
+from src.products.crud import inventory_crud
+from src.products.models.inventory_models import InventoryItem, InventoryReservation, InventoryTransaction
+from src.products.services.packaging_service import get_packaging_option_details
+from src.users.models.core_models import User
+from src.users.services.core_service import get_user_profile
+
+ORDER_SIZES = (1, 10, 100, 500)
+STOCK = 100000
+ORDER_MARK = "ORDER_PIPELINE_BENCH"
+
+
+def next_ids(db, column):
+    """مولد معرفات BIGINT للمسار القديم (ORM صفًا صفًا) يُحسب قبل القياس، فلا يضيف استعلامات إليه."""
+    return itertools.count((db.scalar(select(func.max(column))) or 0) + 1)
+
+
+def ensure_fixtures(db):
+    """ينشئ حالة 'NEW' للطلب ولبند الطلب إن لم توجد، ويعيد ما أنشأه لحذفه في النهاية."""
+    created = []
+    for model, column in ((OrderStatus, OrderStatus.status_name_key), (OrderItemStatus, OrderItemStatus.status_name_key)):
+        if db.scalar(select(column).where(column == "NEW")) is None:
+            row = model(status_name_key="NEW")
+            db.add(row)
+            created.append(row)
+    db.commit()
+    return created
+
+
+def create_inventory(db, options, seller_id):
+    in_stock = db.scalar(select(InventoryItemStatus.inventory_item_status_id).where(InventoryItemStatus.status_name_key == "IN_STOCK"))
+    ids = next_ids(db, InventoryItem.inventory_item_id)
+    db.execute(insert(InventoryItem), [
+        {
+            "inventory_item_id": next(ids), "product_packaging_option_id": option_id, "seller_user_id": seller_id,
+            "available_quantity": STOCK, "reserved_quantity": 0, "on_hand_quantity": STOCK, "inventory_item_status_id": in_stock,
+        }
+        for option_id in options
+    ])
+    db.commit()
+
+
+def cleanup(db, options):
+    order_ids = select(Order.order_id).where(Order.notes_from_buyer == ORDER_MARK)
+    db.execute(delete(InventoryReservation).where(InventoryReservation.order_id.in_(order_ids)))
+    db.execute(delete(OrderStatusHistory).where(OrderStatusHistory.order_id.in_(order_ids)))
+    db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+    db.execute(delete(Order).where(Order.notes_from_buyer == ORDER_MARK))
+    if options:
+        item_ids = select(InventoryItem.inventory_item_id).where(InventoryItem.product_packaging_option_id.in_(options))
+        db.execute(delete(InventoryTransaction).where(InventoryTransaction.inventory_item_id.in_(item_ids)))
+        db.execute(delete(InventoryItem).where(InventoryItem.product_packaging_option_id.in_(options)))
+    db.commit()
+    cleanup_options(db)
+
+
+def legacy_create_order(db, order_in, buyer, ids):
+    """
+    نسخة من خطوات create_new_order قبل المسار المجمّع (للمقارنة): التحقق والتسعير بند ببند، ثم الطلب وسجل حالته
+    بـ commit لكل منهما، ثم خصم كل بند بـ commit خاص به. يخصم من مخزون بائع البند (النسخة القديمة كانت تمرر المشتري).
+    """
+    item_status = db.query(OrderItemStatus).filter(OrderItemStatus.status_name_key == "NEW").first()
+    items = []
+    for item_in in order_in.items:
+        packaging_option = get_packaging_option_details(db, item_in.product_packaging_option_id)
+        get_user_profile(db, item_in.seller_user_id)
+        inventory_item = inventory_crud.get_or_create_inventory_item(db, item_in.product_packaging_option_id, item_in.seller_user_id)
+        if inventory_item.available_quantity < item_in.quantity_ordered:
+            raise ForbiddenException(detail=f"insufficient stock for {packaging_option.packaging_option_name_key}")
+        unit_price = pricing_service.get_active_price(db, item_in.product_packaging_option_id, item_in.quantity_ordered)
+        items.append((item_in, unit_price))
+    order_amounts = orders_service.calculate_order_amounts([
+        order_schemas.OrderItemCreate(**item_in.model_dump(exclude={"unit_price_at_purchase"}), unit_price_at_purchase=unit_price)
+        for item_in, unit_price in items
+    ])
+    order_status = db.query(OrderStatus).filter(OrderStatus.status_name_key == "NEW").first()
+    db_order = Order(
+        buyer_user_id=buyer.user_id, order_reference_number=f"LEGACY-{next(ids['order'])}", order_status_id=order_status.order_status_id,
+        total_amount_before_discount=order_amounts["total_amount_before_discount"], total_amount_after_discount=order_amounts["total_amount_after_discount"],
+        final_total_amount=order_amounts["final_total_amount"], currency_code=order_in.currency_code, notes_from_buyer=ORDER_MARK,
+    )
+    db.add(db_order)
+    db.flush()
+    for item_in, unit_price in items:
+        db.add(OrderItem(
+            order_item_id=next(ids["order_item"]), order_id=db_order.order_id, product_packaging_option_id=item_in.product_packaging_option_id,
+            seller_user_id=item_in.seller_user_id, quantity_ordered=item_in.quantity_ordered, unit_price_at_purchase=unit_price,
+            total_price_for_item=unit_price * item_in.quantity_ordered, item_status_id=item_status.item_status_id,
+        ))
+    db.commit()
+    db.add(OrderStatusHistory(order_status_history_id=next(ids["history"]), order_id=db_order.order_id, new_status_id=order_status.order_status_id, changed_by_user_id=buyer.user_id))
+    db.commit()
+    for item_in, _ in items:
+        get_packaging_option_details(db, item_in.product_packaging_option_id)
+        inventory_item = inventory_crud.get_or_create_inventory_item(db, item_in.product_packaging_option_id, item_in.seller_user_id)
+        inventory_item.on_hand_quantity -= item_in.quantity_ordered
+        inventory_item.available_quantity = inventory_item.on_hand_quantity - inventory_item.reserved_quantity
+        trans_type = db.query(InventoryTransactionType).filter(InventoryTransactionType.transaction_type_name_key == "SALE_DEDUCTION").first()
+        db.add(InventoryTransaction(
+            transaction_id=next(ids["transaction"]), inventory_item_id=inventory_item.inventory_item_id, transaction_type_id=trans_type.transaction_type_id,
+            quantity_changed=-item_in.quantity_ordered, balance_after_transaction=inventory_item.available_quantity, created_by_user_id=buyer.user_id,
+        ))
+        db.flush()
+        db.commit()
+    return db_order
+
+
+def order_request(cart, seller_id):
+    return order_schemas.OrderCreate(
+        currency_code="SAR", notes_from_buyer=ORDER_MARK,
+        items=[
+            {"product_packaging_option_id": option_id, "seller_user_id": seller_id, "quantity_ordered": quantity, "unit_price_at_purchase": 1, "total_price_for_item": 1}
+            for option_id, quantity in cart
+        ],
+    )
+
+
+def stock(db, options):
+    return dict(db.execute(select(InventoryItem.product_packaging_option_id, InventoryItem.available_quantity).where(InventoryItem.product_packaging_option_id.in_(options))).all())
+
+
+def measure(db, fn):
+    counter, stop = count_queries(db)
+    try:
+        started = time.perf_counter()
+        result = fn()
+        return (time.perf_counter() - started) * 1000, counter.value, result
+    finally:
+        stop()
+
+
+def main():
+    random.seed(13)
+    db = SessionLocal()
+    options = []
+    created = []
+    try:
+        created = ensure_fixtures(db)
+        buyer, seller = db.scalars(select(User).limit(2)).all()
+        seller_id = seller.user_id
+        options = create_options(db)
+        create_inventory(db, options, seller_id)
+        pricing_service.price_many(db, [(option_id, 1) for option_id in options]) # تسخين جداول الأسعار للطريقتين
+        order_numbers = itertools.count(1)
+
+        rows = []
+        bulk_query_counts = set()
+        for size in ORDER_SIZES:
+            cart = [(random.choice(options), random.randint(1, 5)) for _ in range(size)] # تكرار الخيارات يختبر تجميع الكميات
+            ids = { # بعد كل طلب مجمّع، لأنه يحجز معرفاته بنفسه في SQLite
+                "order": order_numbers, "order_item": next_ids(db, OrderItem.order_item_id),
+                "history": next_ids(db, OrderStatusHistory.order_status_history_id), "transaction": next_ids(db, InventoryTransaction.transaction_id),
+            }
+            legacy_ms, legacy_queries, _ = measure(db, lambda: legacy_create_order(db, order_request(cart, seller_id), buyer, ids))
+
+            before = stock(db, options)
+            request = order_request(cart, seller_id)
+            bulk_ms, bulk_queries, db_order = measure(db, lambda: orders_service.create_new_order(db, request, buyer))
+            bulk_query_counts.add(bulk_queries)
+
+            requested = {}
+            for option_id, quantity in cart:
+                requested[option_id] = requested.get(option_id, 0) + quantity
+            after = stock(db, options)
+            assert all(after[option_id] == before[option_id] - requested.get(option_id, 0) for option_id in options), "stock not decremented by the order"
+            assert len(db_order.items) == size
+            ledger = db.execute(select(InventoryTransaction.quantity_changed, InventoryTransaction.balance_after_transaction, InventoryItem.product_packaging_option_id)
+                                .join(InventoryItem, InventoryItem.inventory_item_id == InventoryTransaction.inventory_item_id)
+                                .where(InventoryTransaction.reason_notes.contains(db_order.order_reference_number))).all()
+            assert len(ledger) == len(requested), f"{len(ledger)} ledger rows for {len(requested)} inventory items"
+            assert all(-row.quantity_changed == requested[row.product_packaging_option_id] and row.balance_after_transaction == after[row.product_packaging_option_id] for row in ledger)
+            expected_total = sum(Decimal(str(line.line_total)) for line in pricing_service.price_many(db, cart))
+            assert abs(Decimal(str(db_order.total_amount_before_discount)) - expected_total) < Decimal("0.01")
+            rows.append((size, legacy_ms, legacy_queries, bulk_ms, bulk_queries))
+
+        # طلب يتجاوز المخزون في بند واحد لا يترك طلبًا ولا خصمًا، وبائع غير موجود يُرفض
+        before, orders_before = stock(db, options), db.scalar(select(func.count()).select_from(Order))
+        try:
+            orders_service.create_new_order(db, order_request([(options[0], 1), (options[1], STOCK * 2)], seller_id), buyer)
+            raise AssertionError("oversold order accepted")
+        except ForbiddenException:
+            db.rollback()
+        assert stock(db, options) == before and db.scalar(select(func.count()).select_from(Order)) == orders_before, "rejected order left partial writes"
+        try:
+            orders_service.create_new_order(db, order_request([(options[0], 1)], buyer.user_id), buyer)
+            raise AssertionError("order against a seller without inventory accepted")
+        except ForbiddenException:
+            db.rollback()
+        try:
+            orders_service.create_new_order(db, order_request([(-1, 1)], seller_id), buyer)
+            raise AssertionError("missing packaging option accepted")
+        except NotFoundException:
+            db.rollback()
+    finally:
+        db.rollback()
+        cleanup(db, options)
+        for row in created:
+            db.delete(row)
+        db.commit()
+        db.close()
+
+    print(f"{'lines':>6} {'legacy ms':>10} {'queries':>8} {'bulk ms':>9} {'queries':>8}")
+    for size, legacy_ms, legacy_queries, bulk_ms, bulk_queries in rows:
+        print(f"{size:>6} {legacy_ms:10.1f} {legacy_queries:>8} {bulk_ms:9.2f} {bulk_queries:>8}")
+    (first, legacy_first, _, bulk_first, _), (last, legacy_last, _, bulk_last, _) = rows[0], rows[-1]
+    print(f"cost per extra line: legacy {(legacy_last - legacy_first) / (last - first):.2f} ms, bulk {(bulk_last - bulk_first) / (last - first):.3f} ms")
+    assert len(bulk_query_counts) == 1, f"bulk order query count depends on the number of lines: {sorted(bulk_query_counts)}"
+    print("stock / ledger / atomicity / round trips: ok")
+
+
+if __name__ == "__main__":
+    main()
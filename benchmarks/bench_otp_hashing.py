@@ -0,0 +1,45 @@
+# backend/benchmarks/bench_otp_hashing.py
+# ----------------------------------------------------------------------------------------------------
+# مقارنة تكلفة تجزئة رمز OTP والتحقق منه (دورة طلب + تأكيد):
+#   1. bcrypt (السلوك السابق: get_password_hash / verify_password)
+#   2. HMAC-SHA256 (src/core/token_hashing)
+# ويتحقق من أن مسار الترحيل يقبل تجزئات bcrypt القديمة.
+# لا يحتاج إلى قاعدة بيانات.
+#
+# التشغيل (من مجلد backend):
+#   python -m benchmarks.bench_otp_hashing
+# ----------------------------------------------------------------------------------------------------
+
+import time
+
+from src.core import security
+from src.core.token_hashing import PURPOSE_PASSWORD_RESET, PURPOSE_PHONE_CHANGE, hash_token, verify_token
+
+OTP = "482913"
+
+
+def per_cycle_ms(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    bcrypt_ms = per_cycle_ms(lambda: security.verify_password(OTP, security.get_password_hash(OTP)), 5)
+    hmac_ms = per_cycle_ms(lambda: verify_token(OTP, hash_token(OTP, PURPOSE_PASSWORD_RESET), PURPOSE_PASSWORD_RESET), 20_000)
+    print(f"bcrypt hash+verify : {bcrypt_ms:10.3f} ms/cycle")
+    print(f"hmac   hash+verify : {hmac_ms:10.4f} ms/cycle")
+    print(f"speedup            : {bcrypt_ms / hmac_ms:10.0f}x")
+
+    stored = hash_token(OTP, PURPOSE_PASSWORD_RESET)
+    assert verify_token(OTP, stored, PURPOSE_PASSWORD_RESET)
+    assert not verify_token("000000", stored, PURPOSE_PASSWORD_RESET)
+    assert not verify_token(OTP, stored, PURPOSE_PHONE_CHANGE) # فصل الاستخدامات
+    assert hash_token(OTP, PURPOSE_PASSWORD_RESET) != stored # salt مختلف لكل رمز
+    assert verify_token(OTP, security.get_password_hash(OTP), PURPOSE_PASSWORD_RESET) # تجزئة bcrypt قديمة
+    print("correctness checks : ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# backend/benchmarks/bench_password_hashing.py
+# ----------------------------------------------------------------------------------------------------
+# اختبار حمل لمنفذ تجزئة كلمات المرور (PasswordHasher):
+#   1. عدد عمليات التحقق (bcrypt verify) في الثانية مع زيادة عدد الخيوط، لإظهار التوسع مع الأنوية.
+#      خط الأساس "inline" هو التحقق المباشر داخل حلقة الأحداث (السلوك السابق لنقطة تسجيل الدخول).
+#   2. الضغط العكسي (Backpressure): دفعة أكبر من سعة المنفذ يجب أن يُرفض جزء منها بـ 429.
+# لا يحتاج إلى قاعدة بيانات.
+#
+# التشغيل (من مجلد backend):
+#   python -m benchmarks.bench_password_hashing
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+import os
+import time
+
+from fastapi import HTTPException
+
+from src.core import security
+from src.core.password_hasher import PasswordHasher
+
+VERIFICATIONS = int(os.getenv("BENCH_VERIFICATIONS", "32"))
+CPU_COUNT = os.cpu_count() or 1
+
+
+async def inline_rate(hashed: str) -> float:
+    started = time.perf_counter()
+    for _ in range(VERIFICATIONS):
+        security.verify_password("benchmark-password", hashed)
+    return VERIFICATIONS / (time.perf_counter() - started)
+
+
+async def executor_rate(hashed: str, workers: int) -> float:
+    hasher = PasswordHasher(max_workers=workers, max_queue=VERIFICATIONS)
+    started = time.perf_counter()
+    await asyncio.gather(*(hasher.verify("benchmark-password", hashed) for _ in range(VERIFICATIONS)))
+    return VERIFICATIONS / (time.perf_counter() - started)
+
+
+async def backpressure(hashed: str) -> None:
+    hasher = PasswordHasher(max_workers=1, max_queue=2)
+    results = await asyncio.gather(
+        *(hasher.verify("benchmark-password", hashed) for _ in range(10)),
+        return_exceptions=True,
+    )
+    rejected = [r for r in results if isinstance(r, HTTPException) and r.status_code == 429]
+    print(f"backpressure: burst=10 capacity=3 -> accepted={len(results) - len(rejected)} rejected_429={len(rejected)}")
+
+
+async def main():
+    hashed = security.get_password_hash("benchmark-password")
+    print(f"cpu cores={CPU_COUNT} verifications={VERIFICATIONS}")
+
+    baseline = await inline_rate(hashed)
+    print(f"inline (event loop) : {baseline:7.1f} verify/s")
+
+    for workers in sorted({1, 2, CPU_COUNT, CPU_COUNT * 2}):
+        rate = await executor_rate(hashed, workers)
+        print(f"executor workers={workers:<3}: {rate:7.1f} verify/s  ({rate / baseline:4.2f}x)")
+
+    await backpressure(hashed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_permission_checks.py
+# ----------------------------------------------------------------------------------------------------
+# مقارنة أداء التحقق من الصلاحيات:
+#   1. المسح الحالي: any(p.permission_name_key == KEY for p in user.default_role.permissions)
+#   2. اختبار البت عبر permission_registry.user_has_permission
+# ويتحقق من أن سحب صلاحية في عملية أخرى (سجل آخر) يظهر بعد انتهاء مدة صلاحية القناع.
+# لا يحتاج إلى قاعدة بيانات؛ يتم بناء كائنات تحاكي Role/Permission في الذاكرة.
+#
+# التشغيل (من مجلد backend):
+#   python -m benchmarks.bench_permission_checks
+# ----------------------------------------------------------------------------------------------------
+
+import time
+import timeit
+from types import SimpleNamespace
+
+from src.core.config import settings
+from src.core.permission_registry import PermissionRegistry
+
+PERMISSIONS_PER_ROLE = 80
+ITERATIONS = 200_000
+STALE_TTL_SECONDS = 0.05
+
+
+def build_user(permission_count: int) -> SimpleNamespace:
+    permissions = [SimpleNamespace(permission_name_key=f"PERMISSION_{i:03d}") for i in range(permission_count)]
+    role = SimpleNamespace(role_id=1, role_name_key="ADMIN", permissions=permissions)
+    return SimpleNamespace(default_user_role_id=1, default_role=role)
+
+
+def main():
+    user = build_user(PERMISSIONS_PER_ROLE)
+    registry = PermissionRegistry(role_ttl_seconds=settings.PERMISSION_ROLE_MASK_TTL_SECONDS)
+    registry.user_has_permission(user, "WARM_UP") # بناء قناع الدور مرة واحدة
+
+    # أسوأ حالة للمسح: الصلاحية في آخر القائمة
+    key = f"PERMISSION_{PERMISSIONS_PER_ROLE - 1:03d}"
+
+    scan = timeit.timeit(
+        lambda: any(p.permission_name_key == key for p in user.default_role.permissions),
+        number=ITERATIONS,
+    )
+    bitset = timeit.timeit(
+        lambda: registry.user_has_permission(user, key),
+        number=ITERATIONS,
+    )
+
+    # عمليتان (سجلان) لنفس الدور: السحب في قاعدة البيانات لا يصل للعملية الأخرى إلا بعد انتهاء مدة القناع
+    other_worker = PermissionRegistry(role_ttl_seconds=STALE_TTL_SECONDS)
+    revoked = build_user(PERMISSIONS_PER_ROLE)
+    assert other_worker.user_has_permission(revoked, key)
+    revoked.default_role.permissions = revoked.default_role.permissions[:-1]
+    assert other_worker.user_has_permission(revoked, key), "mask should still be cached"
+    time.sleep(STALE_TTL_SECONDS * 2)
+    assert not other_worker.user_has_permission(revoked, key), "revoked permission still granted after the mask TTL"
+
+    print(f"permissions per role : {PERMISSIONS_PER_ROLE}")
+    print(f"iterations           : {ITERATIONS}")
+    print(f"list scan            : {scan / ITERATIONS * 1e9:8.1f} ns/check")
+    print(f"bitset registry      : {bitset / ITERATIONS * 1e9:8.1f} ns/check")
+    print(f"speedup              : {scan / bitset:8.1f}x")
+    print(f"revocation visible in other workers after the mask TTL ({settings.PERMISSION_ROLE_MASK_TTL_SECONDS:g} s): ok")
+
+
+if __name__ == "__main__":
+    main()
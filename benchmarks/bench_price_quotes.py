@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_price_quotes.py
+# ----------------------------------------------------------------------------------------------------
+# قياس تسعير السلال: حلقة get_active_price القديمة لكل بند (get_packaging_option_details + استعلام الإسنادات بمستوياتها)
+# مقابل price_many (جداول الأسعار المجمّعة لكل البنود معًا) لسلال من 1 إلى 500 بند.
+#   - عدد الاستعلامات وزمن السلة: القديم لكل بند، price_many باردًا (بعد الإبطال) ودافئًا.
+# يتحقق من تطابق الأسعار مع المسار القديم، ومن أن عدد استعلامات price_many الباردة ثابت (2 على الأكثر) والدافئة صفر،
+# ومن رفض خيار تعبئة غير موجود ومن حد PRICE_QUOTE_MAX_LINES في quote_prices.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_OPTIONS=200 python -m benchmarks.bench_price_quotes
+# ----------------------------------------------------------------------------------------------------
+
+import random
+import time
+
+from benchmarks.bench_price_tables import cleanup, count_queries, create_options, legacy_active_price
+from src.core.config import settings
+from src.db.session import SessionLocal
+from src.exceptions import BadRequestException, NotFoundException
+from src.pricing.schemas import pricing_schemas
+from src.pricing.services import pricing_service
+from src.pricing.services.price_tables import price_tables
+
+CART_SIZES = (1, 10, 100, 500)
+QUANTITIES = (1, 9, 10, 25, 40, 79, 80, 500, 10.5)
+
+
+def measure(db, fn):
+    """يعيد (الزمن بالمللي ثانية، عدد الاستعلامات، النتيجة) لاستدعاء واحد."""
+    counter, stop = count_queries(db)
+    try:
+        started = time.perf_counter()
+        result = fn()
+        return (time.perf_counter() - started) * 1000, counter.value, result
+    finally:
+        stop()
+
+
+def main():
+    random.seed(11)
+    db = SessionLocal()
+    try:
+        options = create_options(db)
+        rows = []
+        for size in CART_SIZES:
+            cart = [(random.choice(options), random.choice(QUANTITIES)) for _ in range(size)]
+            legacy_ms, legacy_queries, legacy_prices = measure(db, lambda: [legacy_active_price(db, option_id, quantity) for option_id, quantity in cart])
+            price_tables.invalidate()
+            cold_ms, cold_queries, lines = measure(db, lambda: pricing_service.price_many(db, cart))
+            warm_ms, warm_queries, _ = measure(db, lambda: pricing_service.price_many(db, cart))
+            for line, legacy_price, (option_id, quantity) in zip(lines, legacy_prices, cart):
+                assert line.packaging_option_id == option_id and line.quantity == quantity
+                assert abs(line.unit_price - legacy_price) < 1e-9, f"option {option_id} quantity {quantity}: {legacy_price} != {line.unit_price}"
+            assert cold_queries <= 2, f"cold cart of {size} lines used {cold_queries} queries"
+            assert warm_queries == 0, f"warm cart of {size} lines used {warm_queries} queries"
+            rows.append((size, legacy_ms, legacy_queries, cold_ms, cold_queries, warm_ms, warm_queries))
+
+        # خيار تعبئة غير موجود يرفض السلة كلها، وطلب التسعير محدود بـ PRICE_QUOTE_MAX_LINES
+        try:
+            pricing_service.price_many(db, [(options[0], 1), (-1, 1)])
+            raise AssertionError("missing packaging option accepted")
+        except NotFoundException:
+            pass
+        too_many = pricing_schemas.PriceQuoteRequest(items=[{"packaging_option_id": options[0], "quantity": 1}] * (settings.PRICE_QUOTE_MAX_LINES + 1))
+        try:
+            pricing_service.quote_prices(db, too_many)
+            raise AssertionError("oversized quote accepted")
+        except BadRequestException:
+            pass
+        quote = pricing_service.quote_prices(db, pricing_schemas.PriceQuoteRequest(items=[{"packaging_option_id": option_id, "quantity": 25} for option_id in options[:4]]))
+        assert abs(quote.total - sum(line.line_total for line in quote.lines)) < 1e-9
+    finally:
+        cleanup(db)
+        db.close()
+
+    print(f"{'lines':>6} {'legacy ms':>10} {'queries':>8} {'cold ms':>9} {'queries':>8} {'warm ms':>9} {'queries':>8}")
+    for size, legacy_ms, legacy_queries, cold_ms, cold_queries, warm_ms, warm_queries in rows:
+        print(f"{size:>6} {legacy_ms:10.1f} {legacy_queries:>8} {cold_ms:9.2f} {cold_queries:>8} {warm_ms:9.3f} {warm_queries:>8}")
+    print("prices / round trips / limits : ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# backend/benchmarks/bench_price_tables.py
+# ----------------------------------------------------------------------------------------------------
+# قياس get_active_price: المسار القديم (get_packaging_option_details + استعلام الإسنادات النشطة بمستوياتها + فرز
+# المستويات في كل استدعاء) مقابل جداول الأسعار المجمّعة (price_tables) ببحث ثنائي في الذاكرة.
+#   1. زمن السعر لكل بند طلب على خيارات تعبئة بقواعد NEW_PRICE / PERCENTAGE / FIXED_AMOUNT وأخرى بلا قاعدة.
+#   2. عدد الاستعلامات لكل سعر بعد تسخين الجداول (المتوقع 0).
+# يتحقق من تطابق الأسعار بين الطريقتين لكل الكميات (حول حدود المستويات)، ومن انتهاء صلاحية الجدول عند بدء إسناد
+# مستقبلي وعند انتهاء الإسناد الحالي، ومن إبطال جداول القاعدة عند تعديل أحد مستوياتها.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_OPTIONS=200 BENCH_LEVELS=8 python -m benchmarks.bench_price_tables
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import delete, event, func, insert, select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.db.session import SessionLocal
+from src.pricing.crud import pricing_crud
+from src.pricing.models.tier_pricing_models import PriceTierRule, PriceTierRuleLevel, ProductPackagingPriceTierRuleAssignment
+from src.pricing.schemas import pricing_schemas
+from src.pricing.services import pricing_service
+from src.pricing.services.price_tables import price_tables
+from src.products.models.units_models import ProductPackagingOption
+from src.products.services.packaging_service import get_packaging_option_details
+from src.users.models.core_models import User
+
+OPTIONS = int(os.getenv("BENCH_OPTIONS", "200"))
+LEVELS = int(os.getenv("BENCH_LEVELS", "8"))
+LOOKUPS = 5000
+KEY_PREFIX = "PRICE_TABLE_BENCH"
+DISCOUNT_TYPES = ("NEW_PRICE", "PERCENTAGE", "FIXED_AMOUNT", None) # None = خيار تعبئة بلا قاعدة
+
+
+def legacy_active_price(db, packaging_option_id: int, quantity: float) -> float:
+    """نسخة من get_active_price قبل الجداول المجمّعة (للمقارنة)."""
+    db_packaging_option = get_packaging_option_details(db, packaging_option_id)
+    active_assignments = pricing_crud.get_active_assignments_for_packaging_option(db, packaging_option_id, current_timestamp=datetime.now(timezone.utc))
+    effective_price_per_unit = db_packaging_option.base_price
+    if active_assignments:
+        db_rule = active_assignments[0].rule
+        applicable_level = None
+        for level in sorted(db_rule.levels, key=lambda l: l.minimum_quantity):
+            if quantity >= level.minimum_quantity:
+                applicable_level = level
+            else:
+                break
+        if applicable_level:
+            if db_rule.discount_type == 'NEW_PRICE' and applicable_level.price_per_unit_at_level is not None:
+                effective_price_per_unit = applicable_level.price_per_unit_at_level
+            elif db_rule.discount_type == 'PERCENTAGE' and applicable_level.discount_value is not None:
+                effective_price_per_unit = db_packaging_option.base_price * (1 - applicable_level.discount_value / 100)
+            elif db_rule.discount_type == 'FIXED_AMOUNT' and applicable_level.discount_value is not None:
+                effective_price_per_unit = db_packaging_option.base_price - applicable_level.discount_value
+                if effective_price_per_unit < 0: effective_price_per_unit = 0
+    return float(effective_price_per_unit)
+
+
+def cleanup(db):
+    rule_ids = select(PriceTierRule.rule_id).where(PriceTierRule.rule_name_key.like(f"{KEY_PREFIX}%"))
+    db.execute(delete(ProductPackagingPriceTierRuleAssignment).where(ProductPackagingPriceTierRuleAssignment.rule_id.in_(rule_ids)))
+    db.execute(delete(PriceTierRuleLevel).where(PriceTierRuleLevel.rule_id.in_(rule_ids)))
+    db.execute(delete(PriceTierRule).where(PriceTierRule.rule_name_key.like(f"{KEY_PREFIX}%")))
+    db.execute(delete(ProductPackagingOption).where(ProductPackagingOption.packaging_option_name_key.like(f"{KEY_PREFIX}%")))
+    db.commit()
+
+
+def create_options(db):
+    """ينشئ OPTIONS خيار تعبئة، لكل خيار قاعدة بـ LEVELS مستوى مسندة الآن، وإسنادًا مستقبليًا لقاعدة أخرى."""
+    cleanup(db)
+    template = db.scalars(select(ProductPackagingOption).where(ProductPackagingOption.packaging_option_name_key.not_like(f"{KEY_PREFIX}%")).limit(1)).first()
+    owner = db.scalar(select(User).limit(1))
+    now = datetime.now(timezone.utc)
+    next_assignment_id = (db.scalar(select(func.max(ProductPackagingPriceTierRuleAssignment.assignment_id))) or 0) + 1 # BigInteger بلا تزايد تلقائي في SQLite
+    options = []
+    for i in range(OPTIONS):
+        discount_type = DISCOUNT_TYPES[i % len(DISCOUNT_TYPES)]
+        option = ProductPackagingOption(
+            product_id=template.product_id, packaging_option_name_key=f"{KEY_PREFIX}_{i}",
+            quantity_in_packaging=template.quantity_in_packaging, unit_of_measure_id_for_quantity=template.unit_of_measure_id_for_quantity,
+            base_price=Decimal("100.00") + i, is_active=True,
+        )
+        db.add(option)
+        db.flush()
+        options.append(option.packaging_option_id)
+        if discount_type is None:
+            continue
+        for suffix, start in (("NOW", now - timedelta(days=1)), ("NEXT", now + timedelta(days=30))):
+            rule = PriceTierRule(rule_name_key=f"{KEY_PREFIX}_{i}_{suffix}", discount_type=discount_type, created_by_user_id=owner.user_id)
+            db.add(rule)
+            db.flush()
+            # المستويات تُدرج بترتيب عشوائي لأن المسار القديم يفرزها في كل استدعاء
+            levels = [
+                {
+                    "rule_id": rule.rule_id,
+                    "minimum_quantity": Decimal(10 * (n + 1)),
+                    "price_per_unit_at_level": Decimal("95.00") - 5 * n if discount_type == "NEW_PRICE" else None,
+                    "discount_value": Decimal(2 * (n + 1)) if discount_type != "NEW_PRICE" else None,
+                }
+                for n in random.sample(range(LEVELS), LEVELS)
+            ]
+            db.execute(insert(PriceTierRuleLevel), levels)
+            db.execute(insert(ProductPackagingPriceTierRuleAssignment), [{
+                "assignment_id": next_assignment_id, "packaging_option_id": option.packaging_option_id, "rule_id": rule.rule_id,
+                "start_date": start, "end_date": start + timedelta(days=29, hours=23) if suffix == "NOW" else None, "is_active": True,
+            }])
+            next_assignment_id += 1
+    db.commit()
+    return options
+
+
+def count_queries(db):
+    counter = SimpleNamespace(value=0)
+    def before_cursor_execute(*args):
+        counter.value += 1
+    event.listen(db.get_bind(), "before_cursor_execute", before_cursor_execute)
+    return counter, lambda: event.remove(db.get_bind(), "before_cursor_execute", before_cursor_execute)
+
+
+def main():
+    random.seed(7)
+    db = SessionLocal()
+    try:
+        options = create_options(db)
+        quantities = [Decimal(q) for q in (1, 9, 10, 11, 25, 40, 10 * LEVELS - 1, 10 * LEVELS, 10 * LEVELS + 500)] + [10.5, 30.0]
+        price_tables.invalidate()
+
+        # 1. التطابق لكل خيار وكل كمية
+        for packaging_option_id in options:
+            for quantity in quantities:
+                old = legacy_active_price(db, packaging_option_id, quantity)
+                new = pricing_service.get_active_price(db, packaging_option_id, quantity)
+                assert abs(old - new) < 1e-9, f"option {packaging_option_id} quantity {quantity}: {old} != {new}"
+
+        # 2. الزمن لكل سعر
+        lookups = [(random.choice(options), random.choice(quantities)) for _ in range(LOOKUPS)]
+        legacy_lookups = lookups[: LOOKUPS // 10]
+        started = time.perf_counter()
+        for packaging_option_id, quantity in legacy_lookups:
+            legacy_active_price(db, packaging_option_id, quantity)
+        legacy_us = (time.perf_counter() - started) * 1e6 / len(legacy_lookups)
+
+        counter, stop = count_queries(db)
+        started = time.perf_counter()
+        for packaging_option_id, quantity in lookups:
+            pricing_service.get_active_price(db, packaging_option_id, quantity)
+        table_us = (time.perf_counter() - started) * 1e6 / len(lookups)
+        stop()
+
+        price_tables.invalidate()
+        started = time.perf_counter()
+        for packaging_option_id in options:
+            price_tables.get(db, packaging_option_id)
+        compile_ms = (time.perf_counter() - started) * 1000 / len(options)
+
+        # 3. الصلاحية الزمنية: الجدول ينتهي عند بدء الإسناد المستقبلي وعند انتهاء الإسناد الحالي
+        priced = options[0]
+        table = price_tables.get(db, priced)
+        now_rule = table.rule_id
+        assert table.expires_at is not None and table.expires_at <= datetime.now(timezone.utc) + timedelta(days=29)
+        gap = price_tables.get(db, priced, now=table.expires_at + timedelta(minutes=1))
+        assert gap.rule_id is None and gap.price(Decimal(10 * LEVELS)) == float(gap.base_price), "expired assignment still applied"
+        later = price_tables.get(db, priced, now=datetime.now(timezone.utc) + timedelta(days=31))
+        assert later.rule_id not in (None, now_rule), "future assignment not picked up"
+        price_tables.invalidate(priced)
+
+        # 4. الإبطال عند تعديل مستوى (نفس خطوات update_price_tier_rule_level بعد التحقق من الصلاحيات)
+        before = pricing_service.get_active_price(db, priced, Decimal(10))
+        level = db.scalars(select(PriceTierRuleLevel).where(PriceTierRuleLevel.rule_id == now_rule, PriceTierRuleLevel.minimum_quantity == 10)).one()
+        pricing_crud.update_price_tier_rule_level(db, db_level=level, level_in=pricing_schemas.PriceTierRuleLevelUpdate(price_per_unit_at_level=Decimal("1.00")))
+        assert pricing_service.get_active_price(db, priced, Decimal(10)) == before, "table should still be cached before invalidation"
+        price_tables.invalidate_rule(now_rule)
+        after = pricing_service.get_active_price(db, priced, Decimal(10))
+        assert before != after == 1.0 == legacy_active_price(db, priced, Decimal(10)), f"level update not visible: {before} -> {after}"
+        stats = price_tables.stats()
+    finally:
+        cleanup(db)
+        db.close()
+
+    print(f"packaging options / levels    : {OPTIONS} / {LEVELS} ({len(quantities)} quantities each)")
+    print(f"legacy get_active_price       : {legacy_us:10.1f} us per item")
+    print(f"price table get_active_price  : {table_us:10.1f} us per item ({legacy_us / table_us:.0f}x)")
+    print(f"queries per warm lookup       : {counter.value / len(lookups):10.3f}")
+    print(f"table compile (cold)          : {compile_ms:10.2f} ms per option")
+    print(f"cache stats                   : {stats}")
+    assert counter.value == 0, "warm price lookups reached the database"
+    print("prices / expiry / invalidation: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# backend/benchmarks/bench_query_budget.py
+# ----------------------------------------------------------------------------------------------------
+# فحص ميزانيات الاستعلامات (src/core/query_budget.py) عبر GET /api/v1/users/me:
+#   - QueryBudgetMiddleware مع DEBUG يضيف ترويسات X-DB-* (العدد، الزمن، التكرارات، الميزانية).
+#   - في وضع QUERY_BUDGET_MODE="enforce" يمر الطلب البارد (بدون لقطة هوية في الذاكرة) ضمن @query_budget(12)،
+#     ويطلق QueryBudgetExceeded عند خفض الميزانية إلى أقل من عدد العبارات الفعلي.
+#   - في وضع "report" لا يطلق الطلب نفسه استثناءً (تحذير في السجل فقط).
+# يتم استدعاء تطبيق ASGI مباشرةً داخل العملية (بدون شبكة)، ويحتاج إلى مستخدم نشط في قاعدة البيانات المحددة في DATABASE_URL.
+#
+# التشغيل (من مجلد backend):
+#   python -m benchmarks.bench_query_budget
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.api.v1.routers import users_router
+from src.core import security
+from src.core.config import settings
+from src.core.permission_registry import permission_registry
+from src.core.principal_cache import principal_cache
+from src.core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, query_budget
+from src.core.schemas_bootstrap import rebuild_all_schemas
+from src.db.session import SessionLocal
+from src.users.models.core_models import AccountStatus, User
+
+ME_PATH = "/api/v1/users/me"
+
+
+def build_app() -> FastAPI:
+    """نفس تركيب main.py للمسار: الراوتر تحت /api/v1 مع وسيط الميزانية."""
+    app = FastAPI()
+    api_v1_router = APIRouter(prefix="/api/v1")
+    api_v1_router.include_router(users_router.router)
+    app.include_router(api_v1_router)
+    app.add_middleware(QueryBudgetMiddleware)
+    return app
+
+
+async def call(app, path: str, token: str):
+    """يرسل طلب GET واحدًا إلى تطبيق ASGI ويعيد (رمز الحالة، الترويسات)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "scheme": "http", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    }
+    response = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode(): value.decode() for key, value in message.get("headers", [])}
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"]
+
+
+def cold_call(app, token: str):
+    """طلب بارد: بدون لقطة هوية مخزنة، فيشمل العدّ بناء اللقطة (أسوأ حالة للميزانية)."""
+    principal_cache.clear()
+    return asyncio.run(call(app, ME_PATH, token))
+
+
+def main():
+    rebuild_all_schemas()
+    db = SessionLocal()
+    try:
+        user_id = db.scalar(
+            select(User.user_id).join(AccountStatus, AccountStatus.account_status_id == User.account_status_id)
+            .where(AccountStatus.status_name_key == "ACTIVE", User.is_deleted.is_(False)).limit(1)
+        )
+        assert user_id is not None, "no active user in the database"
+        permission_registry.load(db)
+    finally:
+        db.close()
+    token = security.create_access_token(user_id)
+    endpoint = users_router.get_my_profile_endpoint
+    declared_budget = getattr(endpoint, "__query_budget__")
+    app = build_app()
+
+    original = (settings.DEBUG, settings.QUERY_BUDGET_MODE)
+    settings.DEBUG, settings.QUERY_BUDGET_MODE = True, "enforce"
+    try:
+        # 1. ضمن الميزانية المعلنة: 200 مع ترويسات X-DB-*
+        status_code, headers = cold_call(app, token)
+        assert status_code == 200, status_code
+        statements = int(headers["x-db-statement-count"])
+        assert headers["x-db-statement-budget"] == str(declared_budget), headers
+        assert "x-db-time-ms" in headers and "x-db-repeated-statements" in headers, headers
+        assert statements <= declared_budget, f"{ME_PATH} issued {statements} statements (budget {declared_budget})"
+
+        # 2. ميزانية أقل من العدد الفعلي: يجب أن يفشل الطلب في وضع enforce
+        query_budget(statements - 1)(endpoint)
+        try:
+            cold_call(app, token)
+            raise AssertionError("enforce mode accepted a request over its budget")
+        except QueryBudgetExceeded as exc:
+            exceeded_message = str(exc)
+
+        # 3. وضع report: نفس التجاوز لا يفشل الطلب
+        settings.QUERY_BUDGET_MODE = "report"
+        report_status, _ = cold_call(app, token)
+        assert report_status == 200, report_status
+    finally:
+        query_budget(declared_budget)(endpoint)
+        settings.DEBUG, settings.QUERY_BUDGET_MODE = original
+
+    print(f"{ME_PATH}: {statements} statements (budget {declared_budget}), {headers['x-db-time-ms']} ms in SQL, "
+          f"{headers['x-db-repeated-statements']} repeated shapes")
+    print(f"enforce over budget: {exceeded_message}")
+    print("headers / enforce within budget / enforce over budget / report mode: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# backend/benchmarks/bench_session_revocation.py
+# ----------------------------------------------------------------------------------------------------
+# مقارنة تكلفة التحقق من أن جلسة التوكن (sid) لم تُبطل، لكل طلب:
+#   1. استعلام قاعدة البيانات (security_crud.is_user_session_active) — التحقق "الساذج"
+#   2. قائمة الإبطال في الذاكرة مع مرشح Bloom (src/core/session_revocation)
+# ويقيس نسبة الإيجابيات الكاذبة الفعلية للمرشح، ويتحقق من أن الجلسات المُبطلة تُرفض دائمًا.
+#
+# التشغيل (من مجلد backend، مع DATABASE_URL لقاعدة بيانات تحتوي على الجداول):
+#   python -m benchmarks.bench_session_revocation
+# ----------------------------------------------------------------------------------------------------
+
+import time
+import uuid
+
+from src.core.session_revocation import SessionRevocationList
+from src.db.session import SessionLocal
+from src.users.crud import security_crud
+
+REVOKED = 50_000
+CHECKS = 100_000
+DB_CHECKS = 2_000
+
+
+def main():
+    revocations = SessionRevocationList(retention_seconds=3600, capacity=100_000, false_positive_rate=0.001, sync_seconds=5.0)
+    revoked_ids = [uuid.uuid4() for _ in range(REVOKED)]
+    revocations.revoke(revoked_ids)
+    live_ids = [uuid.uuid4() for _ in range(CHECKS)]
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        for session_id in live_ids[:DB_CHECKS]:
+            security_crud.is_user_session_active(db, session_id)
+        db_us = (time.perf_counter() - started) * 1_000_000 / DB_CHECKS
+    finally:
+        db.close()
+
+    started = time.perf_counter()
+    for session_id in live_ids:
+        revocations.is_revoked(session_id)
+    bloom_us = (time.perf_counter() - started) * 1_000_000 / CHECKS
+
+    stats = revocations.stats()
+    print(f"revoked sessions          : {REVOKED} (bloom {stats['bloom_bits'] // 8 // 1024} KiB, k={stats['bloom_hashes']})")
+    print(f"DB session lookup         : {db_us:8.2f} us/check")
+    print(f"revocation list (bloom)   : {bloom_us:8.2f} us/check  ({db_us / bloom_us:4.1f}x)")
+    print(f"fast-path rate            : {stats['fast_path_rate']:.5f}  (false positives={stats['false_positives']})")
+
+    assert all(revocations.is_revoked(session_id) for session_id in revoked_ids[:5_000])
+    print("correctness checks        : ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# backend/benchmarks/bench_settlement_pipeline.py
+# ----------------------------------------------------------------------------------------------------
+# قياس خط التسويات الدفعي (settlement_pipeline) مقابل التسوية مزادًا مزادًا:
+#   1. الحلقة القديمة: لكل مزاد منتهٍ استعلام وجود التسوية والمزاد والمزايدة الفائزة ثم INSERT و commit مستقلان.
+#   2. الخط الدفعي على نفس عدد المزادات: استعلام فائزين واحد و INSERT جماعي لكل دفعة.
+# يتحقق من أن الفائز هو أعلى مزايدة، وأن المزادات التي لم تبلغ سعر الاحتياطي أو بلا مزايدات لا تُسوّى،
+# وأن لكل تسوية سجل حالة، وأن الاستئناف بعد تشغيل جزئي لا يكرر شيئًا، وأن إعادة التشغيل لا تنشئ تسويات جديدة.
+# ينشئ حالة المزاد ENDED والفهارس وجدول سجل حالات التسوية إذا لم تكن موجودة في قاعدة بيانات الاختبار.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_AUCTIONS=2000 BENCH_CHUNK=500 python -m benchmarks.bench_settlement_pipeline
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.finance.models import commissions_models, wallets_models # noqa: F401 - جداول مفاتيح auction_settlements الأجنبية
+from src.auctions.crud import settlements_crud
+from src.auctions.models.auctions_models import Auction
+from src.auctions.models.bidding_models import Bid
+from src.auctions.models.settlements_models import AuctionSettlement, AuctionSettlementStatus, AuctionSettlementStatusHistory
+from src.auctions.schemas.settlement_schemas import AuctionSettlementCreate
+from src.auctions.services.settlement_pipeline import SettlementPipeline
+from src.lookups.models.lookups_models import AuctionStatus
+from src.db.session import SessionLocal
+from src.users.models.core_models import User
+
+AUCTIONS = int(os.getenv("BENCH_AUCTIONS", "2000"))
+CHUNK = int(os.getenv("BENCH_CHUNK", "500"))
+BIDS_PER_AUCTION = 3
+
+
+def ensure_fixtures(db) -> None:
+    if db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == "ENDED")) is None:
+        db.add(AuctionStatus(status_name_key="ENDED"))
+    if db.scalar(select(AuctionSettlementStatus.settlement_status_id).where(AuctionSettlementStatus.status_name_key == "PENDING_PAYMENT")) is None:
+        db.add(AuctionSettlementStatus(status_name_key="PENDING_PAYMENT"))
+    db.commit()
+    AuctionSettlementStatusHistory.__table__.create(db.get_bind(), checkfirst=True)
+    for table in (Auction.__table__, Bid.__table__, AuctionSettlement.__table__, AuctionSettlementStatusHistory.__table__):
+        for index in table.indexes:
+            index.create(db.get_bind(), checkfirst=True)
+
+
+def create_ended_auctions(db, count: int):
+    """ينشئ مزادات منتهية: 80% بمزايدات (ربعها لم يبلغ سعر الاحتياطي) و 20% بلا مزايدات. يعيد (المعرفات، الفائزين المتوقعين)."""
+    template = db.scalars(select(Auction).limit(1)).first()
+    ended_status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == "ENDED"))
+    bidders = list(db.scalars(select(User.user_id).where(User.user_id != template.seller_user_id).limit(BIDS_PER_AUCTION)))
+    now = datetime.now(timezone.utc)
+    auction_ids, expected_winners = [], {}
+    for i in range(count):
+        with_bids, below_reserve = i % 5 != 0, i % 20 == 1
+        auction = Auction(
+            auction_id=uuid.uuid4(),
+            seller_user_id=template.seller_user_id,
+            product_id=template.product_id,
+            auction_type_id=template.auction_type_id,
+            auction_status_id=ended_status_id,
+            start_timestamp=now - timedelta(hours=1),
+            end_timestamp=now - timedelta(seconds=random.randint(1, 3000)),
+            starting_price_per_unit=10,
+            minimum_bid_increment=1,
+            reserve_price_per_unit=1000 if below_reserve else None,
+            quantity_offered=template.quantity_offered,
+            unit_of_measure_id_for_quantity=template.unit_of_measure_id_for_quantity,
+            total_bids_count=BIDS_PER_AUCTION if with_bids else 0,
+        )
+        db.add(auction)
+        auction_ids.append(auction.auction_id)
+        if not with_bids:
+            continue
+        bids = [
+            Bid(auction_id=auction.auction_id, bidder_user_id=bidders[j % len(bidders)], bid_amount_per_unit=11 + j,
+                bid_timestamp=now - timedelta(minutes=30 - j), bid_status="ACTIVE_HIGHEST" if j == BIDS_PER_AUCTION - 1 else "OUTBID")
+            for j in range(BIDS_PER_AUCTION)
+        ]
+        db.add_all(bids)
+        if not below_reserve:
+            expected_winners[auction.auction_id] = bids[-1]
+    db.commit()
+    return auction_ids, {auction_id: bid.bid_id for auction_id, bid in expected_winners.items()}
+
+
+def settle_one_by_one(db, auction_ids) -> int:
+    """الحلقة القديمة: كل مزاد باستعلاماته و commit مستقل."""
+    initial_status_id = db.scalar(select(AuctionSettlementStatus.settlement_status_id).where(AuctionSettlementStatus.status_name_key == "PENDING_PAYMENT"))
+    created = 0
+    for auction_id in auction_ids:
+        if db.scalar(select(AuctionSettlement.settlement_id).where(AuctionSettlement.auction_id == auction_id)):
+            continue
+        auction = db.get(Auction, auction_id)
+        winning_bid = db.scalars(select(Bid).where(Bid.auction_id == auction_id, Bid.bid_status == "ACTIVE_HIGHEST")).first()
+        if winning_bid is None or (auction.reserve_price_per_unit is not None and winning_bid.bid_amount_per_unit < auction.reserve_price_per_unit):
+            continue
+        total_amount = winning_bid.bid_amount_per_unit * auction.quantity_offered
+        settlements_crud.create_auction_settlement(db, AuctionSettlementCreate(
+            auction_id=auction_id,
+            winning_bid_id=winning_bid.bid_id,
+            winner_user_id=winning_bid.bidder_user_id,
+            seller_user_id=auction.seller_user_id,
+            final_winning_price_per_unit=winning_bid.bid_amount_per_unit,
+            quantity_won=auction.quantity_offered,
+            total_settlement_amount=total_amount,
+            net_amount_to_seller=total_amount,
+            settlement_status_id=initial_status_id,
+            settlement_timestamp=datetime.now(timezone.utc),
+        ))
+        created += 1
+    return created
+
+
+def main():
+    db = SessionLocal()
+    try:
+        ensure_fixtures(db)
+        loop_ids, _ = create_ended_auctions(db, AUCTIONS)
+        started = time.perf_counter()
+        loop_created = settle_one_by_one(db, loop_ids)
+        loop_seconds = time.perf_counter() - started
+
+        auction_ids, expected_winners = create_ended_auctions(db, AUCTIONS)
+        pipeline = SettlementPipeline(chunk_size=CHUNK, lookback_hours=1)
+
+        # تشغيل جزئي (كأن العامل توقف بعد أول دفعة)، ثم مسح كامل يستأنف الباقي
+        started = time.perf_counter()
+        partial = pipeline.run(db, auction_ids=auction_ids[:CHUNK])
+        full = pipeline.run(db)
+        pipeline_seconds = time.perf_counter() - started
+        rerun = pipeline.run(db)
+
+        settled = dict(db.execute(select(AuctionSettlement.auction_id, AuctionSettlement.winning_bid_id).where(AuctionSettlement.auction_id.in_(auction_ids))).all())
+        history_rows = db.scalar(
+            select(func.count()).select_from(AuctionSettlementStatusHistory)
+            .join(AuctionSettlement, AuctionSettlement.settlement_id == AuctionSettlementStatusHistory.settlement_id)
+            .where(AuctionSettlement.auction_id.in_(auction_ids))
+        )
+        winning_bids_marked = db.scalar(select(func.count()).select_from(Bid).where(Bid.auction_id.in_(auction_ids), Bid.bid_status == "WINNING_BID"))
+    finally:
+        db.close()
+
+    batch_ms = [batch["ms"] for batch in partial["batches"] + full["batches"]]
+    stats = pipeline.stats()
+    print(f"ended auctions per run         : {AUCTIONS} ({len(expected_winners)} with a winner)")
+    print(f"one by one                     : {loop_seconds * 1000:8.1f} ms  ({loop_seconds * 1e6 / AUCTIONS:8.1f} µs/auction, {loop_created} settled)")
+    print(f"pipeline (chunk {CHUNK:>5})         : {pipeline_seconds * 1000:8.1f} ms  ({pipeline_seconds * 1e6 / AUCTIONS:8.1f} µs/auction, {partial['settled'] + full['settled']} settled)")
+    print(f"speed-up                       : {loop_seconds / pipeline_seconds:8.1f}x")
+    print(f"batches / avg / max batch      : {stats['batches']} / {stats['avg_batch_ms']:.1f} ms / {stats['max_batch_ms']:.1f} ms  (this run: {', '.join(f'{ms:.0f}' for ms in batch_ms)} ms)")
+    print(f"re-run settled                 : {rerun['settled']}")
+    assert settled == expected_winners, "settlements do not match the highest bids above reserve"
+    assert history_rows == len(settled), "missing settlement status history"
+    assert winning_bids_marked == len(settled), "winning bids not marked"
+    assert rerun["settled"] == 0, "re-run created duplicate settlements"
+    print("winner / history / idempotency : ok")
+
+
+if __name__ == "__main__":
+    main()
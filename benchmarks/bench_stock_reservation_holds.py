@@ -0,0 +1,197 @@
+# backend/benchmarks/bench_stock_reservation_holds.py
+# ----------------------------------------------------------------------------------------------------
+# دورة حياة حجوزات المخزون (inventory_reservations) وتحرير الحجوزات المنتهية:
+#   - الطلبات عبر orders_service: الإنشاء يحجز (HELD)، الدفع (PAID) يؤكد ويخصم من المخزون الفعلي، الإلغاء يحرر،
+#     والدفع بعد انتهاء المهلة يُرفض وتعود الكميات إلى المتاح عند المسح. إلغاء الطلب المدفوع يعيد كمياته إلى المخزون.
+#   - التحرير: حجزًا حجزًا (قراءة الحجز والبند عبر ORM، ثم التعديل وحركة المخزون و commit لكل حجز) مقابل
+#     release_expired_holds (عبارة UPDATE للحجوزات وأخرى لبنود المخزون وINSERT للحركات لكل دفعة) لنفس عدد الحجوزات.
+#   - الكنّاس في العملية (StockReservationSweeper): حجوزات بمهلة قصيرة تُحرر عند انتهائها دون مسح الجدول.
+# يتحقق من أن المتاح والمحجوز والمخزون الفعلي وسجل الحركات متسقة بعد كل مرحلة.
+#
+# التشغيل (من مجلد backend):
+#   BENCH_HOLDS=5000 python -m benchmarks.bench_stock_reservation_holds
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+
+from benchmarks.bench_order_pipeline import cleanup, create_inventory, ensure_fixtures, next_ids, order_request
+from benchmarks.bench_price_tables import count_queries, create_options
+from src.core.permission_registry import permission_registry
+from src.db.session import SessionLocal
+from src.exceptions import ConflictException
+from src.lookups.models import InventoryTransactionType, OrderStatus, PaymentStatus
+from src.market.schemas import order_schemas
+from src.market.services import orders_service
+from src.products.models.inventory_models import InventoryItem, InventoryReservation, InventoryTransaction
+from src.products.services import stock_reservations
+from src.products.services.stock_reservations import stock_reservation_sweeper
+from src.users.models.core_models import User
+
+HOLDS = int(os.getenv("BENCH_HOLDS", "5000"))
+SWEEPER_HOLDS = 500
+TTL_SECONDS = 1.0
+
+
+def items_state(db, options):
+    """(المتاح، المحجوز، الفعلي) لكل خيار تعبئة."""
+    db.expire_all()
+    rows = db.execute(select(InventoryItem.product_packaging_option_id, InventoryItem.available_quantity, InventoryItem.reserved_quantity, InventoryItem.on_hand_quantity)
+                      .where(InventoryItem.product_packaging_option_id.in_(options))).all()
+    return {row.product_packaging_option_id: (row.available_quantity, row.reserved_quantity, row.on_hand_quantity) for row in rows}
+
+
+def hold_many(db, options, seller_id, count, ttl_seconds):
+    """ينشئ count حجزًا بلا طلب (بكمية 1..3 على خيارات عشوائية) ويعيد مجموع الكميات لكل خيار."""
+    held = {}
+    for _ in range(count):
+        option_id, quantity = random.choice(options), random.randint(1, 3)
+        stock_reservations.hold_stock(db, None, {(option_id, seller_id): Decimal(quantity)}, reason_notes="HOLD_BENCH", ttl_seconds=ttl_seconds)
+        held[option_id] = held.get(option_id, 0) + quantity
+    db.commit()
+    return held
+
+
+def legacy_release_expired(db, now, transaction_ids):
+    """تحرير الحجوزات المنتهية واحدًا واحدًا (قراءة ثم تعديل ثم commit لكل حجز)."""
+    return_type = db.query(InventoryTransactionType).filter(InventoryTransactionType.transaction_type_name_key == "RETURN_TO_STOCK").first()
+    released = 0
+    for reservation_id in db.scalars(select(InventoryReservation.reservation_id).where(InventoryReservation.status == "HELD", InventoryReservation.expires_at <= now)).all():
+        reservation = db.get(InventoryReservation, reservation_id)
+        item = db.get(InventoryItem, reservation.inventory_item_id)
+        item.available_quantity += reservation.quantity
+        item.reserved_quantity -= reservation.quantity
+        reservation.status = "EXPIRED"
+        db.add(InventoryTransaction(
+            transaction_id=next(transaction_ids), inventory_item_id=item.inventory_item_id, transaction_type_id=return_type.transaction_type_id,
+            quantity_changed=reservation.quantity, balance_after_transaction=item.available_quantity,
+        ))
+        db.commit()
+        released += 1
+    return released
+
+
+def measure(db, fn):
+    counter, stop = count_queries(db)
+    try:
+        started = time.perf_counter()
+        result = fn()
+        return (time.perf_counter() - started) * 1000, counter.value, result
+    finally:
+        stop()
+
+
+def main():
+    random.seed(17)
+    db = SessionLocal()
+    options = []
+    created = []
+    try:
+        created = ensure_fixtures(db)
+        for model, values in ((OrderStatus, {"status_name_key": "CANCELED_BY_BUYER"}),):
+            if db.scalar(select(model).where(model.status_name_key == values["status_name_key"])) is None:
+                row = model(**values)
+                db.add(row)
+                created.append(row)
+        db.commit()
+        permission_registry.load(db)
+        paid = db.scalar(select(PaymentStatus.payment_status_id).where(PaymentStatus.status_name_key == "PAID"))
+        buyer, seller = db.scalars(select(User).limit(2)).all()
+        seller_id = seller.user_id
+        options = create_options(db)
+        create_inventory(db, options, seller_id)
+        initial = items_state(db, options)
+
+        # 1. دورة حياة الطلبات: مدفوع، ملغى، منتهي المهلة
+        carts = [[(option_id, random.randint(1, 5)) for option_id in random.sample(options, 3)] for _ in range(3)]
+        paid_order, canceled_order, expired_order = (orders_service.create_new_order(db, order_request(cart, seller_id), buyer) for cart in carts)
+        statuses = dict(db.execute(select(InventoryReservation.order_id, func.count()).where(InventoryReservation.status == "HELD").group_by(InventoryReservation.order_id)).all())
+        assert all(statuses.get(order.order_id) == 3 for order in (paid_order, canceled_order, expired_order)), "orders did not hold their stock"
+
+        orders_service.update_order(db, paid_order.order_id, order_schemas.OrderUpdate(payment_status_id=paid), buyer)
+        orders_service.cancel_order(db, canceled_order.order_id, buyer, reason="HOLD_BENCH")
+        db.execute(InventoryReservation.__table__.update().where(InventoryReservation.order_id == expired_order.order_id).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        db.commit()
+        try:
+            orders_service.update_order(db, expired_order.order_id, order_schemas.OrderUpdate(payment_status_id=paid), buyer)
+            raise AssertionError("payment accepted after the hold expired")
+        except ConflictException:
+            db.rollback()
+        assert stock_reservations.release_expired_holds(db)["expired"] == 3
+        sold = {}
+        for option_id, quantity in carts[0]:
+            sold[option_id] = sold.get(option_id, 0) + quantity
+        after = items_state(db, options)
+        for option_id, (available, reserved, on_hand) in initial.items():
+            assert after[option_id] == (available - sold.get(option_id, 0), 0, on_hand - sold.get(option_id, 0)), f"option {option_id}: {after[option_id]}"
+        by_status = dict(db.execute(select(InventoryReservation.status, func.count()).where(InventoryReservation.order_id.in_([paid_order.order_id, canceled_order.order_id, expired_order.order_id])).group_by(InventoryReservation.status)).all())
+        assert by_status == {"CONFIRMED": 3, "RELEASED": 3, "EXPIRED": 3}, by_status
+        baseline = after
+
+        # 2. تحرير HOLDS حجزًا منتهيًا: حجزًا حجزًا مقابل الدفعات
+        rows = []
+        for name in ("legacy", "batched"):
+            hold_many(db, options, seller_id, HOLDS, ttl_seconds=-1)
+            now = datetime.now(timezone.utc)
+            if name == "legacy":
+                transaction_ids = next_ids(db, InventoryTransaction.transaction_id)
+                elapsed_ms, queries, released = measure(db, lambda: legacy_release_expired(db, now, transaction_ids))
+                batches = released
+            else:
+                elapsed_ms, queries, report = measure(db, lambda: stock_reservations.release_expired_holds(db, now=now))
+                released, batches = report["expired"], report["batches"]
+            assert released == HOLDS, f"{name}: released {released} of {HOLDS}"
+            assert items_state(db, options) == baseline, f"{name}: stock not restored"
+            rows.append((name, elapsed_ms, queries, batches))
+        # سجل الحركات: كل حجز (-q) يقابله تحرير (+q)، فصافي الحركات = التغير في المتاح (المبيع المؤكد فقط)
+        item_ids = select(InventoryItem.inventory_item_id).where(InventoryItem.product_packaging_option_id.in_(options))
+        net = db.scalar(select(func.sum(InventoryTransaction.quantity_changed)).where(InventoryTransaction.inventory_item_id.in_(item_ids)))
+        assert net == -sum(sold.values()), f"ledger net {net} != {-sum(sold.values())}"
+
+        # 3. الكنّاس في العملية: حجوزات بمهلة قصيرة تُحرر عند انتهائها
+        stock_reservation_sweeper.start()
+        try:
+            hold_many(db, options, seller_id, SWEEPER_HOLDS, ttl_seconds=TTL_SECONDS)
+            deadline = time.time() + TTL_SECONDS + 5
+            while stock_reservation_sweeper.stats()["expired"] < SWEEPER_HOLDS and time.time() < deadline:
+                time.sleep(0.05)
+            sweeper = stock_reservation_sweeper.stats()
+        finally:
+            stock_reservation_sweeper.stop()
+        assert sweeper["expired"] == SWEEPER_HOLDS, sweeper
+        assert items_state(db, options) == baseline, "sweeper did not restore stock"
+        assert db.scalar(select(func.count()).select_from(InventoryReservation).where(InventoryReservation.status == "HELD", InventoryReservation.order_id.is_(None))) == 0
+
+        # 4. إلغاء الطلب المدفوع: الكميات المؤكدة تعود إلى المخزون الفعلي والمتاح مع حركة RETURN_TO_STOCK، مرة واحدة
+        for _ in range(2):
+            orders_service.cancel_order(db, paid_order.order_id, buyer, reason="HOLD_BENCH")
+        assert items_state(db, options) == initial, "canceling a paid order did not return its stock"
+        net = db.scalar(select(func.sum(InventoryTransaction.quantity_changed)).where(InventoryTransaction.inventory_item_id.in_(item_ids)))
+        assert net == 0, f"ledger net {net} after canceling the paid order"
+        assert db.scalar(select(func.count()).select_from(InventoryReservation).where(InventoryReservation.order_id == paid_order.order_id, InventoryReservation.status == "CONFIRMED")) == 0
+    finally:
+        db.rollback()
+        item_ids = select(InventoryItem.inventory_item_id).where(InventoryItem.product_packaging_option_id.in_(options))
+        db.execute(delete(InventoryReservation).where(InventoryReservation.inventory_item_id.in_(item_ids)))
+        db.commit()
+        cleanup(db, options)
+        for row in created:
+            db.delete(row)
+        db.commit()
+        db.close()
+
+    print(f"expired holds released: {HOLDS}")
+    print(f"{'path':<8} {'ms':>9} {'queries':>8} {'commits':>8}")
+    for name, elapsed_ms, queries, batches in rows:
+        print(f"{name:<8} {elapsed_ms:9.1f} {queries:>8} {batches:>8}")
+    print(f"sweeper: {sweeper['expired']} holds expired in {sweeper['batches']} batches, max lag {sweeper['max_lag_ms']:.1f} ms, last batch {sweeper['last_batch_ms']:.1f} ms")
+    print("hold / confirm / cancel / expiry / paid cancel / stock consistency: ok")
+
+
+if __name__ == "__main__":
+    main()
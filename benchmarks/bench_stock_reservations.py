@@ -0,0 +1,180 @@
+# backend/benchmarks/bench_stock_reservations.py
+# ----------------------------------------------------------------------------------------------------
+# اختبار ضغط للبيع الزائد (Oversell) على بند مخزون واحد مطلوب بكثرة من عدة خيوط متزامنة:
+#   - القديم: قراءة available_quantity عبر ORM، الفحص في Python، ثم الكتابة و commit (نفس أسلوب adjust_stock_level
+#     والفحص المسبق في create_new_order قبل الحجز الذري).
+#   - الجديد: inventory_service.reserve_stock (عبارة UPDATE شرطية واحدة ... WHERE available_quantity >= q RETURNING
+#     مع حركة المخزون في نفس المعاملة).
+# الطلب الكلي أكبر من المخزون عمدًا. يتحقق من أن المسار الجديد لا يبيع أكثر من المخزون أبدًا، وأن المحجوز وسجل الحركات
+# يطابقان الوحدات المباعة، ومن أن الحجز متعدد البنود كل أو لا شيء، ويعرض البيع الزائد في المسار القديم
+# (التحديثات المفقودة بين القراءة والكتابة: بعزل READ COMMITTED في PostgreSQL، وفي SQLite لأن القراءة تسبق بدء معاملة الكتابة).
+#
+# التشغيل (من مجلد backend):
+#   BENCH_WORKERS=8 BENCH_STOCK=500 python -m benchmarks.bench_stock_reservations
+# ----------------------------------------------------------------------------------------------------
+
+import os
+import random
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.db.session import SessionLocal
+from src.exceptions import ForbiddenException
+from src.lookups.models import InventoryItemStatus
+from src.products.crud import inventory_crud
+from src.products.models.inventory_models import InventoryItem, InventoryTransaction
+from src.products.models.units_models import ProductPackagingOption
+from src.products.services import inventory_service
+from src.users.models.core_models import User
+
+WORKERS = int(os.getenv("BENCH_WORKERS", "8"))
+STOCK = int(os.getenv("BENCH_STOCK", "500"))
+ATTEMPTS = 3 * STOCK // WORKERS # طلب كلي ≈ 6 أضعاف المخزون (متوسط الكمية 2)
+RETRIES = 20
+NOTES = "STOCK_RESERVATION_BENCH"
+
+
+def create_items(db, keys, quantity):
+    in_stock = db.scalar(select(InventoryItemStatus.inventory_item_status_id).where(InventoryItemStatus.status_name_key == "IN_STOCK"))
+    first_id = (db.scalar(select(func.max(InventoryItem.inventory_item_id))) or 0) + 1 # BigInteger بلا تزايد تلقائي في SQLite
+    db.execute(insert(InventoryItem), [
+        {
+            "inventory_item_id": first_id + n, "product_packaging_option_id": option_id, "seller_user_id": seller_id,
+            "available_quantity": quantity, "reserved_quantity": 0, "on_hand_quantity": quantity, "inventory_item_status_id": in_stock,
+        }
+        for n, (option_id, seller_id) in enumerate(keys)
+    ])
+    db.commit()
+    return list(range(first_id, first_id + len(keys)))
+
+
+def cleanup(db, item_ids):
+    db.execute(delete(InventoryTransaction).where(InventoryTransaction.inventory_item_id.in_(item_ids)))
+    db.execute(delete(InventoryItem).where(InventoryItem.inventory_item_id.in_(item_ids)))
+    db.commit()
+
+
+def legacy_reserve(db, item_id, quantity):
+    """القراءة ثم الفحص ثم الكتابة من Python (المسار القديم)."""
+    item = db.get(InventoryItem, item_id, populate_existing=True)
+    if item.available_quantity < quantity:
+        raise ForbiddenException(detail="insufficient stock")
+    time.sleep(0.001) # زمن التطبيق بين القراءة والكتابة (التسعير، التحقق من البائع...)
+    item.available_quantity -= quantity
+    item.reserved_quantity += quantity
+    db.commit()
+
+
+def atomic_reserve(db, key, quantity):
+    inventory_service.reserve_stock(db, {key: Decimal(quantity)}, transaction_type_key="SALE_DEDUCTION", reason_notes=NOTES)
+    time.sleep(0.001) # نفس زمن التطبيق، بعد الحجز (إنشاء الطلب)
+    db.commit()
+
+
+def stress(reserve):
+    """يشغل WORKERS خيطًا، كل منها ATTEMPTS محاولة بكمية 1..3، ويعيد (الوحدات المباعة، الحجوزات الناجحة، المرفوضة، الأخطاء، الزمن)."""
+    totals = {"sold": 0, "accepted": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        db = SessionLocal()
+        counts = dict.fromkeys(totals, 0)
+        try:
+            for _ in range(ATTEMPTS):
+                quantity = rng.randint(1, 3)
+                for _ in range(RETRIES):
+                    try:
+                        reserve(db, quantity)
+                        counts["sold"] += quantity
+                        counts["accepted"] += 1
+                    except ForbiddenException:
+                        db.rollback()
+                        counts["rejected"] += 1
+                    except OperationalError: # قفل SQLite المشغول: إعادة المحاولة
+                        db.rollback()
+                        counts["errors"] += 1
+                        continue
+                    break
+        finally:
+            db.close()
+            with lock:
+                for counter, value in counts.items():
+                    totals[counter] += value
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(WORKERS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    totals["seconds"] = time.perf_counter() - started
+    return totals
+
+
+def quantities(db, item_id):
+    db.expire_all()
+    item = db.get(InventoryItem, item_id)
+    return item.available_quantity, item.reserved_quantity
+
+
+def main():
+    db = SessionLocal()
+    item_ids = []
+    try:
+        option_id = db.scalar(select(ProductPackagingOption.packaging_option_id).limit(1))
+        taken = select(InventoryItem.seller_user_id).where(InventoryItem.product_packaging_option_id == option_id)
+        sellers = db.scalars(select(User.user_id).where(User.user_id.not_in(taken)).limit(4)).all()
+        item_ids = create_items(db, [(option_id, sellers[0]), (option_id, sellers[1])], STOCK)
+        legacy_item, atomic_item = item_ids
+        atomic_key = (option_id, sellers[1])
+
+        legacy = stress(lambda session, quantity: legacy_reserve(session, legacy_item, quantity))
+        legacy_available, legacy_reserved = quantities(db, legacy_item)
+        atomic = stress(lambda session, quantity: atomic_reserve(session, atomic_key, quantity))
+        atomic_available, atomic_reserved = quantities(db, atomic_item)
+
+        # الجديد: لا بيع زائد، والمحجوز وسجل الحركات يطابقان الوحدات المباعة بالضبط
+        ledger_count, ledger_sum = db.execute(
+            select(func.count(), func.coalesce(func.sum(InventoryTransaction.quantity_changed), 0)).where(InventoryTransaction.inventory_item_id == atomic_item)
+        ).one()
+        assert atomic["sold"] <= STOCK, f"atomic path oversold: {atomic['sold']} > {STOCK}"
+        assert atomic_reserved == atomic["sold"] and atomic_available == STOCK - atomic["sold"] >= 0
+        assert atomic_available < 3, f"{atomic_available} units left unsold while demand exceeded stock"
+        assert ledger_count == atomic["accepted"] and -ledger_sum == atomic["sold"], "ledger does not match reservations"
+
+        # الحجز متعدد البنود كل أو لا شيء: بند واحد لا يكفي = لا حجز لأي بند ولا حركات
+        batch_ids = create_items(db, [(option_id, sellers[2]), (option_id, sellers[3])], 5)
+        item_ids += batch_ids
+        before = [quantities(db, item_id) for item_id in batch_ids]
+        try:
+            inventory_service.reserve_stock(db, {(option_id, sellers[2]): Decimal(5), (option_id, sellers[3]): Decimal(6)}, transaction_type_key="SALE_DEDUCTION", reason_notes=NOTES)
+            raise AssertionError("partially available batch reserved")
+        except ForbiddenException:
+            db.commit() # الحجز المعكوس يجب أن يترك الكميات كما كانت حتى بعد commit
+        assert [quantities(db, item_id) for item_id in batch_ids] == before, "failed batch left partial reservations"
+        assert db.scalar(select(func.count()).select_from(InventoryTransaction).where(InventoryTransaction.inventory_item_id.in_(batch_ids))) == 0
+
+        # تعديل المخزون اليدوي الشرطي يرفض الكمية السالبة ولا يغير شيئًا
+        assert inventory_crud.adjust_inventory_quantity(db, batch_ids[0], -6) is None
+        assert inventory_crud.adjust_inventory_quantity(db, batch_ids[0], -5).available_quantity == 0
+        db.rollback()
+    finally:
+        db.rollback()
+        cleanup(db, item_ids)
+        db.close()
+
+    print(f"workers / attempts / stock      : {WORKERS} / {WORKERS * ATTEMPTS} / {STOCK}")
+    print(f"{'path':<8} {'sold':>6} {'oversold':>9} {'available':>10} {'reserved':>9} {'accepted':>9} {'rejected':>9} {'errors':>7} {'seconds':>8}")
+    for name, totals, available, reserved in (("legacy", legacy, legacy_available, legacy_reserved), ("atomic", atomic, atomic_available, atomic_reserved)):
+        print(f"{name:<8} {totals['sold']:>6} {max(totals['sold'] - STOCK, 0):>9} {available:>10} {reserved:>9} {totals['accepted']:>9} {totals['rejected']:>9} {totals['errors']:>7} {totals['seconds']:8.2f}")
+    print("no oversell / ledger / all-or-nothing batches: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# backend/benchmarks/bench_user_loader_profiles.py
+# ----------------------------------------------------------------------------------------------------
+# يعد عبارات SQL التي يصدرها جلب مستخدم واحد بكل ملف من ملفات التحميل (USER_LOADER_PROFILES)،
+# ويتحقق من أنها لا تتجاوز الميزانية المتوقعة لكل ملف.
+# يستخدم قاعدة البيانات المحددة في DATABASE_URL (يجب أن تحتوي على مستخدم واحد على الأقل).
+#
+# التشغيل (من مجلد backend):
+#   python -m benchmarks.bench_user_loader_profiles
+# ----------------------------------------------------------------------------------------------------
+
+import sys
+
+from sqlalchemy import event
+
+from src.db import base # noqa: F401 - تحميل جميع المودلز
+from src.db.session import SessionLocal, engine
+from src.users.crud import core_crud
+from src.users.models.core_models import User
+
+# الحد الأقصى لعدد العبارات لكل ملف تحميل
+STATEMENT_BUDGETS = {
+    "auth": 1,
+    "profile": 3,
+    "admin_detail": 8,
+    "embedded_ref": 1,
+}
+
+
+def main() -> int:
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = SessionLocal()
+    try:
+        first = db.query(User.user_id).first()
+        if first is None:
+            print("لا يوجد مستخدمون في قاعدة البيانات.")
+            return 1
+        user_id = first[0]
+
+        failed = False
+        for profile, budget in STATEMENT_BUDGETS.items():
+            db.expunge_all()
+            statements.clear()
+            db.query(User).options(*core_crud.user_loader_options(profile)).filter(User.user_id == user_id).first()
+            status = "ok" if len(statements) <= budget else "OVER BUDGET"
+            failed = failed or len(statements) > budget
+            print(f"{profile:<14} statements={len(statements):<3} budget={budget:<3} {status}")
+        return 1 if failed else 0
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""Add auction lifecycle indexes
+
+Revision ID: 3f2a9c7d1b04
+Revises: e5100b1fc724
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c7d1b04'
+down_revision: Union[str, None] = 'e5100b1fc724'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_auctions_status_start_timestamp', 'auctions', ['auction_status_id', 'start_timestamp'], unique=False)
+    op.create_index('ix_auctions_status_end_timestamp', 'auctions', ['auction_status_id', 'end_timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auctions_status_end_timestamp', table_name='auctions')
+    op.drop_index('ix_auctions_status_start_timestamp', table_name='auctions')
@@ -0,0 +1,35 @@
+"""Widen phone change OTP columns to hold OTP hashes
+
+Revision ID: 4a7c1e9d2f58
+Revises: 9b2d4f6a8c13
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7c1e9d2f58'
+down_revision: Union[str, None] = '9b2d4f6a8c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # batch_alter_table: SQLite has no ALTER COLUMN, so the table is copied there; PostgreSQL gets plain ALTER statements.
+    with op.batch_alter_table('phone_change_requests') as batch_op:
+        for column in ('old_phone_otp_code', 'new_phone_otp_code'):
+            batch_op.alter_column(column, existing_type=sa.String(length=10), type_=sa.String(length=255), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # OTP hashes do not fit in 10 characters and cannot be turned back into codes; open requests must be restarted.
+    op.execute("UPDATE phone_change_requests SET old_phone_otp_code = NULL, new_phone_otp_code = NULL")
+    with op.batch_alter_table('phone_change_requests') as batch_op:
+        for column in ('old_phone_otp_code', 'new_phone_otp_code'):
+            batch_op.alter_column(column, existing_type=sa.String(length=255), type_=sa.String(length=10), existing_nullable=True)
@@ -0,0 +1,48 @@
+"""Add inventory reservations for order stock holds
+
+Revision ID: 5e9b3c1d7a24
+Revises: d3a8f5b2c6e1
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9b3c1d7a24'
+down_revision: Union[str, None] = 'd3a8f5b2c6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inventory_reservations',
+    sa.Column('reservation_id', sa.UUID(), nullable=False),
+    sa.Column('inventory_item_id', sa.BigInteger(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default=sa.text("'HELD'"), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('created_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.CheckConstraint('quantity > 0', name='chk_inventory_reservation_quantity_positive'),
+    sa.CheckConstraint("status IN ('HELD', 'CONFIRMED', 'RELEASED', 'EXPIRED')", name='chk_inventory_reservation_status'),
+    sa.ForeignKeyConstraint(['created_by_user_id'], ['users.user_id'], ),
+    sa.ForeignKeyConstraint(['inventory_item_id'], ['inventory_items.inventory_item_id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('reservation_id')
+    )
+    op.create_index('ix_inventory_reservations_status_expires_at', 'inventory_reservations', ['status', 'expires_at'], unique=False)
+    op.create_index('ix_inventory_reservations_order_id', 'inventory_reservations', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_reservations_order_id', table_name='inventory_reservations')
+    op.drop_index('ix_inventory_reservations_status_expires_at', table_name='inventory_reservations')
+    op.drop_table('inventory_reservations')
@@ -0,0 +1,30 @@
+"""Add verification attempts to password reset tokens
+
+Revision ID: 6c1e8b3a9f47
+Revises: 4a7c1e9d2f58
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1e8b3a9f47'
+down_revision: Union[str, None] = '4a7c1e9d2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('password_reset_tokens') as batch_op:
+        batch_op.add_column(sa.Column('verification_attempts', sa.SmallInteger(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('password_reset_tokens') as batch_op:
+        batch_op.drop_column('verification_attempts')
@@ -0,0 +1,48 @@
+"""Add settlement status history and settlement pipeline indexes
+
+Revision ID: 8c4d2e6f1a37
+Revises: 3f2a9c7d1b04
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d2e6f1a37'
+down_revision: Union[str, None] = '3f2a9c7d1b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auction_settlement_status_history',
+    sa.Column('settlement_status_history_id', sa.BigInteger(), nullable=False),
+    sa.Column('settlement_id', sa.BigInteger(), nullable=False),
+    sa.Column('old_status_id', sa.Integer(), nullable=True),
+    sa.Column('new_status_id', sa.Integer(), nullable=False),
+    sa.Column('change_timestamp', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('changed_by_user_id', sa.UUID(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['changed_by_user_id'], ['users.user_id'], ),
+    sa.ForeignKeyConstraint(['new_status_id'], ['auction_settlement_statuses.settlement_status_id'], ),
+    sa.ForeignKeyConstraint(['old_status_id'], ['auction_settlement_statuses.settlement_status_id'], ),
+    sa.ForeignKeyConstraint(['settlement_id'], ['auction_settlements.settlement_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('settlement_status_history_id')
+    )
+    op.create_index(op.f('ix_auction_settlement_status_history_settlement_id'), 'auction_settlement_status_history', ['settlement_id'], unique=False)
+    op.create_index('ix_auction_settlements_auction_id', 'auction_settlements', ['auction_id'], unique=False)
+    op.create_index('ix_bids_auction_amount', 'bids', ['auction_id', 'bid_amount_per_unit'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bids_auction_amount', table_name='bids')
+    op.drop_index('ix_auction_settlements_auction_id', table_name='auction_settlements')
+    op.drop_index(op.f('ix_auction_settlement_status_history_settlement_id'), table_name='auction_settlement_status_history')
+    op.drop_table('auction_settlement_status_history')
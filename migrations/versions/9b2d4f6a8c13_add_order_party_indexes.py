@@ -0,0 +1,40 @@
+"""Add order_items.order_date and order party indexes for keyset pagination
+
+Revision ID: 9b2d4f6a8c13
+Revises: 5e9b3c1d7a24
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d4f6a8c13'
+down_revision: Union[str, None] = '5e9b3c1d7a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_items', sa.Column('order_date', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE order_items SET order_date = "
+        "(SELECT orders.order_date FROM orders WHERE orders.order_id = order_items.order_id)"
+    )
+    op.create_index('ix_orders_buyer_order_date', 'orders', ['buyer_user_id', 'order_date', 'order_id'], unique=False)
+    op.create_index('ix_orders_seller_order_date', 'orders', ['seller_user_id', 'order_date', 'order_id'], unique=False)
+    op.create_index('ix_order_items_seller_order_date', 'order_items', ['seller_user_id', 'order_date', 'order_id'], unique=False)
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_order_items_seller_order_date', table_name='order_items')
+    op.drop_index('ix_orders_seller_order_date', table_name='orders')
+    op.drop_index('ix_orders_buyer_order_date', table_name='orders')
+    op.drop_column('order_items', 'order_date')
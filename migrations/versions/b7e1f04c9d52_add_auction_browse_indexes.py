@@ -0,0 +1,36 @@
+"""Add auction browse keyset indexes
+
+Revision ID: b7e1f04c9d52
+Revises: 8c4d2e6f1a37
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1f04c9d52'
+down_revision: Union[str, None] = '8c4d2e6f1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_auctions_status_end_timestamp', table_name='auctions')
+    op.create_index('ix_auctions_status_end_timestamp', 'auctions', ['auction_status_id', 'end_timestamp', 'auction_id'], unique=False)
+    op.create_index('ix_auctions_browse_status_type', 'auctions', ['auction_status_id', 'auction_type_id', 'end_timestamp', 'auction_id'], unique=False)
+    op.create_index('ix_auctions_browse_seller', 'auctions', ['seller_user_id', 'end_timestamp', 'auction_id'], unique=False)
+    op.create_index('ix_auctions_browse_end', 'auctions', ['end_timestamp', 'auction_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auctions_browse_end', table_name='auctions')
+    op.drop_index('ix_auctions_browse_seller', table_name='auctions')
+    op.drop_index('ix_auctions_browse_status_type', table_name='auctions')
+    op.drop_index('ix_auctions_status_end_timestamp', table_name='auctions')
+    op.create_index('ix_auctions_status_end_timestamp', 'auctions', ['auction_status_id', 'end_timestamp'], unique=False)
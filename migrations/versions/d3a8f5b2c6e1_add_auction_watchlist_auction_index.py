@@ -0,0 +1,28 @@
+"""Add auction watchlist index for bid notification fan-out
+
+Revision ID: d3a8f5b2c6e1
+Revises: b7e1f04c9d52
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f5b2c6e1'
+down_revision: Union[str, None] = 'b7e1f04c9d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_auction_watchlists_auction_user', 'auction_watchlists', ['auction_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auction_watchlists_auction_user', table_name='auction_watchlists')
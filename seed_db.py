@@ -817,6 +817,36 @@ def seed_all(db: Session):
         {"notification_type_id": 3, "type_translation_id": 3, "language_code": "ar", "translated_type_name": "عرض ترويجي"},
     ])
 
+    # 9. حالات تسليم الإشعارات
+    notification_delivery_statuses = [
+        {"delivery_status_id": 1, "status_name_key": "PENDING"},
+        {"delivery_status_id": 2, "status_name_key": "SENT"},
+        {"delivery_status_id": 3, "status_name_key": "DELIVERED"},
+        {"delivery_status_id": 4, "status_name_key": "FAILED"},
+    ]
+    seed_main_table(db, NotificationDeliveryStatus, "delivery_status_id", notification_delivery_statuses)
+    seed_translation_table(db, NotificationDeliveryStatusTranslation, "delivery_status_id", [
+        {"status_translation_id": 1, "delivery_status_id": 1, "language_code": "ar", "translated_status_name": "قيد الإرسال"},
+        {"status_translation_id": 2, "delivery_status_id": 2, "language_code": "ar", "translated_status_name": "تم الإرسال"},
+        {"status_translation_id": 3, "delivery_status_id": 3, "language_code": "ar", "translated_status_name": "تم التسليم"},
+        {"status_translation_id": 4, "delivery_status_id": 4, "language_code": "ar", "translated_status_name": "فشل الإرسال"},
+    ])
+
+    # 10. قوالب إشعارات المزايدات (المعاملات: {auction_title}, {amount})
+    notification_templates = [
+        {"template_id": 1, "template_name_key": "AUCTION_OUTBID", "description": "إخطار المزايد بأن مزايدته تم تجاوزها", "default_language_code": "ar"},
+        {"template_id": 2, "template_name_key": "AUCTION_WATCHLIST_BID", "description": "إخطار مراقبي المزاد بمزايدة جديدة", "default_language_code": "ar"},
+    ]
+    seed_main_table(db, NotificationTemplate, "template_id", notification_templates)
+    seed_translation_table(db, NotificationTemplateTranslation, "template_id", [
+        # AUCTION_OUTBID
+        {"template_translation_id": 1, "template_id": 1, "language_code": "ar", "translated_subject": "تم تجاوز مزايدتك", "translated_body": "تم تجاوز مزايدتك في مزاد \"{auction_title}\". أعلى مزايدة الآن {amount}."},
+        {"template_translation_id": 2, "template_id": 1, "language_code": "en", "translated_subject": "You have been outbid", "translated_body": "You have been outbid on \"{auction_title}\". The highest bid is now {amount}."},
+        # AUCTION_WATCHLIST_BID
+        {"template_translation_id": 3, "template_id": 2, "language_code": "ar", "translated_subject": "مزايدة جديدة على مزاد تراقبه", "translated_body": "مزايدة جديدة على \"{auction_title}\". أعلى مزايدة الآن {amount}."},
+        {"template_translation_id": 4, "template_id": 2, "language_code": "en", "translated_subject": "New bid on a watched auction", "translated_body": "New bid on \"{auction_title}\". The highest bid is now {amount}."},
+    ])
+
     db.commit()
 
     logger.info("--- Seeding Geographic Data Tables ---")
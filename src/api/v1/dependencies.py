@@ -17,7 +17,12 @@ from pydantic import ValidationError
 
 from src.core import security # لوحدة الأمان الخاصة بنا (فك تشفير JWTs، خوارزميات التشفير)
 from src.db.session import get_db # للحصول على جلسة قاعدة البيانات للوصول إلى DB
+from src.core.config import settings
 from src.users.crud import core_crud # للوصول إلى دوال CRUD للمستخدمين (مثل get_user_by_id)
+from src.users.crud import security_crud # للتحقق من أن جلسة التوكن (sid) ما زالت نشطة
+from src.core.permission_registry import permission_registry # لجلب مفاتيح صلاحيات الدور من أقنعة البتات
+from src.core.principal_cache import PrincipalSnapshot, principal_cache # ذاكرة لقطات الهوية داخل العملية
+from src.core.session_revocation import session_revocations # قائمة الجلسات المُبطلة (تسجيل الخروج)
 
 # استيراد مودل User مباشرة
 from src.users.models.core_models import User # <-- تم التعديل هنا: استيراد User مباشرة
@@ -50,43 +55,84 @@ async def get_current_user(
     )
     try:
         # 1. فك تشفير التوكن (JWT) والتحقق من توقيعه باستخدام decode_access_token
-        # هذا يعيد TokenPayload مع user_id كـ UUID بالفعل
-        token_data = security.decode_access_token(token)
+        # هذا يعيد TokenPayload مع user_id كـ UUID بالفعل (من ذاكرة التوكنات إن كان قد تم التحقق منه مسبقًا)
+        # عند تفعيل JWT_VERIFY_SESSION_ON_REQUEST يتم التحقق من أن الجلسة (sid) ما زالت نشطة عند كل إخفاق في الذاكرة؛
+        # تسجيل الخروج يبطل مدخلات الذاكرة فورًا في هذه العملية، وJWT_DECODE_CACHE_MAX_AGE_SECONDS يحدها في العمليات الأخرى.
+        session_validator = None
+        if settings.JWT_VERIFY_SESSION_ON_REQUEST:
+            session_validator = lambda session_id: security_crud.is_user_session_active(db, session_id)
+        token_data = security.decode_access_token(token, session_validator=session_validator)
         
     except (JWTError, ValidationError, HTTPException): # نلتقط أي أخطاء متعلقة بـ JWT أو Pydantic ValidationError
         raise credentials_exception # يتم رمي استثناء بيانات الاعتماد غير الصالحة
 
+    # 2. رفض توكنات الجلسات التي تم تسجيل الخروج منها (فحص في الذاكرة عبر مرشح Bloom، بدون استعلام)
+    if token_data.sid is not None and session_revocations.is_revoked(token_data.sid):
+        raise credentials_exception
+
     # 4. جلب كائن المستخدم من قاعدة البيانات باستخدام معرف المستخدم من التوكن
-    user = core_crud.get_user_by_id(db, user_id=token_data.user_id) # token_data.user_id هو UUID بالفعل
+    # نستخدم الجلب الخفيف؛ الصلاحيات تُقرأ من لقطة الهوية في get_current_principal
+    user = core_crud.get_user_for_auth(db, user_id=token_data.user_id) # token_data.user_id هو UUID بالفعل
     if user is None:
         # إذا تم حذف المستخدم من قاعدة البيانات بعد إصدار التوكن، يعتبر التوكن غير صالح
         raise credentials_exception 
-    
-    # TODO: هنا يمكن إضافة تحقق إضافي لـ JTI (معرف الجلسة) لضمان أن الجلسة لم يتم إبطالها يدوياً.
-    # if token_data.sid:
-    #    db_session = security_crud.get_user_session_by_id(db, session_id=UUID(token_data.sid))
-    #    if not db_session or not db_session.is_active:
-    #        raise credentials_exception # الجلسة غير نشطة أو ملغاة
 
     return user
 
 
+# ----------------------------------------------------------------------------------------------------
+# تابع مساعد: get_current_principal
+# الغرض: جلب لقطة الهوية (الحالة، الدور، الصلاحيات) من الذاكرة المؤقتة أو بنائها عند الإخفاق.
+# ----------------------------------------------------------------------------------------------------
+def build_principal_snapshot(db: Session, user: User) -> PrincipalSnapshot:
+    """
+    يبني لقطة هوية جديدة للمستخدم. تُقرأ مفاتيح الصلاحيات من سجل الأقنعة
+    (استعلام واحد فقط إذا لم يكن قناع الدور محملاً بعد أو انتهت مدة صلاحيته).
+    """
+    role = user.default_role
+    permission_keys = permission_registry.permission_keys_for_role(db, role.role_id) if role else frozenset()
+    return PrincipalSnapshot(
+        user_id=user.user_id,
+        role_id=user.default_user_role_id,
+        account_status_key=user.account_status.status_name_key if user.account_status else None,
+        is_deleted=bool(user.is_deleted),
+        role_key=role.role_name_key if role else None,
+        permission_keys=permission_keys,
+    )
+
+
+async def get_current_principal(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> PrincipalSnapshot:
+    """
+    يعيد لقطة الهوية للمستخدم الحالي مفهرسة بـ (user_id, role_id).
+    عند الإصابة لا يتم أي استعلام إضافي؛ وعند الإخفاق تُبنى اللقطة وتُخزّن.
+    """
+    snapshot = principal_cache.get(current_user.user_id, current_user.default_user_role_id)
+    if snapshot is None:
+        snapshot = build_principal_snapshot(db, current_user)
+        principal_cache.put(snapshot)
+    return snapshot
+
+
 # ----------------------------------------------------------------------------------------------------
 # التابع الثاني: get_current_active_user
 # الغرض: جلب كائن المستخدم الحالي والتحقق من أن حسابه نشط.
 # ----------------------------------------------------------------------------------------------------
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user) # يعتمد على التابع السابق لجلب المستخدم
+    current_user: User = Depends(get_current_user), # يعتمد على التابع السابق لجلب المستخدم
+    principal: PrincipalSnapshot = Depends(get_current_principal) # لقطة الهوية (من الذاكرة المؤقتة)
 ) -> User:
     """
     يجلب المستخدم الحالي النشط. يمنع الوصول إذا كان الحساب غير نشط أو محذوف.
     """
-    if current_user.account_status.status_name_key != "ACTIVE": # يعتمد على تحميل حالة الحساب في مودل User
+    if principal.account_status_key != "ACTIVE": # من لقطة الهوية بدلاً من تحميل علاقة حالة الحساب
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, # Forbidden (ممنوع) هو الأنسب لحساب غير نشط
             detail="الحساب غير نشط. يرجى التواصل مع فريق الدعم."
         )
-    if current_user.is_deleted: # حقل الحذف الناعم في مودل User
+    if principal.is_deleted: # حقل الحذف الناعم في مودل User
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="الحساب محذوف ولا يمكن الوصول إليه."
@@ -105,39 +151,22 @@ def has_permission(permission_key: str) -> Callable:
     """
     async def permission_checker(
         current_user: User = Depends(get_current_active_user), # يعتمد على المستخدم النشط الحالي
-        db: Session = Depends(get_db) # نحتاج session للتحقق من الصلاحيات
+        principal: PrincipalSnapshot = Depends(get_current_principal) # لقطة الهوية (نفس النسخة المحلولة في الطلب)
     ) -> User:
         # 1. التحقق من أن المستخدم لديه دور أساسي
-        if not current_user.default_role:
+        if principal.role_id is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="المستخدم ليس لديه دور أساسي."
             )
 
-        # 2. البحث في الصلاحيات - إعادة تحميل الدور مع الصلاحيات من نفس session
-        has_perm = False
-        
-        from src.users.models.roles_models import Role, RolePermission
-        from sqlalchemy.orm import selectinload, joinedload
-        
-        # إعادة تحميل الدور مع الصلاحيات من نفس session
-        role_with_perms = db.query(Role).options(
-            selectinload(Role.permission_associations).joinedload(RolePermission.permission)
-        ).filter(Role.role_id == current_user.default_role.role_id).first()
-        
-        if role_with_perms and role_with_perms.permission_associations:
-            # البحث في الصلاحيات المحملة
-            for pa in role_with_perms.permission_associations:
-                if pa.permission and pa.permission.permission_name_key == permission_key:
-                    has_perm = True
-                    break
+        # 2. البحث في مجموعة مفاتيح الصلاحيات المخزنة في اللقطة (بدون إعادة تحميل الدور من قاعدة البيانات)
+        has_perm = principal.has_permission(permission_key)
 
         # 3. تجاوز الصلاحية للمسؤولين الفائقين (SUPER_ADMIN)
         # TODO: يجب أن يكون مفتاح الدور "SUPER_ADMIN" معرفاً كقيمة ثابتة في مكان مركزي (مثل settings).
         #       يفترض أن SUPER_ADMIN له صلاحية عامة.
-        is_super_admin = False
-        if current_user.default_role.role_name_key == "SUPER_ADMIN":
-            is_super_admin = True
+        is_super_admin = principal.role_key == "SUPER_ADMIN"
             
         if not has_perm and not is_super_admin: # إذا لم يمتلك الصلاحية المطلوبة وليس سوبر أدمن
             raise HTTPException(
@@ -168,6 +197,8 @@ async def get_current_user_or_none(
     try:
         # هنا نستفيد من التحسينات في دالة security.decode_access_token
         payload = security.decode_access_token(token)
+        if payload.sid is not None and session_revocations.is_revoked(payload.sid):
+            return None
         user = core_crud.get_user_by_id(db, user_id=payload.user_id) # user_id هو payload.user_id (TokenPayload object)
         if user is None: # إذا لم يتم العثور على المستخدم
             return None
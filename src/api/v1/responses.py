@@ -0,0 +1,23 @@
+# backend/src/api/v1/responses.py
+# ----------------------------------------------------------------------------------------------------
+# ترميز سريع لاستجابات القوائم الكبيرة.
+# عند إرجاع كائنات أو قواميس من نقطة الوصول، يعيد FastAPI التحقق منها مقابل response_model ثم يمررها عبر
+# jsonable_encoder (بايثون خالص) قبل json.dumps. fast_json_response تتحقق من القواميس وترمزها إلى JSON
+# داخل pydantic-core مباشرة بمحول (TypeAdapter) مخزن لكل نوع، وتعيد Response جاهزة يتجاوز بها FastAPI الخطوتين.
+# يبقى response_model في المسار لتوثيق OpenAPI، ويُمرر نفس النوع هنا.
+# ----------------------------------------------------------------------------------------------------
+
+from typing import Any, Dict
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def fast_json_response(response_type: Any, data: Any, status_code: int = 200) -> Response:
+    """يتحقق من data مقابل response_type ويرمزها إلى JSON دون المرور بـ jsonable_encoder."""
+    adapter = _adapters.get(response_type)
+    if adapter is None:
+        adapter = _adapters.setdefault(response_type, TypeAdapter(response_type))
+    return Response(content=adapter.dump_json(adapter.validate_python(data)), status_code=status_code, media_type="application/json")
@@ -0,0 +1,216 @@
+# backend\src\api\v1\routers\admin_diagnostics_router.py
+
+from fastapi import APIRouter, Depends # استيراد المكونات الأساسية لـ FastAPI
+from typing import Any, Dict # لتعريف أنواع البيانات في Python
+
+# استيراد المكونات المشتركة للمشروع
+from src.api.v1 import dependencies # لتبعية الصلاحيات
+from src.core.config import settings # لإعدادات المجمع المهيأة
+from src.db.session import active_engines # المحركات التي تم إنشاؤها
+from src.db.pool_stats import pool_status, pool_telemetry # حالة المجمع والمدرج التكراري لأزمنة الانتظار
+from src.core.password_hasher import password_hasher # منفذ تجزئة كلمات المرور
+from src.core.token_cache import token_cache # ذاكرة توكنات JWT المفكوكة
+from src.core.session_revocation import session_revocations # قائمة الجلسات المُبطلة
+from src.auctions.services.auction_engine import auction_engine # محرك المزادات في الذاكرة
+from src.auctions.services.auction_events import auction_events # موزع التحديثات الحية للمزادات
+from src.auctions.services.auction_scheduler import auction_scheduler # مجدول دورة حياة المزادات
+from src.auctions.services.settlement_pipeline import settlement_pipeline # خط التسويات الدفعي
+from src.auctions.services.auction_lookups import auction_lookups # خريطة حالات وأنواع المزادات المخزنة
+from src.auctions.services.bid_notifications import bid_notifications # توزيع إشعارات المزايدات
+from src.communications.services.notification_channels import local_channel # قناة الإشعارات المحلية
+from src.pricing.services.price_tables import price_tables # جداول الأسعار المجمّعة لخيارات التعبئة
+from src.products.services.stock_reservations import stock_reservation_sweeper # كنّاس حجوزات المخزون المنتهية
+
+
+# تعريف الراوتر لتشخيص البنية التحتية من جانب المسؤولين.
+router = APIRouter(
+    prefix="/diagnostics", # المسار الأساسي (مثال: /admin/diagnostics)
+    tags=["Admin - System Settings & Configuration"], # الوسوم التي تظهر في وثائق OpenAPI (Swagger UI)
+    dependencies=[Depends(dependencies.has_permission("ADMIN_MANAGE_SETTINGS"))] # صلاحية عامة لإدارة الإعدادات
+)
+
+
+@router.get(
+    "/db-pool",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة مجمع اتصالات قاعدة البيانات",
+    description="""
+    يعرض حالة مجمع الاتصالات لكل محرك (المحجوزة، الفائضة، المتاحة) في هذه العملية،
+    ومدرجًا تكراريًا لأزمنة انتظار الحصول على اتصال منذ بدء التشغيل.
+    max_connections_per_process تساعد على حساب عدد العمال المسموح به مقابل max_connections في PostgreSQL.
+    """,
+)
+async def get_db_pool_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات مجمع الاتصالات."""
+    return {
+        "configured": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle_seconds": settings.DB_POOL_RECYCLE_SECONDS,
+            "pre_ping": settings.DB_POOL_PRE_PING,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+            "pgbouncer_mode": settings.DB_PGBOUNCER_MODE,
+            "max_connections_per_process": settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        },
+        "pools": {name: pool_status(engine.pool) for name, engine in active_engines().items()},
+        "checkout_wait": pool_telemetry.histogram(),
+    }
+
+
+@router.get(
+    "/password-hashing",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة منفذ تجزئة كلمات المرور",
+    description="""
+    يعرض عدد خيوط bcrypt، والعمليات الجارية، وعمق الطابور، وعدد الطلبات المرفوضة بـ 429 في هذه العملية.
+    """,
+)
+async def get_password_hashing_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات منفذ تجزئة كلمات المرور."""
+    return {
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        **password_hasher.stats(),
+    }
+
+
+@router.get(
+    "/token-cache",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة ذاكرة توكنات JWT المفكوكة",
+    description="""
+    يعرض حجم ذاكرة التوكنات التي تم التحقق منها، ونسبة الإصابة، وعدد المدخلات المُخلاة (LRU) في هذه العملية.
+    """,
+)
+async def get_token_cache_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات ذاكرة التوكنات."""
+    return {
+        "verify_session_on_request": settings.JWT_VERIFY_SESSION_ON_REQUEST,
+        **token_cache.stats(),
+    }
+
+
+@router.get(
+    "/session-revocations",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة قائمة إبطال الجلسات",
+    description="""
+    يعرض المخزن المستخدم (الذاكرة أو Redis)، وحجم مرشح Bloom، ونسبة الفحوصات التي حُسمت من المرشح دون I/O،
+    وعدد الإيجابيات الكاذبة في هذه العملية.
+    """,
+)
+async def get_session_revocations_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات قائمة إبطال الجلسات."""
+    return session_revocations.stats()
+
+
+@router.get(
+    "/auction-engine",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة محرك المزادات في الذاكرة",
+    description="""
+    يعرض عدد الدفاتر المحملة، والمزايدات المقبولة والمرفوضة، والمزايدات المعلقة بانتظار الحفظ،
+    وعدد دفعات الحفظ المؤجل وزمن آخر دفعة في هذه العملية.
+    """,
+)
+async def get_auction_engine_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات محرك المزادات."""
+    return auction_engine.stats()
+
+
+@router.get(
+    "/auction-events",
+    response_model=Dict[str, Any],
+    summary="[Admin] قياسات التحديثات الحية للمزادات",
+    description="""
+    يعرض عدد المزادات والمشتركين الحيين (WebSocket / SSE) في هذه العملية، وعدد التغييرات المنشورة والموزعة،
+    وعدد التغييرات التي دُمجت للعملاء البطيئين بدلاً من تراكمها، والرسائل المستقبلة من العمال الآخرين عبر Redis.
+    """,
+)
+async def get_auction_events_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات موزع التحديثات الحية."""
+    return auction_events.stats()
+
+
+@router.get(
+    "/auction-scheduler",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة مجدول دورة حياة المزادات",
+    description="""
+    يعرض عدد المواعيد المحملة في النافذة الحالية، وعدد المزادات التي بدأت وانتهت والتي أعيدت جدولتها
+    (تأجيل أو تمديد منع القنص)، والتسويات التي أُنشئت، وتأخر الإطلاق عن الموعد (آخر قيمة وأقصاها) في هذه العملية.
+    """,
+)
+async def get_auction_scheduler_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات مجدول دورة حياة المزادات."""
+    return auction_scheduler.stats()
+
+
+@router.get(
+    "/settlement-pipeline",
+    response_model=Dict[str, Any],
+    summary="[Admin] قياسات خط التسويات الدفعي",
+    description="""
+    يعرض عدد التشغيلات والدفعات، والمزادات المنتهية التي مُسحت والتي أُنشئت لها تسويات، والدفعات التي أُلغيت لتعارضها
+    مع تشغيل آخر، وزمن الدفعة (آخر قيمة وأقصاها ومتوسطها) في هذه العملية.
+    """,
+)
+async def get_settlement_pipeline_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات خط التسويات الدفعي."""
+    return settlement_pipeline.stats()
+
+
+@router.get(
+    "/auction-lookups",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة خريطة حالات وأنواع المزادات المخزنة",
+    description="""
+    يعرض عدد الحالات والأنواع في اللقطة المخزنة وعمرها، وعدد مرات استخدامها من الذاكرة مقابل مرات تحميلها من قاعدة البيانات
+    في هذه العملية.
+    """,
+)
+async def get_auction_lookups_diagnostics_endpoint():
+    """نقطة وصول لعرض حالة خريطة حالات وأنواع المزادات."""
+    return auction_lookups.stats()
+
+
+@router.get(
+    "/bid-notifications",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة توزيع إشعارات المزايدات",
+    description="""
+    يعرض قياسات توزيع إشعارات المزايدات في هذه العملية: الأحداث المستلمة والمدمجة والمسقطة، عدد التفريغات والإشعارات،
+    وقياسات موزع الإشعارات (السجلات، المرسلة، الفاشلة، عمليات تصيير القوالب) والقناة المحلية.
+    """,
+)
+async def get_bid_notifications_diagnostics_endpoint():
+    """نقطة وصول لعرض قياسات توزيع إشعارات المزايدات."""
+    return {**bid_notifications.stats(), "local_channel": local_channel.stats()}
+
+
+@router.get(
+    "/price-tables",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة جداول الأسعار المجمّعة",
+    description="""
+    يعرض عدد جداول أسعار خيارات التعبئة المخزنة (ومنها المبنية على قاعدة تسعير متدرجة)، وعدد مرات حساب السعر من الذاكرة
+    مقابل مرات بناء الجداول من قاعدة البيانات، والجداول المنتهية صلاحيتها والمُخرجة والإبطالات في هذه العملية.
+    """,
+)
+async def get_price_tables_diagnostics_endpoint():
+    """نقطة وصول لعرض حالة جداول الأسعار المجمّعة."""
+    return price_tables.stats()
+
+
+@router.get(
+    "/stock-reservations",
+    response_model=Dict[str, Any],
+    summary="[Admin] حالة كنّاس حجوزات المخزون",
+    description="""
+    يعرض عدد حجوزات المخزون المعلقة في كومة الكنّاس وموعد أقرب انتهاء، وعدد الحجوزات المحررة بانتهاء مهلتها
+    ودفعاتها وزمن آخر دفعة، والتأخر عن موعد الانتهاء، والحجوزات التي أُكدت أو حُررت قبل وصول الكنّاس إليها.
+    """,
+)
+async def get_stock_reservations_diagnostics_endpoint():
+    """نقطة وصول لعرض حالة كنّاس حجوزات المخزون."""
+    return stock_reservation_sweeper.stats()
@@ -1,12 +1,21 @@
 # backend\src\api\v1\routers\auctions_router.py
 
+import json # لترميز أحداث SSE
+
 from fastapi import APIRouter, Depends, status, HTTPException # استيراد المكونات الأساسية لـ FastAPI
+from fastapi import Request, WebSocket, WebSocketDisconnect # للقنوات الحية (SSE / WebSocket)
+from fastapi.concurrency import run_in_threadpool # لتشغيل الخدمات المتزامنة من القنوات الحية
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session # لاستخدام جلسة قاعدة البيانات
+from sqlalchemy.ext.asyncio import AsyncSession # لجلسة قاعدة البيانات غير المتزامنة
 from typing import List, Optional # لتعريف أنواع البيانات في Python
 from uuid import UUID # لمعالجة معرفات المستخدمين والمزادات
 
 # استيراد المكونات المشتركة للمشروع
-from src.db.session import get_db # للحصول على جلسة قاعدة البيانات
+from src.db.session import get_db, get_async_db, SessionLocal # للحصول على جلسة قاعدة البيانات (متزامنة/غير متزامنة)
+from src.core.config import settings # لفترة نبض القنوات الحية
+from src.exceptions import NotFoundException
 from src.api.v1 import dependencies # لتبعية الصلاحيات والمستخدم الحالي
 from src.users.models.core_models import User # مودل المستخدم، للتحقق من الصلاحيات
 
@@ -17,6 +26,8 @@ from src.auctions.schemas import bidding_schemas as bidding_schemas # لـ Bid,
 # استيراد الخدمات (منطق العمل) المتعلقة بالمزادات
 from src.auctions.services import auctions_service
 from src.auctions.services import bidding_service
+from src.auctions.services.auction_events import auction_events # موزع التحديثات الحية
+from src.api.v1.responses import fast_json_response # ترميز قوائم الملخصات مباشرةً في pydantic-core
 
 # تعريف الراوتر الرئيسي لوحدة إدارة المزادات.
 # هذا الراوتر سيتعامل مع نقاط الوصول المتعلقة بالمزادات للمشترين والبائعين.
@@ -51,31 +62,59 @@ async def create_new_auction_endpoint(
 
 @router.get(
     "/",
-    response_model=List[auction_schemas.AuctionRead],
+    response_model=List[auction_schemas.AuctionSummary],
     summary="[Public] جلب جميع المزادات المتاحة",
     description="""
-    يجلب قائمة بالمزادات المتاحة (النشطة والمجدولة) في النظام.
-    متاحة للعامة (غير المصادقين) لغرض التصفح، وقد تظهر تفاصيل إضافية للمستخدمين المسجلين.
+    يجلب قائمة بالمزادات المتاحة (النشطة والمجدولة) في النظام كملخصات (بدون البائع والمنتج واللوطات المتداخلة)؛
+    التفاصيل الكاملة لكل مزاد من GET /auctions/{auction_id}.
+    متاحة للعامة (غير المصادقين) لغرض التصفح.
     """,
 )
 async def get_all_public_auctions_endpoint(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     status_name_key: Optional[str] = "ACTIVE", # افتراضيًا جلب النشطة
     type_name_key: Optional[str] = None,
+    language_code: Optional[str] = None, # لغة العنوان المترجم (الافتراضية إذا لم تُحدد)
     skip: int = 0,
     limit: int = 100
 ):
     """نقطة وصول لجلب جميع المزادات المتاحة."""
-    return auctions_service.get_all_auctions(
-        db=db, status_name_key=status_name_key, type_name_key=type_name_key, skip=skip, limit=limit
+    summaries = await auctions_service.get_auction_summaries_async(
+        db=db, status_name_key=status_name_key, type_name_key=type_name_key, language_code=language_code, skip=skip, limit=limit
     )
+    return fast_json_response(List[auction_schemas.AuctionSummary], summaries)
+
+@router.get(
+    "/browse",
+    response_model=auction_schemas.AuctionBrowsePage,
+    summary="[Public] تصفح المزادات بترقيم المؤشر",
+    description="""
+    يجلب صفحة من المزادات مرتبة بموعد الانتهاء (الأقرب أولاً)، بملخص لكل مزاد بدون الكائنات المتداخلة.
+    للصفحة التالية مرر next_cursor من الاستجابة في cursor مع نفس التصفية؛ تكلفة الصفحة العميقة مثل الأولى.
+    متاحة للعامة (غير المصادقين) لغرض التصفح.
+    """,
+)
+async def browse_auctions_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    status_name_key: Optional[str] = "ACTIVE", # افتراضيًا تصفح النشطة
+    type_name_key: Optional[str] = None,
+    seller_user_id: Optional[UUID] = None,
+    language_code: Optional[str] = None, # لغة العنوان المترجم (الافتراضية إذا لم تُحدد)
+    cursor: Optional[str] = None,
+    limit: int = 20
+):
+    """نقطة وصول لتصفح المزادات صفحةً صفحة."""
+    page = await auctions_service.browse_auctions_async(
+        db=db, status_name_key=status_name_key, type_name_key=type_name_key, seller_user_id=seller_user_id, language_code=language_code, cursor=cursor, limit=limit
+    )
+    return fast_json_response(auction_schemas.AuctionBrowsePage, page)
 
 @router.get(
     "/me/created",
-    response_model=List[auction_schemas.AuctionRead],
+    response_model=List[auction_schemas.AuctionSummary],
     summary="[Seller] جلب المزادات التي أنشأتها",
     description="""
-    يجلب قائمة بجميع المزادات التي قام البائع الحالي بإنشائها.
+    يجلب قائمة بجميع المزادات التي قام البائع الحالي بإنشائها كملخصات بلغته المفضلة.
     يتطلب صلاحية 'AUCTION_MANAGE_OWN'.
     """,
 )
@@ -86,7 +125,24 @@ async def get_my_created_auctions_endpoint(
     limit: int = 100
 ):
     """نقطة وصول لجلب المزادات التي أنشأها البائع الحالي."""
-    return auctions_service.get_my_created_auctions(db=db, current_user=current_user, skip=skip, limit=limit)
+    summaries = auctions_service.get_my_created_auctions(db=db, current_user=current_user, skip=skip, limit=limit)
+    return fast_json_response(List[auction_schemas.AuctionSummary], summaries)
+
+@router.get(
+    "/me/watchlist",
+    response_model=List[auction_schemas.AuctionWatchlistSummary],
+    summary="[User] جلب قائمة مراقبة المزادات",
+    description="""
+    يجلب المزادات في قائمة مراقبة المستخدم الحالي كملخصات بلغته المفضلة، الأحدث إضافةً أولاً.
+    """,
+)
+async def get_my_auction_watchlist_endpoint(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(dependencies.get_current_active_user)
+):
+    """نقطة وصول لجلب قائمة مراقبة المزادات للمستخدم الحالي."""
+    summaries = bidding_service.get_my_auction_watchlists(db=db, current_user=current_user)
+    return fast_json_response(List[auction_schemas.AuctionWatchlistSummary], summaries)
 
 
 @router.get(
@@ -100,11 +156,11 @@ async def get_my_created_auctions_endpoint(
 )
 async def get_auction_details_endpoint(
     auction_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """نقطة وصول لجلب تفاصيل مزاد محدد."""
     # خدمة get_auction_details لا تتحقق من المستخدم، التحقق من الصلاحيات الإضافية سيكون في وظائف أخرى
-    return auctions_service.get_auction_details(db=db, auction_id=auction_id)
+    return await auctions_service.get_auction_details_async(db=db, auction_id=auction_id)
 
 @router.patch(
     "/{auction_id}",
@@ -143,6 +199,107 @@ async def cancel_auction_endpoint(
     """نقطة وصول لإلغاء (حذف ناعم) مزاد محدد."""
     return auctions_service.cancel_auction(db=db, auction_id=auction_id, current_user=current_user)
 
+# ================================================================
+# --- نقاط الوصول للمزايدات (Bid) ---
+#    (تتطلب صلاحية AUCTION_PLACE_BID)
+# ================================================================
+
+@router.post(
+    "/{auction_id}/bids",
+    response_model=bidding_schemas.BidRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="[Bidder] تقديم مزايدة على مزاد",
+    description="""
+    يقدم مزايدة على مزاد نشط. يجب أن تكون المزايدة أعلى من السعر الحالي بمقدار الحد الأدنى للزيادة على الأقل.
+    المزايدات المتزامنة على نفس المزاد تُسلسل بتحديث شرطي ذري؛ عند الضغط الشديد قد تُرجع 409 ويمكن إعادة المحاولة.
+    يتطلب صلاحية 'AUCTION_PLACE_BID'.
+    """,
+)
+def place_bid_endpoint(
+    auction_id: UUID,
+    bid_in: bidding_schemas.BidCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(dependencies.has_permission("AUCTION_PLACE_BID"))
+):
+    """نقطة وصول لتقديم مزايدة (دالة متزامنة: تعمل في مجمع الخيوط لأن إعادة المحاولة قد تنتظر)."""
+    bid_in = bid_in.model_copy(update={"auction_id": auction_id})
+    return bidding_service.place_bid(db=db, bid_in=bid_in, current_user=current_user)
+
+# ================================================================
+# --- القنوات الحية للمزاد (WebSocket / SSE) ---
+#    (عامة مثل تفاصيل المزاد؛ بديل عن الاستطلاع المتكرر لـ get_auction_details)
+# ================================================================
+
+def _load_live_state(auction_id: UUID) -> dict:
+    """
+    يقرأ اللقطة الأولية بجلسة قصيرة في مجمع الخيوط: القناة الحية تبقى مفتوحة طويلاً،
+    فلا تحجز اتصال قاعدة بيانات طوال عمرها كما تفعل تبعية get_db.
+    """
+    db = SessionLocal()
+    try:
+        return jsonable_encoder(bidding_service.get_live_auction_state(db, auction_id))
+    finally:
+        db.close()
+
+@router.websocket("/{auction_id}/live")
+async def auction_live_updates_websocket(websocket: WebSocket, auction_id: UUID):
+    """
+    قناة WebSocket للتحديثات الحية لمزاد: لقطة أولية ثم تغييرات مختصرة (السعر، الحالة، التسوية).
+    التغييرات المتتالية تُدمج للعميل البطيء فيستلم أحدث حالة؛ ونبضة {"type": "heartbeat"} عند الهدوء.
+    """
+    subscription = auction_events.subscribe(auction_id)
+    if subscription is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        try:
+            subscription.offer(await run_in_threadpool(_load_live_state, auction_id))
+        except NotFoundException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        await websocket.accept()
+        while True:
+            state = await subscription.next(timeout=settings.AUCTION_EVENTS_HEARTBEAT_SECONDS)
+            await websocket.send_json(state if state is not None else {"type": "heartbeat"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+@router.get(
+    "/{auction_id}/events",
+    response_class=StreamingResponse,
+    summary="[Public] التحديثات الحية لمزاد (SSE)",
+    description="""
+    قناة Server-Sent Events للتحديثات الحية لمزاد: لقطة أولية ثم تغييرات مختصرة عند المزايدة والإلغاء والتسوية.
+    كل حدث كائن JSON بالحقول التي تغيرت؛ seq (عدد المزايدات) يزداد مع كل تغيير في السعر.
+    """,
+)
+async def auction_live_updates_sse_endpoint(auction_id: UUID, request: Request):
+    """نقطة وصول لبث التحديثات الحية لمزاد عبر SSE."""
+    subscription = auction_events.subscribe(auction_id)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="عدد المتابعين الحيين لهذا المزاد بلغ الحد الأقصى. يرجى إعادة المحاولة لاحقًا.",
+            headers={"Retry-After": "5"},
+        )
+    try:
+        subscription.offer(await run_in_threadpool(_load_live_state, auction_id))
+    except Exception:
+        subscription.close()
+        raise
+
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                state = await subscription.next(timeout=settings.AUCTION_EVENTS_HEARTBEAT_SECONDS)
+                yield f"data: {json.dumps(state)}\n\n" if state is not None else ": heartbeat\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # ================================================================
 # --- نقاط الوصول لوطات/دفعات المزاد (AuctionLot) ---
 #    (تتطلب صلاحية AUCTION_MANAGE_OWN)
@@ -8,7 +8,8 @@ from uuid import UUID # لمعالجة معرفات المستخدمين
 from pydantic import BaseModel, Field
 
 # استيراد المكونات المشتركة للمشروع
-from src.db.session import get_db # للحصول على جلسة قاعدة البيانات
+from sqlalchemy.ext.asyncio import AsyncSession # لجلسة قاعدة البيانات غير المتزامنة
+from src.db.session import get_db, get_async_db # للحصول على جلسة قاعدة البيانات (متزامنة/غير متزامنة)
 from src.api.v1 import dependencies # لتبعية الصلاحيات والمستخدم الحالي (للتسجيل/تغيير كلمة المرور)
 from src.users.models.core_models import User as UserModel # مودل المستخدم، للتحقق من الصلاحيات (يُعاد تسميته لتجنب التضارب)
 
@@ -49,7 +50,7 @@ async def register_user_endpoint(
 ):
     """نقطة وصول لتسجيل مستخدم جديد."""
     # تمرير user_type_key و default_role_key مباشرة من user_in
-    return core_service.register_new_user(
+    return await core_service.register_new_user(
         db=db,
         user_in=user_in,
         user_type_key=user_in.user_type_key, # <-- تم التعديل هنا
@@ -91,10 +92,10 @@ class LoginRequest(BaseModel):
 )
 async def login_endpoint(
     user_in: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """نقطة وصول لتسجيل الدخول."""
-    return core_service.authenticate_user(
+    return await core_service.authenticate_user_async(
         db=db,
         phone_number=user_in.phone_number,
         password=user_in.password
@@ -49,21 +49,22 @@ async def create_new_order_endpoint(
 
 @router.get(
     "/me",
-    response_model=List[schemas.OrderRead],
+    response_model=schemas.OrderPage,
     summary="[Buyer/Seller] جلب جميع طلباتي (كمشتري أو بائع)",
     description="""
-    يجلب قائمة بجميع الطلبات التي يكون المستخدم الحالي طرفًا فيها، سواء كمشترٍ (أنشأ الطلب) أو كبائع (لبنود داخل الطلب).
+    يجلب صفحة من الطلبات التي يكون المستخدم الحالي طرفًا فيها، سواء كمشترٍ (أنشأ الطلب) أو كبائع (لبنود داخل الطلب)،
+    مرتبة بتاريخ الطلب (الأحدث أولاً). للصفحة التالية مرر next_cursor من الاستجابة في cursor؛ تكلفة الصفحة العميقة مثل الأولى.
     يتطلب صلاحية 'ORDER_VIEW_OWN'.
     """,
 )
 async def get_my_orders_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(dependencies.has_permission("ORDER_VIEW_OWN")),
-    skip: int = 0,
-    limit: int = 100
+    cursor: Optional[str] = None,
+    limit: int = 20
 ):
-    """نقطة وصول لجلب جميع الطلبات الخاصة بالمستخدم الحالي."""
-    return orders_service.get_my_orders(db=db, current_user=current_user, skip=skip, limit=limit)
+    """نقطة وصول لجلب طلبات المستخدم الحالي صفحةً صفحة."""
+    return orders_service.get_my_orders(db=db, current_user=current_user, cursor=cursor, limit=limit)
 
 @router.get(
     "/{order_id}",
@@ -391,4 +391,32 @@ async def soft_delete_price_tier_rule_assignment_endpoint(
 # --- دمج الراوترات الفرعية في الراوتر الرئيسي (pricing_router) ---
 # ================================================================
 router.include_router(levels_router)
-router.include_router(assignments_router)
\ No newline at end of file
+router.include_router(assignments_router)
+
+# ================================================================
+# --- نقطة وصول تسعير السلال (Price Quotation) ---
+#    (عامة: تُستخدم لعرض أسعار السلة قبل إنشاء الطلب)
+# ================================================================
+
+# راوتر مستقل بمسار /pricing (لا يندرج تحت /pricing-rules لأنه لا يدير القواعد)
+quote_router = APIRouter(
+    prefix="/pricing",
+    tags=["Pricing - Quotation"]
+)
+
+@quote_router.post(
+    "/quote",
+    response_model=schemas.PriceQuoteRead,
+    summary="[Public] تسعير سلة كاملة دفعة واحدة",
+    description="""
+    يحسب السعر الفعال لكل بند (خيار تعبئة + كمية) بعد تطبيق شرائح الأسعار النشطة، وإجمالي السلة.
+    كل البنود تُسعّر معًا بعدد ثابت من الاستعلامات مهما كان عددها (أقصى عدد بنود: PRICE_QUOTE_MAX_LINES).
+    يمكن لأي مستخدم استخدام هذه النقطة.
+    """,
+)
+async def quote_prices_endpoint(
+    quote_in: schemas.PriceQuoteRequest,
+    db: Session = Depends(get_db)
+):
+    """نقطة وصول لتسعير سلة كاملة."""
+    return pricing_service.quote_prices(db=db, quote_in=quote_in)
\ No newline at end of file
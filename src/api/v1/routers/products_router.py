@@ -2,13 +2,14 @@
 
 from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID, uuid4
 import json
 import os
 from pathlib import Path
 
-from src.db.session import get_db
+from src.db.session import get_db, get_async_db
 from src.api.v1 import dependencies
 from src.users.models.core_models import User
 from src.products.services import product_service, variety_service, packaging_service, image_service, future_offerings_service, category_service
@@ -415,9 +416,9 @@ def delete_my_product(
 # ================================================================
 
 @router.get("/", response_model=List[schemas.ProductRead], summary="[Public] Get all active products")
-def get_public_products(db: Session = Depends(get_db)):
+async def get_public_products(db: AsyncSession = Depends(get_async_db)):
     """جلب قائمة بالمنتجات النشطة فقط المتاحة للعامة."""
-    return product_service.get_public_active_products(db)
+    return await product_service.get_public_active_products_async(db)
 
 @router.get("/{product_id}", response_model=schemas.ProductRead, summary="[Public] Get single product details")
 def get_single_product(
@@ -13,7 +13,8 @@ from src.api.v1.routers import (
     admin_address_lookups_router,  # لإدارة جداول العناوين (Admin /address-lookups)
     admin_verification_router,     # لإدارة التراخيص والتحقق (Admin /verification)
     admin_auctions_router,         # لإدارة المزادات كمسؤول
-    unit_of_measure_admin_router   # لإدارة وحدات القياس كمسؤول
+    unit_of_measure_admin_router,  # لإدارة وحدات القياس كمسؤول
+    admin_diagnostics_router       # لتشخيص البنية التحتية (مجمع الاتصالات، تجزئة كلمات المرور)
 )
 # TODO: تأكد من استيراد أي راوترات إدارية أخرى (مثل للمنتجات، المخزون، عمليات السوق، التسعير)
 #       إذا تم إنشاء راوترات إدارية منفصلة لها.
@@ -45,6 +46,9 @@ router.include_router(admin_auctions_router.router)
 # 3. راوترات إدارة المنتجات والمخزون (المجموعة 2) - جداول Lookups
 router.include_router(unit_of_measure_admin_router.router) # هذا راوتر جاهز لوحدات القياس
 
+# 4. راوترات تشخيص البنية التحتية
+router.include_router(admin_diagnostics_router.router)
+
 # TODO: دمج راوترات إدارية أخرى إذا تم إنشاؤها
 #       مثال: router.include_router(admin_product_management_router.router)
 #       مثال: router.include_router(admin_market_management_router.router)
@@ -8,6 +8,7 @@ from uuid import UUID # لمعالجة معرفات المستخدمين
 # استيراد المكونات المشتركة للمشروع
 from src.db.session import get_db # للحصول على جلسة قاعدة البيانات
 from src.api.v1 import dependencies # لتبعية الصلاحيات والمستخدم الحالي
+from src.core.query_budget import query_budget # ميزانية عبارات SQL لنقطة النهاية
 from src.users.models.core_models import User as UserModel # مودل المستخدم، لضمان User type hint
 
 # استيراد Schemas (هياكل البيانات)
@@ -40,6 +41,7 @@ router = APIRouter(
     (REQ-FUN-020)
     """,
 )
+@query_budget(12) # تحميل المستخدم + لقطة الهوية + العلاقات المرجعية لـ UserRead وترجماتها
 async def get_my_profile_endpoint(
     current_user: UserModel = Depends(dependencies.get_current_active_user)
 ):
@@ -81,7 +83,7 @@ async def change_my_password_endpoint(
     current_user: UserModel = Depends(dependencies.get_current_active_user)
 ):
     """نقطة وصول لتغيير كلمة مرور المستخدم الحالي."""
-    return core_service.change_user_password(db=db, user=current_user, password_data=password_data)
+    return await core_service.change_user_password(db=db, user=current_user, password_data=password_data)
 
 
 @router.delete(
@@ -0,0 +1,116 @@
+# backend/src/auctions/crud/async_auctions_crud.py
+# ----------------------------------------------------------------------------------------------------
+# نسخ غير متزامنة (AsyncSession) من دوال CRUD لقراءة المزادات.
+# AuctionRead يتضمن البائع والمنتج واللوطات بشكل متداخل، لذا يتم تحميل الشجرة كاملة مسبقًا
+# (لا يوجد تحميل كسول في AsyncSession).
+# ----------------------------------------------------------------------------------------------------
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.auctions.models import auctions_models as models_auction
+from src.auctions.crud.auctions_crud import auction_summary_query
+from src.lookups.models import lookups_models as models_statuses
+from src.products.crud.async_product_crud import product_read_options
+from src.products.models.units_models import ProductPackagingOption
+from src.users.crud.async_core_crud import user_read_options
+
+
+def auction_read_options() -> list:
+    """خيارات التحميل اللازمة لتسلسل AuctionRead بالكامل."""
+    Auction = models_auction.Auction
+    AuctionLot = models_auction.AuctionLot
+    packaging_option = selectinload(Auction.lots).selectinload(AuctionLot.products_in_lot).joinedload(models_auction.LotProduct.packaging_option)
+    return [
+        joinedload(Auction.seller).options(*user_read_options()),
+        joinedload(Auction.current_highest_bidder).options(*user_read_options()),
+        joinedload(Auction.product).options(*product_read_options()),
+        joinedload(Auction.auction_type).selectinload(models_statuses.AuctionType.translations),
+        joinedload(Auction.auction_status).selectinload(models_statuses.AuctionStatus.translations),
+        selectinload(Auction.lots).selectinload(AuctionLot.translations),
+        selectinload(Auction.lots).selectinload(AuctionLot.images),
+        packaging_option.joinedload(ProductPackagingOption.unit_of_measure),
+        packaging_option.selectinload(ProductPackagingOption.translations),
+    ]
+
+
+async def get_auction(db: AsyncSession, auction_id: UUID) -> Optional[models_auction.Auction]:
+    """
+    يجلب سجل مزاد واحد بالـ ID الخاص به، بما في ذلك لوطاته والكائنات المرتبطة.
+    """
+    result = await db.execute(
+        select(models_auction.Auction).options(*auction_read_options()).where(models_auction.Auction.auction_id == auction_id)
+    )
+    return result.unique().scalars().first()
+
+
+async def get_auction_status_by_key(db: AsyncSession, status_name_key: str) -> Optional[models_statuses.AuctionStatus]:
+    """يجلب حالة مزاد بمفتاحها."""
+    result = await db.execute(select(models_statuses.AuctionStatus).where(models_statuses.AuctionStatus.status_name_key == status_name_key))
+    return result.scalars().first()
+
+
+async def get_auction_type_by_key(db: AsyncSession, type_name_key: str) -> Optional[models_statuses.AuctionType]:
+    """يجلب نوع مزاد بمفتاحه."""
+    result = await db.execute(select(models_statuses.AuctionType).where(models_statuses.AuctionType.type_name_key == type_name_key))
+    return result.scalars().first()
+
+
+async def get_all_auctions(db: AsyncSession, seller_user_id: Optional[UUID] = None, auction_status_id: Optional[int] = None, auction_type_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[models_auction.Auction]:
+    """
+    يجلب قائمة بجميع المزادات، مع خيارات للتصفية والترقيم.
+    """
+    query = select(models_auction.Auction).options(*auction_read_options())
+    if seller_user_id:
+        query = query.where(models_auction.Auction.seller_user_id == seller_user_id)
+    if auction_status_id:
+        query = query.where(models_auction.Auction.auction_status_id == auction_status_id)
+    if auction_type_id:
+        query = query.where(models_auction.Auction.auction_type_id == auction_type_id)
+
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.unique().scalars().all()
+
+
+async def get_auction_summaries(db: AsyncSession, language_code: str, seller_user_id: Optional[UUID] = None, auction_status_id: Optional[int] = None, auction_type_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Row]:
+    """
+    النسخة المختصرة من get_all_auctions لقوائم العرض: صفوف أعمدة AuctionSummary باستعلام واحد.
+    """
+    Auction = models_auction.Auction
+    query = auction_summary_query(language_code)
+    if seller_user_id:
+        query = query.where(Auction.seller_user_id == seller_user_id)
+    if auction_status_id:
+        query = query.where(Auction.auction_status_id == auction_status_id)
+    if auction_type_id:
+        query = query.where(Auction.auction_type_id == auction_type_id)
+
+    result = await db.execute(query.order_by(Auction.end_timestamp, Auction.auction_id).offset(skip).limit(limit))
+    return list(result.all())
+
+
+async def browse_auctions(db: AsyncSession, language_code: str, auction_status_id: Optional[int] = None, auction_type_id: Optional[int] = None, seller_user_id: Optional[UUID] = None, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 20) -> List[Row]:
+    """
+    يجلب صفحة من المزادات مرتبة بـ (end_timestamp, auction_id) بدءًا بعد المؤشر after (ترقيم بالمفاتيح بدلاً من OFFSET).
+    أعمدة AuctionSummary فقط، والتصفيات الشائعة (الحالة، الحالة والنوع، البائع، بدون تصفية)
+    لها فهارس مركبة تنتهي بـ (end_timestamp, auction_id).
+    """
+    Auction = models_auction.Auction
+    query = auction_summary_query(language_code)
+    if seller_user_id:
+        query = query.where(Auction.seller_user_id == seller_user_id)
+    if auction_status_id:
+        query = query.where(Auction.auction_status_id == auction_status_id)
+    if auction_type_id:
+        query = query.where(Auction.auction_type_id == auction_type_id)
+    if after is not None:
+        query = query.where(tuple_(Auction.end_timestamp, Auction.auction_id) > tuple_(*after))
+
+    result = await db.execute(query.order_by(Auction.end_timestamp, Auction.auction_id).limit(limit))
+    return list(result.all())
@@ -1,14 +1,17 @@
 # backend\src\auction\crud\auctions_crud.py
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy import exists, and_, func, select, update, Select
+from sqlalchemy.engine import Row
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 
 # استيراد المودلز من Auction
 from src.auctions.models import auctions_models as models_auction # Auction, AuctionLot, AuctionLotTranslation, LotProduct, LotImage
 from src.lookups.models import lookups_models as models_statuses # AuctionStatus, AuctionStatusTranslation, AuctionType, AuctionTypeTranslation
+from src.products.models.products_models import ProductTranslation # عنوان المزاد المترجم في AuctionSummary
+from src.core.config import settings
 # استيراد الـ Schemas
 from src.auctions.schemas import auction_schemas as schemas
 from src.lookups.schemas import lookups_schemas 
@@ -511,6 +514,81 @@ def get_all_auctions(db: Session, seller_user_id: Optional[UUID] = None, auction
     
     return query.offset(skip).limit(limit).all()
 
+def auction_summary_query(language_code: str) -> Select:
+    """
+    عبارة SELECT لأعمدة AuctionSummary فقط (بدون تحميل كائنات ORM وعلاقاتها)، مع العنوان المترجم:
+    العنوان المخصص للمزاد، وإلا اسم المنتج بلغة language_code، وإلا بلغة DEFAULT_LANGUAGE، وإلا مفتاح العنوان.
+    تُضاف إليها شروط التصفية والترتيب في الدالة المستدعية.
+    """
+    Auction = models_auction.Auction
+    return _with_translated_title(select(
+        Auction.auction_id,
+        Auction.seller_user_id,
+        Auction.product_id,
+        Auction.auction_type_id,
+        Auction.auction_status_id,
+        Auction.auction_title_key,
+        Auction.custom_auction_title,
+        Auction.start_timestamp,
+        Auction.end_timestamp,
+        Auction.starting_price_per_unit,
+        Auction.minimum_bid_increment,
+        Auction.current_highest_bid_amount_per_unit,
+        Auction.total_bids_count,
+        Auction.quantity_offered,
+        Auction.unit_of_measure_id_for_quantity,
+        Auction.is_private_auction,
+    ), language_code)
+
+def _with_translated_title(query: Select, language_code: str) -> Select:
+    """يضيف إلى استعلام على auctions عمود title المترجم (مع JOIN ترجمات المنتج باللغة المطلوبة والافتراضية)."""
+    Auction = models_auction.Auction
+    requested = aliased(ProductTranslation)
+    query = query.outerjoin(requested, and_(requested.product_id == Auction.product_id, requested.language_code == language_code))
+    titles = [Auction.custom_auction_title, requested.translated_product_name]
+    if language_code != settings.DEFAULT_LANGUAGE:
+        fallback = aliased(ProductTranslation)
+        query = query.outerjoin(fallback, and_(fallback.product_id == Auction.product_id, fallback.language_code == settings.DEFAULT_LANGUAGE))
+        titles.append(fallback.translated_product_name)
+    return query.add_columns(func.coalesce(*titles, Auction.auction_title_key).label("title"))
+
+def get_auction_titles(db: Session, auction_ids: List[UUID], language_code: str) -> Dict[UUID, Optional[str]]:
+    """
+    يجلب العنوان المترجم لمجموعة مزادات باستعلام واحد (نفس قاعدة title في AuctionSummary)، لتصيير الإشعارات.
+
+    Returns:
+        Dict[UUID, Optional[str]]: معرف المزاد ← عنوانه بلغة language_code.
+    """
+    Auction = models_auction.Auction
+    query = _with_translated_title(select(Auction.auction_id), language_code).where(Auction.auction_id.in_(auction_ids))
+    return dict(db.execute(query).all())
+
+def get_auction_summaries(db: Session, language_code: str, seller_user_id: Optional[UUID] = None, auction_status_id: Optional[int] = None, auction_type_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Row]:
+    """
+    النسخة المختصرة من get_all_auctions لقوائم العرض: صفوف أعمدة AuctionSummary باستعلام واحد.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        language_code (str): لغة العنوان المترجم.
+        seller_user_id (Optional[UUID]): تصفية حسب معرف البائع.
+        auction_status_id (Optional[int]): تصفية حسب معرف حالة المزاد.
+        auction_type_id (Optional[int]): تصفية حسب معرف نوع المزاد.
+        skip (int): عدد السجلات المراد تخطيها.
+        limit (int): الحد الأقصى لعدد السجلات المراد جلبها.
+
+    Returns:
+        List[Row]: صفوف بأعمدة AuctionSummary (بدون مفتاحي الحالة والنوع).
+    """
+    Auction = models_auction.Auction
+    query = auction_summary_query(language_code)
+    if seller_user_id:
+        query = query.where(Auction.seller_user_id == seller_user_id)
+    if auction_status_id:
+        query = query.where(Auction.auction_status_id == auction_status_id)
+    if auction_type_id:
+        query = query.where(Auction.auction_type_id == auction_type_id)
+    return list(db.execute(query.order_by(Auction.end_timestamp, Auction.auction_id).offset(skip).limit(limit)).all())
+
 def update_auction(db: Session, db_auction: models_auction.Auction, auction_in: schemas.AuctionUpdate) -> models_auction.Auction:
     """
     يحدث بيانات سجل مزاد موجود.
@@ -551,6 +629,50 @@ def update_auction_status(db: Session, db_auction: models_auction.Auction, new_s
     db.refresh(db_auction)
     return db_auction
 
+def get_auction_deadlines_before(db: Session, auction_status_id: int, deadline_column: str, before: datetime) -> List[Row]:
+    """
+    يجلب (auction_id, الموعد) للمزادات في حالة معينة التي يحل موعدها (start_timestamp أو end_timestamp) قبل وقت معين،
+    بما فيها المتأخرة. يعتمد على الفهرسين (auction_status_id, start_timestamp) و (auction_status_id, end_timestamp)،
+    فالتكلفة بعدد المزادات في النافذة لا بحجم الجدول.
+    """
+    Auction = models_auction.Auction
+    deadline = getattr(Auction, deadline_column)
+    return db.execute(
+        select(Auction.auction_id, deadline.label("deadline"))
+        .where(Auction.auction_status_id == auction_status_id, deadline < before)
+    ).all()
+
+def get_auction_schedule_states(db: Session, auction_ids: List[UUID]) -> List[Row]:
+    """يجلب (auction_id, auction_status_id, start_timestamp, end_timestamp) لمجموعة مزادات (لإعادة جدولة ما لم ينتقل)."""
+    Auction = models_auction.Auction
+    return db.execute(
+        select(Auction.auction_id, Auction.auction_status_id, Auction.start_timestamp, Auction.end_timestamp)
+        .where(Auction.auction_id.in_(auction_ids))
+    ).all()
+
+def transition_auction_statuses(db: Session, auction_ids: List[UUID], from_status_id: int, to_status_id: int, deadline_column: str, now: datetime) -> List[UUID]:
+    """
+    ينقل دفعة مزادات من حالة إلى أخرى بتحديث شرطي واحد (النسخة الجماعية من update_auction_status):
+    ينجح لكل مزاد ما زال في from_status_id وحل موعده (deadline_column <= now)؛ المزاد الذي تغيرت حالته
+    أو مُدد موعده (مثلاً بمزايدة في اللحظات الأخيرة) لا يتأثر. لا يقوم بعمل commit.
+
+    Returns:
+        List[UUID]: معرفات المزادات التي انتقلت فعلاً.
+    """
+    Auction = models_auction.Auction
+    result = db.execute(
+        update(Auction)
+        .where(
+            Auction.auction_id.in_(auction_ids),
+            Auction.auction_status_id == from_status_id,
+            getattr(Auction, deadline_column) <= now,
+        )
+        .values(auction_status_id=to_status_id)
+        .returning(Auction.auction_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
 # لا يوجد delete_auction مباشر، يتم إدارة الحالة عبر تحديث auction_status_id
 
 
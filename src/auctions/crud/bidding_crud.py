@@ -1,7 +1,8 @@
 # backend\src\auction\crud\bidding_crud.py
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_
+from sqlalchemy.orm import Session, joinedload, lazyload
+from sqlalchemy import case, exists, and_, func, select, update
+from sqlalchemy.engine import Row
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -10,6 +11,9 @@ from datetime import datetime
 from src.auctions.models import bidding_models as models_bidding # AuctionParticipant, Bid, AutoBidSetting, AuctionWatchlist
 from src.auctions.models import auctions_models as models_auction # Auction, AuctionLot (للعلاقات)
 from src.users.models.core_models import User # User (للعلاقات)
+from src.users.crud.core_crud import user_loader_options # ملفات تحميل المستخدم
+from src.lookups.models.lookups_models import AuctionStatus # لمفتاح حالة المزاد في إسقاط المزايدة
+from src.auctions.crud.auctions_crud import auction_summary_query # أعمدة AuctionSummary لقائمة المراقبة
 # استيراد Schemas
 from src.auctions.schemas import bidding_schemas as schemas
 
@@ -133,21 +137,28 @@ def get_bid(db: Session, bid_id: int) -> Optional[models_bidding.Bid]:
     return db.query(models_bidding.Bid).options(
         joinedload(models_bidding.Bid.auction),
         joinedload(models_bidding.Bid.lot),
-        joinedload(models_bidding.Bid.bidder)
+        joinedload(models_bidding.Bid.bidder).options(*user_loader_options("embedded_ref")) # المزايد كمرجع مضمّن فقط
     ).filter(models_bidding.Bid.bid_id == bid_id).first()
 
-def get_all_bids_for_auction(db: Session, auction_id: UUID) -> List[models_bidding.Bid]:
+def get_all_bids_for_auction(db: Session, auction_id: UUID, skip: int = 0, limit: Optional[int] = None) -> List[models_bidding.Bid]:
     """
     يجلب جميع المزايدات لمزاد معين.
+    BidRead لا يتضمن المزاد أو اللوت أو المزايد، لذا تُعطَّل علاقات selectin (lazyload) لتجنب إعادة تحميلها مع كل صفحة.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
         auction_id (UUID): معرف المزاد.
+        skip (int): عدد السجلات لتخطيها.
+        limit (Optional[int]): الحد الأقصى لعدد السجلات (None = الكل).
 
     Returns:
         List[models_bidding.Bid]: قائمة بكائنات المزايدات.
     """
-    return db.query(models_bidding.Bid).filter(models_bidding.Bid.auction_id == auction_id).order_by(models_bidding.Bid.bid_timestamp.desc()).all()
+    return db.query(models_bidding.Bid).options(
+        lazyload("*")
+    ).filter(models_bidding.Bid.auction_id == auction_id).order_by(
+        models_bidding.Bid.bid_timestamp.desc(), models_bidding.Bid.bid_id.desc()
+    ).offset(skip).limit(limit).all()
 
 def get_highest_bid_for_auction(db: Session, auction_id: UUID) -> Optional[models_bidding.Bid]:
     """
@@ -167,6 +178,152 @@ def get_highest_bid_for_auction(db: Session, auction_id: UUID) -> Optional[model
         models_bidding.Bid.bid_timestamp.asc() # الأقدم في حال التساوي
     ).first()
 
+def get_auction_bid_state(db: Session, auction_id: UUID, for_update: bool = False) -> Optional[Row]:
+    """
+    يجلب إسقاطًا (Projection) مصغرًا للمزاد يكفي للتحقق من مزايدة: بدون تحميل اللوطات والترجمات والصور والمنتج.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        auction_id (UUID): معرف المزاد.
+        for_update (bool): قفل صف المزاد حتى نهاية المعاملة (SELECT ... FOR UPDATE).
+
+    Returns:
+        Optional[Row]: صف يحتوي على حقول المزايدة ومفتاح الحالة، أو None إذا لم يوجد المزاد.
+    """
+    Auction = models_auction.Auction
+    statement = (
+        select(
+            Auction.auction_id,
+            Auction.seller_user_id,
+            Auction.auction_status_id,
+            AuctionStatus.status_name_key,
+            Auction.end_timestamp,
+            Auction.starting_price_per_unit,
+            Auction.minimum_bid_increment,
+            Auction.current_highest_bid_amount_per_unit,
+            Auction.current_highest_bidder_user_id,
+            Auction.total_bids_count,
+        )
+        .join(AuctionStatus, AuctionStatus.auction_status_id == Auction.auction_status_id)
+        .where(Auction.auction_id == auction_id)
+    )
+    if for_update:
+        statement = statement.with_for_update(of=Auction)
+    return db.execute(statement).first()
+
+def try_raise_highest_bid(db: Session, auction_id: UUID, auction_status_id: int, bidder_user_id: UUID, bid_amount_per_unit, now: datetime, extend_end_to: Optional[datetime] = None) -> Optional[Row]:
+    """
+    يرفع أعلى مزايدة للمزاد بتحديث شرطي ذري (Compare-and-Set):
+    ينجح فقط إذا كانت المزايدة ما زالت أعلى من (أعلى مزايدة حالية أو سعر البداية) + الحد الأدنى للزيادة،
+    والمزاد ما زال في نفس الحالة ولم ينتهِ وقته. التحديث يقفل صف المزاد حتى نهاية المعاملة،
+    فتتسلسل المزايدات المتزامنة على نفس المزاد دون تحديثات مفقودة.
+    إذا أُعطي extend_end_to (منع القنص) تُمدد نهاية المزاد إليه في نفس التحديث، ولا تُقصَّر أبدًا.
+    لا يقوم بعمل commit؛ المستدعي مسؤول عن إنهاء المعاملة.
+
+    Returns:
+        Optional[Row]: (total_bids_count, end_timestamp) بعد القبول (عدد المزايدات رقم إصدار متزايد)،
+        أو None إذا سبقتها مزايدة أخرى أو تغيرت حالة المزاد.
+    """
+    Auction = models_auction.Auction
+    end_timestamp = Auction.end_timestamp
+    if extend_end_to is not None:
+        end_timestamp = case((Auction.end_timestamp < extend_end_to, extend_end_to), else_=Auction.end_timestamp)
+    result = db.execute(
+        update(Auction)
+        .where(
+            Auction.auction_id == auction_id,
+            Auction.auction_status_id == auction_status_id,
+            Auction.end_timestamp > now,
+            func.coalesce(Auction.current_highest_bid_amount_per_unit, Auction.starting_price_per_unit)
+            + Auction.minimum_bid_increment <= bid_amount_per_unit,
+        )
+        .values(
+            current_highest_bid_amount_per_unit=bid_amount_per_unit,
+            current_highest_bidder_user_id=bidder_user_id,
+            total_bids_count=Auction.total_bids_count + 1,
+            end_timestamp=end_timestamp,
+        )
+        .returning(Auction.total_bids_count, Auction.end_timestamp)
+        .execution_options(synchronize_session=False)
+    )
+    return result.one_or_none()
+
+def mark_highest_bids_outbid(db: Session, auction_id: UUID) -> List[UUID]:
+    """
+    يحول المزايدة الأعلى السابقة للمزاد إلى 'OUTBID' (بدون commit).
+    يُستدعى بعد try_raise_highest_bid الناجح، أثناء قفل صف المزاد.
+
+    Returns:
+        List[UUID]: معرفات أصحاب المزايدات التي تم تجاوزها (لإخطارهم).
+    """
+    result = db.execute(
+        update(models_bidding.Bid)
+        .where(
+            models_bidding.Bid.auction_id == auction_id,
+            models_bidding.Bid.bid_status == "ACTIVE_HIGHEST",
+        )
+        .values(bid_status="OUTBID")
+        .returning(models_bidding.Bid.bidder_user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars())
+
+def add_bid(db: Session, bid_in: schemas.BidCreate, bid_status: Optional[str] = None, bid_timestamp: Optional[datetime] = None) -> models_bidding.Bid:
+    """
+    يضيف سجل مزايدة إلى المعاملة الحالية (flush بدون commit) ليتم تأكيده مع تحديث المزاد في عملية واحدة.
+    bid_timestamp اختياري (الافتراضي وقت الخادم)، لترتيب المزايدة قبل المزايدات الآلية الناتجة عنها.
+    """
+    db_bid = models_bidding.Bid(
+        auction_id=bid_in.auction_id,
+        lot_id=bid_in.lot_id,
+        bidder_user_id=bid_in.bidder_user_id,
+        bid_amount_per_unit=bid_in.bid_amount_per_unit,
+        is_auto_bid=bid_in.is_auto_bid,
+        bid_status=bid_status,
+    )
+    if bid_timestamp is not None:
+        db_bid.bid_timestamp = bid_timestamp
+    db.add(db_bid)
+    db.flush()
+    return db_bid
+
+def get_bid_ladder(db: Session, auction_id: UUID, limit: int) -> List[Row]:
+    """
+    يجلب أعلى المزايدات لمزاد (المبلغ، المزايد، الوقت) كصفوف خفيفة بدون كائنات ORM،
+    لاستعادة دفتر المزاد في الذاكرة بعد إعادة التشغيل.
+    """
+    Bid = models_bidding.Bid
+    return db.execute(
+        select(Bid.bidder_user_id, Bid.bid_amount_per_unit, Bid.bid_timestamp)
+        .where(Bid.auction_id == auction_id)
+        .order_by(Bid.bid_amount_per_unit.desc(), Bid.bid_timestamp.asc())
+        .limit(limit)
+    ).all()
+
+def persist_bid_batch(db: Session, auction_id: UUID, bids: List[models_bidding.Bid], highest_amount, highest_bidder_user_id: UUID, extend_end_to: Optional[datetime] = None) -> None:
+    """
+    يحفظ دفعة مزايدات مقبولة مسبقًا لمزاد واحد (بدون commit):
+    يحول المزايدة الأعلى السابقة إلى OUTBID، يضيف الدفعة، ويحدث أعلى مزايدة وعدد المزايدات في صف المزاد
+    (ونهاية المزاد إذا مددها منع القنص؛ لا تُقصَّر أبدًا).
+    المزايدات يجب أن تكون مرتبة؛ آخرها فقط بحالة ACTIVE_HIGHEST.
+    """
+    Auction = models_auction.Auction
+    values = {
+        "current_highest_bid_amount_per_unit": highest_amount,
+        "current_highest_bidder_user_id": highest_bidder_user_id,
+        "total_bids_count": Auction.total_bids_count + len(bids),
+    }
+    if extend_end_to is not None:
+        values["end_timestamp"] = case((Auction.end_timestamp < extend_end_to, extend_end_to), else_=Auction.end_timestamp)
+    mark_highest_bids_outbid(db, auction_id=auction_id)
+    db.add_all(bids)
+    db.execute(
+        update(Auction)
+        .where(Auction.auction_id == auction_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
 # لا يوجد تحديث أو حذف للمزايدات لأنها سجلات غير قابلة للتعديل.
 
 
@@ -197,6 +354,25 @@ def create_auto_bid_setting(db: Session, setting_in: schemas.AutoBidSettingCreat
     db.refresh(db_setting)
     return db_setting
 
+def get_active_proxy_bids(db: Session, auction_id: UUID, min_max_amount=None) -> List[Row]:
+    """
+    يجلب إعدادات المزايدة الآلية النشطة لمزاد كصفوف خفيفة (user_id, max_bid_amount_per_unit, increment_amount, created_at)
+    لحلها في مرور واحد (auto_bid_resolver). الإعدادات التي لا يبلغ حدها الأقصى min_max_amount لا تؤثر على النتيجة فتُستبعد.
+    """
+    AutoBidSetting = models_bidding.AutoBidSetting
+    statement = select(
+        AutoBidSetting.user_id,
+        AutoBidSetting.max_bid_amount_per_unit,
+        AutoBidSetting.increment_amount,
+        AutoBidSetting.created_at,
+    ).where(
+        AutoBidSetting.auction_id == auction_id,
+        AutoBidSetting.is_active.is_(True),
+    )
+    if min_max_amount is not None:
+        statement = statement.where(AutoBidSetting.max_bid_amount_per_unit >= min_max_amount)
+    return db.execute(statement).all()
+
 def get_auto_bid_setting(db: Session, auto_bid_setting_id: int) -> Optional[models_bidding.AutoBidSetting]:
     """
     يجلب إعداد مزايدة آلية واحد بالـ ID الخاص به.
@@ -329,6 +505,43 @@ def get_all_auction_watchlists_for_user(db: Session, user_id: UUID) -> List[mode
     """
     return db.query(models_bidding.AuctionWatchlist).filter(models_bidding.AuctionWatchlist.user_id == user_id).all()
 
+def get_watchlist_auction_summaries_for_user(db: Session, user_id: UUID, language_code: str) -> List[Row]:
+    """
+    يجلب مزادات قائمة مراقبة المستخدم كصفوف أعمدة AuctionSummary مع بيانات الإدخال، باستعلام واحد
+    (بدون تحميل كائنات AuctionWatchlist والمزاد وعلاقاتهما)، الأحدث إضافةً أولاً.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        user_id (UUID): معرف المستخدم.
+        language_code (str): لغة العنوان المترجم.
+
+    Returns:
+        List[Row]: صفوف بأعمدة AuctionWatchlistSummary (بدون مفتاحي الحالة والنوع).
+    """
+    Watchlist = models_bidding.AuctionWatchlist
+    query = (
+        auction_summary_query(language_code)
+        .add_columns(Watchlist.watchlist_entry_id, Watchlist.added_timestamp)
+        .join(Watchlist, Watchlist.auction_id == models_auction.Auction.auction_id)
+        .where(Watchlist.user_id == user_id)
+        .order_by(Watchlist.added_timestamp.desc(), Watchlist.watchlist_entry_id.desc())
+    )
+    return list(db.execute(query).all())
+
+def get_auction_watchers(db: Session, auction_ids: List[UUID]) -> List[Row]:
+    """
+    يجلب مراقبي مجموعة مزادات باستعلام واحد عبر فهرس (auction_id, user_id)، لتوزيع إشعارات المزايدات.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        auction_ids (List[UUID]): معرفات المزادات.
+
+    Returns:
+        List[Row]: صفوف (auction_id, user_id).
+    """
+    Watchlist = models_bidding.AuctionWatchlist
+    return list(db.execute(select(Watchlist.auction_id, Watchlist.user_id).where(Watchlist.auction_id.in_(auction_ids))).all())
+
 def delete_auction_watchlist_entry(db: Session, db_entry: models_bidding.AuctionWatchlist):
     """
     يحذف إدخال قائمة مراقبة مزاد معين (حذف صارم).
@@ -1,16 +1,20 @@
 # backend\src\auction\crud\settlements_crud.py
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_
-from typing import List, Optional
+from sqlalchemy import exists, and_, or_, select, insert, update, func, tuple_
+from sqlalchemy.engine import Row
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
 # استيراد المودلز من Auction
 from src.auctions.models import settlements_models as models_settlements # AuctionSettlement, AuctionSettlementStatus, AuctionSettlementStatusTranslation
+from src.auctions.models import auctions_models as models_auction # Auction (خط التسويات الدفعي)
+from src.auctions.models import bidding_models as models_bidding # Bid (تحديد الفائزين)
 # استيراد Schemas
 from src.auctions.schemas import settlement_schemas as schemas
 from src.lookups.schemas import lookups_schemas 
+from src.db.ids import reserve_ids # معرفات BIGINT للإدراج الجماعي في SQLite
 
 
 # ==========================================================
@@ -141,6 +145,115 @@ def update_auction_settlement_status(db: Session, db_settlement: models_settleme
 # لا يوجد delete_auction_settlement مباشر، يتم إدارة الحالة عبر تحديث settlement_status_id
 
 
+# ==========================================================
+# --- خط التسويات الدفعي (Settlement Pipeline) ---
+# ==========================================================
+
+def get_unsettled_ended_auctions(db: Session, ended_status_id: int, limit: int, after: Optional[Tuple[datetime, UUID]] = None, ended_since: Optional[datetime] = None, auction_ids: Optional[List[UUID]] = None) -> List[Row]:
+    """
+    يجلب الدفعة التالية من المزادات المنتهية التي لا تملك تسوية، مرتبة بـ (end_timestamp, auction_id)
+    ومقسمة بمؤشر (keyset) بدلاً من OFFSET، عبر فهرس (auction_status_id, end_timestamp).
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        ended_status_id (int): معرف حالة المزاد 'ENDED'.
+        limit (int): حجم الدفعة.
+        after (Optional[Tuple[datetime, UUID]]): (end_timestamp, auction_id) لآخر مزاد في الدفعة السابقة.
+        ended_since (Optional[datetime]): تجاهل المزادات المنتهية قبل هذا الوقت (حد نافذة المسح).
+        auction_ids (Optional[List[UUID]]): حصر المسح في هذه المزادات.
+
+    Returns:
+        List[Row]: صفوف (auction_id, end_timestamp).
+    """
+    Auction = models_auction.Auction
+    AuctionSettlement = models_settlements.AuctionSettlement
+    stmt = select(Auction.auction_id, Auction.end_timestamp).where(
+        Auction.auction_status_id == ended_status_id,
+        ~exists().where(AuctionSettlement.auction_id == Auction.auction_id),
+    )
+    if ended_since is not None:
+        stmt = stmt.where(Auction.end_timestamp >= ended_since)
+    if auction_ids is not None:
+        stmt = stmt.where(Auction.auction_id.in_(auction_ids))
+    if after is not None:
+        stmt = stmt.where(tuple_(Auction.end_timestamp, Auction.auction_id) > tuple_(*after))
+    return list(db.execute(stmt.order_by(Auction.end_timestamp, Auction.auction_id).limit(limit)).all())
+
+def get_auction_winners(db: Session, auction_ids: List[UUID]) -> List[Row]:
+    """
+    يحدد الفائز لدفعة مزادات باستعلام تجميعي واحد: أعلى مزايدة لكل مزاد (الأسبق عند التساوي)،
+    مع بيانات المزاد اللازمة للتسوية. المزادات بلا مزايدات أو التي لم تبلغ أعلى مزايداتها سعر الاحتياطي لا تظهر.
+
+    Returns:
+        List[Row]: صفوف (auction_id, bid_id, bidder_user_id, bid_amount_per_unit, seller_user_id, quantity_offered).
+    """
+    Auction = models_auction.Auction
+    Bid = models_bidding.Bid
+    ranked = select(
+        Bid.auction_id,
+        Bid.bid_id,
+        Bid.bidder_user_id,
+        Bid.bid_amount_per_unit,
+        func.row_number().over(
+            partition_by=Bid.auction_id,
+            order_by=(Bid.bid_amount_per_unit.desc(), Bid.bid_timestamp, Bid.bid_id),
+        ).label("bid_rank"),
+    ).where(Bid.auction_id.in_(auction_ids)).subquery()
+    stmt = (
+        select(
+            ranked.c.auction_id,
+            ranked.c.bid_id,
+            ranked.c.bidder_user_id,
+            ranked.c.bid_amount_per_unit,
+            Auction.seller_user_id,
+            Auction.quantity_offered,
+        )
+        .join(Auction, Auction.auction_id == ranked.c.auction_id)
+        .where(
+            ranked.c.bid_rank == 1,
+            or_(Auction.reserve_price_per_unit.is_(None), ranked.c.bid_amount_per_unit >= Auction.reserve_price_per_unit),
+        )
+    )
+    return list(db.execute(stmt).all())
+
+def bulk_create_auction_settlements(db: Session, settlements: List[Dict[str, Any]], initial_status_id: int, notes: Optional[str] = None) -> List[Row]:
+    """
+    يدرج دفعة تسويات مع سجل حالتها الأولى بعبارتي INSERT جماعيتين، ويعلّم المزايدات الفائزة بـ 'WINNING_BID'.
+    لا يقوم بعمل commit: الدفعة كلها معاملة واحدة، وتعارضها مع تشغيل آخر (winning_bid_id فريد) يلغيها كاملة.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        settlements (List[Dict[str, Any]]): أعمدة AuctionSettlement لكل تسوية.
+        initial_status_id (int): معرف الحالة الأولية (تُسجل في سجل الحالة).
+        notes (Optional[str]): ملاحظة سجل الحالة.
+
+    Returns:
+        List[Row]: صفوف (settlement_id, auction_id) للتسويات المدرجة.
+    """
+    AuctionSettlement = models_settlements.AuctionSettlement
+    AuctionSettlementStatusHistory = models_settlements.AuctionSettlementStatusHistory
+    ids = reserve_ids(db, AuctionSettlement.settlement_id, len(settlements))
+    if ids:
+        settlements = [{**settlement, "settlement_id": settlement_id} for settlement, settlement_id in zip(settlements, ids)]
+    created = list(db.execute(
+        insert(AuctionSettlement).returning(AuctionSettlement.settlement_id, AuctionSettlement.auction_id),
+        settlements,
+    ).all())
+    history = [{"settlement_id": row.settlement_id, "old_status_id": None, "new_status_id": initial_status_id, "notes": notes} for row in created]
+    ids = reserve_ids(db, AuctionSettlementStatusHistory.settlement_status_history_id, len(history))
+    if ids:
+        for row, settlement_status_history_id in zip(history, ids):
+            row["settlement_status_history_id"] = settlement_status_history_id
+    db.execute(insert(AuctionSettlementStatusHistory), history)
+    db.execute(
+        update(models_bidding.Bid)
+        .where(models_bidding.Bid.bid_id.in_([settlement["winning_bid_id"] for settlement in settlements]))
+        .values(bid_status="WINNING_BID")
+        .execution_options(synchronize_session=False)
+    )
+    return created
+
+
 # ==========================================================
 # --- CRUD Functions for AuctionSettlementStatus (حالات تسوية المزاد) ---
 # ==========================================================
@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Integer, String, Text, Boolean, BigInteger, Numeric,
-    func, TIMESTAMP, text, ForeignKey
+    func, TIMESTAMP, text, ForeignKey, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column,relationship
@@ -39,6 +39,16 @@ class Auction(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # مواعيد دورة الحياة القادمة حسب الحالة (مجدول دورة حياة المزادات)
+        Index('ix_auctions_status_start_timestamp', 'auction_status_id', 'start_timestamp'),
+        # تصفح المزادات بترقيم المؤشر على (end_timestamp, auction_id) لكل تصفية شائعة (يخدم المجدول أيضًا)
+        Index('ix_auctions_status_end_timestamp', 'auction_status_id', 'end_timestamp', 'auction_id'),
+        Index('ix_auctions_browse_status_type', 'auction_status_id', 'auction_type_id', 'end_timestamp', 'auction_id'),
+        Index('ix_auctions_browse_seller', 'seller_user_id', 'end_timestamp', 'auction_id'),
+        Index('ix_auctions_browse_end', 'end_timestamp', 'auction_id'),
+    )
+
     # --- SQLAlchemy Relationships ---
     # علاقات مع مودلات من مجموعات أخرى
     seller: Mapped["User"] = relationship("User", foreign_keys=[seller_user_id], lazy="selectin")
@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Integer, String, Text, Boolean, BigInteger, Numeric,
-    func, TIMESTAMP, text, ForeignKey, UniqueConstraint
+    func, TIMESTAMP, text, ForeignKey, UniqueConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column,relationship
@@ -37,6 +37,11 @@ class Bid(Base):
     bid_status: Mapped[str] = mapped_column(String(50), nullable=True, comment="e.g., 'ACTIVE_HIGHEST', 'OUTBID', 'WINNING_BID'")
     is_auto_bid: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
 
+    __table_args__ = (
+        # أعلى مزايدة لكل مزاد (تحديد الفائزين في خط التسويات الدفعي)
+        Index('ix_bids_auction_amount', 'auction_id', 'bid_amount_per_unit'),
+    )
+
     # --- SQLAlchemy Relationships ---
     auction: Mapped["Auction"] = relationship("Auction", back_populates="bids", foreign_keys=[auction_id], lazy="selectin") # علاقة بالمزاد الأب
     lot: Mapped[Optional["AuctionLot"]] = relationship("AuctionLot", back_populates="bids", foreign_keys=[lot_id], lazy="selectin") # علاقة باللوت (إذا كانت المزايدة على لوت)
@@ -72,6 +77,8 @@ class AuctionWatchlist(Base):
 
     __table_args__ = (
         UniqueConstraint('user_id', 'auction_id', name='uq_user_auction_watchlist'),
+        # مراقبو المزاد (توزيع إشعارات المزايدات)؛ القيد الفريد يبدأ بـ user_id فلا يخدم البحث بالمزاد
+        Index('ix_auction_watchlists_auction_user', 'auction_id', 'user_id'),
     )
 
     # --- SQLAlchemy Relationships ---
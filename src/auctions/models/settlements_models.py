@@ -3,7 +3,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Integer, String, Text, Boolean, BigInteger, Numeric,
-    func, TIMESTAMP, ForeignKey
+    func, TIMESTAMP, ForeignKey, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -81,6 +81,11 @@ class AuctionSettlement(Base):
     
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # البحث عن تسوية المزاد (تجاوز المزادات المسواة في خط التسويات الدفعي)
+        Index('ix_auction_settlements_auction_id', 'auction_id'),
+    )
  
      # --- SQLAlchemy Relationships ---
     # علاقات مع مودلات من مجموعات أخرى أو مودلات لم تُستورد مباشرةً:
@@ -89,9 +94,28 @@ class AuctionSettlement(Base):
     winner_user: Mapped["User"] = relationship("User", foreign_keys=[winner_user_id], lazy="selectin") # المستخدم الفائز
     seller_user: Mapped["User"] = relationship("User", foreign_keys=[seller_user_id], lazy="selectin") # البائع
     settlement_status: Mapped["AuctionSettlementStatus"] = relationship("AuctionSettlementStatus", foreign_keys=[settlement_status_id], back_populates="settlements", lazy="selectin") # حالة التسوية
+    history: Mapped[List["AuctionSettlementStatusHistory"]] = relationship(back_populates="settlement", cascade="all, delete-orphan") # سجل تغييرات حالة التسوية
     
     # العلاقات مع مودلات من المجموعة 8 (المحفظة والمدفوعات)
     # TODO: platform_commission: Mapped[Optional["PlatformCommission"]] = relationship("PlatformCommission", foreign_keys=[AuctionSettlement.platform_commission_id], lazy="selectin")
     # TODO: payment_transaction: Mapped[Optional["WalletTransaction"]] = relationship("WalletTransaction", foreign_keys=[AuctionSettlement.payment_transaction_id], lazy="selectin")
     # TODO: payout_transaction: Mapped[Optional["WalletTransaction"]] = relationship("WalletTransaction", foreign_keys=[AuctionSettlement.payout_transaction_id], lazy="selectin")
 
+
+class AuctionSettlementStatusHistory(Base):
+    """(5.ج.4) جدول سجل تغييرات حالة تسوية المزاد."""
+    __tablename__ = 'auction_settlement_status_history'
+    settlement_status_history_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    settlement_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('auction_settlements.settlement_id', ondelete='CASCADE'), nullable=False, index=True)
+    old_status_id: Mapped[int] = mapped_column(Integer, ForeignKey('auction_settlement_statuses.settlement_status_id'), nullable=True)
+    new_status_id: Mapped[int] = mapped_column(Integer, ForeignKey('auction_settlement_statuses.settlement_status_id'), nullable=False)
+    change_timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    changed_by_user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.user_id'), nullable=True)
+    notes: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    # --- SQLAlchemy Relationships ---
+    settlement: Mapped["AuctionSettlement"] = relationship(back_populates="history") # علاقة بالتسوية الأب
+    old_status: Mapped[Optional["AuctionSettlementStatus"]] = relationship("AuctionSettlementStatus", foreign_keys=[old_status_id], lazy="selectin") # العلاقة بالحالة القديمة
+    new_status: Mapped["AuctionSettlementStatus"] = relationship("AuctionSettlementStatus", foreign_keys=[new_status_id], lazy="selectin") # العلاقة بالحالة الجديدة
+    changed_by_user: Mapped[Optional["User"]] = relationship("User", foreign_keys=[changed_by_user_id], lazy="selectin") # المستخدم الذي أجرى التغيير (NULL للنظام)
@@ -227,3 +227,41 @@ class AuctionRead(AuctionBase):
     current_highest_bidder: Optional[UserRead] = None # قد لا يكون هناك مزايد بعد
 
     model_config = ConfigDict(from_attributes=True)
+
+class AuctionSummary(BaseModel):
+    """
+    نموذج مختصر للمزاد في قوائم العرض (التصفح، مزادات البائع، قائمة المراقبة): أعمدة المزاد فقط
+    (بدون البائع والمنتج واللوطات المتداخلة) مع العنوان المترجم، ومفتاحي الحالة والنوع من خريطة الحالات والأنواع المخزنة.
+    يُبنى من صفوف استعلام أعمدة مباشرةً (auctions_crud.auction_summary_query) دون إنشاء كائنات ORM.
+    """
+    auction_id: UUID
+    seller_user_id: UUID
+    product_id: UUID
+    auction_type_id: int
+    auction_type_key: Optional[str] = None
+    auction_status_id: int
+    auction_status_key: Optional[str] = None
+    title: Optional[str] = Field(None, description="العنوان المخصص، وإلا اسم المنتج المترجم، وإلا مفتاح العنوان.")
+    auction_title_key: Optional[str] = None
+    custom_auction_title: Optional[str] = None
+    start_timestamp: datetime
+    end_timestamp: datetime
+    starting_price_per_unit: float
+    minimum_bid_increment: float
+    current_highest_bid_amount_per_unit: Optional[float] = None
+    total_bids_count: int = 0
+    quantity_offered: float
+    unit_of_measure_id_for_quantity: int
+    is_private_auction: Optional[bool] = False
+
+    model_config = ConfigDict(from_attributes=True)
+
+class AuctionWatchlistSummary(AuctionSummary):
+    """ملخص مزاد في قائمة مراقبة المستخدم، مع بيانات إدخال القائمة."""
+    watchlist_entry_id: int
+    added_timestamp: datetime
+
+class AuctionBrowsePage(BaseModel):
+    """صفحة من تصفح المزادات مرتبة بموعد الانتهاء، مع مؤشر الصفحة التالية."""
+    items: List[AuctionSummary] = Field([])
+    next_cursor: Optional[str] = Field(None, description="يُمرر كما هو في cursor لجلب الصفحة التالية؛ None عند آخر صفحة.")
@@ -63,7 +63,7 @@ class BidCreate(BidBase):
 
 class BidRead(BidBase):
     """نموذج لقراءة وعرض تفاصيل المزايدة."""
-    bid_id: int
+    bid_id: Optional[int] = Field(None, description="معرف المزايدة (None إذا قبلها محرك المزادات ولم تُحفظ بعد).")
     bid_timestamp: datetime
     bid_status: Optional[str] = Field(None, description="حالة المزايدة (مثلاً: 'ACTIVE_HIGHEST', 'OUTBID', 'WINNING_BID').")
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,520 @@
+# backend\src\auctions\services\auction_engine.py
+# ----------------------------------------------------------------------------------------------------
+# محرك المزادات في الذاكرة (اختياري - AUCTION_ENGINE_ENABLED).
+# في المزادات الساخنة يصبح صف المزاد (current_highest_bid_amount_per_unit) نقطة التزاحم الوحيدة.
+# هذا المحرك يحتفظ بدفتر كل مزاد نشط (أعلى مزايدة، آخر المزايدات) في الذاكرة:
+# - التقسيم (Sharding) حسب auction_id: لكل قسم خيط واحد يعالج أوامره بالتسلسل، فلكل مزاد كاتب واحد
+#   (Single-writer actor) بدون أقفال، والتحقق من المزايدة يتم في ميكروثوانٍ.
+# - الحفظ المؤجل (Write-behind): المزايدات المقبولة تُحفظ في جدول bids على دفعات كل
+#   AUCTION_ENGINE_FLUSH_INTERVAL_MS أو عند بلوغ AUCTION_ENGINE_FLUSH_BATCH_SIZE.
+# - الاستعادة: عند أول مزايدة على مزاد بعد إعادة التشغيل يُبنى دفتره من صف المزاد وجدول bids.
+# - المزايدات الآلية: إعدادات المزاد النشطة محفوظة في الدفتر وتُحل بعد كل مزايدة مقبولة (auto_bid_resolver)؛
+#   تُعاد قراءتها من قاعدة البيانات عند تغيير أي إعداد (resolve_auto_bids).
+# - منع القنص: المزايدة في اللحظات الأخيرة تمدد end_timestamp في الدفتر، ويُحفظ التمديد مع دفعة المزايدات التالية.
+#
+# تنبيهات تشغيلية:
+# - يجب أن تملك عملية واحدة كل مزاد (عامل واحد، أو توجيه ثابت حسب auction_id)؛ المحرك لا ينسق بين العمليات.
+# - المزايدات المقبولة وغير المحفوظة بعد تضيع عند انهيار العملية (حتى فترة دفعة واحدة)؛ الإيقاف الطبيعي يحفظها.
+# - كل مزاد يُحفظ في معاملة مستقلة: فشل حفظ مزاد واحد لا يوقف بقية مزادات القسم. المزاد الفاشل يُعاد بمهلة متزايدة،
+#   وبعد AUCTION_ENGINE_MAX_FLUSH_FAILURES إخفاقًا متتاليًا يتوقف قبول المزايدات عليه (503) حتى ينجح حفظه.
+# - المزايدات غير المحفوظة في القسم محدودة بـ AUCTION_ENGINE_MAX_PENDING_BIDS؛ بعدها تُرفض المزايدات بـ 429.
+# - الدفتر يُحذف من الذاكرة عند تغيير حالة المزاد من خارج المحرك (evict).
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Set
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+from src.db.session import SessionLocal
+from src.auctions.crud import bidding_crud
+from src.auctions.models import bidding_models as models_bidding
+from src.auctions.schemas import bidding_schemas as schemas
+from src.auctions.services.auction_events import publish_bid_state
+from src.auctions.services.bid_notifications import bid_notifications
+from src.auctions.services.auto_bid_resolver import resolve_proxy_bids
+from src.auctions.services.bid_rules import anti_sniping_end_timestamp, bidding_is_open, required_bid_amount, validate_bid_against_state
+from src.exceptions import NotFoundException
+
+logger = logging.getLogger(__name__)
+
+_MAX_FLUSH_BACKOFF_SECONDS = 30.0 # أقصى مهلة بين محاولات حفظ مزاد فشل حفظه
+
+
+class AuctionBook:
+    """
+    دفتر مزاد واحد في الذاكرة. يوفر نفس حقول إسقاط المزاد (get_auction_bid_state) لتطبيق bid_rules عليه.
+    لا يُعدَّل إلا من خيط القسم المالك.
+    """
+
+    def __init__(self, state, ladder, proxies, ladder_depth: int):
+        self.auction_id: UUID = state.auction_id
+        self.seller_user_id: UUID = state.seller_user_id
+        self.status_name_key: str = state.status_name_key
+        self.end_timestamp: datetime = state.end_timestamp
+        self.starting_price_per_unit: Decimal = state.starting_price_per_unit
+        self.minimum_bid_increment: Decimal = state.minimum_bid_increment
+        self.current_highest_bid_amount_per_unit: Optional[Decimal] = state.current_highest_bid_amount_per_unit
+        self.current_highest_bidder_user_id: Optional[UUID] = state.current_highest_bidder_user_id
+        self.total_bids_count: int = state.total_bids_count
+        # آخر المزايدات المقبولة، الأحدث أولاً: (المبلغ، المزايد، الوقت)
+        self.ladder = deque(((row.bid_amount_per_unit, row.bidder_user_id, row.bid_timestamp) for row in ladder), maxlen=ladder_depth)
+        # إعدادات المزايدة الآلية النشطة (صفوف get_active_proxy_bids)
+        self.proxies = list(proxies)
+        # مزايدات مقبولة بانتظار الحفظ
+        self.pending: List[schemas.BidCreate] = []
+        self.pending_timestamps: List[datetime] = []
+        # نهاية جديدة مددها منع القنص بانتظار الحفظ (None = لا تمديد معلق)
+        self.extended_end: Optional[datetime] = None
+        # المتصدرون الذين تم تجاوزهم منذ آخر نشر (لإشعاراتهم)
+        self.outbid_user_ids: Set[UUID] = set()
+        # إخفاقات الحفظ المتتالية، وأقرب وقت (monotonic) لإعادة المحاولة التلقائية
+        self.flush_failures = 0
+        self.retry_at = 0.0
+
+        # إذا سبق جدول bids صف المزاد (مسار قديم)، فالمصدر الموثوق هو أعلى مزايدة محفوظة
+        if self.ladder and (self.current_highest_bid_amount_per_unit is None or self.ladder[0][0] > self.current_highest_bid_amount_per_unit):
+            self.current_highest_bid_amount_per_unit, self.current_highest_bidder_user_id = self.ladder[0][0], self.ladder[0][1]
+
+    def accept(self, bid_in: schemas.BidCreate, bid_amount: Decimal, now: datetime) -> None:
+        if self.current_highest_bidder_user_id is not None and self.current_highest_bidder_user_id != bid_in.bidder_user_id:
+            self.outbid_user_ids.add(self.current_highest_bidder_user_id)
+        self.current_highest_bid_amount_per_unit = bid_amount
+        self.current_highest_bidder_user_id = bid_in.bidder_user_id
+        self.total_bids_count += 1
+        self.ladder.appendleft((bid_amount, bid_in.bidder_user_id, now))
+        self.pending.append(bid_in)
+        self.pending_timestamps.append(now)
+        extended_end = anti_sniping_end_timestamp(self.end_timestamp, now)
+        if extended_end is not None:
+            self.end_timestamp = self.extended_end = extended_end
+
+    def publish(self) -> None:
+        """
+        ينشر حالة السعر الحالية لمشتركي المزاد الحيين (قبل الحفظ المؤجل؛ المزايدة مقبولة بالفعل)،
+        ويسجل الحدث لإشعارات من تم تجاوزهم ومراقبي المزاد.
+        """
+        bid_notifications.publish(self.auction_id, self.current_highest_bid_amount_per_unit, self.current_highest_bidder_user_id, self.outbid_user_ids)
+        self.outbid_user_ids = set()
+        amount, bidder, at = self.ladder[0]
+        publish_bid_state(
+            self.auction_id,
+            highest_amount=self.current_highest_bid_amount_per_unit,
+            highest_bidder_user_id=self.current_highest_bidder_user_id,
+            total_bids_count=self.total_bids_count,
+            last_bid={
+                "bidder_user_id": bidder,
+                "bid_amount_per_unit": amount,
+                "is_auto_bid": bool(self.pending and self.pending[-1].is_auto_bid),
+                "bid_timestamp": at,
+            },
+            end_timestamp=self.extended_end,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "auction_id": self.auction_id,
+            "end_timestamp": self.end_timestamp,
+            "current_highest_bid_amount_per_unit": self.current_highest_bid_amount_per_unit,
+            "current_highest_bidder_user_id": self.current_highest_bidder_user_id,
+            "total_bids_count": self.total_bids_count,
+            "pending_bids": len(self.pending),
+            "recent_bids": [
+                {"bid_amount_per_unit": amount, "bidder_user_id": bidder, "bid_timestamp": at}
+                for amount, bidder, at in self.ladder
+            ],
+        }
+
+
+class _Shard:
+    """قسم من المحرك: خيط واحد يملك مجموعة من الدفاتر ويعالج أوامرها بالتسلسل ثم يحفظها على دفعات."""
+
+    def __init__(self, index: int, engine: "AuctionEngine"):
+        self.index = index
+        self.engine = engine
+        self.books: Dict[UUID, AuctionBook] = {}
+        self.commands: "queue.Queue" = queue.Queue(maxsize=engine.queue_size)
+        self.pending_count = 0
+        self.next_flush_at: Optional[float] = None
+        self.thread = threading.Thread(target=self._run, name=f"auction-engine-{index}", daemon=True)
+        self.thread.start()
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        future: Future = Future()
+        try:
+            self.commands.put_nowait((fn, future))
+        except queue.Full:
+            self.engine.count("rejected_saturated")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="المزاد يشهد ضغطًا عاليًا حاليًا. يرجى إعادة المحاولة بعد قليل.",
+                headers={"Retry-After": "1"},
+            )
+        return future
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self.next_flush_at is not None:
+                timeout = max(self.next_flush_at - time.monotonic(), 0)
+            try:
+                command = self.commands.get(timeout=timeout)
+            except queue.Empty:
+                command = None
+            if command is not None:
+                fn, future = command
+                if fn is None: # أمر الإيقاف
+                    self.flush(retry_failed=True)
+                    future.set_result(None)
+                    return
+                try:
+                    future.set_result(fn())
+                except BaseException as exc:
+                    future.set_exception(exc)
+            if self.pending_count and (
+                self.pending_count >= self.engine.flush_batch_size or time.monotonic() >= self.next_flush_at
+            ):
+                self.flush()
+
+    # --- العمليات (تُنفذ داخل خيط القسم فقط) ---
+
+    def load_book(self, auction_id: UUID) -> AuctionBook:
+        book = self.books.get(auction_id)
+        if book is not None:
+            return book
+        db = SessionLocal()
+        try:
+            state = bidding_crud.get_auction_bid_state(db, auction_id)
+            if state is None:
+                raise NotFoundException(detail=f"المزاد بمعرف {auction_id} غير موجود.")
+            ladder = bidding_crud.get_bid_ladder(db, auction_id, self.engine.ladder_depth)
+            proxies = bidding_crud.get_active_proxy_bids(db, auction_id)
+        finally:
+            db.close()
+        book = AuctionBook(state, ladder, proxies, self.engine.ladder_depth)
+        # المزادات غير النشطة لا تبقى في الذاكرة: حالتها قد تتغير من خارج المحرك
+        if book.status_name_key == "ACTIVE":
+            self.books[auction_id] = book
+            self.engine.count("recovered_books")
+        return book
+
+    def place_bid(self, bid_in: schemas.BidCreate) -> models_bidding.Bid:
+        now = datetime.now(timezone.utc)
+        bid_amount = Decimal(str(bid_in.bid_amount_per_unit))
+        book = self.load_book(bid_in.auction_id)
+        self._check_can_accept(book)
+        try:
+            validate_bid_against_state(book, bid_amount, bid_in.bidder_user_id, now)
+        except HTTPException:
+            self.engine.count("rejected")
+            raise
+        book.accept(bid_in, bid_amount, now)
+        self.engine.count("accepted")
+        auto_bids = self._resolve_proxies(book, now)
+        self._track_pending(1 + auto_bids)
+        book.publish()
+        # كائن غير مرتبط بالجلسة؛ bid_id يُعيَّن عند الحفظ المؤجل
+        return models_bidding.Bid(
+            auction_id=bid_in.auction_id,
+            lot_id=bid_in.lot_id,
+            bidder_user_id=bid_in.bidder_user_id,
+            bid_amount_per_unit=bid_amount,
+            bid_timestamp=now,
+            bid_status="OUTBID" if auto_bids else "ACTIVE_HIGHEST",
+            is_auto_bid=bool(bid_in.is_auto_bid),
+        )
+
+    def resolve_auto_bids(self, auction_id: UUID) -> int:
+        """يعيد تحميل إعدادات المزايدة الآلية للمزاد ويحلها مقابل أعلى مزايدة حالية."""
+        now = datetime.now(timezone.utc)
+        book = self.books.get(auction_id)
+        if book is None:
+            book = self.load_book(auction_id) # يحمّل الإعدادات الحالية مع الدفتر
+        else:
+            db = SessionLocal()
+            try:
+                book.proxies = list(bidding_crud.get_active_proxy_bids(db, auction_id))
+            finally:
+                db.close()
+        # الدفاتر غير النشطة لا تبقى في الذاكرة، فلا تُقبل عليها مزايدات معلقة
+        if self.books.get(auction_id) is not book or not bidding_is_open(book, now) or self._is_stalled(book) \
+                or self.pending_count >= self.engine.max_pending_bids:
+            return 0
+        auto_bids = self._resolve_proxies(book, now)
+        self._track_pending(auto_bids)
+        if auto_bids:
+            book.publish()
+        return auto_bids
+
+    def _is_stalled(self, book: AuctionBook) -> bool:
+        return book.flush_failures >= self.engine.max_flush_failures
+
+    def _check_can_accept(self, book: AuctionBook) -> None:
+        """يرفض المزايدة إذا تعثر حفظ دفتر المزاد، أو بلغت مزايدات القسم غير المحفوظة الحد الأقصى."""
+        if self._is_stalled(book):
+            self.engine.count("rejected_unflushed")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="المزايدة على هذا المزاد متوقفة مؤقتًا. يرجى إعادة المحاولة لاحقًا.",
+                headers={"Retry-After": str(int(_MAX_FLUSH_BACKOFF_SECONDS))},
+            )
+        if self.pending_count >= self.engine.max_pending_bids:
+            self.engine.count("rejected_backlog")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="المزاد يشهد ضغطًا عاليًا حاليًا. يرجى إعادة المحاولة بعد قليل.",
+                headers={"Retry-After": "1"},
+            )
+
+    def _resolve_proxies(self, book: AuctionBook, now: datetime) -> int:
+        resolved = resolve_proxy_bids(
+            current_amount=book.current_highest_bid_amount_per_unit,
+            current_leader=book.current_highest_bidder_user_id,
+            required_amount=required_bid_amount(book),
+            minimum_increment=book.minimum_bid_increment,
+            proxies=book.proxies,
+        )
+        for i, auto_bid in enumerate(resolved):
+            bid_in = schemas.BidCreate(
+                auction_id=book.auction_id,
+                bidder_user_id=auto_bid.bidder_user_id,
+                bid_amount_per_unit=float(auto_bid.amount),
+                is_auto_bid=True,
+            )
+            book.accept(bid_in, auto_bid.amount, now + timedelta(microseconds=i + 1))
+        if resolved:
+            self.engine.count("auto_bids", len(resolved))
+        return len(resolved)
+
+    def _track_pending(self, count: int) -> None:
+        if not count:
+            return
+        self.pending_count += count
+        if self.next_flush_at is None:
+            self.next_flush_at = time.monotonic() + self.engine.flush_interval_seconds
+
+    def flush(self, auction_id: Optional[UUID] = None, retry_failed: bool = False) -> int:
+        """
+        يحفظ المزايدات المعلقة (لكل الدفاتر أو لمزاد واحد)، كل دفتر في معاملة مستقلة.
+        الدفتر الذي يفشل حفظه يبقى معلقًا ويُتخطى في الحفظ الدوري حتى انتهاء مهلته، ما لم يُطلب مزاده تحديدًا أو retry_failed.
+        """
+        now = time.monotonic()
+        books = [
+            book for book in self.books.values()
+            if book.pending and (auction_id is None or book.auction_id == auction_id)
+            and (auction_id is not None or retry_failed or book.retry_at <= now)
+        ]
+        if not books:
+            if auction_id is None and self.pending_count: # كل المعلقات في دفاتر تنتظر مهلة إعادة المحاولة
+                self.next_flush_at = now + self.engine.flush_interval_seconds
+            return 0
+        started = time.perf_counter()
+        flushed = 0
+        db = SessionLocal()
+        try:
+            for book in books:
+                last = len(book.pending) - 1
+                rows = [
+                    models_bidding.Bid(
+                        auction_id=bid_in.auction_id,
+                        lot_id=bid_in.lot_id,
+                        bidder_user_id=bid_in.bidder_user_id,
+                        bid_amount_per_unit=Decimal(str(bid_in.bid_amount_per_unit)),
+                        bid_timestamp=at,
+                        bid_status="ACTIVE_HIGHEST" if i == last else "OUTBID",
+                        is_auto_bid=bool(bid_in.is_auto_bid),
+                    )
+                    for i, (bid_in, at) in enumerate(zip(book.pending, book.pending_timestamps))
+                ]
+                try:
+                    bidding_crud.persist_bid_batch(
+                        db,
+                        auction_id=book.auction_id,
+                        bids=rows,
+                        highest_amount=rows[-1].bid_amount_per_unit,
+                        highest_bidder_user_id=rows[-1].bidder_user_id,
+                        extend_end_to=book.extended_end,
+                    )
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    self._flush_failed(book)
+                    continue
+                flushed += len(book.pending)
+                book.pending = []
+                book.pending_timestamps = []
+                book.extended_end = None
+                book.flush_failures = 0
+                book.retry_at = 0.0
+        finally:
+            db.close()
+
+        self.pending_count -= flushed
+        self.next_flush_at = (time.monotonic() + self.engine.flush_interval_seconds) if self.pending_count else None
+        if flushed:
+            self.engine.record_flush(flushed, (time.perf_counter() - started) * 1000)
+        return flushed
+
+    def _flush_failed(self, book: AuctionBook) -> None:
+        """يسجل فشل حفظ دفتر (داخل كتلة except) ويؤجل إعادة محاولته بمهلة متزايدة."""
+        book.flush_failures += 1
+        book.retry_at = time.monotonic() + min(self.engine.flush_interval_seconds * 2 ** book.flush_failures, _MAX_FLUSH_BACKOFF_SECONDS)
+        self.engine.count("flush_failures")
+        logger.exception("Auction engine shard %d failed to flush auction %s (%d bids pending, failure %d)",
+                         self.index, book.auction_id, len(book.pending), book.flush_failures)
+        if book.flush_failures == self.engine.max_flush_failures:
+            logger.error("Auction engine stopped accepting bids on auction %s after %d failed flushes",
+                         book.auction_id, book.flush_failures)
+
+    def evict(self, auction_id: UUID) -> bool:
+        self.flush(auction_id)
+        book = self.books.get(auction_id)
+        if book is not None and book.pending:
+            return False # فشل الحفظ: الدفتر يبقى بمزايداته المعلقة
+        self.books.pop(auction_id, None)
+        return True
+
+
+class AuctionEngine:
+    """
+    نقطة الدخول للمحرك: توجه كل أمر إلى قسم المزاد (hash(auction_id) % shards) وتنتظر نتيجته.
+    الخيوط تُنشأ عند أول استخدام.
+    """
+
+    def __init__(self, shards: int, queue_size: int, flush_interval_ms: float, flush_batch_size: int, ladder_depth: int,
+                 max_pending_bids: int = 20000, max_flush_failures: int = 5, submit_timeout_seconds: float = 10.0):
+        self.shard_count = max(shards, 1)
+        self.queue_size = queue_size
+        self.flush_interval_seconds = flush_interval_ms / 1000
+        self.flush_batch_size = flush_batch_size
+        self.ladder_depth = ladder_depth
+        self.max_pending_bids = max_pending_bids
+        self.max_flush_failures = max_flush_failures
+        self.submit_timeout_seconds = submit_timeout_seconds
+        self._shards: Optional[List[_Shard]] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.rejected_saturated = 0
+        self.rejected_backlog = 0
+        self.rejected_unflushed = 0
+        self.auto_bids = 0
+        self.recovered_books = 0
+        self.flushes = 0
+        self.flushed_bids = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    def _get_shards(self) -> List[_Shard]:
+        if self._shards is None:
+            with self._lock:
+                if self._shards is None:
+                    self._shards = [_Shard(i, self) for i in range(self.shard_count)]
+        return self._shards
+
+    def _shard_for(self, auction_id: UUID) -> _Shard:
+        return self._get_shards()[auction_id.int % self.shard_count]
+
+    def _call(self, auction_id: UUID, fn: Callable[[_Shard], Any]) -> Any:
+        shard = self._shard_for(auction_id)
+        return shard.submit(lambda: fn(shard)).result(timeout=self.submit_timeout_seconds)
+
+    # --- الواجهة العامة ---
+
+    def place_bid(self, bid_in: schemas.BidCreate) -> models_bidding.Bid:
+        """يتحقق من المزايدة ويقبلها في الذاكرة؛ الحفظ في قاعدة البيانات مؤجل."""
+        return self._call(bid_in.auction_id, lambda shard: shard.place_bid(bid_in))
+
+    def snapshot(self, auction_id: UUID) -> Dict[str, Any]:
+        """حالة دفتر المزاد الحالية (أعلى مزايدة وآخر المزايدات) بدون قراءة جدول bids."""
+        return self._call(auction_id, lambda shard: shard.load_book(auction_id).snapshot())
+
+    def flush(self, auction_id: Optional[UUID] = None) -> int:
+        """يحفظ المزايدات المعلقة فورًا (لمزاد واحد أو للجميع)، مثلاً قبل قراءة سجل المزايدات من قاعدة البيانات."""
+        if self._shards is None:
+            return 0
+        if auction_id is not None:
+            return self._call(auction_id, lambda shard: shard.flush(auction_id))
+        return sum(shard.submit(shard.flush).result(timeout=self.submit_timeout_seconds) for shard in self._shards)
+
+    def resolve_auto_bids(self, auction_id: UUID) -> int:
+        """يحل المزايدات الآلية للمزاد بعد تغيير إعداداتها؛ يعيد عدد المزايدات الآلية المقبولة."""
+        return self._call(auction_id, lambda shard: shard.resolve_auto_bids(auction_id))
+
+    def evict(self, auction_id: UUID) -> bool:
+        """
+        يحفظ ويحذف دفتر المزاد من الذاكرة (عند تغيير حالته أو إغلاقه من خارج المحرك).
+        يعيد False إذا فشل حفظ مزايداته المعلقة (يبقى الدفتر في الذاكرة)؛ يجب ألا يُغلق المزاد حينها.
+        """
+        if self._shards is None:
+            return True
+        return self._call(auction_id, lambda shard: shard.evict(auction_id))
+
+    def shutdown(self) -> None:
+        """يحفظ كل المزايدات المعلقة ويوقف الخيوط (عند إيقاف التطبيق)."""
+        if self._shards is None:
+            return
+        futures: List[Future] = []
+        for shard in self._shards:
+            future: Future = Future()
+            shard.commands.put((None, future))
+            futures.append(future)
+        for future in futures:
+            future.result(timeout=self.submit_timeout_seconds)
+        self._shards = None
+
+    # --- القياسات ---
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def record_flush(self, flushed: int, elapsed_ms: float) -> None:
+        with self._stats_lock:
+            self.flushes += 1
+            self.flushed_bids += flushed
+            self.last_flush_ms = elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        shards = self._shards or []
+        return {
+            "enabled": settings.AUCTION_ENGINE_ENABLED,
+            "shards": self.shard_count,
+            "books": sum(len(shard.books) for shard in shards),
+            "pending_bids": sum(shard.pending_count for shard in shards),
+            "stalled_books": sum(1 for shard in shards for book in list(shard.books.values()) if book.flush_failures >= self.max_flush_failures),
+            "queue_depth": sum(shard.commands.qsize() for shard in shards),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "rejected_saturated": self.rejected_saturated,
+            "rejected_backlog": self.rejected_backlog,
+            "rejected_unflushed": self.rejected_unflushed,
+            "auto_bids": self.auto_bids,
+            "recovered_books": self.recovered_books,
+            "flushes": self.flushes,
+            "flushed_bids": self.flushed_bids,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+        }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+auction_engine = AuctionEngine(
+    shards=settings.AUCTION_ENGINE_SHARDS,
+    queue_size=settings.AUCTION_ENGINE_QUEUE_SIZE,
+    flush_interval_ms=settings.AUCTION_ENGINE_FLUSH_INTERVAL_MS,
+    flush_batch_size=settings.AUCTION_ENGINE_FLUSH_BATCH_SIZE,
+    ladder_depth=settings.AUCTION_ENGINE_LADDER_DEPTH,
+    max_pending_bids=settings.AUCTION_ENGINE_MAX_PENDING_BIDS,
+    max_flush_failures=settings.AUCTION_ENGINE_MAX_FLUSH_FAILURES,
+)
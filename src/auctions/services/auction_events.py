@@ -0,0 +1,261 @@
+# backend\src\auctions\services\auction_events.py
+# ----------------------------------------------------------------------------------------------------
+# موزع تحديثات المزادات الحية (Fan-out hub) لقنوات WebSocket و SSE.
+# بدلاً من أن يستطلع العملاء get_auction_details (تحميل كامل لشجرة المزاد) لمعرفة السعر، تنشر الخدمات
+# تغييرات مختصرة (Deltas) عند المزايدة والإلغاء والتسوية، ويوزعها الموزع على مشتركي كل مزاد.
+#
+# الدمج (Coalescing): لكل مشترك خانة واحدة بآخر حالة غير مرسلة؛ التغييرات المتتالية تُدمج فيها حقلاً بحقل.
+# العميل البطيء يستلم أحدث حالة عند جاهزيته بدلاً من طابور متراكم، والناشر لا ينتظر أي عميل أبدًا.
+#
+# seq = total_bids_count: رقم إصدار متزايد لحقول السعر؛ التغييرات الأقدم مما استلمه المشترك (مثلاً من عامل آخر
+# عبر Redis، أو اللقطة الأولية بعد تغيير أحدث) لا تعيد السعر إلى الوراء.
+#
+# تعدد العمال (AUCTION_EVENTS_USE_REDIS): كل تغيير يُنشر أيضًا على قناة Redis (auction_events:<auction_id>)،
+# وخيط في كل عملية يستقبل تغييرات العمليات الأخرى ويوزعها على مشتركيه المحليين.
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "auction_events:"
+
+# الحقول التي يحكمها seq (حالة السعر)؛ باقي الحقول (الحالة، التسوية) تُدمج دائمًا
+_VERSIONED_FIELDS = frozenset({
+    "seq",
+    "current_highest_bid_amount_per_unit",
+    "current_highest_bidder_user_id",
+    "total_bids_count",
+    "last_bid",
+    "end_timestamp", # يتغير مع المزايدات فقط (منع القنص)
+})
+
+
+class Subscription:
+    """
+    اشتراك عميل واحد في مزاد. offer() تُستدعى من أي خيط (الخدمات، محرك المزادات، جسر Redis)،
+    و next() من حلقة asyncio الخاصة بالاتصال.
+    """
+
+    def __init__(self, hub: "AuctionEventHub", auction_id: UUID, loop: asyncio.AbstractEventLoop):
+        self.hub = hub
+        self.auction_id = auction_id
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Any] = {}
+        self._last_seq = -1 # اللقطة الأولية لمزاد بلا مزايدات تحمل seq = 0
+
+    def offer(self, delta: Dict[str, Any]) -> None:
+        """يدمج تغييرًا في الحالة غير المرسلة، ويوقظ الاتصال إذا كانت فارغة."""
+        with self._lock:
+            seq = delta.get("seq")
+            if seq is not None and seq <= self._last_seq:
+                # أقدم مما استُلم: حقول السعر فيه متجاوزة
+                delta = {key: value for key, value in delta.items() if key not in _VERSIONED_FIELDS}
+                if not delta:
+                    return
+            elif seq is not None:
+                self._last_seq = seq
+            wake = not self._pending
+            if not wake:
+                self.hub.count("coalesced")
+            self._pending.update(delta)
+        if wake:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError: # الحلقة أُغلقت (الاتصال انتهى)
+                pass
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """ينتظر حتى timeout ثانية ويعيد الحالة المدمجة منذ آخر إرسال، أو None (للنبض)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            with self._lock:
+                self._wakeup.clear()
+                state, self._pending = self._pending, {}
+            if state:
+                state["auction_id"] = str(self.auction_id)
+                return state
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class AuctionEventHub:
+    """موزع داخل العملية مع جسر Redis اختياري بين العمليات."""
+
+    def __init__(self, max_subscribers_per_auction: int, redis: Optional[Any] = None):
+        self.max_subscribers_per_auction = max_subscribers_per_auction
+        self._redis = redis
+        self._origin = uuid.uuid4().hex # لتجاهل رسائل هذه العملية عند عودتها من Redis
+        self._lock = threading.Lock()
+        self._subscribers: Dict[UUID, Set[Subscription]] = {}
+        self._bridge: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.remote_received = 0
+        self.rejected_subscribers = 0
+
+    # --- الاشتراك ---
+
+    def subscribe(self, auction_id: UUID) -> Optional[Subscription]:
+        """يسجل مشتركًا جديدًا (من داخل حلقة asyncio)؛ يعيد None عند بلوغ الحد الأقصى للمزاد."""
+        subscription = Subscription(self, auction_id, asyncio.get_running_loop())
+        with self._lock:
+            subscribers = self._subscribers.setdefault(auction_id, set())
+            if len(subscribers) >= self.max_subscribers_per_auction:
+                self.count("rejected_subscribers")
+                return None
+            subscribers.add(subscription)
+        if self._redis is not None:
+            self._ensure_bridge()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.auction_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.auction_id]
+
+    # --- النشر ---
+
+    def publish(self, auction_id: UUID, delta: Dict[str, Any]) -> None:
+        """ينشر تغييرًا مختصرًا لمزاد (من أي خيط، بعد commit). لا يرفع استثناءات إلى المستدعي."""
+        try:
+            delta = jsonable_encoder(delta)
+            self.count("published")
+            self._deliver(auction_id, delta)
+            if self._redis is not None:
+                message = json.dumps({"origin": self._origin, "delta": delta})
+                self._redis.publish(f"{CHANNEL_PREFIX}{auction_id}", message)
+        except Exception:
+            logger.exception("Failed to publish live update for auction %s", auction_id)
+
+    def _deliver(self, auction_id: UUID, delta: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(auction_id, ()))
+        for subscription in subscribers:
+            subscription.offer(delta)
+        if subscribers:
+            self.count("delivered", len(subscribers))
+
+    # --- جسر Redis ---
+
+    def _ensure_bridge(self) -> None:
+        if self._bridge is not None:
+            return
+        with self._lock:
+            if self._bridge is None:
+                self._bridge = threading.Thread(target=self._run_bridge, name="auction-events-bridge", daemon=True)
+                self._bridge.start()
+
+    def _run_bridge(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                for message in pubsub.listen():
+                    self._on_remote_message(message)
+            except Exception:
+                logger.exception("Auction events Redis bridge disconnected; reconnecting")
+                time.sleep(1)
+
+    def _on_remote_message(self, message: Dict[str, Any]) -> None:
+        payload = json.loads(message["data"])
+        if payload.get("origin") == self._origin:
+            return
+        auction_id = UUID(message["channel"][len(CHANNEL_PREFIX):])
+        self.count("remote_received")
+        self._deliver(auction_id, payload["delta"])
+
+    # --- القياسات ---
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            auctions = len(self._subscribers)
+            subscribers = sum(len(subscribers) for subscribers in self._subscribers.values())
+        return {
+            "backend": "memory" if self._redis is None else "redis",
+            "auctions": auctions,
+            "subscribers": subscribers,
+            "published": self.published,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "remote_received": self.remote_received,
+            "rejected_subscribers": self.rejected_subscribers,
+        }
+
+
+def _build_hub() -> AuctionEventHub:
+    redis = None
+    if settings.AUCTION_EVENTS_USE_REDIS:
+        from src.db.redis_client import redis_client
+        if redis_client is None:
+            logger.warning("AUCTION_EVENTS_USE_REDIS is set but REDIS_HOST is not configured; live updates stay in-process")
+        redis = redis_client
+    return AuctionEventHub(max_subscribers_per_auction=settings.AUCTION_EVENTS_MAX_SUBSCRIBERS_PER_AUCTION, redis=redis)
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+auction_events = _build_hub()
+
+
+# --- التغييرات المختصرة التي تنشرها الخدمات ---
+
+def publish_bid_state(auction_id: UUID, highest_amount, highest_bidder_user_id: UUID, total_bids_count: int, last_bid: Optional[Dict[str, Any]] = None, end_timestamp: Optional[datetime] = None) -> None:
+    """ينشر حالة السعر بعد مزايدة مقبولة (يدوية أو آلية)، ونهاية المزاد الجديدة إذا مددها منع القنص."""
+    delta = {
+        "seq": total_bids_count,
+        "current_highest_bid_amount_per_unit": highest_amount,
+        "current_highest_bidder_user_id": highest_bidder_user_id,
+        "total_bids_count": total_bids_count,
+    }
+    if last_bid is not None:
+        delta["last_bid"] = last_bid
+    if end_timestamp is not None:
+        delta["end_timestamp"] = end_timestamp
+    auction_events.publish(auction_id, delta)
+
+
+def publish_status(auction_id: UUID, status_name_key: str, **fields: Any) -> None:
+    """ينشر تغيير حالة المزاد (إلغاء، إغلاق، تسوية) مع حقول إضافية اختيارية."""
+    auction_events.publish(auction_id, {"status_name_key": status_name_key, **fields})
+
+
+def publish_settlement(auction_id: UUID, winner_user_id: UUID, final_winning_price_per_unit, settlement_status_name_key: str) -> None:
+    """ينشر نتيجة تسوية المزاد (الفائز والسعر النهائي)."""
+    auction_events.publish(auction_id, {
+        "settlement": {
+            "winner_user_id": winner_user_id,
+            "final_winning_price_per_unit": final_winning_price_per_unit,
+            "settlement_status_name_key": settlement_status_name_key,
+        }
+    })
@@ -0,0 +1,105 @@
+# backend\src\auctions\services\auction_lookups.py
+# ----------------------------------------------------------------------------------------------------
+# خريطة مخزنة داخل العملية لحالات وأنواع المزادات (مفتاح ↔ معرف).
+# جداول auction_statuses و auction_types صغيرة ونادرًا ما تتغير، بينما تحتاجها كل صفحة تصفح لتحويل
+# status_name_key / type_name_key إلى معرفات ولإرجاع المفاتيح مع كل مزاد دون JOIN.
+# تُحمّل الجداول كاملة مرة كل AUCTION_LOOKUP_CACHE_TTL_SECONDS (لقطة غير قابلة للتعديل)، وتُبطل عند تعديلها
+# من خدمات المسؤول. الإبطال محلي لكل عملية؛ المفتاح غير الموجود يعيد التحميل مرة واحدة قبل رفضه.
+# ----------------------------------------------------------------------------------------------------
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.lookups.models.lookups_models import AuctionStatus, AuctionType
+
+
+@dataclass(frozen=True)
+class AuctionLookupSnapshot:
+    """لقطة غير قابلة للتعديل لمفاتيح ومعرفات حالات وأنواع المزادات."""
+    status_ids: Dict[str, int]
+    type_ids: Dict[str, int]
+    status_keys: Dict[int, str]
+    type_keys: Dict[int, str]
+    loaded_at: float
+
+
+_STATUSES = select(AuctionStatus.status_name_key, AuctionStatus.auction_status_id)
+_TYPES = select(AuctionType.type_name_key, AuctionType.auction_type_id)
+
+
+class AuctionLookupCache:
+    """يحتفظ بلقطة واحدة مع TTL، آمنة للاستخدام من عدة خيوط ومن المسارات غير المتزامنة."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[AuctionLookupSnapshot] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def _fresh(self, snapshot: Optional[AuctionLookupSnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+
+    def _store(self, statuses, types) -> AuctionLookupSnapshot:
+        status_ids = {row[0]: row[1] for row in statuses}
+        type_ids = {row[0]: row[1] for row in types}
+        snapshot = AuctionLookupSnapshot(
+            status_ids=status_ids,
+            type_ids=type_ids,
+            status_keys={value: key for key, value in status_ids.items()},
+            type_keys={value: key for key, value in type_ids.items()},
+            loaded_at=time.monotonic(),
+        )
+        with self._lock:
+            self._snapshot = snapshot
+            self.loads += 1
+        return snapshot
+
+    def _cached(self, refresh: bool) -> Optional[AuctionLookupSnapshot]:
+        with self._lock:
+            snapshot = self._snapshot
+            if refresh or not self._fresh(snapshot):
+                return None
+            self.hits += 1
+            return snapshot
+
+    def get(self, db: Session, refresh: bool = False) -> AuctionLookupSnapshot:
+        """يعيد اللقطة الحالية، ويعيد تحميلها من قاعدة البيانات إذا انتهت صلاحيتها أو طُلب ذلك."""
+        return self._cached(refresh) or self._store(db.execute(_STATUSES).all(), db.execute(_TYPES).all())
+
+    async def get_async(self, db: AsyncSession, refresh: bool = False) -> AuctionLookupSnapshot:
+        """النسخة غير المتزامنة من get."""
+        cached = self._cached(refresh)
+        if cached is not None:
+            return cached
+        statuses = (await db.execute(_STATUSES)).all()
+        types = (await db.execute(_TYPES)).all()
+        return self._store(statuses, types)
+
+    def invalidate(self) -> None:
+        """يبطل اللقطة (عند إنشاء حالة أو نوع مزاد أو تعديله أو حذفه)."""
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "statuses": len(snapshot.status_ids) if snapshot else 0,
+                "types": len(snapshot.type_ids) if snapshot else 0,
+                "age_seconds": round(time.monotonic() - snapshot.loaded_at, 3) if snapshot else None,
+                "hits": self.hits,
+                "loads": self.loads,
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+auction_lookups = AuctionLookupCache(ttl_seconds=settings.AUCTION_LOOKUP_CACHE_TTL_SECONDS)
@@ -0,0 +1,234 @@
+# backend\src\auctions\services\auction_scheduler.py
+# ----------------------------------------------------------------------------------------------------
+# مجدول دورة حياة المزادات (اختياري - AUCTION_SCHEDULER_ENABLED):
+# ينقل المزادات SCHEDULED → ACTIVE عند start_timestamp و ACTIVE → ENDED عند end_timestamp، ثم يبدأ تسوياتها.
+# - الكومة وخيط الإطلاق من DeadlineScheduler (src/core/deadline_scheduler.py).
+# - الذاكرة: كومة (heap) بالمواعيد التي تحل خلال AUCTION_SCHEDULER_HORIZON_SECONDS فقط. النافذة تُعاد قراءتها كل
+#   AUCTION_SCHEDULER_REFRESH_SECONDS عبر فهرسي (auction_status_id, الموعد)، فالتكلفة بعدد المزادات القريبة لا بحجم الجدول.
+# - الإطلاق: خيط واحد ينام حتى أقرب موعد (دقة أقل من ثانية)، ثم يجمع كل ما حل موعده وينقله بتحديث شرطي
+#   واحد لكل دفعة (AUCTION_SCHEDULER_BATCH_SIZE)، وتُسلَّم المزادات المنتهية لخط التسويات الدفعي على خيط منفصل.
+# - منع القنص (AUCTION_ANTI_SNIPING_SECONDS): التمديد يُكتب في صف المزاد مع المزايدة، فيفشل الإغلاق الشرطي
+#   (end_timestamp <= الآن) للمزاد الممدد ويُعاد جدولته على نهايته الجديدة. عند تفعيل محرك المزادات
+#   تُحفظ مزايداته المعلقة (evict) قبل الإغلاق؛ المزاد الذي لم تُحفظ مزايداته لا يُغلق ويُعاد جدولته بعد
+#   _EVICT_RETRY_SECONDS، فلا تُسوى مزادات بدون مزايدات مقبولة.
+# - التكرار آمن: تشغيل أكثر من نسخة، أو تغيير الحالة يدويًا، لا ينقل المزاد مرتين، والتسوية تتجاوز المزادات المسواة.
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from src.core.config import settings
+from src.core.deadline_scheduler import DeadlineScheduler
+from src.db.session import SessionLocal
+from src.auctions.crud import auctions_crud
+from src.lookups.models.lookups_models import AuctionStatus
+from src.auctions.services.auction_engine import auction_engine
+from src.auctions.services.auction_events import publish_status
+from src.auctions.services.settlement_pipeline import settlement_pipeline
+
+logger = logging.getLogger(__name__)
+
+START = "start"
+END = "end"
+
+_EVICT_RETRY_SECONDS = 1.0 # مهلة إعادة محاولة إغلاق مزاد بقيت له مزايدات غير محفوظة في محرك المزادات
+
+# نوع الموعد: (عمود الموعد، الحالة الحالية، الحالة الجديدة)
+_TRANSITIONS = {
+    START: ("start_timestamp", "SCHEDULED", "ACTIVE"),
+    END: ("end_timestamp", "ACTIVE", "ENDED"),
+}
+
+
+class AuctionScheduler(DeadlineScheduler):
+    """
+    مواعيد البدء والانتهاء القادمة مفهرسة بالمفتاح (نوع الموعد، المزاد)؛ المدخلات الأقدم في الكومة
+    (بعد تأجيل أو تمديد) تُتجاهل عند خروجها.
+    """
+
+    label = "Auction scheduler"
+    thread_name = "auction-scheduler"
+
+    def __init__(self, horizon_seconds: float, refresh_seconds: float, batch_size: int):
+        super().__init__(horizon_seconds, refresh_seconds, batch_size)
+        self._status_ids: Dict[str, int] = {}
+        self._waiting: Dict[int, Tuple[str, str]] = {} # معرف الحالة → (نوع الموعد المنتظر، عموده)
+        self._settlements: Optional[ThreadPoolExecutor] = None
+        self.started = 0
+        self.ended = 0
+        self.rescheduled = 0
+        self.deferred = 0
+        self.settlements = 0
+
+    # --- التشغيل ---
+
+    def on_start(self) -> bool:
+        """يحمّل معرفات حالات المزاد. يرفض البدء إذا كانت الحالات المطلوبة غير موجودة في البيانات المرجعية."""
+        keys = {key for _, from_key, to_key in _TRANSITIONS.values() for key in (from_key, to_key)}
+        db = SessionLocal()
+        try:
+            rows = db.execute(select(AuctionStatus.status_name_key, AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key.in_(keys))).all()
+        finally:
+            db.close()
+        self._status_ids = {row.status_name_key: row.auction_status_id for row in rows}
+        missing = keys - self._status_ids.keys()
+        if missing:
+            logger.error("Auction scheduler not started: auction statuses %s are missing", sorted(missing))
+            return False
+        self._waiting = {self._status_ids[from_key]: (kind, column) for kind, (column, from_key, _) in _TRANSITIONS.items()}
+        self._settlements = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auction-settlements")
+        return True
+
+    def on_stop(self) -> None:
+        """ينتظر انتهاء التسويات الجارية."""
+        self._settlements.shutdown(wait=True)
+
+    # --- الجدولة ---
+
+    def schedule(self, kind: str, auction_id: UUID, deadline: datetime) -> None:
+        """يضيف أو يحدث موعد مزاد (من أي خيط). المواعيد خارج النافذة تُترك للقراءة الدورية."""
+        self.add_deadline((kind, auction_id), deadline)
+
+    def schedule_auction(self, auction_id: UUID, status_name_key: str, start_timestamp: datetime, end_timestamp: datetime) -> None:
+        """يجدول مزادًا أُنشئ أو عُدلت مواعيده في هذه العملية، دون انتظار القراءة الدورية التالية."""
+        if not self.running:
+            return
+        if status_name_key == _TRANSITIONS[START][1]:
+            self.schedule(START, auction_id, start_timestamp)
+        elif status_name_key == _TRANSITIONS[END][1]:
+            self.schedule(END, auction_id, end_timestamp)
+
+    def refresh(self, now: Optional[float] = None) -> int:
+        """يقرأ من جدول auctions المواعيد التي تحل قبل نهاية النافذة (بما فيها المتأخرة) ويضيفها إلى الكومة."""
+        now = time.time() if now is None else now
+        before = datetime.fromtimestamp(now + self.horizon_seconds, timezone.utc)
+        db = SessionLocal()
+        try:
+            due = [
+                (kind, row.auction_id, row.deadline)
+                for kind, (column, from_key, _) in _TRANSITIONS.items()
+                for row in auctions_crud.get_auction_deadlines_before(db, self._status_ids[from_key], column, before)
+            ]
+        finally:
+            db.close()
+        for kind, auction_id, deadline in due:
+            self.schedule(kind, auction_id, deadline)
+        self.count("loaded", len(due))
+        return len(due)
+
+    # --- الإطلاق ---
+
+    def split_due(self, due: List[Tuple[str, UUID]]) -> List[List[Tuple[str, UUID]]]:
+        # البدء أولاً: مزاد يبدأ وينتهي في نفس النافذة يُجدول إغلاقه بعد بدئه
+        return [[key for key in due if key[0] == kind] for kind in (START, END)]
+
+    def fire(self, keys: List[Tuple[str, UUID]], now: float) -> int:
+        """ينقل دفعة مزادات من نفس نوع الموعد بتحديث شرطي واحد. يعيد عدد المزادات التي انتقلت فعلاً."""
+        kind = keys[0][0]
+        auction_ids = [auction_id for _, auction_id in keys]
+        column, from_key, to_key = _TRANSITIONS[kind]
+        if kind == END:
+            # يحفظ المزايدات المعلقة (وتمديد منع القنص) قبل الإغلاق الشرطي؛ ما لم يُحفظ يؤجل إغلاقه
+            unflushed = set(self._evict(auction_ids))
+            if unflushed:
+                retry_at = datetime.fromtimestamp(now + _EVICT_RETRY_SECONDS, timezone.utc)
+                for auction_id in unflushed:
+                    self.schedule(END, auction_id, retry_at)
+                self.count("deferred", len(unflushed))
+                logger.warning("Deferred ending %d auctions with bids not yet saved by the auction engine", len(unflushed))
+                auction_ids = [auction_id for auction_id in auction_ids if auction_id not in unflushed]
+                if not auction_ids:
+                    return 0
+        db = SessionLocal()
+        try:
+            moved = auctions_crud.transition_auction_statuses(
+                db, auction_ids,
+                from_status_id=self._status_ids[from_key],
+                to_status_id=self._status_ids[to_key],
+                deadline_column=column,
+                now=datetime.fromtimestamp(now, timezone.utc),
+            )
+            db.commit()
+            states = auctions_crud.get_auction_schedule_states(db, auction_ids)
+        finally:
+            db.close()
+
+        # المزادات التي لم تنتقل (أُجلت أو مُددت) تُعاد جدولتها، والمزادات التي بدأت يُجدول إغلاقها
+        for state in states:
+            waiting = self._waiting.get(state.auction_status_id)
+            if waiting is None:
+                continue # انتهت دورة حياته أو أُلغي
+            next_kind, next_column = waiting
+            self.schedule(next_kind, state.auction_id, getattr(state, next_column))
+            if next_kind == kind:
+                self.count("rescheduled")
+
+        for auction_id in moved:
+            publish_status(auction_id, to_key)
+        if kind == END and moved:
+            # دفتر أعيد تحميله قبل الإغلاق لا يبقى في الذاكرة
+            unflushed = set(self._evict(moved))
+            if unflushed:
+                logger.error("Auctions %s ended with bids not yet saved by the auction engine; leaving their settlement to the periodic run",
+                             sorted(map(str, unflushed)))
+            settle = [auction_id for auction_id in moved if auction_id not in unflushed]
+            if settle:
+                self._settlements.submit(self._settle, settle)
+
+        self.count("started" if kind == START else "ended", len(moved))
+        return len(moved)
+
+    def _evict(self, auction_ids: List[UUID]) -> List[UUID]:
+        """
+        يحفظ ويحذف دفاتر المزادات من محرك المزادات (إن كان مفعلاً)، كل مزاد على حدة.
+        يعيد المزادات التي بقيت لها مزايدات غير محفوظة أو تعذر الوصول إلى دفترها (قسم مزدحم أو انتهاء المهلة).
+        """
+        if not settings.AUCTION_ENGINE_ENABLED:
+            return []
+        unflushed = []
+        for auction_id in auction_ids:
+            try:
+                if not auction_engine.evict(auction_id):
+                    unflushed.append(auction_id)
+            except Exception:
+                logger.exception("Failed to evict auction %s from the auction engine", auction_id)
+                unflushed.append(auction_id)
+        return unflushed
+
+    def _settle(self, auction_ids: List[UUID]) -> None:
+        db = SessionLocal()
+        try:
+            self.count("settlements", settlement_pipeline.run(db, auction_ids=auction_ids)["settled"])
+        except Exception:
+            db.rollback()
+            self.count("failures")
+            logger.exception("Failed to settle %d ended auctions", len(auction_ids))
+        finally:
+            db.close()
+
+    # --- القياسات ---
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.AUCTION_SCHEDULER_ENABLED,
+            **super().stats(),
+            "started": self.started,
+            "ended": self.ended,
+            "rescheduled": self.rescheduled,
+            "deferred": self.deferred,
+            "settlements": self.settlements,
+        }
+
+
+# نسخة واحدة مشتركة على مستوى العملية (تبدأ عند بدء التطبيق إذا كان AUCTION_SCHEDULER_ENABLED مفعلاً)
+auction_scheduler = AuctionScheduler(
+    horizon_seconds=settings.AUCTION_SCHEDULER_HORIZON_SECONDS,
+    refresh_seconds=settings.AUCTION_SCHEDULER_REFRESH_SECONDS,
+    batch_size=settings.AUCTION_SCHEDULER_BATCH_SIZE,
+)
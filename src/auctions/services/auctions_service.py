@@ -1,7 +1,8 @@
 # backend\src\auction\services\auctions_service.py
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta, timezone # لاستخدام التواريخ والأوقات
 
@@ -14,11 +15,18 @@ from src.lookups.schemas import lookups_schemas as schemas_lookups
 
 # استيراد دوال الـ CRUD
 from src.auctions.crud import auctions_crud
+from src.auctions.crud import async_auctions_crud # نسخ AsyncSession للقراءات العامة
 # استيراد الاستثناءات المخصصة
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.config import settings # لحد حجم صفحة التصفح واللغة الافتراضية
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
+from src.auctions.services.auction_events import publish_status # التحديثات الحية لمشتركي المزاد (WebSocket / SSE)
+from src.auctions.services.auction_scheduler import auction_scheduler # مجدول دورة حياة المزادات (بدء/انتهاء تلقائي)
+from src.auctions.services.auction_lookups import AuctionLookupSnapshot, auction_lookups # خريطة الحالات والأنواع المخزنة
+from src.db.keyset import TIMESTAMP_ID_PARSERS, decode_cursor, encode_cursor # مؤشرات الترقيم بالمفاتيح
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
 from src.users.services.core_service import get_user_profile # للتحقق من وجود البائع والمزايد
@@ -50,7 +58,9 @@ def create_new_auction_status(db: Session, status_in: schemas_lookups.AuctionSta
     """
     if db.query(models_statuses.AuctionStatus).filter(models_statuses.AuctionStatus.status_name_key == status_in.status_name_key).first():
         raise ConflictException(detail=f"حالة المزاد بمفتاح '{status_in.status_name_key}' موجودة بالفعل.")
-    return auctions_crud.create_auction_status(db=db, status_in=status_in)
+    db_status = auctions_crud.create_auction_status(db=db, status_in=status_in)
+    auction_lookups.invalidate()
+    return db_status
 
 def get_auction_status_details(db: Session, auction_status_id: int) -> models_statuses.AuctionStatus:
     """
@@ -103,7 +113,9 @@ def update_auction_status_service(db: Session, auction_status_id: int, status_in
     if status_in.status_name_key and status_in.status_name_key != db_status.status_name_key:
         if db.query(models_statuses.AuctionStatus).filter(models_statuses.AuctionStatus.status_name_key == status_in.status_name_key).first():
             raise ConflictException(detail=f"حالة المزاد بمفتاح '{status_in.status_name_key}' موجودة بالفعل.")
-    return auctions_crud.update_auction_status_crud(db=db, db_status=db_status, status_in=status_in)
+    db_status = auctions_crud.update_auction_status_crud(db=db, db_status=db_status, status_in=status_in)
+    auction_lookups.invalidate()
+    return db_status
 
 def delete_auction_status_service(db: Session, auction_status_id: int):
     """
@@ -127,6 +139,7 @@ def delete_auction_status_service(db: Session, auction_status_id: int):
        db.query(models_auction.AuctionLot).filter(models_auction.AuctionLot.lot_status_id == auction_status_id).count() > 0:
         raise ForbiddenException(detail=f"لا يمكن حذف حالة المزاد بمعرف {auction_status_id} لأنها تستخدم من قبل مزادات أو لوطات موجودة.")
     auctions_crud.delete_auction_status(db=db, db_status=db_status)
+    auction_lookups.invalidate()
     return {"message": "تم حذف حالة المزاد بنجاح."}
 
 
@@ -234,7 +247,9 @@ def create_new_auction_type(db: Session, type_in: schemas_lookups.AuctionTypeCre
     """
     if db.query(models_statuses.AuctionType).filter(models_statuses.AuctionType.type_name_key == type_in.type_name_key).first():
         raise ConflictException(detail=f"نوع المزاد بمفتاح '{type_in.type_name_key}' موجود بالفعل.")
-    return auctions_crud.create_auction_type(db=db, type_in=type_in)
+    db_type = auctions_crud.create_auction_type(db=db, type_in=type_in)
+    auction_lookups.invalidate()
+    return db_type
 
 def get_auction_type_details(db: Session, auction_type_id: int) -> models_statuses.AuctionType:
     """
@@ -287,7 +302,9 @@ def update_auction_type_service(db: Session, auction_type_id: int, type_in: sche
     if type_in.type_name_key and type_in.type_name_key != db_type.type_name_key:
         if db.query(models_statuses.AuctionType).filter(models_statuses.AuctionType.type_name_key == type_in.type_name_key).first():
             raise ConflictException(detail=f"نوع المزاد بمفتاح '{type_in.type_name_key}' موجود بالفعل.")
-    return auctions_crud.update_auction_type_crud(db=db, db_type=db_type, type_in=type_in)
+    db_type = auctions_crud.update_auction_type_crud(db=db, db_type=db_type, type_in=type_in)
+    auction_lookups.invalidate()
+    return db_type
 
 def delete_auction_type_service(db: Session, auction_type_id: int):
     """
@@ -309,6 +326,7 @@ def delete_auction_type_service(db: Session, auction_type_id: int):
     if db.query(models_auction.Auction).filter(models_auction.Auction.auction_type_id == auction_type_id).count() > 0:
         raise ForbiddenException(detail=f"لا يمكن حذف نوع المزاد بمعرف {auction_type_id} لأنه يستخدم من قبل مزادات موجودة.")
     auctions_crud.delete_auction_type(db=db, db_type=db_type)
+    auction_lookups.invalidate()
     return {"message": "تم حذف نوع المزاد بنجاح."}
 
 
@@ -387,7 +405,8 @@ def create_new_auction(db: Session, auction_in: schemas.AuctionCreate, current_u
     #       يتطلب معرفة packaging_option_id للمنتج المعروض.
 
     # TODO: إخطار وحدة الإشعارات (Module 11) بأن المزاد قد تم جدولته.
-    # TODO: جدولة مهمة خلفية (Celery Task) لبدء المزاد تلقائيًا في start_timestamp.
+    # بدء المزاد تلقائيًا في start_timestamp (المجدولات في العمليات الأخرى تلتقطه مع قراءتها الدورية)
+    auction_scheduler.schedule_auction(db_auction.auction_id, initial_auction_status.status_name_key, db_auction.start_timestamp, db_auction.end_timestamp)
 
     return db_auction
 
@@ -428,25 +447,124 @@ def get_all_auctions(db: Session, status_name_key: Optional[str] = None, type_na
     Raises:
         BadRequestException: إذا كانت مفاتيح الحالة أو النوع غير موجودة.
     """
-    auction_status_id = None
-    if status_name_key:
-        status_obj = db.query(models_statuses.AuctionStatus).filter(models_statuses.AuctionStatus.status_name_key == status_name_key).first()
-        if not status_obj:
-            raise BadRequestException(detail=f"حالة المزاد '{status_name_key}' غير موجودة.")
-        auction_status_id = status_obj.auction_status_id
-
-    auction_type_id = None
-    if type_name_key:
-        type_obj = db.query(models_statuses.AuctionType).filter(models_statuses.AuctionType.type_name_key == type_name_key).first()
-        if not type_obj:
-            raise BadRequestException(detail=f"نوع المزاد '{type_name_key}' غير موجود.")
-        auction_type_id = type_obj.auction_type_id
+    lookups = auction_lookups.get(db)
+    if not _has_lookup_keys(lookups, status_name_key, type_name_key):
+        lookups = auction_lookups.get(db, refresh=True) # مفتاح أُضيف بعد تحميل اللقطة (ربما في عملية أخرى)
+    auction_status_id, auction_type_id = _resolve_lookup_keys(lookups, status_name_key, type_name_key)
 
     return auctions_crud.get_all_auctions(db, seller_user_id=seller_user_id, auction_status_id=auction_status_id, auction_type_id=auction_type_id, skip=skip, limit=limit)
 
-def get_my_created_auctions(db: Session, current_user: User, skip: int = 0, limit: int = 100) -> List[models_auction.Auction]:
+async def get_auction_details_async(db: AsyncSession, auction_id: UUID) -> models_auction.Auction:
+    """النسخة غير المتزامنة من get_auction_details."""
+    auction = await async_auctions_crud.get_auction(db, auction_id=auction_id)
+    if not auction:
+        raise NotFoundException(detail=f"المزاد بمعرف {auction_id} غير موجود.")
+    return auction
+
+async def get_all_auctions_async(db: AsyncSession, status_name_key: Optional[str] = None, type_name_key: Optional[str] = None, seller_user_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[models_auction.Auction]:
+    """النسخة غير المتزامنة من get_all_auctions (نفس التصفية ونفس الاستثناءات)."""
+    _, (auction_status_id, auction_type_id) = await _resolve_lookup_keys_async(db, status_name_key, type_name_key)
+    return await async_auctions_crud.get_all_auctions(db, seller_user_id=seller_user_id, auction_status_id=auction_status_id, auction_type_id=auction_type_id, skip=skip, limit=limit)
+
+async def get_auction_summaries_async(db: AsyncSession, status_name_key: Optional[str] = None, type_name_key: Optional[str] = None, seller_user_id: Optional[UUID] = None, language_code: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    النسخة المختصرة من get_all_auctions_async لقوائم العرض: ملخصات المزادات (AuctionSummary) كقواميس
+    من استعلام أعمدة واحد، بدون كائنات ORM وعلاقاتها.
+
+    Args:
+        db (AsyncSession): جلسة قاعدة البيانات غير المتزامنة.
+        status_name_key (Optional[str]): تصفية حسب مفتاح اسم الحالة.
+        type_name_key (Optional[str]): تصفية حسب مفتاح اسم النوع.
+        seller_user_id (Optional[UUID]): تصفية حسب معرف البائع.
+        language_code (Optional[str]): لغة العنوان المترجم (DEFAULT_LANGUAGE إذا لم تُحدد).
+        skip (int): عدد السجلات لتخطيها.
+        limit (int): الحد الأقصى لعدد السجلات.
+
+    Returns:
+        List[Dict[str, Any]]: ملخصات المزادات بحقول AuctionSummary.
+
+    Raises:
+        BadRequestException: إذا كانت مفاتيح الحالة أو النوع غير موجودة.
+    """
+    lookups, (auction_status_id, auction_type_id) = await _resolve_lookup_keys_async(db, status_name_key, type_name_key)
+    rows = await async_auctions_crud.get_auction_summaries(
+        db, language_code or settings.DEFAULT_LANGUAGE, seller_user_id=seller_user_id, auction_status_id=auction_status_id, auction_type_id=auction_type_id, skip=skip, limit=limit
+    )
+    return auction_summary_dicts(rows, lookups)
+
+async def browse_auctions_async(db: AsyncSession, status_name_key: Optional[str] = None, type_name_key: Optional[str] = None, seller_user_id: Optional[UUID] = None, language_code: Optional[str] = None, cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
     """
-    خدمة لجلب جميع المزادات التي أنشأها البائع الحالي.
+    خدمة لتصفح المزادات مرتبة بموعد الانتهاء (الأقرب أولاً) بترقيم المؤشر بدلاً من skip:
+    كل صفحة تبدأ من (end_timestamp, auction_id) لآخر مزاد في الصفحة السابقة على فهرس بنفس الترتيب،
+    فتكلفة الصفحة العميقة مثل الأولى. تعيد ملخصات المزادات (AuctionSummary) كقواميس بدون كائنات ORM.
+
+    Args:
+        db (AsyncSession): جلسة قاعدة البيانات غير المتزامنة.
+        status_name_key (Optional[str]): تصفية حسب مفتاح اسم الحالة.
+        type_name_key (Optional[str]): تصفية حسب مفتاح اسم النوع.
+        seller_user_id (Optional[UUID]): تصفية حسب معرف البائع.
+        language_code (Optional[str]): لغة العنوان المترجم (DEFAULT_LANGUAGE إذا لم تُحدد).
+        cursor (Optional[str]): next_cursor من الصفحة السابقة (None للصفحة الأولى).
+        limit (int): عدد المزادات في الصفحة (بحد أقصى AUCTION_BROWSE_MAX_PAGE_SIZE).
+
+    Returns:
+        Dict[str, Any]: صفحة بحقول AuctionBrowsePage (items و next_cursor).
+
+    Raises:
+        BadRequestException: إذا كانت مفاتيح الحالة أو النوع غير موجودة، أو كان المؤشر تالفًا.
+    """
+    lookups, (auction_status_id, auction_type_id) = await _resolve_lookup_keys_async(db, status_name_key, type_name_key)
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, TIMESTAMP_ID_PARSERS)
+        except ValueError:
+            raise BadRequestException(detail="مؤشر الصفحة غير صالح.")
+    limit = max(1, min(limit, settings.AUCTION_BROWSE_MAX_PAGE_SIZE))
+
+    rows = await async_auctions_crud.browse_auctions(
+        db, language_code or settings.DEFAULT_LANGUAGE, auction_status_id=auction_status_id, auction_type_id=auction_type_id, seller_user_id=seller_user_id, after=after, limit=limit + 1
+    )
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].end_timestamp, page[-1].auction_id) if len(rows) > limit else None
+    return {"items": auction_summary_dicts(page, lookups), "next_cursor": next_cursor}
+
+def auction_summary_dicts(rows, lookups: AuctionLookupSnapshot) -> List[Dict[str, Any]]:
+    """يحول صفوف auction_summary_query إلى قواميس AuctionSummary ويضيف مفتاحي الحالة والنوع من اللقطة المخزنة."""
+    return [
+        dict(
+            row._mapping,
+            auction_status_key=lookups.status_keys.get(row.auction_status_id),
+            auction_type_key=lookups.type_keys.get(row.auction_type_id),
+        )
+        for row in rows
+    ]
+
+def _has_lookup_keys(lookups: AuctionLookupSnapshot, status_name_key: Optional[str], type_name_key: Optional[str]) -> bool:
+    """هل مفتاحا الحالة والنوع (إن وُجدا) موجودان في لقطة الخريطة المخزنة؟"""
+    return (not status_name_key or status_name_key in lookups.status_ids) and (not type_name_key or type_name_key in lookups.type_ids)
+
+def _resolve_lookup_keys(lookups: AuctionLookupSnapshot, status_name_key: Optional[str], type_name_key: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """يحول مفتاحي الحالة والنوع إلى معرفاتهما من لقطة الخريطة المخزنة."""
+    if status_name_key and status_name_key not in lookups.status_ids:
+        raise BadRequestException(detail=f"حالة المزاد '{status_name_key}' غير موجودة.")
+    if type_name_key and type_name_key not in lookups.type_ids:
+        raise BadRequestException(detail=f"نوع المزاد '{type_name_key}' غير موجود.")
+    return (
+        lookups.status_ids[status_name_key] if status_name_key else None,
+        lookups.type_ids[type_name_key] if type_name_key else None,
+    )
+
+async def _resolve_lookup_keys_async(db: AsyncSession, status_name_key: Optional[str], type_name_key: Optional[str]) -> Tuple[AuctionLookupSnapshot, Tuple[Optional[int], Optional[int]]]:
+    """النسخة غير المتزامنة: تعيد اللقطة المستخدمة مع المعرفات."""
+    lookups = await auction_lookups.get_async(db)
+    if not _has_lookup_keys(lookups, status_name_key, type_name_key):
+        lookups = await auction_lookups.get_async(db, refresh=True) # مفتاح أُضيف بعد تحميل اللقطة (ربما في عملية أخرى)
+    return lookups, _resolve_lookup_keys(lookups, status_name_key, type_name_key)
+
+def get_my_created_auctions(db: Session, current_user: User, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    خدمة لجلب جميع المزادات التي أنشأها البائع الحالي كملخصات (AuctionSummary) بلغته المفضلة.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
@@ -455,13 +573,14 @@ def get_my_created_auctions(db: Session, current_user: User, skip: int = 0, limi
         limit (int): الحد الأقصى لعدد السجلات.
 
     Returns:
-        List[models_auction.Auction]: قائمة بكائنات المزادات.
+        List[Dict[str, Any]]: ملخصات المزادات بحقول AuctionSummary.
     """
     # التحقق من أن المستخدم لديه صلاحية لعرض المزادات التي أنشأها.
     # هذه الدالة تتطلب صلاحية 'AUCTION_CREATE_OWN' أو 'AUCTION_MANAGE_OWN'
     # TODO: إضافة تحقق صلاحية أكثر صرامة إذا كانت 'AUCTION_VIEW_OWN' موجودة.
 
-    return auctions_crud.get_all_auctions(db, seller_user_id=current_user.user_id, skip=skip, limit=limit)
+    rows = auctions_crud.get_auction_summaries(db, current_user.preferred_language_code or settings.DEFAULT_LANGUAGE, seller_user_id=current_user.user_id, skip=skip, limit=limit)
+    return auction_summary_dicts(rows, auction_lookups.get(db))
 
 
 def update_auction(db: Session, auction_id: UUID, auction_in: schemas.AuctionUpdate, current_user: User) -> models_auction.Auction:
@@ -488,7 +607,7 @@ def update_auction(db: Session, auction_id: UUID, auction_in: schemas.AuctionUpd
 
     # 1. التحقق من صلاحيات المستخدم: يجب أن يكون البائع المالك أو مسؤولاً.
     is_owner = db_auction.seller_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY")
 
     if not (is_owner or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بتحديث هذا المزاد.")
@@ -516,7 +635,9 @@ def update_auction(db: Session, auction_id: UUID, auction_in: schemas.AuctionUpd
         #       if new_status.status_name_key == "CANCELLED": # هذا يجب أن يتم عبر cancel_auction
         #           raise BadRequestException("يرجى استخدام نقطة نهاية الإلغاء لإلغاء المزاد.")
 
-    return auctions_crud.update_auction(db=db, db_auction=db_auction, auction_in=auction_in)
+    db_auction = auctions_crud.update_auction(db=db, db_auction=db_auction, auction_in=auction_in)
+    auction_scheduler.schedule_auction(db_auction.auction_id, db_auction.auction_status.status_name_key, db_auction.start_timestamp, db_auction.end_timestamp)
+    return db_auction
 
 def cancel_auction(db: Session, auction_id: UUID, current_user: User, reason: Optional[str] = None) -> models_auction.Auction:
     """
@@ -542,7 +663,7 @@ def cancel_auction(db: Session, auction_id: UUID, current_user: User, reason: Op
 
     # 1. التحقق من صلاحيات المستخدم: يجب أن يكون البائع المالك أو مسؤولاً.
     is_owner = db_auction.seller_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY")
 
     if not (is_owner or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بإلغاء هذا المزاد.")
@@ -561,6 +682,7 @@ def cancel_auction(db: Session, auction_id: UUID, current_user: User, reason: Op
 
     # 4. تحديث حالة المزاد
     auctions_crud.update_auction_status(db=db, db_auction=db_auction, new_status_id=canceled_status.auction_status_id)
+    publish_status(auction_id, canceled_status.status_name_key)
 
     # TODO: هـام: إعادة الكميات المحجوزة من المخزون إلى المخزون المتاح (inventory_service).
     #       إذا تم حجز الكمية عند إنشاء المزاد.
@@ -596,7 +718,7 @@ def create_auction_lot(db: Session, lot_in: schemas.AuctionLotCreate, current_us
     # 1. التحقق من وجود المزاد الأم وصلاحية المستخدم (البائع أو المسؤول)
     db_auction = get_auction_details(db, lot_in.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإضافة لوط لهذا المزاد.")
 
     # 2. التحقق من أن المزاد في حالة تسمح بإضافة لوطات (عادةً 'SCHEDULED' وقبل بدء المزاد)
@@ -688,7 +810,7 @@ def update_auction_lot(db: Session, lot_id: UUID, lot_in: schemas.AuctionLotUpda
     # 1. التحقق من ملكية البائع للمزاد الأم وصلاحياته
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث لوت المزاد هذا.")
 
     # 2. التحقق من أن المزاد في حالة تسمح بالتعديل (عادةً 'SCHEDULED')
@@ -731,7 +853,7 @@ def delete_auction_lot(db: Session, lot_id: UUID, current_user: User):
     # 1. التحقق من ملكية البائع للمزاد الأم وصلاحياته
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف لوت المزاد هذا.")
 
     # 2. التحقق من أن المزاد في حالة تسمح بالحذف (عادةً 'SCHEDULED' وقبل بدء المزاد)
@@ -777,7 +899,7 @@ def create_auction_lot_translation(db: Session, lot_id: UUID, trans_in: schemas.
     db_lot = get_auction_lot_details(db, lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإضافة ترجمة لهذا اللوت.")
 
     # 2. التحقق من عدم وجود ترجمة بنفس اللغة للوت
@@ -831,7 +953,7 @@ def update_auction_lot_translation(db: Session, lot_id: UUID, language_code: str
     db_lot = get_auction_lot_details(db, lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث ترجمة هذا اللوت.")
 
     return auctions_crud.update_auction_lot_translation(db=db, db_translation=db_translation, trans_in=trans_in)
@@ -860,7 +982,7 @@ def delete_auction_lot_translation(db: Session, lot_id: UUID, language_code: str
     db_lot = get_auction_lot_details(db, lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف ترجمة هذا اللوت.")
 
     auctions_crud.delete_auction_lot_translation(db=db, db_translation=db_translation)
@@ -893,7 +1015,7 @@ def create_lot_product(db: Session, lot_product_in: schemas.LotProductCreate, cu
     db_lot = get_auction_lot_details(db, lot_product_in.lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإضافة منتج لهذا اللوت.")
 
     # 2. التحقق من وجود خيار التعبئة
@@ -965,7 +1087,7 @@ def update_lot_product(db: Session, lot_product_id: int, lot_product_in: schemas
     db_lot = get_auction_lot_details(db, db_lot_product.lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث منتج اللوت هذا.")
 
     # التحقق من الكمية
@@ -997,7 +1119,7 @@ def delete_lot_product(db: Session, lot_product_id: int, current_user: User):
     db_lot = get_auction_lot_details(db, db_lot_product.lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف منتج اللوت هذا.")
 
     auctions_crud.delete_lot_product(db=db, db_lot_product=db_lot_product)
@@ -1029,7 +1151,7 @@ def create_lot_image(db: Session, lot_image_in: schemas.LotImageCreate, current_
     db_lot = get_auction_lot_details(db, lot_image_in.lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإضافة صورة لهذا اللوت.")
 
     # 2. التحقق من وجود الصورة الأساسية (Image)
@@ -1096,7 +1218,7 @@ def update_lot_image(db: Session, lot_image_id: int, lot_image_in: schemas.LotIm
     db_lot = get_auction_lot_details(db, db_lot_image.lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث صورة اللوت هذه.")
 
     return auctions_crud.update_lot_image(db=db, db_lot_image=db_lot_image, lot_image_in=lot_image_in)
@@ -1124,7 +1246,7 @@ def delete_lot_image(db: Session, lot_image_id: int, current_user: User):
     db_lot = get_auction_lot_details(db, db_lot_image.lot_id)
     db_auction = get_auction_details(db, db_lot.auction_id)
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف صورة اللوت هذه.")
 
     auctions_crud.delete_lot_image(db=db, db_lot_image=db_lot_image)
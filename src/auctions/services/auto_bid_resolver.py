@@ -0,0 +1,101 @@
+# backend\src\auctions\services\auto_bid_resolver.py
+# ----------------------------------------------------------------------------------------------------
+# حل المزايدات الآلية (Proxy bidding) بأسلوب السعر الثاني (Second-price):
+# بدلاً من تنفيذ مزايدة تلو الأخرى بين الإعدادات الآلية حتى يتوقف أحدها، تُحسب النتيجة النهائية في مرور واحد:
+# - الفائز هو صاحب أعلى حد أقصى (max_bid_amount_per_unit)، وعند التساوي الأقدم (القائد الحالي ثم الأسبق إنشاءً).
+# - السعر النهائي = min(حد الفائز، ثاني أعلى حد + زيادة الفائز)، وليس أقل من المزايدة المطلوبة.
+# - المزايدات الناتجة هي الحد الأدنى: مزايدة المنافس الثاني بحده الأقصى (إن تجاوز السعر الحالي) ثم مزايدة الفائز.
+# التكلفة: مرور خطي على الإعدادات + اختيار أعلى اثنين (heapq)، أي O(n) لكل حل.
+# ----------------------------------------------------------------------------------------------------
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class ProxyBid:
+    """
+    إعداد مزايدة آلية نشط كما يحتاجه الحل. الحقول بنفس أسماء أعمدة AutoBidSetting،
+    فتصلح صفوف bidding_crud.get_active_proxy_bids مباشرة في مكانه.
+    """
+    user_id: UUID
+    max_bid_amount_per_unit: Decimal
+    increment_amount: Optional[Decimal]
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class ResolvedBid:
+    """مزايدة آلية ناتجة عن الحل (بالترتيب؛ آخرها هو القائد الجديد)."""
+    bidder_user_id: UUID
+    amount: Decimal
+
+
+def _step(proxy: Optional[ProxyBid], minimum_increment: Decimal) -> Decimal:
+    if proxy is None or proxy.increment_amount is None:
+        return minimum_increment
+    return max(proxy.increment_amount, minimum_increment)
+
+
+def resolve_proxy_bids(
+    current_amount: Optional[Decimal],
+    current_leader: Optional[UUID],
+    required_amount: Decimal,
+    minimum_increment: Decimal,
+    proxies: Iterable[ProxyBid],
+) -> List[ResolvedBid]:
+    """
+    يحسب المزايدات الآلية اللازمة بعد أي تغيير (مزايدة يدوية جديدة أو إعداد آلي جديد).
+
+    Args:
+        current_amount: أعلى مزايدة حالية (None إذا لم توجد مزايدات).
+        current_leader: صاحب أعلى مزايدة حالية.
+        required_amount: أقل مزايدة مقبولة الآن (انظر bid_rules.required_bid_amount).
+        minimum_increment: الحد الأدنى للزيادة في المزاد.
+        proxies: الإعدادات الآلية النشطة للمزاد.
+
+    Returns:
+        List[ResolvedBid]: المزايدات الآلية بالترتيب، أو قائمة فارغة إذا بقي القائد الحالي بنفس السعر.
+    """
+    leader_proxy: Optional[ProxyBid] = None
+    challengers: List[ProxyBid] = []
+    for proxy in proxies:
+        if proxy.user_id == current_leader:
+            leader_proxy = proxy
+        elif proxy.max_bid_amount_per_unit >= required_amount:
+            challengers.append(proxy)
+    if not challengers:
+        return []
+
+    leader_max = current_amount
+    if leader_proxy is not None and (leader_max is None or leader_proxy.max_bid_amount_per_unit > leader_max):
+        leader_max = leader_proxy.max_bid_amount_per_unit
+
+    ranked = heapq.nsmallest(2, challengers, key=lambda proxy: (-proxy.max_bid_amount_per_unit, proxy.created_at))
+    best = ranked[0]
+    runner_up = ranked[1] if len(ranked) > 1 else None
+
+    # 1. القائد الحالي يدافع (يفوز عند التساوي لأنه الأسبق): المنافس يُدفع إلى حده الأقصى
+    if current_leader is not None and leader_max is not None and leader_max >= best.max_bid_amount_per_unit:
+        price = min(leader_max, best.max_bid_amount_per_unit + _step(leader_proxy, minimum_increment))
+        return [ResolvedBid(best.user_id, best.max_bid_amount_per_unit), ResolvedBid(current_leader, price)]
+
+    # 2. أفضل منافس يتصدر: السعر يحدده ثاني أعلى حد (القائد السابق أو المنافس الثاني)
+    second_user, second_max = None, None
+    if runner_up is not None:
+        second_user, second_max = runner_up.user_id, runner_up.max_bid_amount_per_unit
+    if current_leader is not None and leader_max is not None and (second_max is None or leader_max > second_max):
+        second_user, second_max = current_leader, leader_max
+
+    resolved: List[ResolvedBid] = []
+    price = required_amount
+    if second_max is not None:
+        if current_amount is None or second_max > current_amount:
+            resolved.append(ResolvedBid(second_user, second_max))
+        price = max(required_amount, min(best.max_bid_amount_per_unit, second_max + _step(best, minimum_increment)))
+    resolved.append(ResolvedBid(best.user_id, price))
+    return resolved
@@ -0,0 +1,201 @@
+# backend\src\auctions\services\bid_notifications.py
+# ----------------------------------------------------------------------------------------------------
+# توزيع إشعارات المزايدات (Fan-out): إخطار المزايدين الذين تم تجاوزهم ومراقبي المزاد (auction_watchlists).
+# - مسار المزايدة لا ينتظر الإشعارات أبدًا: publish() تدمج الحدث في خانة المزاد في الذاكرة وتعود فورًا.
+# - الدمج (Coalescing): كل مزايدات المزاد خلال BID_NOTIFICATION_WINDOW_SECONDS تصبح حدثًا واحدًا (أعلى مبلغ،
+#   المتصدر الأخير، ومجموعة من تم تجاوزهم)، فيستلم كل مستخدم إشعارًا واحدًا لكل مزاد في النافذة مهما تعددت المزايدات.
+# - خيط في الخلفية يفرغ الخانات كل نافذة: استعلام واحد لمراقبي كل مزادات الدفعة عبر فهرس (auction_id, user_id)،
+#   ثم notification_dispatcher يصيّر القوالب مرة لكل (مزاد، لغة) ويحفظ السجلات دفعة واحدة ويرسلها بحد تزامن.
+# - من تم تجاوزه يستلم AUCTION_OUTBID (وليس AUCTION_WATCHLIST_BID أيضًا)، والمتصدر الحالي لا يُخطر.
+# الإشعارات بأفضل جهد: الخانات في ذاكرة العملية (تضيع عند انهيارها)، والزائد عن BID_NOTIFICATION_MAX_PENDING_AUCTIONS يُسقط ويُحصى.
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.exceptions import ConflictException
+from src.db.session import SessionLocal
+from src.auctions.crud import auctions_crud, bidding_crud
+from src.communications.services.notification_dispatcher import NotificationDispatcher, NotificationRequest, notification_dispatcher
+
+logger = logging.getLogger(__name__)
+
+OUTBID_TEMPLATE_KEY = "AUCTION_OUTBID"
+WATCHLIST_TEMPLATE_KEY = "AUCTION_WATCHLIST_BID"
+
+
+@dataclass
+class _PendingAuction:
+    """حالة مزاد واحد المدمجة منذ آخر تفريغ."""
+    amount: Decimal
+    leader_user_id: Optional[UUID]
+    outbid_user_ids: Set[UUID] = field(default_factory=set)
+    events: int = 1
+
+
+class BidNotificationFanout:
+    """يدمج أحداث المزايدات لكل مزاد ويوزعها على المتأثرين دفعةً كل نافذة، ويحتفظ بقياساته في هذه العملية."""
+
+    def __init__(self, window_seconds: float, max_pending_auctions: int, dispatcher: NotificationDispatcher, enabled: bool = True):
+        self.window_seconds = window_seconds
+        self.max_pending_auctions = max_pending_auctions
+        self.dispatcher = dispatcher
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._pending: Dict[UUID, _PendingAuction] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self.events = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.notifications = 0
+        self.last_flush_ms = 0.0
+
+    # --- مسار المزايدة ---
+
+    def publish(self, auction_id: UUID, amount, leader_user_id: Optional[UUID], outbid_user_ids: Iterable[UUID] = ()) -> None:
+        """يسجل مزايدة مقبولة (بعد commit أو قبولها في المحرك) للتوزيع لاحقًا. لا تصل إلى قاعدة البيانات ولا ترفع استثناءات."""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                pending = self._pending.get(auction_id)
+                if pending is None:
+                    if len(self._pending) >= self.max_pending_auctions:
+                        self.count("dropped")
+                        return
+                    self._pending[auction_id] = _PendingAuction(amount=amount, leader_user_id=leader_user_id, outbid_user_ids=set(outbid_user_ids))
+                else:
+                    # أحداث نفس المزاد قد تصل بغير ترتيبها من عدة خيوط: الأعلى مبلغًا هو الأحدث
+                    if amount is not None and (pending.amount is None or amount >= pending.amount):
+                        pending.amount, pending.leader_user_id = amount, leader_user_id
+                    pending.outbid_user_ids.update(outbid_user_ids)
+                    pending.events += 1
+                    self.count("coalesced")
+            self.count("events")
+            self._ensure_worker()
+        except Exception:
+            logger.exception("Failed to queue bid notifications for auction %s", auction_id)
+
+    # --- التوزيع ---
+
+    def flush(self, db: Session) -> Dict[str, Any]:
+        """
+        يفرغ الأحداث المدمجة ويوزع إشعاراتها (يستدعيه خيط الخلفية كل نافذة، ويمكن استدعاؤه مباشرة).
+
+        Returns:
+            Dict[str, Any]: تقرير التوزيع: عدد المزادات والإشعارات وتقرير notification_dispatcher.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return {"auctions": 0, "notifications": 0}
+        started = time.perf_counter()
+        requests = self._requests(db, pending)
+        report = self.dispatcher.dispatch(db, requests, lambda db, language_code, auction_ids: self._params(db, language_code, auction_ids, pending))
+        flush_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self.flushes += 1
+            self.notifications += len(requests)
+            self.last_flush_ms = flush_ms
+        return {"auctions": len(pending), "notifications": len(requests), "dispatch": report}
+
+    def _requests(self, db: Session, pending: Dict[UUID, _PendingAuction]) -> List[NotificationRequest]:
+        """طلب إشعار واحد لكل (مستخدم، مزاد): التجاوز أولاً، ثم المراقبون الآخرون؛ والمتصدر مستبعد."""
+        watchers: Dict[UUID, Set[UUID]] = {}
+        for row in bidding_crud.get_auction_watchers(db, list(pending)):
+            watchers.setdefault(row.auction_id, set()).add(row.user_id)
+
+        requests = []
+        for auction_id, state in pending.items():
+            outbid = state.outbid_user_ids - {state.leader_user_id}
+            related = str(auction_id)
+            requests.extend(NotificationRequest(user_id, OUTBID_TEMPLATE_KEY, auction_id, "AUCTION", related) for user_id in outbid)
+            for user_id in watchers.get(auction_id, set()) - outbid - {state.leader_user_id}:
+                requests.append(NotificationRequest(user_id, WATCHLIST_TEMPLATE_KEY, auction_id, "AUCTION", related))
+        return requests
+
+    @staticmethod
+    def _params(db: Session, language_code: str, auction_ids: List[Hashable], pending: Dict[UUID, _PendingAuction]) -> Dict[Hashable, Dict[str, Any]]:
+        """معاملات القوالب لكل مزاد بلغة واحدة: العنوان المترجم وأعلى مبلغ."""
+        titles = auctions_crud.get_auction_titles(db, auction_ids, language_code)
+        return {
+            auction_id: {
+                "auction_title": titles.get(auction_id) or "",
+                "amount": f"{pending[auction_id].amount:,.2f}" if pending[auction_id].amount is not None else "",
+            }
+            for auction_id in auction_ids
+        }
+
+    # --- خيط الخلفية ---
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="bid-notifications", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.window_seconds)
+            if not self._pending:
+                continue
+            db = SessionLocal()
+            try:
+                self.flush(db)
+            except ConflictException as exc: # بيانات مرجعية ناقصة (القناة أو حالات التسليم)
+                db.rollback()
+                self.count("failed_flushes")
+                logger.warning("Bid notification fan-out skipped: %s", exc.detail)
+            except Exception:
+                # الدفعة تُسقط (الإشعارات بأفضل جهد)؛ الأحداث الجديدة تُوزع في النافذة التالية
+                db.rollback()
+                self.count("failed_flushes")
+                logger.exception("Bid notification fan-out failed")
+            finally:
+                db.close()
+
+    # --- القياسات ---
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending_auctions = len(self._pending)
+        with self._stats_lock:
+            return {
+                "enabled": self.enabled,
+                "window_seconds": self.window_seconds,
+                "pending_auctions": pending_auctions,
+                "events": self.events,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "notifications": self.notifications,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "dispatcher": self.dispatcher.stats(),
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+bid_notifications = BidNotificationFanout(
+    window_seconds=settings.BID_NOTIFICATION_WINDOW_SECONDS,
+    max_pending_auctions=settings.BID_NOTIFICATION_MAX_PENDING_AUCTIONS,
+    dispatcher=notification_dispatcher,
+    enabled=settings.BID_NOTIFICATIONS_ENABLED,
+)
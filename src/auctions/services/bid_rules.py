@@ -0,0 +1,66 @@
+# backend\src\auctions\services\bid_rules.py
+# ----------------------------------------------------------------------------------------------------
+# قواعد قبول المزايدة المشتركة بين مسار قاعدة البيانات (bidding_service.place_bid)
+# ومحرك المزادات في الذاكرة (auction_engine). تعمل على أي كائن يوفر حقول إسقاط المزاد:
+# status_name_key, end_timestamp, seller_user_id, starting_price_per_unit, minimum_bid_increment,
+# current_highest_bid_amount_per_unit.
+# ----------------------------------------------------------------------------------------------------
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from src.core.config import settings
+from src.exceptions import BadRequestException, ForbiddenException
+
+
+def required_bid_amount(state) -> Decimal:
+    """أقل مزايدة مقبولة: (أعلى مزايدة حالية أو سعر البداية) + الحد الأدنى للزيادة."""
+    return (state.current_highest_bid_amount_per_unit or state.starting_price_per_unit) + state.minimum_bid_increment
+
+
+def bidding_is_open(state, now: datetime) -> bool:
+    """هل يقبل المزاد مزايدات الآن (نشط ولم ينتهِ وقته)؟"""
+    end_timestamp = state.end_timestamp
+    if end_timestamp.tzinfo is None:
+        end_timestamp = end_timestamp.replace(tzinfo=timezone.utc)
+    return state.status_name_key == "ACTIVE" and end_timestamp > now
+
+
+def anti_sniping_end_timestamp(end_timestamp: datetime, now: datetime) -> Optional[datetime]:
+    """
+    منع القنص (Anti-sniping): مزايدة مقبولة قبل النهاية بأقل من AUCTION_ANTI_SNIPING_SECONDS
+    تمدد نهاية المزاد إلى (الآن + المدة)، فيبقى للمزايدين الآخرين وقت للرد.
+    يعيد النهاية الجديدة، أو None إذا لم يلزم التمديد.
+    """
+    if settings.AUCTION_ANTI_SNIPING_SECONDS <= 0:
+        return None
+    if end_timestamp.tzinfo is None:
+        end_timestamp = end_timestamp.replace(tzinfo=timezone.utc)
+    extended = now + timedelta(seconds=settings.AUCTION_ANTI_SNIPING_SECONDS)
+    return extended if extended > end_timestamp else None
+
+
+def validate_bid_against_state(state, bid_amount: Decimal, bidder_user_id: UUID, now: datetime) -> None:
+    """يتحقق من المزايدة مقابل إسقاط المزاد، ويطلق الاستثناء المناسب عند الرفض."""
+    # 1. التحقق من حالة المزاد ووقته
+    if state.status_name_key != "ACTIVE":
+        raise BadRequestException(detail=f"المزاد ليس نشطًا حاليًا، حالته: {state.status_name_key}.")
+    end_timestamp = state.end_timestamp
+    if end_timestamp.tzinfo is None:
+        end_timestamp = end_timestamp.replace(tzinfo=timezone.utc)
+    if end_timestamp <= now:
+        raise BadRequestException(detail="انتهى وقت المزاد.")
+
+    # 2. التحقق من أن المزايد ليس بائع المزاد
+    if state.seller_user_id == bidder_user_id:
+        raise ForbiddenException(detail="لا يمكن لبائع المزاد المزايدة في مزاده الخاص.")
+
+    # 3. التحقق من قيمة المزايدة
+    if bid_amount <= 0:
+        raise BadRequestException(detail="قيمة المزايدة يجب أن تكون أكبر من صفر.")
+
+    required_bid = required_bid_amount(state)
+    if bid_amount < required_bid:
+        raise BadRequestException(detail=f"يجب أن تكون مزايدتك أعلى من السعر الحالي بمقدار لا يقل عن {state.minimum_bid_increment} ريال. المزايدة المطلوبة هي: {required_bid} ريال.")
@@ -1,10 +1,16 @@
 # backend\src\auction\services\bidding_service.py
 
+import time
+from decimal import Decimal
+
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.exc import OperationalError
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
 
+from src.core.config import settings
+
 # استيراد المودلز
 from src.auctions.models import bidding_models as models_bidding
 from src.auctions.models import auctions_models as models_auction # لـ Auction في العلاقات
@@ -13,13 +19,21 @@ from src.users.models.core_models import User # لـ User في العلاقات
 from src.auctions.schemas import bidding_schemas as schemas
 # استيراد دوال الـ CRUD
 from src.auctions.crud import bidding_crud
+from src.auctions.services.bid_rules import anti_sniping_end_timestamp, bidding_is_open, required_bid_amount, validate_bid_against_state # قواعد قبول المزايدة المشتركة مع محرك المزادات
+from src.auctions.services.auto_bid_resolver import ResolvedBid, resolve_proxy_bids # حل المزايدات الآلية في مرور واحد
+from src.auctions.services.auction_engine import auction_engine # محرك المزادات في الذاكرة (اختياري)
+from src.auctions.services.auction_events import publish_bid_state # التحديثات الحية لمشتركي المزاد (WebSocket / SSE)
+from src.auctions.services.bid_notifications import bid_notifications # إشعارات من تم تجاوزهم ومراقبي المزاد
 # استيراد الاستثناءات المخصصة
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
 from src.auctions.services.auctions_service import get_auction_details # للتحقق من وجود المزاد
+from src.auctions.services.auctions_service import auction_summary_dicts # ملخصات المزادات (AuctionSummary) لقائمة المراقبة
+from src.auctions.services.auction_lookups import auction_lookups # خريطة الحالات والأنواع المخزنة
 from src.users.services.core_service import get_user_profile # للتحقق من وجود المستخدم
 # TODO: خدمة المحفظة (wallet_service) من Module 8 للتحقق من الرصيد وحجزه.
 # TODO: خدمة الإشعارات (notifications_service) من Module 11 لإرسال الإشعارات.
@@ -114,7 +128,7 @@ def get_all_auction_participants_for_auction(db: Session, auction_id: UUID, curr
     db_auction = get_auction_details(db, auction_id)
     # التحقق من الصلاحيات: البائع المالك أو المسؤول
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك برؤية المشاركين في هذا المزاد.")
     return bidding_crud.get_all_auction_participants_for_auction(db, auction_id=auction_id)
 
@@ -142,7 +156,7 @@ def get_bid_details_service(db: Session, bid_id: int, current_user: Optional[Use
     # التحقق من الصلاحيات: صاحب المزايدة أو صاحب المزاد أو مسؤول
     is_bidder = current_user and db_bid.bidder_user_id == current_user.user_id
     is_auction_owner = current_user and db_bid.auction.seller_user_id == current_user.user_id # يتطلب تحميل المزاد في CRUD
-    is_admin = current_user and any(p.permission_name_key == "ADMIN_AUCTION_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = current_user and permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_VIEW_ANY")
 
     # TODO: يمكن أن تكون المزايدة الأخيرة مرئية للجميع في بعض أنواع المزادات.
     if not (is_bidder or is_auction_owner or is_admin):
@@ -176,7 +190,7 @@ def update_auction_participant_status(db: Session, auction_participant_id: int,
 
     # التحقق من الصلاحيات: يجب أن يكون بائع المزاد أو مسؤولاً.
     if db_auction.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث حالة مشارك المزاد هذا.")
 
     # TODO: التحقق من أن 'new_status' هي قيمة صالحة من قائمة الحالات المسموح بها ('REGISTERED', 'APPROVED_TO_BID', 'BLOCKED').
@@ -190,11 +204,20 @@ def update_auction_participant_status(db: Session, auction_participant_id: int,
 # --- خدمات المزايدات (Bid) ---
 # ==========================================================
 
+# أعمدة المزايدة التي يعاد تحميلها بعد commit (بدون العلاقات ذات التحميل selectin)
+_BID_COLUMNS = list(models_bidding.Bid.__table__.columns.keys())
+
 def place_bid(db: Session, bid_in: schemas.BidCreate, current_user: User) -> models_bidding.Bid:
     """
     خدمة لتقديم مزايدة جديدة على مزاد.
     تتضمن التحقق من المزاد، المستخدم، قواعد المزايدة، والرصيد المالي.
 
+    تعمل على إسقاط مصغر للمزاد (بدون اللوطات والترجمات والصور) وترفع أعلى مزايدة بتحديث شرطي ذري،
+    فلا تضيع مزايدات متزامنة على نفس المزاد. إذا سبقتها مزايدة أخرى يعاد التحقق من الحالة الجديدة؛
+    وتعارضات المعاملات العابرة (Deadlock / Serialization) يعاد تنفيذها حتى BID_PLACEMENT_MAX_ATTEMPTS.
+    المزايدات الآلية التي تتجاوزها تُحل في نفس المعاملة (auto_bid_resolver)، وعندها تُعاد المزايدة بحالة OUTBID.
+    عند تفعيل AUCTION_ENGINE_ENABLED يتم التحقق والقبول في محرك المزادات في الذاكرة، والحفظ مؤجل (bid_id = None).
+
     Args:
         db (Session): جلسة قاعدة البيانات.
         bid_in (schemas.BidCreate): بيانات المزايدة للإنشاء.
@@ -207,12 +230,44 @@ def place_bid(db: Session, bid_in: schemas.BidCreate, current_user: User) -> mod
         NotFoundException: إذا لم يتم العثور على المزاد أو اللوت.
         ForbiddenException: إذا لم يكن المستخدم مؤهلاً للمزايدة، أو رصيده غير كافٍ.
         BadRequestException: إذا كانت قيمة المزايدة غير صالحة (أقل من الحد الأدنى للزيادة، أو أقل من السعر الحالي).
-        ConflictException: إذا كان المزاد ليس نشطًا.
+        ConflictException: إذا تعذر تنفيذ المزايدة بسبب ضغط التعارضات على المزاد.
+    """
+    # المزايد هو دائمًا المستخدم الحالي، بغض النظر عن bidder_user_id المرسل
+    bid_in = bid_in.model_copy(update={"bidder_user_id": current_user.user_id})
+    if settings.AUCTION_ENGINE_ENABLED:
+        return auction_engine.place_bid(bid_in)
+
+    max_attempts = max(settings.BID_PLACEMENT_MAX_ATTEMPTS, 1)
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            db_bid = _try_place_bid(db, bid_in, current_user)
+        except OperationalError:
+            # تعارض عابر في قاعدة البيانات (Deadlock / Serialization / Lock timeout): إعادة المحاولة
+            db.rollback()
+            if attempt == max_attempts:
+                break
+            time.sleep(settings.BID_PLACEMENT_RETRY_BACKOFF_MS * (2 ** (attempt - 1)) / 1000)
+            continue
+        if db_bid is not None:
+            return db_bid
+        # سبقتنا مزايدة أخرى: المحاولة التالية تعيد قراءة الحالة، فإما أن تُرفض برسالة دقيقة أو تنجح
+        db.rollback()
+
+    raise ConflictException(detail="المزاد يشهد عددًا كبيرًا من المزايدات المتزامنة. يرجى إعادة المحاولة.")
+
+def _try_place_bid(db: Session, bid_in: schemas.BidCreate, current_user: User) -> Optional[models_bidding.Bid]:
+    """
+    محاولة واحدة لتقديم المزايدة. تعيد None إذا فشل التحديث الشرطي (سبقتها مزايدة أخرى).
     """
-    # 1. التحقق من وجود المزاد وحالته
-    db_auction = get_auction_details(db, bid_in.auction_id)
-    if db_auction.auction_status.status_name_key != "ACTIVE":
-        raise BadRequestException(detail=f"المزاد ليس نشطًا حاليًا، حالته: {db_auction.auction_status.status_name_key}.")
+    now = datetime.now(timezone.utc)
+    bid_amount = Decimal(str(bid_in.bid_amount_per_unit))
+
+    # 1. قراءة الإسقاط المصغر للمزاد والتحقق من المزايدة (رفض سريع بدون أي كتابة)
+    state = bidding_crud.get_auction_bid_state(db, bid_in.auction_id)
+    if state is None:
+        raise NotFoundException(detail=f"المزاد بمعرف {bid_in.auction_id} غير موجود.")
+    validate_bid_against_state(state, bid_amount, current_user.user_id, now)
 
     # 2. التحقق من اللوت إذا كانت المزايدة على لوت محدد
     if bid_in.lot_id:
@@ -227,44 +282,137 @@ def place_bid(db: Session, bid_in: schemas.BidCreate, current_user: User) -> mod
     # participant = bidding_crud.get_auction_participant(db, auction_id=bid_in.auction_id, user_id=current_user.user_id)
     # if not participant or participant.participation_status != "APPROVED_TO_BID":
     #     raise ForbiddenException(detail="غير مؤهل للمزايدة في هذا المزاد. يرجى التأكد من التسجيل والتأهيل.")
-    
-    # 4. التحقق من أن المزايد ليس بائع المزاد
-    if db_auction.seller_user_id == current_user.user_id:
-        raise ForbiddenException(detail="لا يمكن لبائع المزاد المزايدة في مزاده الخاص.")
-
-    # 5. التحقق من قيمة المزايدة
-    if bid_in.bid_amount_per_unit <= 0:
-        raise BadRequestException(detail="قيمة المزايدة يجب أن تكون أكبر من صفر.")
-    
-    required_bid = db_auction.current_highest_bid_amount_per_unit or db_auction.starting_price_per_unit
-    required_bid += db_auction.minimum_bid_increment
 
-    if bid_in.bid_amount_per_unit < required_bid:
-        raise BadRequestException(detail=f"يجب أن تكون مزايدتك أعلى من السعر الحالي بمقدار لا يقل عن {db_auction.minimum_bid_increment} ريال. المزايدة المطلوبة هي: {required_bid} ريال.")
-
-    # 6. التحقق من الرصيد المالي للمزايد (بالتكامل مع وحدة المحفظة)
+    # 4. التحقق من الرصيد المالي للمزايد (بالتكامل مع وحدة المحفظة)
     # TODO: هـام: استدعاء wallet_service.check_and_reserve_funds(current_user.user_id, bid_in.bid_amount_per_unit)
     #       هذا سيحجز المبلغ ويضمن أن المستخدم لديه رصيد كافٍ.
     #       إذا كان هناك نظام مزايدة آلية، قد يتم حجز الحد الأقصى للمزايدة الآلية.
 
-    # 7. تحديث معلومات المزاد (current_highest_bid_amount, current_highest_bidder_user_id, total_bids_count)
-    db_auction.current_highest_bid_amount_per_unit = bid_in.bid_amount_per_unit
-    db_auction.current_highest_bidder_user_id = current_user.user_id
-    db_auction.total_bids_count += 1
-    
-    # 8. استدعاء CRUD لإنشاء المزايدة
-    db_bid = bidding_crud.create_bid(db=db, bid_in=bid_in)
-
-    # TODO: إخطار المزايد الذي تم تجاوزه (وحدة الإشعارات).
-    # TODO: إخطار المشاهدين في قائمة المراقبة (وحدة الإشعارات).
-    # TODO: تشغيل منطق المزايدة الآلية (AutoBidService) إذا تم تجاوز مزايدة آلية.
+    # 5. رفع أعلى مزايدة ذريًا (يقفل صف المزاد حتى commit)، مع تمديد النهاية إذا جاءت في اللحظات الأخيرة (منع القنص)
+    extended_end = anti_sniping_end_timestamp(state.end_timestamp, now)
+    raised = bidding_crud.try_raise_highest_bid(
+        db,
+        auction_id=state.auction_id,
+        auction_status_id=state.auction_status_id,
+        bidder_user_id=current_user.user_id,
+        bid_amount_per_unit=bid_amount,
+        now=now,
+        extend_end_to=extended_end,
+    )
+    if raised is None:
+        return None
+    total_bids_count = raised.total_bids_count
+
+    # 6. حل المزايدات الآلية التي تتجاوز المزايدة الجديدة (صف المزاد ما زال مقفلاً)
+    required_amount = bid_amount + state.minimum_bid_increment
+    resolved = resolve_proxy_bids(
+        current_amount=bid_amount,
+        current_leader=current_user.user_id,
+        required_amount=required_amount,
+        minimum_increment=state.minimum_bid_increment,
+        proxies=bidding_crud.get_active_proxy_bids(db, state.auction_id, min_max_amount=required_amount),
+    )
+
+    # 7. تحويل المزايدة الأعلى السابقة إلى OUTBID وإضافة المزايدة الجديدة (والمزايدات الآلية الناتجة) في نفس المعاملة
+    outbid_user_ids = bidding_crud.mark_highest_bids_outbid(db, auction_id=state.auction_id)
+    db_bid = bidding_crud.add_bid(db, bid_in=bid_in, bid_status="OUTBID" if resolved else "ACTIVE_HIGHEST", bid_timestamp=now)
+    if resolved:
+        _persist_auto_bids(db, state.auction_id, resolved, now)
 
     db.commit() # تأكيد المزايدة وتحديث المزاد في عملية واحدة
-    db.refresh(db_auction) # لتحديث بيانات المزاد
-    db.refresh(db_bid)
+    db.refresh(db_bid, attribute_names=_BID_COLUMNS) # الأعمدة فقط، بدون تحميل علاقات المزاد والمزايد
+    # التحديث الحي وإشعارات من تم تجاوزهم والمراقبين (تُدمج وتوزع في الخلفية، بدون انتظار)
+    _publish_bid_state(state.auction_id, total_bids_count, current_user.user_id, bid_amount, resolved, now, end_timestamp=extended_end, outbid_user_ids=outbid_user_ids)
 
     return db_bid
 
+def _publish_bid_state(auction_id: UUID, total_bids_count: int, bidder_user_id: Optional[UUID], bid_amount, resolved: List[ResolvedBid], now: datetime, end_timestamp: Optional[datetime] = None, outbid_user_ids: Sequence[UUID] = ()) -> None:
+    """
+    ينشر حالة السعر النهائية (بعد المزايدات الآلية إن وجدت) لمشتركي المزاد الحيين، بعد commit،
+    ويسجل الحدث لإشعارات من تم تجاوزهم (المتصدر السابق، وكل من تصدر ثم تجاوزته مزايدة آلية) ومراقبي المزاد.
+    """
+    outbid = set(outbid_user_ids)
+    if resolved:
+        outbid.update(auto_bid.bidder_user_id for auto_bid in resolved)
+        if bidder_user_id is not None:
+            outbid.add(bidder_user_id)
+        bidder_user_id, bid_amount = resolved[-1].bidder_user_id, resolved[-1].amount
+    bid_notifications.publish(auction_id, bid_amount, bidder_user_id, outbid)
+    publish_bid_state(
+        auction_id,
+        highest_amount=bid_amount,
+        highest_bidder_user_id=bidder_user_id,
+        total_bids_count=total_bids_count + len(resolved),
+        last_bid={
+            "bidder_user_id": bidder_user_id,
+            "bid_amount_per_unit": bid_amount,
+            "is_auto_bid": bool(resolved),
+            "bid_timestamp": now + timedelta(microseconds=len(resolved)),
+        },
+        end_timestamp=end_timestamp,
+    )
+
+def _persist_auto_bids(db: Session, auction_id: UUID, resolved: List[ResolvedBid], now: datetime, extend_end_to: Optional[datetime] = None) -> None:
+    """يضيف المزايدات الآلية الناتجة عن الحل (بدون commit)؛ آخرها فقط بحالة ACTIVE_HIGHEST."""
+    last = len(resolved) - 1
+    rows = [
+        models_bidding.Bid(
+            auction_id=auction_id,
+            bidder_user_id=auto_bid.bidder_user_id,
+            bid_amount_per_unit=auto_bid.amount,
+            bid_timestamp=now + timedelta(microseconds=i + 1), # بعد المزايدة التي سببتها وبنفس ترتيب الحل
+            bid_status="ACTIVE_HIGHEST" if i == last else "OUTBID",
+            is_auto_bid=True,
+        )
+        for i, auto_bid in enumerate(resolved)
+    ]
+    bidding_crud.persist_bid_batch(
+        db,
+        auction_id=auction_id,
+        bids=rows,
+        highest_amount=rows[-1].bid_amount_per_unit,
+        highest_bidder_user_id=rows[-1].bidder_user_id,
+        extend_end_to=extend_end_to,
+    )
+
+def resolve_auto_bids(db: Session, auction_id: UUID) -> int:
+    """
+    خدمة لحل المزايدات الآلية لمزاد بعد إنشاء أو تعديل إعداد مزايدة آلية (بدون مزايدة يدوية جديدة).
+    تقفل صف المزاد، وتحسب النتيجة النهائية لكل الإعدادات النشطة في مرور واحد، وتحفظ المزايدات الناتجة في معاملة واحدة.
+    عند تفعيل AUCTION_ENGINE_ENABLED يتم الحل داخل محرك المزادات بعد إعادة تحميل الإعدادات.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        auction_id (UUID): معرف المزاد.
+
+    Returns:
+        int: عدد المزايدات الآلية التي تم تقديمها.
+    """
+    if settings.AUCTION_ENGINE_ENABLED:
+        return auction_engine.resolve_auto_bids(auction_id)
+
+    now = datetime.now(timezone.utc)
+    state = bidding_crud.get_auction_bid_state(db, auction_id, for_update=True)
+    resolved = []
+    extended_end = None
+    if state is not None and bidding_is_open(state, now):
+        required_amount = required_bid_amount(state)
+        resolved = resolve_proxy_bids(
+            current_amount=state.current_highest_bid_amount_per_unit,
+            current_leader=state.current_highest_bidder_user_id,
+            required_amount=required_amount,
+            minimum_increment=state.minimum_bid_increment,
+            proxies=bidding_crud.get_active_proxy_bids(db, auction_id, min_max_amount=required_amount),
+        )
+    if resolved:
+        extended_end = anti_sniping_end_timestamp(state.end_timestamp, now)
+        _persist_auto_bids(db, auction_id, resolved, now, extend_end_to=extended_end)
+    db.commit() # ينهي المعاملة ويحرر قفل صف المزاد
+    if resolved:
+        previous_leader = [state.current_highest_bidder_user_id] if state.current_highest_bidder_user_id else []
+        _publish_bid_state(auction_id, state.total_bids_count, None, None, resolved, now, end_timestamp=extended_end, outbid_user_ids=previous_leader)
+    return len(resolved)
+
 def get_bids_for_auction(db: Session, auction_id: UUID, current_user: User, skip: int = 0, limit: int = 100) -> List[models_bidding.Bid]:
     """
     خدمة لجلب جميع المزايدات لمزاد معين.
@@ -294,12 +442,49 @@ def get_bids_for_auction(db: Session, auction_id: UUID, current_user: User, skip
             models_bidding.AuctionParticipant.user_id == current_user.user_id
         )
     ).first()
-    is_admin = any(p.permission_name_key == "ADMIN_AUCTION_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_VIEW_ANY")
 
     if not (is_seller or is_participant or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية سجل المزايدات لهذا المزاد.")
 
-    return bidding_crud.get_all_bids_for_auction(db=db, auction_id=auction_id)
+    # المزايدات المقبولة في محرك المزادات تُحفظ أولاً ليظهر السجل كاملاً
+    if settings.AUCTION_ENGINE_ENABLED:
+        auction_engine.flush(auction_id)
+    return bidding_crud.get_all_bids_for_auction(db=db, auction_id=auction_id, skip=skip, limit=limit)
+
+def get_live_auction_state(db: Session, auction_id: UUID) -> dict:
+    """
+    خدمة لجلب الحالة الحية المختصرة لمزاد (الحالة، السعر، عدد المزايدات) كلقطة أولية لقنوات WebSocket / SSE.
+    تقرأ إسقاط المزاد المصغر بدلاً من تحميل شجرة المزاد الكاملة؛ وعند تفعيل محرك المزادات يؤخذ السعر من دفتره.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        auction_id (UUID): معرف المزاد.
+
+    Returns:
+        dict: الحالة بنفس حقول التغييرات المنشورة (seq = total_bids_count).
+
+    Raises:
+        NotFoundException: إذا لم يتم العثور على المزاد.
+    """
+    state = bidding_crud.get_auction_bid_state(db, auction_id)
+    if state is None:
+        raise NotFoundException(detail=f"المزاد بمعرف {auction_id} غير موجود.")
+    live_state = {
+        "status_name_key": state.status_name_key,
+        "end_timestamp": state.end_timestamp,
+        "starting_price_per_unit": state.starting_price_per_unit,
+        "minimum_bid_increment": state.minimum_bid_increment,
+        "current_highest_bid_amount_per_unit": state.current_highest_bid_amount_per_unit,
+        "current_highest_bidder_user_id": state.current_highest_bidder_user_id,
+        "total_bids_count": state.total_bids_count,
+    }
+    if settings.AUCTION_ENGINE_ENABLED and state.status_name_key == "ACTIVE":
+        snapshot = auction_engine.snapshot(auction_id)
+        for key in ("end_timestamp", "current_highest_bid_amount_per_unit", "current_highest_bidder_user_id", "total_bids_count"):
+            live_state[key] = snapshot[key]
+    live_state["seq"] = live_state["total_bids_count"]
+    return live_state
 
 def get_my_bids(db: Session, current_user: User, skip: int = 0, limit: int = 100) -> List[models_bidding.Bid]:
     """
@@ -364,7 +549,10 @@ def create_auto_bid_setting(db: Session, setting_in: schemas.AutoBidSettingCreat
     # TODO: التحقق من أن المزايد مسجل كمشارك في المزاد وحالته 'APPROVED_TO_BID'
     # TODO: التحقق من أن المزايد لديه رصيد كافٍ في المحفظة لتغطية max_bid_amount_per_unit.
 
-    return bidding_crud.create_auto_bid_setting(db=db, setting_in=setting_in)
+    db_setting = bidding_crud.create_auto_bid_setting(db=db, setting_in=setting_in)
+    # 6. الإعداد الجديد قد يتجاوز أعلى مزايدة حالية فورًا
+    resolve_auto_bids(db, db_setting.auction_id)
+    return db_setting
 
 def get_auto_bid_setting_details(db: Session, auto_bid_setting_id: int) -> models_bidding.AutoBidSetting:
     """
@@ -438,7 +626,10 @@ def update_auto_bid_setting(db: Session, auto_bid_setting_id: int, setting_in: s
             raise BadRequestException(detail="أقصى مبلغ للمزايدة يجب أن يكون أعلى من السعر الحالي للمزاد.")
         # TODO: التحقق من الرصيد الكافي إذا زادت قيمة max_bid.
 
-    return bidding_crud.update_auto_bid_setting(db=db, db_setting=db_setting, setting_in=setting_in)
+    db_setting = bidding_crud.update_auto_bid_setting(db=db, db_setting=db_setting, setting_in=setting_in)
+    # 4. رفع الحد الأقصى أو إعادة التفعيل قد يغير نتيجة المزاد فورًا
+    resolve_auto_bids(db, db_setting.auction_id)
+    return db_setting
 
 def deactivate_auto_bid_setting(db: Session, auto_bid_setting_id: int, current_user: User) -> models_bidding.AutoBidSetting:
     """
@@ -465,7 +656,10 @@ def deactivate_auto_bid_setting(db: Session, auto_bid_setting_id: int, current_u
     if not db_setting.is_active:
         raise BadRequestException(detail=f"إعداد المزايدة الآلية بمعرف {auto_bid_setting_id} غير نشط بالفعل.")
 
-    return bidding_crud.soft_delete_auto_bid_setting(db=db, db_setting=db_setting)
+    db_setting = bidding_crud.soft_delete_auto_bid_setting(db=db, db_setting=db_setting)
+    if settings.AUCTION_ENGINE_ENABLED:
+        auction_engine.resolve_auto_bids(db_setting.auction_id) # إعادة تحميل الإعدادات في دفتر المزاد
+    return db_setting
 
 # ==========================================================
 # --- خدمات قوائم مراقبة المزادات (AuctionWatchlist) ---
@@ -518,18 +712,20 @@ def get_auction_watchlist_entry_details(db: Session, watchlist_entry_id: int) ->
         raise NotFoundException(detail=f"إدخال قائمة المراقبة بمعرف {watchlist_entry_id} غير موجود.")
     return entry
 
-def get_my_auction_watchlists(db: Session, current_user: User) -> List[models_bidding.AuctionWatchlist]:
+def get_my_auction_watchlists(db: Session, current_user: User) -> List[Dict[str, Any]]:
     """
-    خدمة لجلب جميع المزادات في قائمة مراقبة المستخدم الحالي.
+    خدمة لجلب جميع المزادات في قائمة مراقبة المستخدم الحالي كملخصات (AuctionWatchlistSummary) بلغته المفضلة،
+    باستعلام أعمدة واحد بدلاً من تحميل إدخالات القائمة ومزاداتها كائنات ORM.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
         current_user (User): المستخدم الحالي.
 
     Returns:
-        List[models_bidding.AuctionWatchlist]: قائمة بكائنات قائمة المراقبة.
+        List[Dict[str, Any]]: ملخصات المزادات المراقبة، الأحدث إضافةً أولاً.
     """
-    return bidding_crud.get_all_auction_watchlists_for_user(db, user_id=current_user.user_id)
+    rows = bidding_crud.get_watchlist_auction_summaries_for_user(db, user_id=current_user.user_id, language_code=current_user.preferred_language_code or settings.DEFAULT_LANGUAGE)
+    return auction_summary_dicts(rows, auction_lookups.get(db))
 
 def delete_auction_watchlist_entry(db: Session, watchlist_entry_id: int, current_user: User):
     """
@@ -0,0 +1,184 @@
+# backend\src\auctions\services\settlement_pipeline.py
+# ----------------------------------------------------------------------------------------------------
+# خط التسويات الدفعي: ينشئ تسويات المزادات المنتهية (ENDED) على دفعات بدلاً من تسوية كل مزاد بطلب مستقل.
+# - المسح: المزادات المنتهية بلا تسوية بمؤشر (end_timestamp, auction_id) عبر فهرس (auction_status_id, end_timestamp)،
+#   محصورة في نافذة AUCTION_SETTLEMENT_LOOKBACK_HOURS حتى لا تُعاد قراءة المزادات القديمة بلا فائز في كل مسح.
+# - لكل دفعة (AUCTION_SETTLEMENT_CHUNK_SIZE): استعلام تجميعي واحد لأعلى مزايدة لكل مزاد، ثم INSERT جماعي
+#   للتسويات وسجل حالتها الأولى وتعليم المزايدات الفائزة، في معاملة واحدة لكل دفعة.
+# - التكرار آمن والاستئناف تلقائي: المزاد المسوّى يخرج من المسح (NOT EXISTS)، والدفعة التي فشلت أو انقطعت
+#   لا تترك أثرًا فتُعاد في المسح التالي. تعارض تشغيلين متزامنين (winning_bid_id فريد) يلغي الدفعة ويعيدها مرة واحدة.
+# يستدعيه مجدول دورة حياة المزادات بعد كل دفعة إغلاق، ومهمة Celery الدورية settle_ended_auctions لما فاته.
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.exceptions import ConflictException
+from src.auctions.crud import settlements_crud
+from src.auctions.models import settlements_models as models_settlements
+from src.lookups.models.lookups_models import AuctionStatus
+from src.auctions.services.auction_events import publish_settlement
+
+logger = logging.getLogger(__name__)
+
+ENDED_STATUS_KEY = "ENDED"
+INITIAL_SETTLEMENT_STATUS_KEY = "PENDING_PAYMENT"
+
+
+class SettlementPipeline:
+    """ينشئ تسويات المزادات المنتهية على دفعات، ويحتفظ بقياسات كل دفعة في هذه العملية."""
+
+    def __init__(self, chunk_size: int, lookback_hours: float):
+        self.chunk_size = chunk_size
+        self.lookback_hours = lookback_hours
+        self._stats_lock = threading.Lock()
+        self.runs = 0
+        self.batches = 0
+        self.scanned = 0
+        self.settled = 0
+        self.conflicts = 0
+        self.last_batch_ms = 0.0
+        self.max_batch_ms = 0.0
+        self.total_batch_ms = 0.0
+        self.last_run_ms = 0.0
+
+    def _status_ids(self, db: Session) -> Dict[str, int]:
+        ended_status_id = db.scalar(select(AuctionStatus.auction_status_id).where(AuctionStatus.status_name_key == ENDED_STATUS_KEY))
+        if ended_status_id is None:
+            raise ConflictException(detail=f"حالة المزاد '{ENDED_STATUS_KEY}' غير موجودة. يرجى تهيئة البيانات المرجعية.")
+        initial_status_id = db.scalar(
+            select(models_settlements.AuctionSettlementStatus.settlement_status_id)
+            .where(models_settlements.AuctionSettlementStatus.status_name_key == INITIAL_SETTLEMENT_STATUS_KEY)
+        )
+        if initial_status_id is None:
+            raise ConflictException(detail=f"حالة التسوية الأولية '{INITIAL_SETTLEMENT_STATUS_KEY}' غير موجودة. يرجى تهيئة البيانات المرجعية.")
+        return {"ended": ended_status_id, "initial": initial_status_id}
+
+    def run(self, db: Session, auction_ids: Optional[List[UUID]] = None) -> Dict[str, Any]:
+        """
+        يسوّي كل المزادات المنتهية بلا تسوية (أو المزادات المحددة فقط) دفعةً دفعة.
+
+        Args:
+            db (Session): جلسة قاعدة البيانات (يتم commit بعد كل دفعة).
+            auction_ids (Optional[List[UUID]]): حصر التشغيل في هذه المزادات (بدون حد نافذة المسح).
+
+        Returns:
+            Dict[str, Any]: تقرير التشغيل: عدد المزادات الممسوحة والمسواة والتعارضات، وزمن كل دفعة.
+
+        Raises:
+            ConflictException: إذا لم يتم العثور على حالة المزاد 'ENDED' أو حالة التسوية الأولية.
+        """
+        status_ids = self._status_ids(db)
+        run_started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        ended_since = None if auction_ids is not None else now - timedelta(hours=self.lookback_hours)
+        report: Dict[str, Any] = {"scanned": 0, "settled": 0, "conflicts": 0, "batches": []}
+
+        after = None
+        retried = False
+        while True:
+            batch_started = time.perf_counter()
+            chunk = settlements_crud.get_unsettled_ended_auctions(
+                db, status_ids["ended"], self.chunk_size, after=after, ended_since=ended_since, auction_ids=auction_ids
+            )
+            if not chunk:
+                break
+            winners = settlements_crud.get_auction_winners(db, [row.auction_id for row in chunk])
+            settlements = []
+            for winner in winners:
+                total_amount = winner.bid_amount_per_unit * winner.quantity_offered
+                platform_commission_amount = 0 # TODO: حساب عمولة المنصة (Module 8) وخصمها
+                settlements.append({
+                    "auction_id": winner.auction_id,
+                    "winning_bid_id": winner.bid_id,
+                    "winner_user_id": winner.bidder_user_id,
+                    "seller_user_id": winner.seller_user_id,
+                    "final_winning_price_per_unit": winner.bid_amount_per_unit,
+                    "quantity_won": winner.quantity_offered,
+                    "total_settlement_amount": total_amount,
+                    "net_amount_to_seller": total_amount - platform_commission_amount,
+                    "settlement_status_id": status_ids["initial"],
+                    "settlement_timestamp": now,
+                })
+            try:
+                if settlements:
+                    settlements_crud.bulk_create_auction_settlements(db, settlements, status_ids["initial"], notes="تسوية تلقائية بعد انتهاء المزاد")
+                db.commit()
+            except IntegrityError:
+                # تشغيل آخر سوّى بعض مزادات الدفعة: تُلغى الدفعة وتُعاد مرة واحدة (المسواة تخرج من المسح)
+                db.rollback()
+                report["conflicts"] += 1
+                self.count("conflicts")
+                if retried:
+                    raise
+                retried = True
+                continue
+            retried = False
+            after = (chunk[-1].end_timestamp, chunk[-1].auction_id)
+
+            for settlement in settlements:
+                publish_settlement(
+                    settlement["auction_id"],
+                    winner_user_id=settlement["winner_user_id"],
+                    final_winning_price_per_unit=settlement["final_winning_price_per_unit"],
+                    settlement_status_name_key=INITIAL_SETTLEMENT_STATUS_KEY,
+                )
+            # TODO: بدء عملية الدفع وإنشاء الطلب وإخطار الطرفين (كما في create_auction_settlement).
+
+            batch_ms = (time.perf_counter() - batch_started) * 1000
+            report["scanned"] += len(chunk)
+            report["settled"] += len(settlements)
+            report["batches"].append({"auctions": len(chunk), "settled": len(settlements), "ms": round(batch_ms, 3)})
+            with self._stats_lock:
+                self.batches += 1
+                self.scanned += len(chunk)
+                self.settled += len(settlements)
+                self.last_batch_ms = batch_ms
+                self.max_batch_ms = max(self.max_batch_ms, batch_ms)
+                self.total_batch_ms += batch_ms
+            if len(chunk) < self.chunk_size:
+                break
+
+        with self._stats_lock:
+            self.runs += 1
+            self.last_run_ms = (time.perf_counter() - run_started) * 1000
+        if report["settled"]:
+            logger.info("Settled %d of %d ended auctions in %d batches", report["settled"], report["scanned"], len(report["batches"]))
+        return report
+
+    # --- القياسات ---
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "chunk_size": self.chunk_size,
+                "lookback_hours": self.lookback_hours,
+                "runs": self.runs,
+                "batches": self.batches,
+                "scanned": self.scanned,
+                "settled": self.settled,
+                "conflicts": self.conflicts,
+                "last_batch_ms": round(self.last_batch_ms, 3),
+                "max_batch_ms": round(self.max_batch_ms, 3),
+                "avg_batch_ms": round(self.total_batch_ms / self.batches, 3) if self.batches else 0.0,
+                "last_run_ms": round(self.last_run_ms, 3),
+            }
+
+
+settlement_pipeline = SettlementPipeline(
+    chunk_size=settings.AUCTION_SETTLEMENT_CHUNK_SIZE,
+    lookback_hours=settings.AUCTION_SETTLEMENT_LOOKBACK_HOURS,
+)
@@ -18,7 +18,9 @@ from src.auctions.crud import settlements_crud
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.lookups.schemas import lookups_schemas as schemas_lookups
+from src.auctions.services.auction_events import publish_settlement # التحديثات الحية لمشتركي المزاد (WebSocket / SSE)
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
 from src.auctions.services.auctions_service import get_auction_details # للتحقق من وجود المزاد
@@ -54,7 +56,7 @@ def create_auction_settlement(db: Session, settlement_in: schemas.AuctionSettlem
         ConflictException: إذا لم يتم العثور على حالة التسوية الأولية.
     """
     # 1. التحقق من صلاحيات المستخدم (يجب أن يكون مسؤول نظام أو خدمة خلفية)
-    if not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions):
+    if not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإنشاء تسوية مزاد.")
 
     # 2. التحقق من وجود المزاد والمزايدة الفائزة والمستخدمين
@@ -95,6 +97,12 @@ def create_auction_settlement(db: Session, settlement_in: schemas.AuctionSettlem
 
     db.commit()
     db.refresh(db_settlement)
+    publish_settlement(
+        settlement_in.auction_id,
+        winner_user_id=settlement_in.winner_user_id,
+        final_winning_price_per_unit=settlement_in.final_winning_price_per_unit,
+        settlement_status_name_key=initial_settlement_status.status_name_key,
+    )
 
     # TODO: هـام: بدء عملية الدفع من المشتري الفائز (وحدة المحفظة - Module 8).
     #       مثلاً: wallet_service.deduct_funds_for_settlement(winner_user_id, total_settlement_amount, db_settlement.settlement_id)
@@ -130,7 +138,7 @@ def get_auction_settlement_details(db: Session, settlement_id: int, current_user
     # التحقق من الصلاحيات: الفائز، البائع، أو المسؤول
     is_winner = settlement.winner_user_id == current_user.user_id
     is_seller = settlement.seller_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions) # TODO: صلاحية view settlement
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY") # TODO: صلاحية view settlement
 
     if not (is_winner or is_seller or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل تسوية المزاد هذه.")
@@ -196,7 +204,7 @@ def update_auction_settlement(db: Session, settlement_id: int, settlement_in: sc
     db_settlement = get_auction_settlement_details(db, settlement_id, current_user) # تتحقق من الوجود والصلاحيات
 
     # التحقق من أن المستخدم مسؤول فقط (للسماح بتعديل التسوية)
-    if not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions): # TODO: صلاحية ADMIN_SETTLEMENT_MANAGE_ANY
+    if not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"): # TODO: صلاحية ADMIN_SETTLEMENT_MANAGE_ANY
         raise ForbiddenException(detail="غير مصرح لك بتحديث تسوية المزاد هذه.")
 
     # التحقق من وجود الحالة الجديدة إذا تم تحديثها
@@ -230,7 +238,7 @@ def update_auction_settlement_status(db: Session, settlement_id: int, new_status
     db_settlement = get_auction_settlement_details(db, settlement_id, current_user) # تتحقق من الوجود والصلاحيات
 
     # التحقق من أن المستخدم مسؤول فقط
-    if not any(p.permission_name_key == "ADMIN_AUCTION_MANAGE_ANY" for p in current_user.default_role.permissions): # TODO: صلاحية ADMIN_SETTLEMENT_MANAGE_ANY
+    if not permission_registry.user_has_permission(current_user, "ADMIN_AUCTION_MANAGE_ANY"): # TODO: صلاحية ADMIN_SETTLEMENT_MANAGE_ANY
         raise ForbiddenException(detail="غير مصرح لك بتغيير حالة تسوية المزاد هذه.")
 
     # التحقق من وجود الحالة الجديدة
@@ -0,0 +1,21 @@
+# backend/src/auctions/tasks.py
+
+from src.core.celery_app import celery
+from src.db.session import SessionLocal
+from src.auctions.services.settlement_pipeline import settlement_pipeline
+from datetime import datetime, timezone
+
+# مسح دوري للمزادات المنتهية بلا تسوية (ما فات مجدول دورة حياة المزادات أو دفعة فشلت).
+@celery.task
+def settle_ended_auctions():
+    """
+    مهمة Celery دورية تشغّل خط التسويات الدفعي على المزادات المنتهية خلال نافذة المسح.
+    """
+    db = SessionLocal()
+    try:
+        report = settlement_pipeline.run(db)
+
+        print(f"[{datetime.now(timezone.utc)}] Auction settlement sweep: Settled {report['settled']} of {report['scanned']} ended auctions in {len(report['batches'])} batches.")
+        return f"Settled {report['settled']} auctions."
+    finally:
+        db.close()
@@ -0,0 +1,103 @@
+# backend\src\communications\crud\notifications_crud.py
+
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+# استيراد المودلز من Communications
+from src.communications.models import notifications_models as models_notifications # NotificationTemplate, NotificationLog, ...
+from src.users.models.core_models import User # لغة المستلم وعناوينه
+
+
+# ==========================================================
+# --- CRUD Functions for Notification Lookups (القنوات وحالات التسليم) ---
+# ==========================================================
+
+def get_notification_channel_id(db: Session, channel_name_key: str) -> Optional[int]:
+    """
+    يجلب معرف قناة إشعارات نشطة بمفتاح اسمها.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        channel_name_key (str): مفتاح اسم القناة (مثلاً 'IN_APP', 'EMAIL').
+
+    Returns:
+        Optional[int]: معرف القناة أو None إذا لم توجد أو كانت غير نشطة.
+    """
+    Channel = models_notifications.NotificationChannel
+    return db.scalar(select(Channel.channel_id).where(Channel.channel_name_key == channel_name_key, Channel.is_active.is_(True)))
+
+def get_delivery_status_ids(db: Session, status_name_keys: List[str]) -> Dict[str, int]:
+    """
+    يجلب معرفات حالات تسليم الإشعارات بمفاتيحها.
+
+    Returns:
+        Dict[str, int]: مفتاح الحالة ← معرفها (المفاتيح غير الموجودة لا تظهر).
+    """
+    Status = models_notifications.NotificationDeliveryStatus
+    return dict(db.execute(select(Status.status_name_key, Status.delivery_status_id).where(Status.status_name_key.in_(status_name_keys))).all())
+
+
+# ==========================================================
+# --- CRUD Functions for NotificationTemplate (قوالب الإشعارات) ---
+# ==========================================================
+
+def get_active_templates(db: Session, template_name_keys: List[str]) -> List[Row]:
+    """
+    يجلب القوالب النشطة بمفاتيحها مع لغتها الافتراضية.
+
+    Returns:
+        List[Row]: صفوف (template_id, template_name_key, default_language_code).
+    """
+    Template = models_notifications.NotificationTemplate
+    return list(db.execute(
+        select(Template.template_id, Template.template_name_key, Template.default_language_code)
+        .where(Template.template_name_key.in_(template_name_keys), Template.is_active.is_(True))
+    ).all())
+
+def get_template_translations(db: Session, template_ids: List[int]) -> List[Row]:
+    """
+    يجلب ترجمات مجموعة قوالب بكل لغاتها باستعلام واحد.
+
+    Returns:
+        List[Row]: صفوف (template_id, language_code, translated_subject, translated_body).
+    """
+    Translation = models_notifications.NotificationTemplateTranslation
+    return list(db.execute(
+        select(Translation.template_id, Translation.language_code, Translation.translated_subject, Translation.translated_body)
+        .where(Translation.template_id.in_(template_ids))
+    ).all())
+
+
+# ==========================================================
+# --- CRUD Functions for NotificationLog (سجل الإشعارات) ---
+# ==========================================================
+
+def get_notification_recipients(db: Session, user_ids: List[UUID]) -> List[Row]:
+    """
+    يجلب لغة وعناوين مجموعة مستلمين باستعلام واحد (بدون تحميل كائنات المستخدم وعلاقاتها).
+
+    Returns:
+        List[Row]: صفوف (user_id, preferred_language_code, email, phone_number).
+    """
+    return list(db.execute(
+        select(User.user_id, User.preferred_language_code, User.email, User.phone_number).where(User.user_id.in_(user_ids))
+    ).all())
+
+def bulk_create_notification_logs(db: Session, logs: List[Dict[str, Any]]) -> None:
+    """
+    يضيف دفعة سجلات إشعارات بعبارة INSERT واحدة (بدون commit).
+    كل قاموس يحمل notification_log_id مولدًا مسبقًا لتحديث حالة التسليم لاحقًا.
+    """
+    if logs:
+        db.execute(insert(models_notifications.NotificationLog), logs)
+
+def bulk_update_notification_delivery(db: Session, updates: List[Dict[str, Any]]) -> None:
+    """
+    يحدث حالة التسليم ورد البوابة لدفعة سجلات بالمفتاح الأساسي (بدون commit).
+    كل قاموس: notification_log_id و delivery_status_id و gateway_response.
+    """
+    if updates:
+        db.execute(update(models_notifications.NotificationLog), updates)
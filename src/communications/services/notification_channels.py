@@ -0,0 +1,91 @@
+# backend\src\communications\services\notification_channels.py
+# ----------------------------------------------------------------------------------------------------
+# قنوات إرسال الإشعارات القابلة للاستبدال (Pluggable Channels).
+# كل قناة في notification_channels (IN_APP, EMAIL, SMS) تُربط بمنفذ إرسال يسجَّل هنا باسمها.
+# المنفذ الوحيد حاليًا هو القناة المحلية (Stub) لـ IN_APP: تحتفظ بآخر الإشعارات في الذاكرة بدون بوابة خارجية.
+# منافذ البريد والرسائل النصية تُسجَّل بـ register_channel_backend عند ربط بواباتها.
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutgoingNotification:
+    """إشعار جاهز للإرسال (بعد حفظه في notification_logs)."""
+    notification_log_id: UUID
+    user_id: UUID
+    recipient_address: str
+    subject: Optional[str]
+    body: str
+
+
+class NotificationChannelBackend(ABC):
+    """
+    واجهة منفذ الإرسال (صنف مجرد: المنفذ الذي لا يطبق send() يفشل عند إنشائه لا عند أول إرسال). send() تُستدعى من خيوط الإرسال المتزامنة (بحد NOTIFICATION_DELIVERY_CONCURRENCY)،
+    فيجب أن تكون آمنة للاستخدام من عدة خيوط. تعيد رد البوابة (يُحفظ في gateway_response)، وترفع استثناءً عند الفشل.
+    """
+
+    def recipient_address(self, recipient) -> str:
+        """عنوان المستلم في هذه القناة من صف (user_id, preferred_language_code, email, phone_number)."""
+        return recipient.email or recipient.phone_number
+
+    @abstractmethod
+    def send(self, notification: OutgoingNotification) -> Optional[str]:
+        """يرسل الإشعار عبر بوابة القناة ويعيد ردها."""
+
+
+class LocalNotificationChannel(NotificationChannelBackend):
+    """قناة محلية: تسجل الإشعار وتحتفظ بآخر keep_last إشعارًا في الذاكرة (داخل التطبيق، وللتجارب)."""
+
+    def __init__(self, keep_last: int = 1000):
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=keep_last)
+        self.sent = 0
+
+    def recipient_address(self, recipient) -> str:
+        return str(recipient.user_id)
+
+    def send(self, notification: OutgoingNotification) -> Optional[str]:
+        with self._lock:
+            self._recent.append(notification)
+            self.sent += 1
+        logger.debug("Local notification %s to %s: %s", notification.notification_log_id, notification.user_id, notification.subject)
+        return "LOCAL_ACCEPTED"
+
+    def recent(self, limit: int = 50) -> List[OutgoingNotification]:
+        """آخر الإشعارات المرسلة، الأحدث أولاً."""
+        with self._lock:
+            return list(self._recent)[::-1][:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sent": self.sent, "kept": len(self._recent)}
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+local_channel = LocalNotificationChannel()
+
+_backends: Dict[str, NotificationChannelBackend] = {"IN_APP": local_channel}
+_backends_lock = threading.Lock()
+
+
+def register_channel_backend(channel_name_key: str, backend: NotificationChannelBackend) -> None:
+    """يربط منفذ إرسال بقناة (يستبدل المنفذ الحالي إن وجد)."""
+    if not isinstance(backend, NotificationChannelBackend):
+        raise TypeError(f"Notification channel backend for {channel_name_key} must subclass NotificationChannelBackend, got {type(backend).__name__}")
+    with _backends_lock:
+        _backends[channel_name_key] = backend
+
+
+def get_channel_backend(channel_name_key: str) -> Optional[NotificationChannelBackend]:
+    """يعيد منفذ الإرسال المسجل للقناة، أو None إذا لم يُسجل لها منفذ."""
+    with _backends_lock:
+        return _backends.get(channel_name_key)
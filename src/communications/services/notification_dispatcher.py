@@ -0,0 +1,235 @@
+# backend\src\communications\services\notification_dispatcher.py
+# ----------------------------------------------------------------------------------------------------
+# موزع الإشعارات الدفعي: يحول دفعة طلبات إشعار (مستخدم + قالب + مجموعة) إلى سجلات notification_logs مرسلة.
+# - التصيير مرة واحدة لكل (قالب، مجموعة، لغة): الطلبات بنفس القالب والمجموعة (مثلاً نفس المزاد) تتشارك النص،
+#   ومعاملات القالب تُحل مرة واحدة لكل لغة (resolve_params)، فلا يتكرر التصيير لكل مستخدم.
+# - قراءات الدفعة استعلامات ثابتة العدد: القناة وحالات التسليم والقوالب وترجماتها ولغات المستلمين.
+# - الحفظ بعبارة INSERT واحدة بحالة PENDING، ثم الإرسال عبر منفذ القناة بحد NOTIFICATION_DELIVERY_CONCURRENCY
+#   خيطًا، ثم تحديث جماعي للحالة (SENT / FAILED) مع رد البوابة.
+# يُستدعى من مراحل التوزيع في الخلفية (مثل bid_notifications)، وليس من مسار الطلب.
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.exceptions import ConflictException
+from src.communications.crud import notifications_crud
+from src.communications.services.notification_channels import OutgoingNotification, get_channel_backend
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUS_KEY = "PENDING"
+SENT_STATUS_KEY = "SENT"
+FAILED_STATUS_KEY = "FAILED"
+
+# (db, language_code, group_keys) -> {group_key: معاملات القالب بهذه اللغة}
+ParamsResolver = Callable[[Session, str, List[Hashable]], Dict[Hashable, Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class NotificationRequest:
+    """طلب إشعار مستخدم واحد. الطلبات بنفس template_name_key و group_key تتشارك نصًا واحدًا لكل لغة."""
+    user_id: UUID
+    template_name_key: str
+    group_key: Hashable
+    related_entity_type: Optional[str] = None
+    related_entity_id: Optional[str] = None
+
+
+class _TemplateParams(dict):
+    """المعاملات غير المعروفة تبقى كما هي في النص بدلاً من KeyError."""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _render(text: Optional[str], params: Dict[str, Any]) -> Optional[str]:
+    if text is None:
+        return None
+    try:
+        return text.format_map(_TemplateParams(params))
+    except (ValueError, IndexError): # أقواس غير متوازنة في نص القالب
+        return text
+
+
+class NotificationDispatcher:
+    """يصيّر ويحفظ ويرسل دفعات الإشعارات عبر قناة واحدة، ويحتفظ بقياساتها في هذه العملية."""
+
+    def __init__(self, channel_name_key: str, concurrency: int):
+        self.channel_name_key = channel_name_key
+        self.concurrency = max(concurrency, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.requested = 0
+        self.logged = 0
+        self.sent = 0
+        self.failed = 0
+        self.renders = 0
+        self.missing_template = 0
+        self.missing_recipient = 0
+        self.last_batch_ms = 0.0
+        self.max_batch_ms = 0.0
+
+    def _lookups(self, db: Session) -> Tuple[Any, int, Dict[str, int]]:
+        backend = get_channel_backend(self.channel_name_key)
+        channel_id = notifications_crud.get_notification_channel_id(db, self.channel_name_key)
+        if backend is None or channel_id is None:
+            raise ConflictException(detail=f"قناة الإشعارات '{self.channel_name_key}' غير موجودة أو غير نشطة أو بلا منفذ إرسال.")
+        status_ids = notifications_crud.get_delivery_status_ids(db, [PENDING_STATUS_KEY, SENT_STATUS_KEY, FAILED_STATUS_KEY])
+        missing = {PENDING_STATUS_KEY, SENT_STATUS_KEY, FAILED_STATUS_KEY} - status_ids.keys()
+        if missing:
+            raise ConflictException(detail=f"حالات تسليم الإشعارات {sorted(missing)} غير موجودة. يرجى تهيئة البيانات المرجعية.")
+        return backend, channel_id, status_ids
+
+    def dispatch(self, db: Session, requests: Sequence[NotificationRequest], resolve_params: ParamsResolver) -> Dict[str, Any]:
+        """
+        يصيّر دفعة طلبات الإشعار بلغة كل مستلم، ويحفظها في notification_logs، ثم يرسلها عبر القناة.
+
+        Args:
+            db (Session): جلسة قاعدة البيانات (يتم commit بعد الحفظ وبعد تحديث حالات التسليم).
+            requests (Sequence[NotificationRequest]): طلبات الإشعار.
+            resolve_params (ParamsResolver): يعيد معاملات القالب لكل مجموعة بلغة معينة (يُستدعى مرة لكل لغة).
+
+        Returns:
+            Dict[str, Any]: تقرير الدفعة: عدد السجلات والمرسلة والفاشلة وعمليات التصيير والطلبات المتجاهلة.
+
+        Raises:
+            ConflictException: إذا لم توجد القناة أو منفذها أو حالات التسليم.
+        """
+        report: Dict[str, Any] = {"requested": len(requests), "logged": 0, "sent": 0, "failed": 0, "renders": 0, "missing_template": 0, "missing_recipient": 0}
+        if not requests:
+            return report
+        started = time.perf_counter()
+        backend, channel_id, status_ids = self._lookups(db)
+
+        templates = {row.template_name_key: row for row in notifications_crud.get_active_templates(db, list({r.template_name_key for r in requests}))}
+        translations: Dict[Tuple[int, str], Any] = {}
+        if templates:
+            for row in notifications_crud.get_template_translations(db, [t.template_id for t in templates.values()]):
+                translations[(row.template_id, row.language_code)] = row
+        recipients = {row.user_id: row for row in notifications_crud.get_notification_recipients(db, list({r.user_id for r in requests}))}
+
+        # تجميع الطلبات حسب لغة المستلم
+        by_language: Dict[str, List[Tuple[NotificationRequest, Any]]] = {}
+        for request in requests:
+            recipient = recipients.get(request.user_id)
+            if recipient is None:
+                report["missing_recipient"] += 1
+                continue
+            if request.template_name_key not in templates:
+                report["missing_template"] += 1
+                continue
+            by_language.setdefault(recipient.preferred_language_code or settings.DEFAULT_LANGUAGE, []).append((request, recipient))
+
+        logs: List[Dict[str, Any]] = []
+        outgoing: List[OutgoingNotification] = []
+        for language_code, items in by_language.items():
+            params = resolve_params(db, language_code, list({request.group_key for request, _ in items}))
+            rendered: Dict[Tuple[str, Hashable], Optional[Tuple[Optional[str], str]]] = {}
+            for request, recipient in items:
+                key = (request.template_name_key, request.group_key)
+                if key not in rendered:
+                    template = templates[request.template_name_key]
+                    translation = translations.get((template.template_id, language_code)) or translations.get((template.template_id, template.default_language_code))
+                    group_params = params.get(request.group_key, {})
+                    rendered[key] = (_render(translation.translated_subject, group_params), _render(translation.translated_body, group_params)) if translation else None
+                    report["renders"] += 1
+                text = rendered[key]
+                if text is None:
+                    report["missing_template"] += 1
+                    continue
+                log_id = uuid.uuid4()
+                address = backend.recipient_address(recipient)
+                logs.append({
+                    "notification_log_id": log_id,
+                    "user_id": request.user_id,
+                    "template_id": templates[request.template_name_key].template_id,
+                    "channel_id": channel_id,
+                    "recipient_address": address,
+                    "subject_rendered": text[0],
+                    "body_rendered": text[1],
+                    "delivery_status_id": status_ids[PENDING_STATUS_KEY],
+                    "related_entity_type": request.related_entity_type,
+                    "related_entity_id": request.related_entity_id,
+                })
+                outgoing.append(OutgoingNotification(log_id, request.user_id, address, text[0], text[1]))
+
+        notifications_crud.bulk_create_notification_logs(db, logs)
+        db.commit()
+        report["logged"] = len(logs)
+
+        updates = []
+        for notification, (delivered, response) in zip(outgoing, self._deliver(backend, outgoing)):
+            report["sent" if delivered else "failed"] += 1
+            updates.append({
+                "notification_log_id": notification.notification_log_id,
+                "delivery_status_id": status_ids[SENT_STATUS_KEY if delivered else FAILED_STATUS_KEY],
+                "gateway_response": response,
+            })
+        notifications_crud.bulk_update_notification_delivery(db, updates)
+        db.commit()
+
+        batch_ms = (time.perf_counter() - started) * 1000
+        report["ms"] = round(batch_ms, 3)
+        with self._stats_lock:
+            self.batches += 1
+            self.last_batch_ms = batch_ms
+            self.max_batch_ms = max(self.max_batch_ms, batch_ms)
+            for counter in ("requested", "logged", "sent", "failed", "renders", "missing_template", "missing_recipient"):
+                setattr(self, counter, getattr(self, counter) + report[counter])
+        return report
+
+    def _deliver(self, backend, outgoing: List[OutgoingNotification]) -> List[Tuple[bool, Optional[str]]]:
+        """يرسل الإشعارات عبر المنفذ بحد concurrency إرسالاً متزامنًا، ويعيد (نجح؟، رد البوابة) لكل إشعار بنفس الترتيب."""
+        def send(notification: OutgoingNotification) -> Tuple[bool, Optional[str]]:
+            try:
+                return True, backend.send(notification)
+            except Exception as exc:
+                logger.warning("Notification %s delivery failed: %s", notification.notification_log_id, exc)
+                return False, str(exc)[:1000]
+
+        if not outgoing:
+            return []
+        return list(self._get_executor().map(send, outgoing))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="notification-delivery")
+        return self._executor
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "channel": self.channel_name_key,
+                "concurrency": self.concurrency,
+                "batches": self.batches,
+                "requested": self.requested,
+                "logged": self.logged,
+                "sent": self.sent,
+                "failed": self.failed,
+                "renders": self.renders,
+                "missing_template": self.missing_template,
+                "missing_recipient": self.missing_recipient,
+                "last_batch_ms": round(self.last_batch_ms, 3),
+                "max_batch_ms": round(self.max_batch_ms, 3),
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+notification_dispatcher = NotificationDispatcher(
+    channel_name_key=settings.NOTIFICATION_DEFAULT_CHANNEL,
+    concurrency=settings.NOTIFICATION_DELIVERY_CONCURRENCY,
+)
@@ -21,6 +21,7 @@ from src.community.schemas import reviews_schemas as schemas # ReviewReport
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 
 
 # ==========================================================
@@ -91,7 +92,7 @@ def get_review_report_details_service(db: Session, report_id: int, current_user:
         raise NotFoundException(detail=f"البلاغ بمعرف {report_id} غير موجود.")
     
     # التحقق من صلاحيات العرض (فقط المسؤولين يمكنهم رؤية البلاغات)
-    is_admin = current_user and any(p.permission_name_key == "ADMIN_REVIEW_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = current_user and permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_VIEW_ANY")
 
     if not is_admin:
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل هذا البلاغ عن المراجعة.")
@@ -142,7 +143,7 @@ def update_review_report_service(db: Session, report_id: int, report_in: schemas
     db_report = get_review_report_details_service(db, report_id, current_user) # يتحقق من الوجود والصلاحية
 
     # 1. التحقق من صلاحية المستخدم (المسؤول فقط)
-    is_admin = any(p.permission_name_key == "ADMIN_REVIEW_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_MANAGE_ANY")
     if not is_admin:
         raise ForbiddenException(detail="غير مصرح لك بتحديث هذا البلاغ.")
     
@@ -178,7 +179,7 @@ def delete_review_report_service(db: Session, report_id: int, current_user: User
     db_report = get_review_report_details_service(db, report_id, current_user) # يتحقق من الوجود والصلاحية
 
     # 1. التحقق من صلاحية المستخدم (المسؤول فقط)
-    is_admin = any(p.permission_name_key == "ADMIN_REVIEW_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_MANAGE_ANY")
     if not is_admin:
         raise ForbiddenException(detail="غير مصرح لك بحذف هذا البلاغ.")
     
@@ -20,6 +20,7 @@ from src.community.schemas import reviews_schemas as schemas # ReviewResponse
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 
 
 # ==========================================================
@@ -55,7 +56,7 @@ def create_new_review_response(db: Session, response_in: schemas.ReviewResponseC
     #    و للمسؤولين (ADMIN_REVIEW_MANAGE_ANY)
     # TODO: يجب توسيع هذا التحقق ليشمل البائع الفعلي للمنتج أو لوت المزاد.
     is_review_owner = db_review.reviewer_user_id == current_user.user_id # المراجع يمكنه الرد على مراجعته (نادر)
-    is_admin = any(p.permission_name_key == "ADMIN_REVIEW_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_MANAGE_ANY")
 
     # مؤقتاً: السماح للبائعين بالرد إذا كانوا يملكون المنتجات المراجعة
     is_seller_of_reviewed_entity = False
@@ -108,7 +109,7 @@ def get_review_response_details_service(db: Session, response_id: int, current_u
     
     # 1. التحقق من صلاحيات العرض
     is_approved_publicly = db_response.is_approved is True
-    is_admin = current_user and any(p.permission_name_key == "ADMIN_REVIEW_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = current_user and permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_VIEW_ANY")
 
     if not (is_approved_publicly or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل هذا الرد على المراجعة.")
@@ -159,7 +160,7 @@ def update_review_response_service(db: Session, response_id: int, response_in: s
 
     # 1. التحقق من صلاحية المستخدم (صاحب الرد أو المسؤول الذي وافق عليه أو مسؤول عام)
     is_owner = db_response.responder_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_REVIEW_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_MANAGE_ANY")
 
     if not (is_owner or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بتحديث هذا الرد.")
@@ -191,7 +192,7 @@ def delete_review_response_service(db: Session, response_id: int, current_user:
 
     # 1. التحقق من صلاحية المستخدم للحذف
     is_owner = db_response.responder_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_REVIEW_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_MANAGE_ANY")
 
     if not (is_owner or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بحذف هذا الرد.")
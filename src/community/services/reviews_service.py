@@ -25,6 +25,7 @@ from src.community.schemas import reviews_schemas as schemas # Review
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 
 
 # ==========================================================
@@ -126,7 +127,7 @@ def get_review_details(db: Session, review_id: int, current_user: Optional[User]
     # 1. التحقق من صلاحيات العرض
     is_published = db_review.review_status.status_name_key == "PUBLISHED" # TODO: تأكد من اسم المفتاح لحالة "PUBLISHED"
     is_reviewer = current_user and db_review.reviewer_user_id == current_user.user_id
-    is_admin = current_user and any(p.permission_name_key == "ADMIN_REVIEW_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = current_user and permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_VIEW_ANY")
 
     # TODO: إذا كان المستخدم هو البائع للكيان المراجع، فقد يحتاج لرؤية المراجعة حتى لو لم تنشر.
     # is_seller_of_reviewed_entity = False
@@ -244,7 +245,7 @@ def delete_review_service(db: Session, review_id: int, current_user: User) -> Di
 
     # 1. التحقق من صلاحية المستخدم للحذف (مالك المراجعة أو مسؤول)
     is_reviewer = db_review.reviewer_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_REVIEW_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_REVIEW_MANAGE_ANY")
 
     if not (is_reviewer or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بحذف هذه المراجعة.")
@@ -7,7 +7,7 @@ from src.core.config import settings
 celery = Celery(
     "mothmerah_worker",
     broker=settings.CELERY_BROKER_URL,
-    include=["src.users.tasks"] # <-- تحديد مكان ملفات المهام
+    include=["src.users.tasks", "src.auctions.tasks", "src.products.tasks"] # <-- تحديد مكان ملفات المهام
 )
 
 # إعداد المهام المجدولة (Cron jobs)
@@ -16,5 +16,13 @@ celery.conf.beat_schedule = {
         'task': 'src.users.tasks.cleanup_inactive_sessions',
         'schedule': 3600.0,  # <-- كل 3600 ثانية (كل ساعة)
     },
+    'settle-ended-auctions': {
+        'task': 'src.auctions.tasks.settle_ended_auctions',
+        'schedule': settings.AUCTION_SETTLEMENT_SWEEP_SECONDS, # <-- ما فات المجدول (عامل متوقف، دفعة فاشلة)
+    },
+    'release-expired-stock-reservations': {
+        'task': 'src.products.tasks.release_expired_stock_reservations',
+        'schedule': settings.STOCK_RESERVATION_SWEEP_SECONDS, # <-- ما فات كنّاس الحجوزات في العمليات
+    },
 }
 celery.conf.timezone = 'UTC'
\ No newline at end of file
@@ -1,5 +1,6 @@
 # backend/src/core/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 
 class Settings(BaseSettings):
     # PostgreSQL Settings
@@ -9,13 +10,14 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     DATABASE_URL: str
 
-    # Redis Settings - تم تعطيله
-    # REDIS_HOST: str
-    # REDIS_PORT: int
+    # Redis Settings - اختياري (None = تعطيل Redis)
+    REDIS_HOST: Optional[str] = None
+    REDIS_PORT: int = 6379
 
     # API Settings
     PROJECT_NAME: str
     API_V1_STR: str
+    DEFAULT_LANGUAGE: str = "ar" # لغة المستخدم الافتراضية، والترجمة البديلة عند غياب ترجمة اللغة المطلوبة
 
     # JWT Settings
     SECRET_KEY: str
@@ -30,6 +32,106 @@ class Settings(BaseSettings):
     # CELERY_BROKER_URL: str = "redis://redis:6379/1"  # تم تعطيله
     INACTIVE_SESSION_MINUTES: int = 60 * 24 # 24 ساعة
 
+    # --- إعدادات ذاكرة لقطات الهوية (Principal Cache) ---
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # مدة صلاحية أقنعة الأدوار في سجل الصلاحيات؛ أقصى تقادم لسحب صلاحية في عملية أخرى = هذه المدة + PRINCIPAL_CACHE_TTL_SECONDS
+    PERMISSION_ROLE_MASK_TTL_SECONDS: float = 30.0
+
+    # --- إعدادات ذاكرة توكنات JWT المفكوكة (Decoded Token Cache) ---
+    JWT_DECODE_CACHE_MAX_ENTRIES: int = 10000 # 0 = تعطيل الذاكرة
+    JWT_DECODE_CACHE_MAX_AGE_SECONDS: float = 60.0 # أقصى عمر للمدخل حتى لو كان exp أبعد (يحد من تقادم الإبطال بين العمليات)
+    JWT_VERIFY_SESSION_ON_REQUEST: bool = False # التحقق من أن الجلسة (sid) نشطة عند كل إخفاق في الذاكرة
+
+    # --- إعدادات قائمة إبطال الجلسات (Session Revocation List) ---
+    SESSION_REVOCATION_USE_REDIS: bool = False # مشاركة الإبطال بين العمليات عبر Redis (يتطلب REDIS_HOST)
+    SESSION_REVOCATION_SYNC_SECONDS: float = 5.0 # كل كم ثانية تسحب العملية الإبطالات الجديدة من Redis
+    SESSION_REVOCATION_BLOOM_CAPACITY: int = 100000 # عدد الإبطالات المتوقع خلال مدة صلاحية توكن الوصول
+    SESSION_REVOCATION_BLOOM_FP_RATE: float = 0.001 # نسبة الإيجابيات الكاذبة المستهدفة لمرشح Bloom
+
+    # --- إعدادات تجزئة كلمات المرور (bcrypt) ---
+    BCRYPT_ROUNDS: int = 12 # تغيير القيمة يعيد تجزئة كلمات المرور تدريجيًا عند تسجيل الدخول
+    PASSWORD_HASH_WORKERS: Optional[int] = None # عدد خيوط التجزئة (None = عدد أنوية المعالج)
+    PASSWORD_HASH_MAX_QUEUE: int = 64 # أقصى عدد عمليات منتظرة قبل الرفض بـ 429
+
+    # --- إعدادات الرموز قصيرة العمر (OTP) ---
+    OTP_HASH_PEPPER: Optional[str] = None # مفتاح HMAC لتجزئة رموز OTP (None = مشتق من SECRET_KEY)
+    PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 10 # مدة صلاحية رمز إعادة تعيين كلمة المرور
+    OTP_MAX_VERIFICATION_ATTEMPTS: int = 5 # محاولات التحقق من رمز OTP قبل إبطاله (يجب طلب رمز جديد)
+
+    # --- إعدادات محرك المزايدات (Bid Engine) ---
+    BID_PLACEMENT_MAX_ATTEMPTS: int = 3 # عدد المحاولات عند تعارض المعاملات (Deadlock / Serialization)
+    BID_PLACEMENT_RETRY_BACKOFF_MS: float = 5.0 # زمن الانتظار الأساسي بين المحاولات (يتضاعف)
+
+    # --- إعدادات محرك المزادات في الذاكرة (Auction Engine) ---
+    AUCTION_ENGINE_ENABLED: bool = False # يتطلب أن تملك عملية واحدة كل مزاد (عامل واحد أو توجيه ثابت)
+    AUCTION_ENGINE_SHARDS: int = 4 # عدد خيوط الكتابة (كل مزاد يملكه خيط واحد)
+    AUCTION_ENGINE_QUEUE_SIZE: int = 10000 # أقصى أوامر منتظرة لكل قسم قبل الرفض بـ 429
+    AUCTION_ENGINE_FLUSH_INTERVAL_MS: float = 50.0 # أقصى تأخير لحفظ المزايدات المقبولة في قاعدة البيانات
+    AUCTION_ENGINE_FLUSH_BATCH_SIZE: int = 500 # حفظ فوري عند بلوغ هذا العدد من المزايدات المعلقة
+    AUCTION_ENGINE_LADDER_DEPTH: int = 50 # عدد آخر المزايدات المحفوظة في دفتر كل مزاد
+    AUCTION_ENGINE_MAX_PENDING_BIDS: int = 20000 # أقصى مزايدات غير محفوظة لكل قسم قبل الرفض بـ 429 (عند تعثر الحفظ)
+    AUCTION_ENGINE_MAX_FLUSH_FAILURES: int = 5 # بعد هذا العدد من إخفاقات الحفظ المتتالية يتوقف قبول المزايدات على المزاد
+
+    # --- إعدادات التحديثات الحية للمزادات (WebSocket / SSE) ---
+    AUCTION_EVENTS_USE_REDIS: bool = False # توزيع التحديثات بين العمال عبر Redis Pub/Sub (يتطلب REDIS_HOST)
+    AUCTION_EVENTS_HEARTBEAT_SECONDS: float = 15.0 # نبضة للحفاظ على الاتصال عند غياب التحديثات
+    AUCTION_EVENTS_MAX_SUBSCRIBERS_PER_AUCTION: int = 5000 # أقصى عدد اتصالات حية لكل مزاد في كل عملية
+
+    # --- إعدادات جدولة دورة حياة المزادات (Lifecycle Scheduler) ---
+    AUCTION_SCHEDULER_ENABLED: bool = False # تشغيل المجدول في هذه العملية (عملية واحدة تكفي؛ الانتقالات شرطية فلا ضرر من التكرار)
+    AUCTION_SCHEDULER_HORIZON_SECONDS: float = 300.0 # المواعيد التي تحل خلال هذه المدة فقط تُحمّل في الذاكرة
+    AUCTION_SCHEDULER_REFRESH_SECONDS: float = 10.0 # كل كم ثانية تُعاد قراءة النافذة من جدول auctions
+    AUCTION_SCHEDULER_BATCH_SIZE: int = 500 # عدد المزادات في كل تحديث شرطي جماعي
+    AUCTION_ANTI_SNIPING_SECONDS: float = 0.0 # مزايدة قبل النهاية بأقل من هذه المدة تمدد النهاية إلى (الآن + المدة)؛ 0 = تعطيل
+
+    # --- إعدادات تصفح المزادات ---
+    AUCTION_LOOKUP_CACHE_TTL_SECONDS: float = 300.0 # مدة صلاحية خريطة حالات وأنواع المزادات المخزنة في كل عملية
+    AUCTION_BROWSE_MAX_PAGE_SIZE: int = 100 # أقصى عدد مزادات في صفحة التصفح
+
+    # --- إعدادات خط التسويات الدفعي (Settlement Pipeline) ---
+    AUCTION_SETTLEMENT_CHUNK_SIZE: int = 500 # عدد المزادات المنتهية في كل دفعة (استعلام فائزين واحد و INSERT جماعي)
+    AUCTION_SETTLEMENT_LOOKBACK_HOURS: float = 72.0 # المسح الدوري يتجاهل المزادات المنتهية قبل هذه المدة
+    AUCTION_SETTLEMENT_SWEEP_SECONDS: float = 60.0 # الفاصل بين مسوح مهمة Celery الدورية (settle_ended_auctions)
+
+    # --- إعدادات توزيع إشعارات المزايدات (Bid Notification Fan-out) ---
+    BID_NOTIFICATIONS_ENABLED: bool = True # إخطار المزايدين الذين تم تجاوزهم ومراقبي المزاد
+    BID_NOTIFICATION_WINDOW_SECONDS: float = 2.0 # نافذة الدمج: مزايدات المزاد خلالها تصبح إشعارًا واحدًا لكل مستخدم
+    BID_NOTIFICATION_MAX_PENDING_AUCTIONS: int = 10000 # أقصى عدد مزادات بانتظار التوزيع (الزائد يُسقط ويُحصى)
+    NOTIFICATION_DEFAULT_CHANNEL: str = "IN_APP" # قناة إرسال الإشعارات التلقائية (notification_channels.channel_name_key)
+    NOTIFICATION_DELIVERY_CONCURRENCY: int = 8 # أقصى عدد إرسالات متزامنة عبر القناة
+
+    # --- إعدادات جداول الأسعار المجمّعة (Compiled Price Tables) ---
+    PRICE_TABLE_CACHE_TTL_SECONDS: float = 300.0 # أقصى عمر لجدول أسعار خيار تعبئة في الذاكرة (الإبطال محلي لكل عملية)
+    PRICE_TABLE_CACHE_MAX_ENTRIES: int = 50000 # أقصى عدد خيارات تعبئة بجداول مخزنة في كل عملية
+    PRICE_QUOTE_MAX_LINES: int = 500 # أقصى عدد بنود في طلب تسعير سلة واحد (POST /pricing/quote)
+
+    # --- إعدادات حجوزات المخزون (Inventory Reservations) ---
+    STOCK_RESERVATION_TTL_SECONDS: float = 900.0 # مهلة حجز كميات الطلب حتى الدفع، بعدها تعود إلى المتاح
+    STOCK_RESERVATION_SWEEPER_ENABLED: bool = False # تشغيل كنّاس الحجوزات المنتهية في هذه العملية (مهمة Celery الدورية تغطي الباقي)
+    STOCK_RESERVATION_HORIZON_SECONDS: float = 300.0 # الحجوزات التي تنتهي خلال هذه المدة فقط تُحمّل في كومة الذاكرة
+    STOCK_RESERVATION_REFRESH_SECONDS: float = 30.0 # كل كم ثانية تُعاد قراءة النافذة من جدول inventory_reservations
+    STOCK_RESERVATION_BATCH_SIZE: int = 500 # عدد الحجوزات في كل تحرير جماعي
+    STOCK_RESERVATION_SWEEP_SECONDS: float = 60.0 # الفاصل بين مسوح مهمة Celery الدورية (release_expired_stock_reservations)
+
+    # --- إعدادات قوائم الطلبات ---
+    ORDERS_MAX_PAGE_SIZE: int = 100 # أقصى عدد طلبات في صفحة "طلباتي" (GET /orders/me)
+
+    # --- إعدادات مجمع اتصالات قاعدة البيانات (Connection Pool) ---
+    DB_POOL_SIZE: int = 5 # عدد الاتصالات الدائمة لكل عملية (لكل Worker)
+    DB_MAX_OVERFLOW: int = 10 # اتصالات إضافية مؤقتة فوق DB_POOL_SIZE
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0 # مهلة انتظار اتصال متاح قبل إطلاق TimeoutError
+    DB_POOL_RECYCLE_SECONDS: int = 1800 # إعادة فتح الاتصالات الأقدم من هذه المدة
+    DB_POOL_PRE_PING: bool = True # فحص الاتصال قبل استخدامه (يتجاوز الاتصالات المقطوعة)
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None # statement_timeout في PostgreSQL (None = بدون حد)
+    DB_PGBOUNCER_MODE: bool = False # تعطيل العبارات المُجهزة للتوافق مع PgBouncer (Transaction Pooling)
+
+    # --- إعدادات قياس الاستعلامات وميزانيات المسارات ---
+    DEBUG: bool = False # عند التفعيل تُضاف ترويسات X-DB-* إلى الاستجابات
+    QUERY_BUDGET_MODE: str = "report" # off | report | enforce (enforce يطلق استثناء عند التجاوز، للاختبارات)
+    QUERY_DEFAULT_STATEMENT_BUDGET: Optional[int] = None # ميزانية افتراضية للمسارات التي لا تعلن ميزانية
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5 # عدد تكرارات نفس شكل العبارة لاعتبارها نمط N+1
+
     # هذا السطر يخبر Pydantic بأن يقرأ المتغيرات من ملف .env
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,195 @@
+# backend/src/core/deadline_scheduler.py
+# ----------------------------------------------------------------------------------------------------
+# أساس مشترك للمجدولات المعتمدة على المواعيد (مجدول دورة حياة المزادات، كنّاس حجوزات المخزون):
+# - الذاكرة: كومة (heap) بالمواعيد التي تحل خلال horizon_seconds فقط، ولكل مفتاح موعد واحد ساري في _deadlines؛
+#   المدخلات القديمة في الكومة (بعد إعادة جدولة أو إلغاء) تُتجاهل عند خروجها.
+# - خيط واحد يعيد قراءة النافذة من قاعدة البيانات كل refresh_seconds (refresh)، وينام حتى أقرب موعد،
+#   ثم يطلق كل ما حل موعده على دفعات بحجم batch_size (fire).
+# الأصناف الفرعية تطبق refresh و fire، ويمكنها تقسيم المواعيد المستحقة إلى مجموعات مرتبة (split_due).
+# ----------------------------------------------------------------------------------------------------
+
+import heapq
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class DeadlineScheduler(ABC):
+    """
+    كومة مواعيد مع خيط إطلاق واحد وعدادات مشتركة (المحمّل، الدفعات، الإخفاقات، تأخر الإطلاق، زمن آخر دفعة).
+    """
+
+    label = "Deadline scheduler" # يظهر في السجلات
+    thread_name = "deadline-scheduler"
+
+    def __init__(self, horizon_seconds: float, refresh_seconds: float, batch_size: int):
+        self.horizon_seconds = horizon_seconds
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = max(batch_size, 1)
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self.loaded = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.last_batch_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    # --- نقاط التوسعة ---
+
+    def on_start(self) -> bool:
+        """يُستدعى قبل بدء الخيط؛ إعادة False تلغي البدء."""
+        return True
+
+    def on_stop(self) -> None:
+        """يُستدعى بعد توقف الخيط."""
+
+    @abstractmethod
+    def refresh(self, now: Optional[float] = None) -> int:
+        """يقرأ المواعيد التي تحل قبل نهاية النافذة ويضيفها بـ add_deadline. يعيد عددها."""
+
+    def split_due(self, due: List[Hashable]) -> List[List[Hashable]]:
+        """يقسم المفاتيح المستحقة إلى مجموعات تُطلق بالترتيب (كل مجموعة على دفعات)."""
+        return [due]
+
+    @abstractmethod
+    def fire(self, keys: List[Hashable], now: float) -> int:
+        """يطلق دفعة مفاتيح حل موعدها. يعيد عدد ما طُبق فعلاً."""
+
+    # --- التشغيل ---
+
+    def start(self) -> bool:
+        """يبدأ خيط المجدول. يعيد False إذا رفض on_start البدء."""
+        if self.running:
+            return True
+        if not self.on_start():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join()
+        self.on_stop()
+        self._thread = None
+        with self._lock:
+            self._heap.clear()
+            self._deadlines.clear()
+
+    def _run(self) -> None:
+        next_refresh = 0.0
+        while not self._stop.is_set():
+            now = time.time()
+            try:
+                if now >= next_refresh:
+                    self.refresh(now)
+                    next_refresh = now + self.refresh_seconds
+                self.run_due()
+            except Exception:
+                self.count("failures")
+                logger.exception("%s iteration failed", self.label)
+                next_refresh = min(next_refresh, now + 1) # المواعيد التي لم تُطبق تعود مع القراءة التالية
+            with self._lock:
+                next_at = self._heap[0][0] if self._heap else next_refresh
+            self._wakeup.wait(max(min(next_at, next_refresh) - time.time(), 0))
+            self._wakeup.clear()
+
+    # --- الجدولة ---
+
+    def add_deadline(self, key: Hashable, deadline: datetime) -> None:
+        """يضيف أو يحدث موعد مفتاح (من أي خيط). المواعيد خارج النافذة تُترك للقراءة الدورية."""
+        at = _epoch(deadline)
+        if at > time.time() + self.horizon_seconds:
+            return
+        with self._lock:
+            if self._deadlines.get(key) == at:
+                return
+            self._deadlines[key] = at
+            heapq.heappush(self._heap, (at, key))
+            earliest = self._heap[0][0] == at
+        if earliest:
+            self._wakeup.set()
+
+    def discard(self, key: Hashable) -> None:
+        """يلغي موعد مفتاح (مدخله في الكومة يُتجاهل عند خروجه)."""
+        with self._lock:
+            self._deadlines.pop(key, None)
+
+    # --- الإطلاق ---
+
+    def _pop_due(self, now: float) -> List[Hashable]:
+        due: List[Hashable] = []
+        lag = 0.0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                at, key = heapq.heappop(self._heap)
+                if self._deadlines.get(key) != at:
+                    continue # موعد قديم استُبدل أو أُلغي
+                del self._deadlines[key]
+                due.append(key)
+                lag = max(lag, now - at)
+        if due:
+            with self._stats_lock:
+                self.last_lag_ms = lag * 1000
+                self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+        return due
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """يطلق كل المواعيد التي حلت على دفعات. يعيد عدد ما طُبق فعلاً."""
+        now = time.time() if now is None else now
+        fired = 0
+        for group in self.split_due(self._pop_due(now)):
+            for i in range(0, len(group), self.batch_size):
+                started = time.perf_counter()
+                fired += self.fire(group[i:i + self.batch_size], now)
+                with self._stats_lock:
+                    self.batches += 1
+                    self.last_batch_ms = (time.perf_counter() - started) * 1000
+        return fired
+
+    # --- القياسات ---
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._deadlines)
+            next_at = self._heap[0][0] if self._heap else None
+        return {
+            "running": self.running,
+            "pending_deadlines": pending,
+            "next_deadline_in_seconds": None if next_at is None else round(next_at - time.time(), 3),
+            "loaded": self.loaded,
+            "batches": self.batches,
+            "failures": self.failures,
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "last_batch_ms": round(self.last_batch_ms, 3),
+        }
@@ -0,0 +1,105 @@
+# backend/src/core/password_hasher.py
+# ----------------------------------------------------------------------------------------------------
+# منفذ تجزئة كلمات المرور (Password Hashing Executor).
+# bcrypt عملية حسابية مكلفة (~100-300 ms)، وتنفيذها داخل نقطة نهاية async def يحجب حلقة الأحداث
+# ويجعل عمليات تسجيل الدخول متسلسلة داخل العامل الواحد. هذا المنفذ ينقلها إلى مجمع خيوط (Thread Pool)
+# محدود الحجم؛ مكتبة bcrypt تحرر الـ GIL أثناء الحساب، لذا تتوزع العمليات على أنوية المعالج.
+# عند امتلاء الطابور يتم رفض الطلب فورًا بـ 429 بدلاً من تراكم الطلبات (Backpressure).
+# ----------------------------------------------------------------------------------------------------
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+from src.core import security
+
+
+class PasswordHasher:
+    """
+    مجمع خيوط محدود لعمليات bcrypt مع عداد للعمليات الجارية والمنتظرة.
+    الحد الأقصى للعمليات المقبولة = عدد الخيوط + طول الطابور المسموح.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 64):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _acquire_slot(self) -> None:
+        """يحجز مكانًا في المنفذ، أو يطلق 429 إذا كان المنفذ مشبعًا."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="الخادم مشغول حاليًا بمعالجة طلبات تسجيل الدخول. يرجى المحاولة بعد قليل.",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._acquire_slot()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._release_slot()
+
+    # --- العمليات ---
+
+    async def hash(self, password: str) -> str:
+        """يجزئ كلمة مرور بإعدادات bcrypt الحالية."""
+        return await self._run(security.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """يتحقق من كلمة مرور مقابل النسخة المجزأة."""
+        return await self._run(security.verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        يتحقق من كلمة المرور، ويعيد تجزئة جديدة إذا كانت المخزنة بإعدادات قديمة (مثل عدد جولات مختلف).
+        """
+        return await self._run(security.verify_and_update_password, plain_password, hashed_password)
+
+    # --- القياسات ---
+
+    def stats(self) -> Dict[str, int]:
+        """يعيد عمق الطابور والعمليات الجارية وعدد الطلبات المرفوضة."""
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": in_flight,
+                "queue_depth": max(in_flight - self.max_workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
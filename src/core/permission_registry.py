@@ -0,0 +1,175 @@
+# backend/src/core/permission_registry.py
+# ----------------------------------------------------------------------------------------------------
+# سجل الصلاحيات المُجمّع (Permission Registry).
+# يسند لكل مفتاح صلاحية (Permission.permission_name_key) رقم بت (Bit Index) ثابتًا،
+# ويمثل كل دور (Role) كقناع بتات (Bitmask) صحيح، بحيث يصبح التحقق من الصلاحية
+# اختبار بت واحد O(1) بدلاً من المرور على قائمة كائنات ORM في كل مرة.
+# يتم تحديث السجل تدريجيًا من rbac_service عند تعديل الأدوار أو الصلاحيات.
+# ملاحظة: التحديث التدريجي محلي لكل عملية (Worker)؛ لكل قناع مدة صلاحية (PERMISSION_ROLE_MASK_TTL_SECONDS)
+# يُعاد بعدها بناؤه من قاعدة البيانات، فلا يبقى سحب صلاحية في عملية أخرى أطول من هذه المدة.
+# ----------------------------------------------------------------------------------------------------
+
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+
+
+class PermissionRegistry:
+    """
+    سجل داخل العملية يربط مفاتيح الصلاحيات بأرقام بتات، والأدوار بأقنعة بتات.
+    """
+
+    def __init__(self, role_ttl_seconds: float):
+        self.role_ttl_seconds = role_ttl_seconds
+        self._bits: Dict[str, int] = {} # مفتاح الصلاحية -> رقم البت
+        self._keys: List[str] = [] # رقم البت -> مفتاح الصلاحية (للتحويل العكسي)
+        self._role_masks: Dict[int, Tuple[float, int]] = {} # معرف الدور -> (وقت انتهاء الصلاحية، قناع البتات)
+        self._lock = threading.Lock()
+
+    # --- تسجيل الصلاحيات ---
+
+    def _bit_for(self, permission_key: str) -> int:
+        """يعيد رقم البت للمفتاح، ويسند رقمًا جديدًا في آخر القائمة إن لم يكن مسجلاً (يُستدعى تحت القفل)."""
+        bit = self._bits.get(permission_key)
+        if bit is None:
+            bit = len(self._keys)
+            self._bits[permission_key] = bit
+            self._keys.append(permission_key)
+        return bit
+
+    def register_permission(self, permission_key: str) -> int:
+        """يسجل مفتاح صلاحية جديدًا (أو يعيد رقمه الحالي)."""
+        with self._lock:
+            return self._bit_for(permission_key)
+
+    def rename_permission(self, old_key: str, new_key: str) -> None:
+        """ينقل رقم البت من المفتاح القديم إلى الجديد عند تعديل مفتاح الصلاحية، فتبقى أقنعة الأدوار صحيحة."""
+        with self._lock:
+            bit = self._bits.pop(old_key, None)
+            if bit is None:
+                self._bit_for(new_key)
+                return
+            self._bits[new_key] = bit
+            self._keys[bit] = new_key
+
+    def drop_permission(self, permission_key: str) -> None:
+        """يزيل بت الصلاحية من جميع أقنعة الأدوار عند حذفها (يبقى رقم البت محجوزًا للمفتاح)."""
+        with self._lock:
+            bit = self._bits.get(permission_key)
+            if bit is None:
+                return
+            for role_id, (expires_at, mask) in self._role_masks.items():
+                self._role_masks[role_id] = (expires_at, mask & ~(1 << bit))
+
+    def mask_for_keys(self, permission_keys: Iterable[str]) -> int:
+        """يحول مجموعة مفاتيح صلاحيات إلى قناع بتات."""
+        with self._lock:
+            mask = 0
+            for key in permission_keys:
+                mask |= 1 << self._bit_for(key)
+            return mask
+
+    # --- أقنعة الأدوار ---
+
+    def _fresh_mask(self, role_id: int) -> Optional[int]:
+        """يعيد قناع الدور إذا كان محملاً ولم تنته صلاحيته، وإلا None."""
+        entry = self._role_masks.get(role_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def _store_mask(self, role_id: int, mask: int) -> None:
+        """يخزن قناع دور مع وقت انتهاء صلاحيته (يُستدعى تحت القفل)."""
+        self._role_masks[role_id] = (time.monotonic() + self.role_ttl_seconds, mask)
+
+    def load(self, db: Session) -> None:
+        """
+        تحميل كامل للسجل عند بدء التشغيل: استعلام واحد للصلاحيات (مرتبة بالمعرف لضمان ثبات الأرقام)
+        واستعلام واحد لجدول ربط الأدوار بالصلاحيات.
+        """
+        from src.users.models.roles_models import Permission, RolePermission
+
+        permission_rows = db.query(Permission.permission_id, Permission.permission_name_key).order_by(Permission.permission_id).all()
+        association_rows = db.query(RolePermission.role_id, RolePermission.permission_id).all()
+
+        key_by_id = {permission_id: key for permission_id, key in permission_rows}
+        with self._lock:
+            for _, key in permission_rows:
+                self._bit_for(key)
+            masks: Dict[int, int] = {}
+            for role_id, permission_id in association_rows:
+                key = key_by_id.get(permission_id)
+                if key is not None:
+                    masks[role_id] = masks.get(role_id, 0) | (1 << self._bits[key])
+            self._role_masks = {}
+            for role_id, mask in masks.items():
+                self._store_mask(role_id, mask)
+
+    def refresh_role(self, db: Session, role_id: int) -> int:
+        """يعيد بناء قناع دور واحد من قاعدة البيانات (تحديث تدريجي بعد إسناد/سحب صلاحية)."""
+        from src.users.crud import rbac_crud
+
+        mask = self.mask_for_keys(rbac_crud.get_permission_keys_for_role(db, role_id))
+        with self._lock:
+            self._store_mask(role_id, mask)
+        return mask
+
+    def drop_role(self, role_id: int) -> None:
+        """يحذف قناع دور (عند حذف الدور)."""
+        with self._lock:
+            self._role_masks.pop(role_id, None)
+
+    def role_mask(self, db: Session, role_id: int) -> int:
+        """يعيد قناع الدور من السجل، أو يبنيه من قاعدة البيانات عند غيابه أو انتهاء صلاحيته."""
+        mask = self._fresh_mask(role_id)
+        if mask is None:
+            mask = self.refresh_role(db, role_id)
+        return mask
+
+    def permission_keys_for_role(self, db: Session, role_id: int) -> FrozenSet[str]:
+        """يحول قناع الدور إلى مجموعة مفاتيح الصلاحيات (تُستخدم لبناء لقطات الهوية)."""
+        mask = self.role_mask(db, role_id)
+        keys = self._keys
+        return frozenset(keys[bit] for bit in range(mask.bit_length()) if mask >> bit & 1)
+
+    # --- التحقق من الصلاحيات ---
+
+    def role_has_permission(self, role_id: Optional[int], permission_key: str) -> bool:
+        """اختبار بت واحد على قناع دور محمل مسبقًا. يعيد False إذا كان الدور غير محمل أو انتهت صلاحية قناعه."""
+        if role_id is None:
+            return False
+        mask = self._fresh_mask(role_id)
+        bit = self._bits.get(permission_key)
+        if mask is None or bit is None:
+            return False
+        return bool(mask >> bit & 1)
+
+    def user_has_permission(self, user, permission_key: str) -> bool:
+        """
+        يتحقق مما إذا كان الدور الأساسي للمستخدم يمتلك الصلاحية.
+        إذا لم يكن قناع الدور محملاً أو انتهت صلاحيته، يُبنى من صلاحيات الدور المحملة على كائن المستخدم.
+        """
+        role_id = user.default_user_role_id
+        if role_id is None:
+            return False
+        mask = self._fresh_mask(role_id)
+        if mask is None:
+            role = user.default_role
+            mask = self.mask_for_keys(p.permission_name_key for p in role.permissions) if role else 0
+            with self._lock:
+                self._store_mask(role_id, mask)
+        bit = self._bits.get(permission_key)
+        return bit is not None and bool(mask >> bit & 1)
+
+    def clear(self) -> None:
+        """يفرغ أقنعة الأدوار (مع الإبقاء على أرقام البتات ثابتة)."""
+        with self._lock:
+            self._role_masks.clear()
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+permission_registry = PermissionRegistry(role_ttl_seconds=settings.PERMISSION_ROLE_MASK_TTL_SECONDS)
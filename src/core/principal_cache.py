@@ -0,0 +1,123 @@
+# backend/src/core/principal_cache.py
+# ----------------------------------------------------------------------------------------------------
+# ذاكرة تخزين مؤقت (Cache) داخل العملية للقطات هوية المستخدم (Principal) المستخدمة في التوابع
+# get_current_active_user و has_permission.
+# تُخزّن لقطة مضغوطة وغير قابلة للتعديل (حالة الحساب، الحذف الناعم، مفتاح الدور، مجموعة مفاتيح الصلاحيات)
+# مفهرسة بالمفتاح (user_id, role_id)، مع مدة صلاحية (TTL) وإخلاء الأقدم استخدامًا (LRU).
+# ملاحظة: الإبطال الصريح محلي لكل عملية (Worker)؛ مدة الصلاحية تحد من التقادم بين العمليات المختلفة.
+# ----------------------------------------------------------------------------------------------------
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+from uuid import UUID
+
+from src.core.config import settings
+
+
+@dataclass(frozen=True)
+class PrincipalSnapshot:
+    """
+    لقطة غير قابلة للتعديل لبيانات التفويض الخاصة بمستخدم ودوره الأساسي.
+    """
+    user_id: UUID
+    role_id: Optional[int]
+    account_status_key: Optional[str]
+    is_deleted: bool
+    role_key: Optional[str]
+    permission_keys: FrozenSet[str]
+
+    def has_permission(self, permission_key: str) -> bool:
+        """يتحقق مما إذا كانت الصلاحية ضمن صلاحيات الدور في اللقطة."""
+        return permission_key in self.permission_keys
+
+
+PrincipalKey = Tuple[UUID, Optional[int]]
+
+
+class PrincipalCache:
+    """
+    ذاكرة LRU محدودة الحجم مع TTL للقطات الهوية، آمنة للاستخدام من عدة خيوط (Threads).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, PrincipalSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: UUID, role_id: Optional[int]) -> Optional[PrincipalSnapshot]:
+        """
+        يجلب لقطة صالحة من الذاكرة أو None إذا لم تكن موجودة أو انتهت صلاحيتها.
+        """
+        key = (user_id, role_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= now:
+                # انتهت صلاحية اللقطة: نحذفها ونعتبرها إخفاقًا
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+    def put(self, snapshot: PrincipalSnapshot) -> None:
+        """
+        يخزن لقطة جديدة ويخلي الأقدم استخدامًا عند تجاوز الحد الأقصى.
+        """
+        key = (snapshot.user_id, snapshot.role_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """يبطل جميع لقطات مستخدم معين (مثلاً عند تغيير حالة حسابه)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def invalidate_role(self, role_id: int) -> None:
+        """يبطل جميع لقطات المستخدمين المرتبطين بدور معين (مثلاً عند تعديل صلاحياته)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == role_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """يفرغ الذاكرة بالكامل (مثلاً عند تعديل مفتاح صلاحية أو حذفها)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """يعيد عدادات الإصابة والإخفاق والإخلاء وحجم الذاكرة الحالي."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
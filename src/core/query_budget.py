@@ -0,0 +1,97 @@
+# backend/src/core/query_budget.py
+# ----------------------------------------------------------------------------------------------------
+# ميزانيات الاستعلامات لكل مسار (Per-route Statement Budgets) ووسيط (Middleware) القياس.
+# - query_budget(n): مزخرف (Decorator) يعلن الحد الأقصى لعدد عبارات SQL لنقطة نهاية.
+# - QueryBudgetMiddleware: يبدأ تجميع الإحصائيات لكل طلب، ويضيف ترويسات الاستجابة في وضع DEBUG،
+#   ويطلق QueryBudgetExceeded عند تجاوز الميزانية إذا كان QUERY_BUDGET_MODE="enforce" (للاختبارات).
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+from typing import Callable, Optional
+
+from src.core.config import settings
+from src.db.query_stats import QueryStats, start_request_stats
+
+logger = logging.getLogger(__name__)
+
+_BUDGET_ATTRIBUTE = "__query_budget__"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """يُطلق عند تجاوز نقطة نهاية لميزانية عبارات SQL المعلنة (في وضع enforce فقط)."""
+
+
+def query_budget(max_statements: int) -> Callable:
+    """
+    مزخرف يعلن الحد الأقصى لعدد عبارات SQL لنقطة نهاية.
+    يوضع تحت مزخرف الراوتر مباشرةً:
+
+        @router.get("/me")
+        @query_budget(4)
+        def read_me(...): ...
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, _BUDGET_ATTRIBUTE, max_statements)
+        return endpoint
+    return decorator
+
+
+def get_route_budget(scope) -> Optional[int]:
+    """يعيد ميزانية المسار الذي تمت مطابقته (أو الميزانية الافتراضية من الإعدادات)."""
+    endpoint = scope.get("endpoint")
+    budget = getattr(endpoint, _BUDGET_ATTRIBUTE, None) if endpoint is not None else None
+    return budget if budget is not None else settings.QUERY_DEFAULT_STATEMENT_BUDGET
+
+
+class QueryBudgetMiddleware:
+    """
+    وسيط ASGI يقيس عبارات SQL لكل طلب HTTP ويطبق ميزانية المسار.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.QUERY_BUDGET_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_stats()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                # عند بدء إرسال الاستجابة تكون نقطة النهاية والتوابع قد اكتملت
+                headers = list(message.get("headers", []))
+                headers.extend(self._debug_headers(stats, get_route_budget(scope)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+        self._report(scope, stats)
+
+    @staticmethod
+    def _debug_headers(stats: QueryStats, budget: Optional[int]):
+        repeated = stats.repeated_shapes(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+        headers = [
+            (b"x-db-statement-count", str(stats.statement_count).encode()),
+            (b"x-db-time-ms", f"{stats.total_time_ms:.2f}".encode()),
+            (b"x-db-repeated-statements", str(len(repeated)).encode()),
+        ]
+        if budget is not None:
+            headers.append((b"x-db-statement-budget", str(budget).encode()))
+        return headers
+
+    @staticmethod
+    def _report(scope, stats: QueryStats) -> None:
+        path = scope.get("path")
+        repeated = stats.repeated_shapes(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+        for shape, count in repeated.items():
+            logger.warning("Possible N+1 on %s: statement repeated %d times: %s", path, count, shape[:200])
+
+        budget = get_route_budget(scope)
+        if budget is None or stats.statement_count <= budget:
+            return
+        message = f"{scope.get('method')} {path} issued {stats.statement_count} SQL statements (budget {budget})"
+        if settings.QUERY_BUDGET_MODE == "enforce":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
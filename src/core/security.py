@@ -3,11 +3,12 @@ from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import  jwt ,JWTError
 from src.core.config import settings
-from typing import Optional
+from typing import Callable, Optional, Tuple
 import uuid  # استيراد مكتبة UUID للتعامل مع معرفات المستخدمين
 from fastapi import HTTPException, status
 from pydantic import BaseModel, Field, ValidationError
 from passlib.context import CryptContext
+from src.core.token_cache import token_cache
 
 # --- القسم الأول: نماذج البيانات (Schemas) للمصادقة ---
 
@@ -28,7 +29,9 @@ class TokenPayload(BaseModel):
 # نحدد هنا أننا سنستخدم خوارزمية "bcrypt" وهي من أقوى الخوارزميات الموصى بها حاليًا.
 # مكتبة passlib ستقوم تلقائيًا بإنشاء "ملح" (salt) فريد لكل كلمة مرور قبل تجزئتها،
 # وهذا إجراء أمني حيوي لمنع هجمات القواميس وقوس قزح (Rainbow Table Attacks).
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# عدد الجولات (Rounds) يُقرأ من الإعدادات؛ أي تجزئة مخزنة بعدد جولات مختلف تعتبر قديمة
+# ويعاد تجزئتها بشفافية عند تسجيل الدخول التالي (انظر verify_and_update_password).
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 # --- 2. وظائف تجزئة والتحقق من كلمة المرور (محسّنة) ---
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -41,6 +44,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    تتحقق من كلمة المرور، وتعيد تجزئة جديدة إذا كانت التجزئة المخزنة بإعدادات قديمة.
+
+    :param plain_password: كلمة المرور النصية الصريحة التي أدخلها المستخدم.
+    :param hashed_password: النسخة المجزأة المخزنة في قاعدة البيانات.
+    :return: (هل تطابقت، التجزئة الجديدة أو None إذا لم تكن هناك حاجة لإعادة التجزئة).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """
     [الاسم الأصلي محفوظ]
@@ -53,7 +66,7 @@ def get_password_hash(password: str) -> str:
 
 # --- القسم الثالث: وظائف إنشاء والتحقق من توكن JWT ---
 
-def create_access_token(user_id: uuid.UUID, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(user_id: uuid.UUID, expires_delta: Optional[timedelta] = None, session_id: Optional[uuid.UUID] = None) -> str:
     """
     إنشاء توكن وصول JWT جديد للمستخدم بشكل آمن ومحدد.
 
@@ -61,6 +74,7 @@ def create_access_token(user_id: uuid.UUID, expires_delta: Optional[timedelta] =
 
     :param user_id: المعرف الفريد للمستخدم (UUID) الذي سيتم تضمينه في التوكن.
     :param expires_delta: مدة صلاحية مخصصة للتوكن (اختياري).
+    :param session_id: معرف الجلسة (اختياري)؛ يُضمَّن كـ 'sid' ليمكن إبطال التوكن بتسجيل الخروج من الجلسة.
     :return: توكن JWT مشفر كسلسلة نصية.
     """
     if expires_delta:
@@ -71,17 +85,23 @@ def create_access_token(user_id: uuid.UUID, expires_delta: Optional[timedelta] =
     
     # بناء حمولة التوكن بشكل صريح باستخدام 'sub'
     to_encode = {"exp": expire, "sub": str(user_id)}
+    if session_id is not None:
+        to_encode["sid"] = str(session_id)
     
     # تشفير الحمولة باستخدام المفتاح السري والخوارزمية المحددة
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def decode_access_token (token: str) -> TokenPayload: #decode_and_validate_token(token: str) -> TokenPayload:
+def decode_access_token (token: str, session_validator: Optional[Callable[[uuid.UUID], bool]] = None) -> TokenPayload: #decode_and_validate_token(token: str) -> TokenPayload:
     """
     يفك تشفير توكن JWT المستلم، ويتحقق من صلاحيته وتوقيعه،
     ثم يتحقق من صحة هيكل حمولته باستخدام نموذج TokenPayload.
 
+    التوكنات التي تم التحقق منها تُخزن في ذاكرة LRU (token_cache) حتى انتهاء صلاحيتها،
+    فلا يتكرر فك التشفير والتحقق لنفس التوكن في كل طلب.
+
     :param token: توكن JWT كسلسلة نصية مستلمة من العميل.
+    :param session_validator: دالة اختيارية تتحقق من أن الجلسة (sid) ما زالت نشطة؛ تُستدعى عند الإخفاق في الذاكرة فقط.
     :raises HTTPException: يطلق استثناء (401 Unauthorized) في أي من الحالات التالية:
                             - التوكن تالف أو تم التلاعب به (JWTError).
                             - انتهت صلاحية التوكن.
@@ -94,6 +114,10 @@ def decode_access_token (token: str) -> TokenPayload: #decode_and_validate_token
         detail="لا يمكن التحقق من بيانات الاعتماد، التوكن غير صالح أو منتهي الصلاحية",
         headers={"WWW-Authenticate": "Bearer"},
     )  
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         # 1. محاولة فك تشفير التوكن باستخدام نفس المفتاح السري والخوارزمية
         payload = jwt.decode(
@@ -109,7 +133,12 @@ def decode_access_token (token: str) -> TokenPayload: #decode_and_validate_token
         # 3. إذا حدث أي خطأ أثناء فك التشفير أو التحقق من الهيكل، أطلق الاستثناء الموحد
         raise credentials_exception
 
-    # 4. في حالة النجاح، أرجع البيانات التي تم التحقق منها
+    # 4. التحقق الاختياري من أن الجلسة لم يتم إبطالها (تسجيل خروج)
+    if session_validator is not None and token_data.sid is not None and not session_validator(token_data.sid):
+        raise credentials_exception
+
+    # 5. في حالة النجاح، خزّن الحمولة حتى انتهاء صلاحية التوكن وأرجعها
+    token_cache.put(token, token_data, payload.get("exp"))
     return token_data
 
 def create_refresh_token(user_id: uuid.UUID, session_id: uuid.UUID) -> str:
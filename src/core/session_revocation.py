@@ -0,0 +1,229 @@
+# backend/src/core/session_revocation.py
+# ----------------------------------------------------------------------------------------------------
+# قائمة إبطال الجلسات (Session Revocation List) لتوكنات الوصول.
+# توكن الوصول يبقى صالحًا حتى exp حتى لو سجّل المستخدم خروجه من جلسته؛ بدلاً من استعلام قاعدة البيانات
+# عن الجلسة (sid) في كل طلب، تُسجَّل الجلسات المُبطلة هنا ويُفحص sid في الذاكرة.
+#
+# المسار السريع: مرشح Bloom أمام القائمة. الحالة الشائعة ("غير مُبطلة") تُحسم من المرشح وحده دون أي I/O؛
+# فقط الجلسات المُبطلة فعلاً (أو الإيجابيات الكاذبة النادرة) تصل إلى المخزن الموثوق.
+#
+# المخزن الموثوق:
+# - الذاكرة (افتراضيًا): قاموس داخل العملية. الإبطال لا يصل إلى العمليات الأخرى.
+# - Redis (SESSION_REVOCATION_USE_REDIS): مجموعة مرتبة (ZSET) مشتركة بين العمليات ومهام Celery،
+#   درجة كل عنصر هي وقت الإبطال. كل عملية تسحب الإضافات الجديدة إلى مرشحها كل SESSION_REVOCATION_SYNC_SECONDS.
+#
+# لا حاجة لتذكر الجلسة بعد ACCESS_TOKEN_EXPIRE_MINUTES من إبطالها: تجديد التوكن يُرفض للجلسات غير النشطة،
+# فلا يوجد بعدها توكن وصول صالح يحمل هذا sid.
+# ----------------------------------------------------------------------------------------------------
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "session_revocations"
+
+
+class BloomFilter:
+    """مرشح Bloom بسيط على مصفوفة بتات؛ لا يعطي سلبيات كاذبة أبدًا."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = max(capacity, 1)
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(int(math.ceil(-self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2))), 8)
+        self.num_hashes = max(int(round(self.num_bits / self.capacity * math.log(2))), 1)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: bytes):
+        # Double hashing: موضعان مستقلان من تجزئة واحدة تولد k موضعًا
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: bytes) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: bytes) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class SessionRevocationList:
+    """
+    مجموعة معرفات الجلسات المُبطلة مع مرشح Bloom كمسار سريع، آمنة للاستخدام من عدة خيوط.
+    """
+
+    def __init__(
+        self,
+        retention_seconds: float,
+        capacity: int,
+        false_positive_rate: float,
+        sync_seconds: float,
+        redis: Optional[Any] = None,
+    ):
+        self.retention_seconds = retention_seconds
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.sync_seconds = sync_seconds
+        self._redis = redis
+        self._lock = threading.Lock()
+        self._revoked: Dict[UUID, float] = {} # sid -> وقت الإبطال (المخزن الموثوق في وضع الذاكرة)
+        self._bloom = BloomFilter(capacity, false_positive_rate)
+        self._last_sync = 0.0
+        self._last_rebuild = time.time()
+        self.checks = 0
+        self.bloom_negatives = 0
+        self.false_positives = 0
+        self.revoked_hits = 0
+
+    # --- الكتابة ---
+
+    def revoke(self, session_ids: Iterable[UUID]) -> None:
+        """يسجل جلسات مُبطلة (عند تسجيل الخروج أو إلغاء التنشيط)."""
+        session_ids = list(session_ids)
+        if not session_ids:
+            return
+        now = time.time()
+        with self._lock:
+            for session_id in session_ids:
+                if self._redis is None:
+                    self._revoked[session_id] = now
+                self._bloom.add(session_id.bytes)
+        if self._redis is not None:
+            try:
+                self._redis.zadd(REDIS_KEY, {str(session_id): now for session_id in session_ids})
+            except Exception:
+                logger.exception("Failed to publish %d revoked sessions to Redis", len(session_ids))
+
+    # --- القراءة ---
+
+    def is_revoked(self, session_id: UUID) -> bool:
+        """هل تم إبطال الجلسة؟ الحالة الشائعة (لا) تُحسم من مرشح Bloom دون I/O."""
+        self._maybe_sync()
+        key = session_id.bytes
+        with self._lock:
+            self.checks += 1
+            if key not in self._bloom:
+                self.bloom_negatives += 1
+                return False
+            if self._redis is None:
+                revoked = session_id in self._revoked
+                self._count_positive(revoked)
+                return revoked
+        try:
+            revoked = self._redis.zscore(REDIS_KEY, str(session_id)) is not None
+        except Exception:
+            # المرشح يقول "ربما"؛ لا يمكن تأكيد الإبطال دون Redis، فنرفض بأمان
+            logger.exception("Failed to check session revocation in Redis")
+            revoked = True
+        with self._lock:
+            self._count_positive(revoked)
+        return revoked
+
+    def _count_positive(self, revoked: bool) -> None:
+        if revoked:
+            self.revoked_hits += 1
+        else:
+            self.false_positives += 1
+
+    # --- المزامنة والتنظيف ---
+
+    def _maybe_sync(self) -> None:
+        now = time.time()
+        if now - self._last_sync < self.sync_seconds:
+            return
+        with self._lock:
+            if now - self._last_sync < self.sync_seconds:
+                return
+            since = self._last_sync - self.sync_seconds # تداخل بسيط لتحمل فروق الساعات بين العمليات
+            self._last_sync = now
+        try:
+            self._sync(now, since)
+        except Exception:
+            logger.exception("Session revocation list sync failed")
+
+    def _sync(self, now: float, since: float) -> None:
+        horizon = now - self.retention_seconds
+        rebuild = now - self._last_rebuild >= self.retention_seconds
+        if self._redis is None:
+            with self._lock:
+                if rebuild:
+                    self._revoked = {sid: at for sid, at in self._revoked.items() if at >= horizon}
+                    self._rebuild_bloom(self._revoked)
+                    self._last_rebuild = now
+            return
+
+        # Redis: حذف العناصر المنتهية، ثم سحب الإضافات الجديدة (أو الكل عند إعادة بناء المرشح)
+        self._redis.zremrangebyscore(REDIS_KEY, "-inf", horizon)
+        members = self._redis.zrangebyscore(REDIS_KEY, horizon if rebuild else max(since, horizon), "+inf")
+        session_ids = [UUID(member) for member in members]
+        with self._lock:
+            if rebuild:
+                self._rebuild_bloom(session_ids)
+                self._last_rebuild = now
+            else:
+                for session_id in session_ids:
+                    self._bloom.add(session_id.bytes)
+
+    def _rebuild_bloom(self, session_ids: Iterable[UUID]) -> None:
+        """مرشح Bloom لا يدعم الحذف؛ يعاد بناؤه من العناصر السارية فقط."""
+        session_ids = list(session_ids)
+        bloom = BloomFilter(max(self.capacity, len(session_ids) * 2), self.false_positive_rate)
+        for session_id in session_ids:
+            bloom.add(session_id.bytes)
+        self._bloom = bloom
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._bloom = BloomFilter(self.capacity, self.false_positive_rate)
+
+    # --- القياسات ---
+
+    def stats(self) -> Dict[str, Any]:
+        """يعيد عدادات الفحص ونسبة الحسم من المرشح وحجمه."""
+        with self._lock:
+            return {
+                "backend": "memory" if self._redis is None else "redis",
+                "local_entries": len(self._revoked),
+                "bloom_items": self._bloom.count,
+                "bloom_bits": self._bloom.num_bits,
+                "bloom_hashes": self._bloom.num_hashes,
+                "checks": self.checks,
+                "bloom_negatives": self.bloom_negatives,
+                "revoked_hits": self.revoked_hits,
+                "false_positives": self.false_positives,
+                "fast_path_rate": (self.bloom_negatives / self.checks) if self.checks else 0.0,
+            }
+
+
+def _build_revocation_list() -> SessionRevocationList:
+    redis = None
+    if settings.SESSION_REVOCATION_USE_REDIS:
+        from src.db.redis_client import redis_client
+        if redis_client is None:
+            logger.warning("SESSION_REVOCATION_USE_REDIS is set but REDIS_HOST is not configured; using in-memory revocation list")
+        redis = redis_client
+    return SessionRevocationList(
+        retention_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        capacity=settings.SESSION_REVOCATION_BLOOM_CAPACITY,
+        false_positive_rate=settings.SESSION_REVOCATION_BLOOM_FP_RATE,
+        sync_seconds=settings.SESSION_REVOCATION_SYNC_SECONDS,
+        redis=redis,
+    )
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+session_revocations = _build_revocation_list()
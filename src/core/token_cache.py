@@ -0,0 +1,110 @@
+# backend/src/core/token_cache.py
+# ----------------------------------------------------------------------------------------------------
+# ذاكرة تخزين مؤقت (LRU) لتوكنات JWT التي تم فك تشفيرها والتحقق منها.
+# العملاء كثيرو الطلبات (مثل متابعة المزايدات) يرسلون نفس التوكن آلاف المرات؛ بدلاً من تشغيل
+# jwt.decode والتحقق بـ Pydantic في كل طلب، تُخزّن الحمولة (TokenPayload) مفهرسة بمقطع التوقيع
+# حتى انتهاء صلاحية التوكن (exp)، أو حتى JWT_DECODE_CACHE_MAX_AGE_SECONDS أيهما أقرب.
+# يتم حفظ التوكن الكامل مع الحمولة ومقارنته عند الإصابة، فلا يمكن تمرير حمولة معدلة بتوقيع صحيح لتوكن آخر.
+# الإبطال الصريح (تسجيل الخروج) محلي لكل عملية؛ الحد الأقصى للعمر يحد من التقادم بين العمليات.
+# ----------------------------------------------------------------------------------------------------
+
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from src.core.config import settings
+
+# (التوكن الكامل، وقت انتهاء الصلاحية بتوقيت epoch، الحمولة)
+_Entry = Tuple[str, float, Any]
+
+
+class DecodedTokenCache:
+    """
+    ذاكرة LRU محدودة الحجم للحمولات التي تم التحقق منها، آمنة للاستخدام من عدة خيوط (Threads).
+    """
+
+    def __init__(self, max_entries: int, max_age_seconds: float):
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _signature(token: str) -> str:
+        return token.rpartition(".")[2]
+
+    def get(self, token: str) -> Optional[Any]:
+        """يعيد الحمولة المخزنة للتوكن، أو None إذا لم تكن موجودة أو انتهت صلاحيتها."""
+        if self.max_entries <= 0:
+            return None
+        key = self._signature(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not hmac.compare_digest(entry[0], token):
+                self.misses += 1
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, token: str, payload: Any, exp: Optional[float]) -> None:
+        """يخزن حمولة تم التحقق منها حتى exp (أو الحد الأقصى للعمر)."""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.max_age_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = self._signature(token)
+        with self._lock:
+            self._entries[key] = (token, expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_session(self, session_id: UUID) -> None:
+        """يبطل توكنات جلسة معينة (عند تسجيل الخروج منها)."""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if getattr(entry[2], "sid", None) == session_id]:
+                del self._entries[key]
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """يبطل جميع توكنات مستخدم معين (عند تسجيل الخروج من جميع الأجهزة أو تغيير كلمة المرور)."""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if getattr(entry[2], "user_id", None) == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """يعيد عدادات الإصابة والإخفاق والإخلاء وحجم الذاكرة الحالي."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_age_seconds": self.max_age_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+token_cache = DecodedTokenCache(
+    max_entries=settings.JWT_DECODE_CACHE_MAX_ENTRIES,
+    max_age_seconds=settings.JWT_DECODE_CACHE_MAX_AGE_SECONDS,
+)
@@ -0,0 +1,65 @@
+# backend/src/core/token_hashing.py
+# ----------------------------------------------------------------------------------------------------
+# تجزئة الرموز قصيرة العمر (OTP، رموز إعادة التعيين) باستخدام HMAC-SHA256 مع مفتاح سري على الخادم (Pepper).
+# هذه الرموز محدودة الصلاحية وعدد المحاولات، لذا لا حاجة لتكلفة bcrypt المتعمدة (~100-300 ms)؛
+# الحماية من التخمين تأتي من المفتاح السري (غير موجود في قاعدة البيانات) ومن حدود المحاولات.
+#
+# صيغة التجزئة المخزنة: hmac-sha256$<salt>$<digest>
+# - salt عشوائي لكل رمز: يمنع تطابق تجزئتين لنفس الرمز (عمود token_hash فريد).
+# - purpose يفصل بين الاستخدامات، فلا يصلح رمز إعادة التعيين كرمز تغيير جوال.
+# التجزئات القديمة (bcrypt، تبدأ بـ $2) ما زالت مقبولة حتى تنتهي صلاحيتها.
+# ----------------------------------------------------------------------------------------------------
+
+import hashlib
+import hmac
+import secrets
+from typing import Optional
+
+from src.core.config import settings
+from src.core.security import verify_password
+
+_SCHEME = "hmac-sha256"
+_SALT_BYTES = 8
+
+PURPOSE_PASSWORD_RESET = "password_reset"
+PURPOSE_PHONE_CHANGE = "phone_change"
+
+
+def _pepper() -> bytes:
+    """المفتاح السري: OTP_HASH_PEPPER إن وُجد، وإلا مفتاح مشتق من SECRET_KEY."""
+    if settings.OTP_HASH_PEPPER:
+        return settings.OTP_HASH_PEPPER.encode()
+    return hashlib.sha256(b"otp-pepper:" + settings.SECRET_KEY.encode()).digest()
+
+
+def _digest(token: str, purpose: str, salt: str) -> str:
+    message = f"{purpose}:{salt}:{token}".encode()
+    return hmac.new(_pepper(), message, hashlib.sha256).hexdigest()
+
+
+def hash_token(token: str, purpose: str) -> str:
+    """يجزئ رمزًا قصير العمر للتخزين."""
+    salt = secrets.token_hex(_SALT_BYTES)
+    return f"{_SCHEME}${salt}${_digest(token, purpose, salt)}"
+
+
+def is_legacy_hash(stored_hash: Optional[str]) -> bool:
+    """هل التجزئة المخزنة بصيغة bcrypt القديمة؟"""
+    return bool(stored_hash) and stored_hash.startswith("$2")
+
+
+def verify_token(token: str, stored_hash: Optional[str], purpose: str) -> bool:
+    """
+    يتحقق من رمز مقابل التجزئة المخزنة بمقارنة ثابتة الزمن (Constant-time).
+    يقبل تجزئات bcrypt القديمة (مسار الترحيل) دون إعادة تجزئتها، لأن الرموز تنتهي خلال دقائق.
+    """
+    if not stored_hash:
+        return False
+    if is_legacy_hash(stored_hash):
+        return verify_password(token, stored_hash)
+
+    scheme, _, rest = stored_hash.partition("$")
+    salt, _, digest = rest.partition("$")
+    if scheme != _SCHEME or not salt or not digest:
+        return False
+    return hmac.compare_digest(_digest(token, purpose, salt), digest)
@@ -0,0 +1,22 @@
+# backend/src/db/ids.py
+# ----------------------------------------------------------------------------------------------------
+# معرفات BIGINT للإدراج الجماعي.
+# PostgreSQL يولد المفاتيح الأساسية BIGINT (BIGSERIAL) داخل عبارة INSERT نفسها، أما SQLite (بيئة التطوير) فلا يولدها
+# إلا لعمود INTEGER PRIMARY KEY، فتُحجز في SQLite مجموعة معرفات متتالية بعد أكبر معرف موجود باستعلام واحد للدفعة كلها
+# (نفس أسلوب create_account_status_history_record، لكن لدفعة بدلاً من صف واحد).
+# ----------------------------------------------------------------------------------------------------
+
+from typing import Any, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+def reserve_ids(db: Session, column: Any, count: int) -> Optional[List[int]]:
+    """
+    يحجز count معرفًا متتاليًا للعمود column في SQLite، ويعيد None في قواعد البيانات التي تولد المعرفات بنفسها.
+    """
+    if count <= 0 or db.get_bind().dialect.name != "sqlite":
+        return None
+    first_id = (db.scalar(select(func.max(column))) or 0) + 1
+    return list(range(first_id, first_id + count))
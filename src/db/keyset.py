@@ -0,0 +1,39 @@
+# backend/src/db/keyset.py
+# ----------------------------------------------------------------------------------------------------
+# مؤشرات الترقيم بالمفاتيح (Keyset / Cursor Pagination).
+# بدلاً من OFFSET (الذي يقرأ ويتجاهل كل الصفوف السابقة، فتزداد تكلفة الصفحة مع عمقها)، تحمل كل صفحة
+# قيم مفتاح الترتيب لآخر صف فيها، وتبدأ الصفحة التالية بشرط (col1, col2) > (v1, v2) على فهرس بنفس الترتيب،
+# فتكلفة أي صفحة مثل تكلفة الأولى. المؤشر نص base64 معتم للعميل يُعاد كما هو.
+# ----------------------------------------------------------------------------------------------------
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence, Tuple
+from uuid import UUID
+
+
+def encode_cursor(*values: Any) -> str:
+    """يرمّز قيم مفتاح الترتيب لآخر صف في الصفحة إلى مؤشر نصي."""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[str], Any]]) -> Tuple[Any, ...]:
+    """
+    يفك مؤشرًا أنشأه encode_cursor ويحول كل قيمة بالدالة المقابلة (مثلاً datetime.fromisoformat و UUID).
+
+    Raises:
+        ValueError: إذا كان المؤشر تالفًا أو لا يطابق عدد القيم وأنواعها.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor has the wrong number of values")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"invalid cursor: {exc}") from exc
+
+
+# المحولات الشائعة لمفاتيح الترتيب
+TIMESTAMP_ID_PARSERS = (datetime.fromisoformat, UUID)
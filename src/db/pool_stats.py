@@ -0,0 +1,101 @@
+# backend/src/db/pool_stats.py
+# ----------------------------------------------------------------------------------------------------
+# قياس مجمع اتصالات قاعدة البيانات (Connection Pool Telemetry).
+# يسجل زمن انتظار الحصول على اتصال من المجمع (Checkout Wait) في مدرج تكراري (Histogram)،
+# وعدد مرات انتهاء مهلة الانتظار، ويعرض حالة المجمع الحالية (المحجوزة، الفائضة، المتاحة).
+# تُستخدم هذه البيانات لتحديد عدد العمال (Workers) وحجم المجمع مقابل max_connections في PostgreSQL.
+# ----------------------------------------------------------------------------------------------------
+
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# الحدود العليا لفئات المدرج التكراري بالمللي ثانية (الفئة الأخيرة مفتوحة)
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolTelemetry:
+    """مدرج تكراري لأزمنة انتظار الحصول على اتصال، مشترك بين جميع المجمعات في العملية."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bucket_counts: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self._checkouts = 0
+            self._timeouts = 0
+            self._total_wait_ms = 0.0
+            self._max_wait_ms = 0.0
+
+    def record_wait(self, elapsed_ms: float) -> None:
+        with self._lock:
+            index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if elapsed_ms <= bound), len(WAIT_BUCKETS_MS))
+            self._bucket_counts[index] += 1
+            self._checkouts += 1
+            self._total_wait_ms += elapsed_ms
+            self._max_wait_ms = max(self._max_wait_ms, elapsed_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def histogram(self) -> Dict[str, Any]:
+        """يعيد المدرج التكراري وإحصائيات الانتظار المجمعة."""
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait_ms / self._checkouts, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "buckets": dict(zip(labels, self._bucket_counts)),
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+pool_telemetry = PoolTelemetry()
+
+
+class _TimedCheckoutMixin:
+    """
+    يقيس زمن _do_get (انتظار اتصال متاح، أو فتح اتصال فائض جديد).
+    لا يوفر SQLAlchemy حدثًا قبل بدء الانتظار، لذا يتم القياس بتوسيع فئة المجمع.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_telemetry.record_timeout()
+            raise
+        pool_telemetry.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool مع قياس زمن الانتظار (للمحرك المتزامن)."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool مع قياس زمن الانتظار (للمحرك غير المتزامن)."""
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """يعيد حالة المجمع الحالية. المجمعات التي ليست QueuePool تعيد نوعها فقط."""
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout_seconds": pool.timeout(),
+        })
+    return status
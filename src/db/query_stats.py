@@ -0,0 +1,81 @@
+# backend/src/db/query_stats.py
+# ----------------------------------------------------------------------------------------------------
+# قياس استعلامات قاعدة البيانات لكل طلب HTTP.
+# يربط مستمعين (Event Listeners) على المحرك (before/after_cursor_execute) لعدّ العبارات،
+# وجمع الزمن الكلي لقاعدة البيانات، واكتشاف تكرار نفس شكل العبارة (نمط N+1).
+# يتم تخزين الإحصائيات في ContextVar بحيث تصل إليها التوابع المتزامنة التي تعمل في threadpool.
+# ----------------------------------------------------------------------------------------------------
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """إحصائيات الاستعلامات لطلب واحد."""
+    statement_count: int = 0
+    total_time_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.statement_count += 1
+        self.total_time_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """يعيد أشكال العبارات التي تكررت threshold مرة أو أكثر (مرشحة لنمط N+1)."""
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+# الإحصائيات الخاصة بالطلب الحالي (None خارج نطاق أي طلب)
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    يعيد شكل العبارة: النص بعد توحيد المسافات.
+    SQLAlchemy يرسل القيم كمعاملات منفصلة، لذا فإن العبارات التي تختلف في القيم فقط لها نفس الشكل.
+    """
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+def start_request_stats() -> QueryStats:
+    """يبدأ تجميع إحصائيات جديدة للطلب الحالي."""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def get_request_stats() -> Optional[QueryStats]:
+    """يعيد إحصائيات الطلب الحالي (أو None)."""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times: List[float] = conn.info.get("query_start_time") or []
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000 if start_times else 0.0
+    stats.record(statement, elapsed_ms)
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """يربط مستمعي القياس على المحرك (مرة واحدة)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
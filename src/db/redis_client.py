@@ -3,17 +3,20 @@
 import redis
 from src.core.config import settings
 
-# إنشاء عميل اتصال بـ Redis
+# إنشاء عميل اتصال بـ Redis (None إذا لم يتم ضبط REDIS_HOST)
 # decode_responses=True يجعل النتائج تعود كنصوص (strings) بدلاً من بايتات (bytes)
 redis_client = redis.Redis(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     db=0,  # نستخدم قاعدة البيانات 0 للبيانات العامة
     decode_responses=True
-)
+) if settings.REDIS_HOST else None
 
 # يمكنك إضافة دالة للتحقق من الاتصال إذا أردت
 def ping_redis():
+    if redis_client is None:
+        print("Redis is not configured (REDIS_HOST is empty).")
+        return
     try:
         redis_client.ping()
         print("Successfully connected to Redis!")
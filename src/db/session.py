@@ -1,13 +1,71 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, AsyncIterator, Dict, Optional
+import logging
 import os
 from dotenv import load_dotenv
+from src.core.config import settings
+from src.db.query_stats import install_query_instrumentation
+from src.db.pool_stats import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+logger = logging.getLogger(__name__)
 
 # قراءة رابط قاعدة البيانات من متغيرات البيئة
 load_dotenv()
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def _postgres_connect_args(driver: str) -> Dict[str, Any]:
+    """
+    معاملات الاتصال الخاصة بـ PostgreSQL حسب المشغل (Driver):
+    - مهلة العبارات (statement_timeout) كمعامل بدء جلسة.
+    - وضع PgBouncer (Transaction Pooling): تعطيل العبارات المُجهزة (Prepared Statements) على الخادم،
+      لأن الاتصال الفعلي قد يتغير بين معاملة وأخرى.
+    """
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_PGBOUNCER_MODE:
+        if driver == "asyncpg":
+            connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+        elif driver == "psycopg":
+            connect_args["prepare_threshold"] = None
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            # PgBouncer لا يمرر معاملات بدء الجلسة، ويجب ضبط المهلة على دور قاعدة البيانات نفسه
+            logger.warning("DB_STATEMENT_TIMEOUT_MS is ignored in PgBouncer mode; set statement_timeout on the database role instead.")
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        if driver == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return connect_args
+
+def build_engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    يبني معاملات create_engine/create_async_engine من الإعدادات (src/core/config.Settings):
+    حجم المجمع، الفائض، مهلة الانتظار، إعادة التدوير، الفحص المسبق، ومعاملات الاتصال.
+    """
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # SQLite في الذاكرة يستخدم مجمعًا خاصًا (اتصال واحد) لا يقبل معاملات الحجم
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    if parsed.get_backend_name() == "postgresql":
+        connect_args = _postgres_connect_args(parsed.get_driver_name())
+        if connect_args:
+            options["connect_args"] = connect_args
+    return options
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **build_engine_options(SQLALCHEMY_DATABASE_URL))
+install_query_instrumentation(engine) # عدّ العبارات وزمنها لكل طلب (انظر src/db/query_stats.py)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # دالة لتوفير جلسة قاعدة البيانات للـ Endpoints
@@ -16,4 +74,61 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ----------------------------------------------------------------------------------------------------
+# المسار غير المتزامن (AsyncSession) لنقاط النهاية المعرفة بـ async def
+# ----------------------------------------------------------------------------------------------------
+# يتم تحويل رابط قاعدة البيانات إلى المشغل غير المتزامن المقابل:
+#   postgresql / postgresql+psycopg2 -> postgresql+psycopg (psycopg 3 يدعم asyncio مباشرةً)
+#   sqlite -> sqlite+aiosqlite
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "postgresql+asyncpg": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+aiosqlite": "sqlite+aiosqlite",
+}
+
+def to_async_database_url(url: str) -> str:
+    """يحول رابط قاعدة البيانات المتزامن إلى رابط يستخدم مشغلاً غير متزامن."""
+    scheme, sep, rest = url.partition("://")
+    async_scheme = _ASYNC_DRIVERS.get(scheme)
+    if async_scheme is None:
+        raise ValueError(f"لا يوجد مشغل غير متزامن معروف لقاعدة البيانات '{scheme}'.")
+    return f"{async_scheme}{sep}{rest}"
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def get_async_engine() -> AsyncEngine:
+    """
+    ينشئ المحرك غير المتزامن عند أول استخدام فقط، حتى لا يتطلب تشغيل التطبيق
+    تثبيت المشغل غير المتزامن إذا لم تُستخدم نقاط النهاية غير المتزامنة.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        async_url = to_async_database_url(SQLALCHEMY_DATABASE_URL)
+        _async_engine = create_async_engine(async_url, **build_engine_options(async_url, is_async=True))
+        install_query_instrumentation(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def active_engines() -> Dict[str, Any]:
+    """يعيد المحركات التي تم إنشاؤها (المتزامن دائمًا، وغير المتزامن بعد أول استخدام) لأغراض التشخيص."""
+    engines: Dict[str, Any] = {"sync": engine}
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return engines
+
+def AsyncSessionLocal() -> AsyncSession:
+    """ينشئ جلسة غير متزامنة جديدة (مكافئ SessionLocal للمسار غير المتزامن)."""
+    get_async_engine()
+    return _async_session_factory()
+
+# دالة لتوفير جلسة قاعدة البيانات غير المتزامنة للـ Endpoints المعرفة بـ async def
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
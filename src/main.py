@@ -47,6 +47,13 @@ from src.core.exception_handlers import (
     general_exception_handler
 )
 from pydantic import ValidationError # <-- استورد ValidationError لتسجيل معالجها
+from src.db.session import SessionLocal
+from src.core.config import settings
+from src.core.permission_registry import permission_registry
+from src.core.query_budget import QueryBudgetMiddleware
+from src.auctions.services.auction_engine import auction_engine
+from src.auctions.services.auction_scheduler import auction_scheduler
+from src.products.services.stock_reservations import stock_reservation_sweeper
 
 
 # -----------------------------------------------------------------------------
@@ -97,6 +104,9 @@ app.add_exception_handler(ValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 
+# قياس عبارات SQL لكل طلب وتطبيق ميزانيات المسارات (ترويسات X-DB-* في وضع DEBUG)
+app.add_middleware(QueryBudgetMiddleware)
+
 # إعدادات CORS (تبقى كما هي)
 app.add_middleware(
     CORSMiddleware,
@@ -106,6 +116,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# تحميل سجل أقنعة الصلاحيات مرة واحدة عند بدء التشغيل (لتثبيت أرقام البتات حسب ترتيب معرفات الصلاحيات)
+@app.on_event("startup")
+def warm_permission_registry():
+    db = SessionLocal()
+    try:
+        permission_registry.load(db)
+    finally:
+        db.close()
+
+# تشغيل مجدول دورة حياة المزادات (بدء/انتهاء المزادات تلقائيًا) في هذه العملية
+@app.on_event("startup")
+def start_auction_scheduler():
+    if settings.AUCTION_SCHEDULER_ENABLED:
+        auction_scheduler.start()
+
+# تشغيل كنّاس حجوزات المخزون (تحرير حجوزات الطلبات غير المدفوعة عند انتهاء مهلتها) في هذه العملية
+@app.on_event("startup")
+def start_stock_reservation_sweeper():
+    if settings.STOCK_RESERVATION_SWEEPER_ENABLED:
+        stock_reservation_sweeper.start()
+
+# إيقاف المجدول ثم حفظ المزايدات المعلقة في محرك المزادات قبل إيقاف العملية
+@app.on_event("shutdown")
+def flush_auction_engine():
+    auction_scheduler.stop()
+    stock_reservation_sweeper.stop()
+    auction_engine.shutdown()
+
 @app.get("/", tags=["Health Check"])
 def read_root():
     return {"status": "ok", "message": "Welcome to the Mothmerah API! The journey begins."}
@@ -130,6 +168,7 @@ api_v1_router.include_router(products_router.router) # User-facing products
 
 # --- 3. إدارة الأسعار الديناميكية (المجموعة 3) ---
 api_v1_router.include_router(pricing_router.router) # User-facing pricing
+api_v1_router.include_router(pricing_router.quote_router) # تسعير السلال (POST /pricing/quote)
 
 # --- 4. إدارة عمليات السوق (المجموعة 4) ---
 api_v1_router.include_router(orders_router.router)
@@ -1,10 +1,10 @@
 # backend\src\market\crud\orders_crud.py
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_, or_
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import exists, and_, or_, insert, select, tuple_, union
+from typing import List, Optional, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
 # استيراد المودلز من Market
 from src.market.models import orders_models as models_market # Order, OrderItem, OrderStatusHistory
@@ -17,6 +17,7 @@ from src.lookups.models.lookups_models import ( # <-- تم التعديل هنا
 )
 # استيراد الـ Schemas
 from src.market.schemas import order_schemas as schemas
+from src.db.ids import reserve_ids
 # استيراد Schemas للحالات والترجمات من Lookups العامة
 from src.lookups.schemas import ( # <-- تم التعديل هنا: استيراد مباشر للـ Schemas من lookups.schemas
     OrderStatusCreate, OrderStatusUpdate,
@@ -32,14 +33,16 @@ from src.lookups.schemas import ( # <-- تم التعديل هنا: استيرا
 # --- CRUD Functions for Order (الطلبات) ---
 # ==========================================================
 
-def create_order(db: Session, order_in: schemas.OrderCreate, buyer_user_id: UUID, order_reference_number: str, initial_status_id: int, calculated_amounts: dict) -> models_market.Order:
+def create_order(db: Session, order_in: schemas.OrderCreate, items: List[schemas.OrderItemCreate], buyer_user_id: UUID, order_reference_number: str, initial_status_id: int, calculated_amounts: dict) -> models_market.Order:
     """
-    ينشئ سجلاً جديداً للطلب في قاعدة البيانات، بما في ذلك بنوده المضمنة (Order Items).
-    تتم الحسابات المالية وتعيين المعرفات الأولية بواسطة طبقة الخدمة.
+    يضيف سجلاً جديداً للطلب وبنوده (عبارة INSERT واحدة لكل البنود) بدون commit.
+    تتم الحسابات المالية وتعيين المعرفات الأولية بواسطة طبقة الخدمة، والـ commit مسؤوليتها أيضًا
+    ليُحفظ الطلب وسجل حالته وخصم المخزون معًا أو لا يُحفظ أي منها.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
-        order_in (schemas.OrderCreate): بيانات الطلب للإنشاء، بما في ذلك قائمة بنود الطلب.
+        order_in (schemas.OrderCreate): بيانات الطلب للإنشاء.
+        items (List[schemas.OrderItemCreate]): بنود الطلب بعد التسعير في طبقة الخدمة (وليس أسعار order_in.items كما أرسلها العميل).
         buyer_user_id (UUID): معرف المشتري.
         order_reference_number (str): رقم مرجعي فريد للطلب (يُنشأ في الخدمة).
         initial_status_id (int): معرف الحالة الأولية للطلب (يُحدد في الخدمة).
@@ -48,10 +51,12 @@ def create_order(db: Session, order_in: schemas.OrderCreate, buyer_user_id: UUID
     Returns:
         models_market.Order: كائن الطلب الذي تم إنشاؤه.
     """
+    order_date = datetime.now(timezone.utc) # يُنسخ إلى بنود الطلب (order_items.order_date)
     db_order = models_market.Order(
         buyer_user_id=buyer_user_id,
         seller_user_id=order_in.seller_user_id,
         order_reference_number=order_reference_number,
+        order_date=order_date,
         order_status_id=initial_status_id,
         total_amount_before_discount=calculated_amounts['total_amount_before_discount'],
         discount_amount=calculated_amounts['discount_amount'],
@@ -61,7 +66,7 @@ def create_order(db: Session, order_in: schemas.OrderCreate, buyer_user_id: UUID
         currency_code=order_in.currency_code,
         shipping_address_id=order_in.shipping_address_id,
         billing_address_id=order_in.billing_address_id,
-        payment_method_id=order_in.payment_method_id,
+        payment_method_id=getattr(order_in, 'payment_method_id', None), # OrderCreate لا يحمل طريقة الدفع بعد (TODO في order_schemas)
         payment_status_id=order_in.payment_status_id,
         source_of_order=order_in.source_of_order,
         related_quote_id=order_in.related_quote_id,
@@ -72,22 +77,27 @@ def create_order(db: Session, order_in: schemas.OrderCreate, buyer_user_id: UUID
     db.add(db_order)
     db.flush() # للحصول على order_id قبل حفظ البنود وتاريخ الحالة
 
-    if order_in.items:
-        for item_in in order_in.items:
-            db_item = models_market.OrderItem(
-                order_id=db_order.order_id,
-                product_packaging_option_id=item_in.product_packaging_option_id,
-                seller_user_id=item_in.seller_user_id,
-                quantity_ordered=item_in.quantity_ordered,
-                unit_price_at_purchase=item_in.unit_price_at_purchase,
-                total_price_for_item=item_in.total_price_for_item,
-                item_status_id=item_in.item_status_id,
-                notes=item_in.notes
-            )
-            db.add(db_item)
-            
-    db.commit()
-    db.refresh(db_order)
+    if items:
+        item_rows = [
+            {
+                "order_id": db_order.order_id,
+                "product_packaging_option_id": item_in.product_packaging_option_id,
+                "seller_user_id": item_in.seller_user_id,
+                "quantity_ordered": item_in.quantity_ordered,
+                "unit_price_at_purchase": item_in.unit_price_at_purchase,
+                "total_price_for_item": item_in.total_price_for_item,
+                "item_status_id": item_in.item_status_id,
+                "notes": item_in.notes,
+                "order_date": order_date,
+            }
+            for item_in in items
+        ]
+        ids = reserve_ids(db, models_market.OrderItem.order_item_id, len(item_rows))
+        if ids:
+            for row, order_item_id in zip(item_rows, ids):
+                row["order_item_id"] = order_item_id
+        db.execute(insert(models_market.OrderItem), item_rows)
+
     return db_order
 
 def get_order(db: Session, order_id: UUID) -> Optional[models_market.Order]:
@@ -148,6 +158,44 @@ def get_all_orders(db: Session, buyer_user_id: Optional[UUID] = None, seller_use
 
     return query.offset(skip).limit(limit).all()
 
+def get_orders_for_party(db: Session, user_id: UUID, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 20) -> List[models_market.Order]:
+    """
+    يجلب صفحة من الطلبات التي يكون المستخدم طرفًا فيها (مشتريًا، أو بائع الطلب، أو بائعًا لأحد بنوده في طلب متعدد البائعين)،
+    مرتبة بـ (order_date, order_id) تنازليًا (الأحدث أولاً) بدءًا بعد المؤشر after (ترقيم بالمفاتيح بدلاً من OFFSET).
+    عبارة واحدة: UNION (يزيل التكرار) لثلاثة فروع، كل فرع يقرأ أول limit صفًا فقط من فهرسه المركب المنتهي بـ (order_date, order_id)
+    (ix_orders_buyer_order_date، ix_orders_seller_order_date، ix_order_items_seller_order_date)، فتكلفة الصفحة لا تعتمد
+    على عدد طلبات المستخدم ولا على عمق الصفحة.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        user_id (UUID): معرف المستخدم.
+        after (Optional[Tuple[datetime, UUID]]): (order_date, order_id) لآخر طلب في الصفحة السابقة.
+        limit (int): الحد الأقصى لعدد الطلبات.
+
+    Returns:
+        List[models_market.Order]: الطلبات مع بنودها.
+    """
+    Order, OrderItem = models_market.Order, models_market.OrderItem
+
+    def first_rows(query, order_date, order_id):
+        if after is not None:
+            query = query.where(tuple_(order_date, order_id) < tuple_(*after))
+        ranked = query.order_by(order_date.desc(), order_id.desc()).limit(limit).subquery()
+        return select(ranked.c.order_date, ranked.c.order_id)
+
+    page = union(
+        first_rows(select(Order.order_date, Order.order_id).where(Order.buyer_user_id == user_id), Order.order_date, Order.order_id),
+        first_rows(select(Order.order_date, Order.order_id).where(Order.seller_user_id == user_id), Order.order_date, Order.order_id),
+        first_rows(select(OrderItem.order_date, OrderItem.order_id).where(OrderItem.seller_user_id == user_id).distinct(), OrderItem.order_date, OrderItem.order_id),
+    ).subquery()
+    return list(db.scalars(
+        select(Order)
+        .join(page, Order.order_id == page.c.order_id)
+        .options(selectinload(Order.items))
+        .order_by(Order.order_date.desc(), Order.order_id.desc())
+        .limit(limit)
+    ).unique().all())
+
 def update_order(db: Session, db_order: models_market.Order, order_in: schemas.OrderUpdate) -> models_market.Order:
     """
     يحدث بيانات سجل طلب موجود.
@@ -216,7 +264,8 @@ def create_order_item(db: Session, item_in: schemas.OrderItemCreate, order_id: U
         unit_price_at_purchase=item_in.unit_price_at_purchase,
         total_price_for_item=item_in.total_price_for_item,
         item_status_id=item_in.item_status_id,
-        notes=item_in.notes
+        notes=item_in.notes,
+        order_date=select(models_market.Order.order_date).where(models_market.Order.order_id == order_id).scalar_subquery()
     )
     db.add(db_item)
     db.commit()
@@ -281,7 +330,7 @@ def update_order_item(db: Session, db_order_item: models_market.OrderItem, item_
 # --- CRUD Functions for OrderStatusHistory (سجل تغييرات حالة الطلب) ---
 # ==========================================================
 
-def create_order_status_history(db: Session, order_id: UUID, old_status_id: Optional[int], new_status_id: int, changed_by_user_id: Optional[UUID] = None, notes: Optional[str] = None) -> models_market.OrderStatusHistory:
+def create_order_status_history(db: Session, order_id: UUID, old_status_id: Optional[int], new_status_id: int, changed_by_user_id: Optional[UUID] = None, notes: Optional[str] = None, commit: bool = True) -> models_market.OrderStatusHistory:
     """
     ينشئ سجلاً جديداً لتاريخ تغيير حالة الطلب.
     هذه الدالة تُستخدم لتوثيق كل تغيير في حالة الطلب.
@@ -293,6 +342,7 @@ def create_order_status_history(db: Session, order_id: UUID, old_status_id: Opti
         new_status_id (int): معرف الحالة الجديدة للطلب.
         changed_by_user_id (Optional[UUID]): معرف المستخدم الذي أجرى التغيير (NULL إذا كان النظام).
         notes (Optional[str]): ملاحظات إضافية حول سبب التغيير.
+        commit (bool): False لإضافة السجل ضمن معاملة تحفظها طبقة الخدمة (مثلاً مع إنشاء الطلب).
 
     Returns:
         models_market.OrderStatusHistory: كائن سجل التاريخ الذي تم إنشاؤه.
@@ -304,7 +354,13 @@ def create_order_status_history(db: Session, order_id: UUID, old_status_id: Opti
         changed_by_user_id=changed_by_user_id,
         notes=notes
     )
+    ids = reserve_ids(db, models_market.OrderStatusHistory.order_status_history_id, 1)
+    if ids:
+        db_history.order_status_history_id = ids[0]
     db.add(db_history)
+    if not commit:
+        db.flush()
+        return db_history
     db.commit()
     db.refresh(db_history)
     return db_history
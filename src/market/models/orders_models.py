@@ -2,7 +2,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Integer, String, Text, Boolean, BigInteger, Numeric,
-    func, TIMESTAMP, text, ForeignKey, CheckConstraint 
+    func, TIMESTAMP, text, ForeignKey, CheckConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column  ,relationship 
@@ -62,6 +62,12 @@ class Order(Base):
 
     history: Mapped[List["OrderStatusHistory"]] = relationship(back_populates="order", cascade="all, delete-orphan") # علاقة بسجل تغييرات الحالة
 
+    __table_args__ = (
+        # طلباتي (get_orders_for_party): كل طرف يُقرأ بترتيب (order_date, order_id) من فهرسه
+        Index('ix_orders_buyer_order_date', 'buyer_user_id', 'order_date', 'order_id'),
+        Index('ix_orders_seller_order_date', 'seller_user_id', 'order_date', 'order_id'),
+    )
+
 class OrderItem(Base):
     """(4.أ.2) جدول بنود الطلب."""
     __tablename__ = 'order_items'
@@ -76,10 +82,16 @@ class OrderItem(Base):
     # item_status_id: Mapped[int] = mapped_column(Integer, nullable=True)
     item_status_id: Mapped[int] = mapped_column(Integer, ForeignKey('order_item_statuses.item_status_id'), nullable=True)
     notes: Mapped[str] = mapped_column(Text, nullable=True)
+    # نسخة من orders.order_date: طلبات البائع لبنود في طلبات متعددة البائعين تُقرأ مرتبة من فهرس order_items وحده
+    order_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    __table_args__ = (CheckConstraint('quantity_ordered > 0', name='chk_quantity_ordered_positive'),)
+    __table_args__ = (
+        CheckConstraint('quantity_ordered > 0', name='chk_quantity_ordered_positive'),
+        Index('ix_order_items_seller_order_date', 'seller_user_id', 'order_date', 'order_id'),
+        Index('ix_order_items_order_id', 'order_id'), # تحميل بنود صفحة من الطلبات (selectinload) بدون مسح الجدول
+    )
 
     # --- SQLAlchemy Relationships ---
     order: Mapped["Order"] = relationship(back_populates="items") # علاقة بالطلب الأب
@@ -165,6 +165,11 @@ class OrderRead(OrderBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class OrderPage(BaseModel):
+    """صفحة من طلبات المستخدم مرتبة بتاريخ الطلب (الأحدث أولاً)، مع مؤشر الصفحة التالية."""
+    items: List[OrderRead] = Field([])
+    next_cursor: Optional[str] = Field(None, description="يُمرر كما هو في cursor لجلب الصفحة التالية؛ None عند آخر صفحة.")
+
 
 # ==========================================================
 # --- Schemas لسجل تغييرات حالة الطلب (Order Status History) ---
@@ -2,8 +2,8 @@
 
 from sqlalchemy.orm import Session
 from decimal import Decimal
-from typing import List, Optional
-from uuid import UUID
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 from datetime import datetime,  timezone # استخدام timezone لجعل التواريخ aware
 
 # استيراد المودلز
@@ -19,24 +19,24 @@ from src.lookups.models import (
 from src.market.schemas import order_schemas as schemas
 # استيراد دوال الـ CRUD
 from src.market.crud import orders_crud
+from src.products.crud import packaging_crud
+from src.users.crud import core_crud
 # استيراد الاستثناءات المخصصة
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
+from src.core.config import settings # لحد حجم صفحة الطلبات
+from src.db.keyset import TIMESTAMP_ID_PARSERS, decode_cursor, encode_cursor # مؤشرات الترقيم بالمفاتيح
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 
 from src.lookups.schemas import lookups_schemas as schemas_lookups
 
 # استيراد الخدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
-from src.products.services.packaging_service import get_packaging_option_details # للتحقق من خيار التعبئة
 from src.products.services.product_service import get_product_by_id_for_user # للتحقق من ملكية المنتج
-from src.pricing.services.pricing_service import get_active_price # لحساب السعر الفعال
-from src.users.services.core_service import (get_address_by_id, # للتحقق من وجود العناوين
-    get_user_profile) # للتحقق من وجود البائع في Order
-
-# TODO: استيراد خدمة المخزون
-from src.products.services.inventory_service import adjust_stock_level # <-- أضف هذا الاستيراد
-from sqlalchemy.dialects.postgresql import UUID
+from src.pricing.services.pricing_service import price_many # لحساب الأسعار الفعالة لكل البنود دفعة واحدة
+from src.products.services.stock_reservations import confirm_holds, hold_stock, release_holds, return_confirmed_holds # حجوزات المخزون المؤقتة حتى الدفع
+from src.users.services.core_service import get_address_by_id # للتحقق من وجود العناوين
 
 # TODO: هـام (REQ-FUN-077): حفظ محتويات سلة التسوق للمستخدم المسجل ليتمكن من العودة إليها لاحقًا.
 # هذا يتطلب إضافة جدول/مودل جديد لسلة التسوق الدائمة (مثلاً 'shopping_carts' و 'shopping_cart_items').
@@ -116,92 +116,83 @@ def create_new_order(db: Session, order_in: schemas.OrderCreate, current_user: U
     if not currency_exists:
         raise NotFoundException(detail=f"رمز العملة '{order_in.currency_code}' غير صالح.")
 
-    # 3. التحقق من البائع في كل بند وحساب الأسعار وتوفر المخزون
-    initial_order_items_data = []
-    total_amount_before_discount_calc = Decimal(0)
-    total_discount_calc = Decimal(0) # TODO: حساب الخصم العام للطلب (إذا كان موجوداً)
+    # 3. جلب البيانات المرجعية لكل البنود دفعة واحدة (استعلام واحد لكل نوع مهما كان عدد البنود)
+    option_names = packaging_crud.get_packaging_option_names(db, {item_in.product_packaging_option_id for item_in in order_in.items})
+    missing_options = sorted({item_in.product_packaging_option_id for item_in in order_in.items} - option_names.keys())
+    if missing_options:
+        raise NotFoundException(detail=f"Packaging option with ID {', '.join(str(option_id) for option_id in missing_options)} not found.")
+
+    seller_ids = {item_in.seller_user_id for item_in in order_in.items}
+    missing_sellers = seller_ids - core_crud.get_existing_user_ids(db, seller_ids)
+    if missing_sellers:
+        raise NotFoundException(detail=f"البائع بمعرف {', '.join(str(seller_id) for seller_id in missing_sellers)} لبند المنتج غير موجود.")
 
-    # جلب حالة بند الطلب الافتراضية
+    # جلب حالة بند الطلب الافتراضية والحالة الأولية للطلب
     default_item_status = db.query(OrderItemStatus).filter(OrderItemStatus.status_name_key == "NEW").first()
     if not default_item_status:
         raise ConflictException(detail="حالة بند الطلب الافتراضية 'NEW' غير موجودة.")
+    initial_order_status = db.query(OrderStatus).filter(OrderStatus.status_name_key == "NEW").first()
+    if not initial_order_status:
+        raise ConflictException(detail="حالة الطلب الأولية 'NEW' غير موجودة.")
 
-    for item_in in order_in.items:
-        # أ. التحقق من وجود خيار التعبئة والبائع
-        packaging_option = get_packaging_option_details(db, item_in.product_packaging_option_id)
-        seller_for_item = get_user_profile(db, item_in.seller_user_id) # البائع لهذا البند
-        if not seller_for_item:
-            raise NotFoundException(detail=f"البائع بمعرف {item_in.seller_user_id} لبند المنتج غير موجود.")
-
-        # ب. التحقق من توفر المخزون وحجزه
-        # هذا التحقق تم مسبقاً، هنا نقوم بخصم الكمية
-        from src.products.crud.inventory_crud import get_or_create_inventory_item # استيراد مباشر لـ CRUD فقط للتحقق الأولي
-        inventory_item = get_or_create_inventory_item(db, item_in.product_packaging_option_id, item_in.seller_user_id)
-        if inventory_item.available_quantity < item_in.quantity_ordered:
-            raise ForbiddenException(detail=f"الكمية المطلوبة من المنتج '{packaging_option.packaging_option_name_key}' ({item_in.quantity_ordered}) أكبر من الكمية المتاحة في المخزون ({inventory_item.available_quantity}).")
-        
-        # ج. حساب السعر الفعلي للبند (باستخدام خدمة الأسعار الديناميكية)
-        effective_unit_price = get_active_price(db, item_in.product_packaging_option_id, item_in.quantity_ordered)
-        item_total_price = effective_unit_price * item_in.quantity_ordered
-
-        initial_order_items_data.append(schemas.OrderItemCreate(
+    # 4. أسعار كل البنود دفعة واحدة (جداول الأسعار المجمّعة: عدد ثابت من الاستعلامات مهما كان عدد البنود)
+    priced_lines = price_many(db, [(item_in.product_packaging_option_id, item_in.quantity_ordered) for item_in in order_in.items])
+    order_items_data = [
+        schemas.OrderItemCreate(
             product_packaging_option_id=item_in.product_packaging_option_id,
             seller_user_id=item_in.seller_user_id,
             quantity_ordered=item_in.quantity_ordered,
-            unit_price_at_purchase=effective_unit_price,
-            total_price_for_item=item_total_price,
+            unit_price_at_purchase=priced_line.unit_price,
+            total_price_for_item=priced_line.line_total,
             item_status_id=default_item_status.item_status_id,
             notes=item_in.notes
-        ))
-        total_amount_before_discount_calc += Decimal(str(item_total_price)) # يتم تجميع الإجمالي قبل أي خصومات عامة
-
-    # 4. حساب المبالغ النهائية للطلب
-    calculated_amounts = calculate_order_amounts(initial_order_items_data)
-
-    # 5. جلب الحالة الأولية للطلب
-    initial_order_status = db.query(OrderStatus).filter(OrderStatus.status_name_key == "NEW").first()
-    if not initial_order_status:
-        raise ConflictException(detail="حالة الطلب الأولية 'NEW' غير موجودة.")
+        )
+        for item_in, priced_line in zip(order_in.items, priced_lines)
+    ]
+    calculated_amounts = calculate_order_amounts(order_items_data)
 
-    # 6. توليد رقم مرجعي فريد للطلب
-    order_reference_number = f"ORD-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{UUID(bytes=os.urandom(8)).hex[:8].upper()}"
+    # 5. توليد رقم مرجعي فريد للطلب
+    order_reference_number = f"ORD-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{uuid4().hex[:8].upper()}"
     # TODO: يجب أن يكون هناك آلية أكثر قوة لتوليد أرقام مرجعية فريدة وتجنب التكرار المحتمل على المدى الطويل
 
-    # 7. استدعاء CRUD لإنشاء الطلب وبنوده.
+    # 6. إضافة الطلب وبنوده وأول حركة في سجل حالته (بدون commit).
     db_order = orders_crud.create_order(
         db=db,
         order_in=order_in,
+        items=order_items_data,
         buyer_user_id=current_user.user_id,
         order_reference_number=order_reference_number,
         initial_status_id=initial_order_status.order_status_id,
         calculated_amounts=calculated_amounts
     )
-
-    # 8. تسجيل أول حركة في سجل حالة الطلب
     orders_crud.create_order_status_history(
         db=db,
         order_id=db_order.order_id,
         old_status_id=None, # لا يوجد حالة سابقة
         new_status_id=initial_order_status.order_status_id,
         changed_by_user_id=current_user.user_id,
-        notes="الطلب تم إنشاؤه."
+        notes="الطلب تم إنشاؤه.",
+        commit=False
     )
-    
-    # 9. خصم الكميات من المخزون بعد تأكيد الطلب ونجاح الإنشاء (REQ-FUN-090).
-    #    - يتم استدعاء adjust_stock_level لكل بند في الطلب.
-    for item in db_order.items:
-        # إنشاء schema تعديل المخزون (بكمية سالبة)
-        stock_adjustment = inventory_schemas.StockAdjustmentCreate(
-            product_packaging_option_id=item.product_packaging_option_id,
-            change_in_quantity=-float(item.quantity_ordered), # الكمية بالسالب لخصمها
-            reason_notes=f"خصم بسبب الطلب رقم: {db_order.order_reference_number}"
+
+    # 7. حجز الكميات من المخزون حتى الدفع (REQ-FUN-090): عبارة UPDATE شرطية واحدة لكل البنود (الفحص والحجز معًا)،
+    #    ودفعة INSERT واحدة للحركات وأخرى لحجوزات الطلب (تنتهي بعد STOCK_RESERVATION_TTL_SECONDS إن لم يُدفع).
+    #    الكميات تُجمع لكل (خيار تعبئة، بائع) لأن عدة بنود قد تسحب من نفس بند المخزون.
+    #    ترفع ForbiddenException إذا لم تكفِ كمية أي بند، دون حجز أي شيء أو حفظ الطلب.
+    requested: Dict[Tuple[int, UUID], Decimal] = {}
+    for item_in in order_in.items:
+        key = (item_in.product_packaging_option_id, item_in.seller_user_id)
+        requested[key] = requested.get(key, Decimal(0)) + Decimal(str(item_in.quantity_ordered))
+    try:
+        hold_stock(
+            db, db_order.order_id, requested, created_by_user_id=current_user.user_id,
+            reason_notes=f"خصم بسبب الطلب رقم: {order_reference_number}", labels=option_names
         )
-        # استدعاء خدمة تعديل المخزون
-        # يجب تمرير المستخدم الذي يقوم بالخصم (نظام أو البائع في هذه الحالة)
-        # TODO: يمكن تحسين هذه الدالة في inventory_service.adjust_stock_level لتقبل SystemUser بدلاً من CurrentUser.
-        adjust_stock_level(db, stock_adjustment, current_user) # <-- تم تنفيذ هذا الـ TODO
+    except ForbiddenException:
+        db.rollback()
+        raise
 
-    db.commit() # تأكيد العملية بالكامل
+    db.commit() # commit واحد: الطلب وبنوده وسجل حالته وحجز المخزون معًا أو لا شيء
     db.refresh(db_order)
 
     # TODO: هـام (REQ-FUN-082): التكامل الفعلي مع وحدة الدفع والمحفظة (Module 8).
@@ -237,47 +228,43 @@ def get_order_details(db: Session, order_id: UUID, current_user: User) -> models
     # التحقق من الصلاحيات: المشتري أو البائع أو المسؤول
     is_buyer = db_order.buyer_user_id == current_user.user_id
     is_seller_of_any_item = any(item.seller_user_id == current_user.user_id for item in db_order.items)
-    is_admin = any(p.permission_name_key == "ADMIN_ORDER_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_ORDER_VIEW_ANY")
 
     if not (is_buyer or is_seller_of_any_item or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل هذا الطلب.")
     
     return db_order
 
-def get_my_orders(db: Session, current_user: User, skip: int = 0, limit: int = 100) -> List[models_market.Order]:
+def get_my_orders(db: Session, current_user: User, cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
     """
-    خدمة لجلب جميع الطلبات التي يكون المستخدم الحالي طرفًا فيها (كمشتري أو بائع).
+    خدمة لجلب الطلبات التي يكون المستخدم الحالي طرفًا فيها (كمشتري، أو بائع للطلب، أو بائع لبنود داخل طلب متعدد البائعين)،
+    مرتبة بتاريخ الطلب (الأحدث أولاً) بترقيم المؤشر: كل صفحة تبدأ بعد (order_date, order_id) لآخر طلب في الصفحة السابقة،
+    باستعلام واحد على فهارس مرتبة بنفس المفتاح، فتكلفة الصفحة لا تعتمد على عدد طلبات المستخدم ولا على عمقها.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
         current_user (User): المستخدم الحالي.
-        skip (int): عدد السجلات لتخطيها.
-        limit (int): الحد الأقصى لعدد السجلات.
+        cursor (Optional[str]): next_cursor من الصفحة السابقة (None للصفحة الأولى).
+        limit (int): عدد الطلبات في الصفحة (بحد أقصى ORDERS_MAX_PAGE_SIZE).
 
     Returns:
-        List[models_market.Order]: قائمة بكائنات الطلبات.
-    """
-    # جلب الطلبات التي هو المشتري فيها
-    orders_as_buyer = orders_crud.get_all_orders(db, buyer_user_id=current_user.user_id, skip=skip, limit=limit)
-    
-    # جلب الطلبات التي هو بائع لبنود فيها (حتى لو لم يكن هو البائع الرئيسي في جدول الطلبات)
-    # TODO: هذا يتطلب استعلامًا أكثر تعقيدًا لضم جدول OrderItem
-    #       أو دالة CRUD منفصلة لجلب الطلبات التي يكون فيها المستخدم بائعاً لبنود معينة.
-    #       لأغراض MVP، يمكن دمج القوائم بعد جلبها بشكل منفصل.
-    
-    # حالياً، get_all_orders تقوم بالتصفية على seller_user_id في الطلب الرئيسي
-    # وهذا لا يلتقط الطلبات التي تحتوي على بنود من بائعين متعددين.
-    # يجب تحسين get_all_orders في CRUD لتدعم البحث عن seller_user_id في order_items
-    orders_as_seller = orders_crud.get_all_orders(db, seller_user_id=current_user.user_id, skip=skip, limit=limit)
-
-    # دمج القوائم وإزالة التكرارات
-    all_orders = {order.order_id: order for order in orders_as_buyer}
-    all_orders.update({order.order_id: order for order in orders_as_seller})
+        Dict[str, Any]: صفحة بحقول OrderPage (items و next_cursor).
 
-    # TODO: يجب أن تكون تصفية الترقيم والحد (skip, limit) مطبقة بعد الدمج.
-    #       لتحسين الأداء، يجب أن يتم الاستعلام في CRUD ليعيد الطلبات التي يكون المستخدم فيها مشترياً أو بائعاً لبند.
+    Raises:
+        BadRequestException: إذا كان المؤشر تالفًا.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, TIMESTAMP_ID_PARSERS)
+        except ValueError:
+            raise BadRequestException(detail="مؤشر الصفحة غير صالح.")
+    limit = max(1, min(limit, settings.ORDERS_MAX_PAGE_SIZE))
 
-    return list(all_orders.values())
+    orders = orders_crud.get_orders_for_party(db, current_user.user_id, after=after, limit=limit + 1)
+    page = orders[:limit]
+    next_cursor = encode_cursor(page[-1].order_date, page[-1].order_id) if len(orders) > limit else None
+    return {"items": page, "next_cursor": next_cursor}
 
 def get_all_orders_for_admin(db: Session, skip: int = 0, limit: int = 100) -> List[models_market.Order]:
     """
@@ -310,7 +297,8 @@ def update_order(db: Session, order_id: UUID, order_in: schemas.OrderUpdate, cur
     Raises:
         NotFoundException: إذا لم يتم العثور على الطلب.
         ForbiddenException: إذا لم يكن المستخدم مصرحًا له بتحديث الطلب.
-        BadRequestException: إذا كانت الحالة الجديدة غير موجودة.
+        BadRequestException: إذا كانت الحالة الجديدة أو حالة الدفع الجديدة غير موجودة.
+        ConflictException: إذا تم الدفع بعد انتهاء مهلة حجز كميات الطلب.
     """
     db_order = get_order_details(db, order_id, current_user) # يتحقق من الوجود والصلاحية
 
@@ -324,6 +312,14 @@ def update_order(db: Session, order_id: UUID, order_in: schemas.OrderUpdate, cur
         #       مثلاً، لا يمكن الانتقال من "ملغى" إلى "تم الشحن".
         #       يمكن تعريف آلة حالة في مكان مركزي.
 
+    # عند الدفع تُخصم كميات حجوزات الطلب من المخزون الفعلي (ترفع ConflictException إذا انتهت مهلتها)
+    if order_in.payment_status_id and order_in.payment_status_id != db_order.payment_status_id:
+        new_payment_status = db.query(PaymentStatus).filter(PaymentStatus.payment_status_id == order_in.payment_status_id).first()
+        if not new_payment_status:
+            raise BadRequestException(detail=f"حالة الدفع بمعرف {order_in.payment_status_id} غير موجودة.")
+        if new_payment_status.status_name_key == "PAID":
+            confirm_holds(db, db_order.order_id)
+
     updated_order = orders_crud.update_order(db=db, db_order=db_order, order_in=order_in)
 
     # إذا تم تحديث الحالة، سجل ذلك في تاريخ الحالة
@@ -364,7 +360,7 @@ def cancel_order(db: Session, order_id: UUID, current_user: User, reason: Option
     # 1. التحقق من صلاحية المستخدم للإلغاء (مالك الطلب أو بائع لأحد البنود أو مسؤول)
     is_buyer = db_order.buyer_user_id == current_user.user_id
     is_seller_of_any_item = any(item.seller_user_id == current_user.user_id for item in db_order.items)
-    is_admin = any(p.permission_name_key == "ADMIN_ORDER_MANAGE_ANY" for p in current_user.default_role.permissions) # صلاحية إلغاء الطلب كمسؤول
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_ORDER_MANAGE_ANY") # صلاحية إلغاء الطلب كمسؤول
 
     if not (is_buyer or is_seller_of_any_item or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بإلغاء هذا الطلب.")
@@ -385,15 +381,16 @@ def cancel_order(db: Session, order_id: UUID, current_user: User, reason: Option
     if not canceled_status:
         raise ConflictException(detail=f"حالة الإلغاء '{canceled_status_key}' غير موجودة. يرجى تهيئة البيانات المرجعية.")
 
-    # 4. تحديث حالة الطلب
-    orders_crud.update_order_status(db=db, db_order=db_order, new_status_id=canceled_status.order_status_id)
+    # 4. عكس العمليات: تحرير حجوزات المخزون غير المدفوعة، وإعادة كميات المدفوعة (المؤكدة) إلى المخزون الفعلي
+    #    (تُحفظ مع تحديث الحالة)، ثم استرداد المدفوعات
+    reason_notes = f"إلغاء الطلب رقم: {db_order.order_reference_number}"
+    release_holds(db, order_ids=[db_order.order_id], created_by_user_id=current_user.user_id, reason_notes=reason_notes)
+    return_confirmed_holds(db, db_order.order_id, created_by_user_id=current_user.user_id, reason_notes=reason_notes)
+
+    # 5. تحديث حالة الطلب (update_order_status في orders_crud محجوبة بدالة تحديث جدول الحالات التي تحمل نفس الاسم)
+    old_status_id = db_order.order_status_id
+    orders_crud.update_order(db=db, db_order=db_order, order_in=schemas.OrderUpdate(order_status_id=canceled_status.order_status_id))
 
-    # 5. عكس العمليات: إعادة المخزون واسترداد المدفوعات
-    for item in db_order.items:
-        # TODO: استعادة الكميات إلى المخزون (InventoryService)
-        #       مثلاً: inventory_service.adjust_stock_level(db, item.product_packaging_option_id, item.quantity_ordered, ...)
-        pass
-    
     # TODO: بدء عملية استرداد المدفوعات (PaymentService)
     #       مثلاً: payment_service.initiate_refund(db, db_order.order_id, db_order.final_total_amount, ...)
 
@@ -401,7 +398,7 @@ def cancel_order(db: Session, order_id: UUID, current_user: User, reason: Option
     orders_crud.create_order_status_history(
         db=db,
         order_id=db_order.order_id,
-        old_status_id=db_order.order_status_id, # الحالة قبل الإلغاء
+        old_status_id=old_status_id, # الحالة قبل الإلغاء
         new_status_id=canceled_status.order_status_id,
         changed_by_user_id=current_user.user_id,
         notes=reason or f"الطلب تم إلغاؤه بواسطة {current_user.user_id}"
@@ -442,7 +439,7 @@ def get_order_item_details_service(db: Session, order_item_id: int, current_user
     is_seller_of_item = db_item.seller_user_id == current_user.user_id if current_user else False
     is_admin = False
     if current_user:
-        is_admin = any(p.permission_name_key == "ADMIN_ORDER_VIEW_ANY" for p in current_user.default_role.permissions)
+        is_admin = permission_registry.user_has_permission(current_user, "ADMIN_ORDER_VIEW_ANY")
 
     if not (is_buyer_of_order or is_seller_of_item or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل بند الطلب هذا.")
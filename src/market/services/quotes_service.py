@@ -17,6 +17,7 @@ from src.market.crud import quotes_crud
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 from src.lookups.schemas import lookups_schemas as schemas_lookups
 
@@ -127,7 +128,7 @@ def get_quote_details(db: Session, quote_id: int, current_user: User) -> models_
     # التحقق من الصلاحيات: البائع مقدم العرض، أو المشتري صاحب الـ RFQ، أو المسؤول
     is_seller = db_quote.seller_user_id == current_user.user_id
     is_rfq_buyer = db_quote.rfq.buyer_user_id == current_user.user_id # يتطلب تحميل rfq في العلاقة
-    is_admin = any(p.permission_name_key == "ADMIN_QUOTE_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_QUOTE_VIEW_ANY")
 
     if not (is_seller or is_rfq_buyer or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل عرض السعر هذا.")
@@ -238,7 +239,7 @@ def accept_quote(db: Session, quote_id: int, current_user: User) -> models_marke
 
     # 1. التحقق من صلاحية المستخدم (يجب أن يكون مشتري الـ RFQ أو مسؤول)
     if db_quote.rfq.buyer_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_QUOTE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_QUOTE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بقبول عرض السعر هذا.")
 
     # 2. التحقق من أن عرض السعر لا يزال صالحًا وفي حالة تسمح بالقبول
@@ -381,7 +382,7 @@ def reject_quote(db: Session, quote_id: int, current_user: User) -> models_marke
 
     # التحقق من صلاحية المستخدم (يجب أن يكون مشتري الـ RFQ أو مسؤول)
     if db_quote.rfq.buyer_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_QUOTE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_QUOTE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك برفض عرض السعر هذا.")
 
     # TODO: آلة حالة (State Machine) لـ Quote: يجب أن يكون في حالة 'مقدم' أو 'قيد المراجعة'.
@@ -17,6 +17,7 @@ from src.market.crud import rfqs_crud
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 # استيراد المودلات الأخرى المستخدمة
 from src.products.models import Product, UnitOfMeasure
 from src.users.models.addresses_models import  Address
@@ -137,7 +138,7 @@ def get_rfq_details(db: Session, rfq_id: int, current_user: User) -> models_mark
 
     # التحقق من الصلاحيات: المشتري أو المسؤول
     is_buyer = db_rfq.buyer_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_RFQ_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_RFQ_VIEW_ANY")
 
     # TODO: قد تحتاج إضافة منطق للبائعين هنا: هل يمكن للبائع رؤية هذا RFQ (إذا كان موجهًا إليه)؟
     #       هذا سيتطلب معرفة البائعين المستهدفين للـ RFQ.
@@ -247,7 +248,7 @@ def cancel_rfq(db: Session, rfq_id: int, current_user: User) -> models_market.Rf
 
     # التحقق من أن المستخدم هو المشتري أو مسؤول
     is_buyer = db_rfq.buyer_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_RFQ_MANAGE_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_RFQ_MANAGE_ANY")
 
     if not (is_buyer or is_admin):
         raise ForbiddenException(detail="غير مصرح لك بإلغاء طلب عرض الأسعار هذا.")
@@ -486,7 +487,7 @@ def get_rfq_item_details_service(db: Session, rfq_item_id: int, current_user: Us
         raise NotFoundException(detail="الـ RFQ الأم لبند الـ RFQ غير موجود.")
 
     is_buyer = db_rfq_parent.buyer_user_id == current_user.user_id
-    is_admin = any(p.permission_name_key == "ADMIN_RFQ_VIEW_ANY" for p in current_user.default_role.permissions)
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_RFQ_VIEW_ANY")
 
     if not (is_buyer or is_admin):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل بند طلب عرض الأسعار هذا.")
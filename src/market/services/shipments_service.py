@@ -19,6 +19,7 @@ from src.market.crud import shipments_crud
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 from src.lookups.schemas import lookups_schemas as schemas_lookups
 
@@ -130,7 +131,7 @@ def get_shipment_details(db: Session, shipment_id: int, current_user: User) -> m
     # التحقق من الصلاحيات: المشتري (صاحب الطلب)، أو البائع (الشاحن/بائع الطلب)، أو المسؤول
     is_buyer = db_shipment.order.buyer_user_id == current_user.user_id
     is_seller = db_shipment.order.seller_user_id == current_user.user_id # إذا كان الطلب لبائع واحد
-    is_admin = any(p.permission_name_key == "ADMIN_ORDER_VIEW_ANY" for p in current_user.default_role.permissions) # TODO: صلاحية view shipments
+    is_admin = permission_registry.user_has_permission(current_user, "ADMIN_ORDER_VIEW_ANY") # TODO: صلاحية view shipments
 
     # TODO: قد تحتاج إلى منطق أكثر تعقيدًا إذا كان الطلب متعدد البائعين.
     #       مثلاً، البائع يرى الشحنة إذا كانت تخص أحد بنوده.
@@ -1,7 +1,8 @@
 # backend\src\pricing\crud\pricing_crud.py
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_
+from sqlalchemy import exists, and_, select
+from sqlalchemy.engine import Row
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -10,6 +11,7 @@ from datetime import datetime
 from src.pricing.models import tier_pricing_models as models
 # استيراد الـ Schemas (بناءً على التسمية الجديدة للملف)
 from src.pricing.schemas import pricing_schemas as schemas
+from src.products.models.units_models import ProductPackagingOption # السعر الأساسي لجداول الأسعار المجمّعة
 
 
 # ==========================================================
@@ -365,6 +367,52 @@ def get_active_assignments_for_packaging_option(db: Session, packaging_option_id
     )
     return query.all()
 
+def get_price_table_sources(db: Session, packaging_option_ids: List[int], current_timestamp: datetime) -> List[Row]:
+    """
+    يجلب السعر الأساسي لمجموعة خيارات تعبئة مع إسناداتها النشطة التي لم تنتهِ بعد (الحالية والمستقبلية)
+    ونوع خصم قواعدها، باستعلام أعمدة واحد (LEFT JOIN: الخيار بلا إسنادات يظهر بصف أعمدة إسناده فارغة).
+    الإسنادات بلا start_date مستبعدة كما في get_active_assignments_for_packaging_option.
+
+    Returns:
+        List[Row]: صفوف (packaging_option_id, base_price, assignment_id, rule_id, start_date, end_date, discount_type)
+                   مرتبة حسب خيار التعبئة ثم start_date. خيارات التعبئة غير الموجودة لا تظهر.
+    """
+    Assignment = models.ProductPackagingPriceTierRuleAssignment
+    assignments = (
+        select(Assignment.packaging_option_id, Assignment.assignment_id, Assignment.rule_id, Assignment.start_date, Assignment.end_date, models.PriceTierRule.discount_type)
+        .join(models.PriceTierRule, models.PriceTierRule.rule_id == Assignment.rule_id)
+        .where(
+            Assignment.packaging_option_id.in_(packaging_option_ids),
+            Assignment.is_active == True,
+            Assignment.start_date.is_not(None),
+            (Assignment.end_date == None) | (Assignment.end_date >= current_timestamp),
+        )
+        .subquery()
+    )
+    return list(db.execute(
+        select(
+            ProductPackagingOption.packaging_option_id, ProductPackagingOption.base_price,
+            assignments.c.assignment_id, assignments.c.rule_id, assignments.c.start_date, assignments.c.end_date, assignments.c.discount_type,
+        )
+        .outerjoin(assignments, assignments.c.packaging_option_id == ProductPackagingOption.packaging_option_id)
+        .where(ProductPackagingOption.packaging_option_id.in_(packaging_option_ids))
+        .order_by(ProductPackagingOption.packaging_option_id, assignments.c.start_date, assignments.c.assignment_id)
+    ).all())
+
+def get_price_levels_for_rules(db: Session, rule_ids: List[int]) -> List[Row]:
+    """
+    يجلب مستويات مجموعة قواعد سعر كأعمدة فقط باستعلام واحد.
+
+    Returns:
+        List[Row]: صفوف (rule_id, minimum_quantity, price_per_unit_at_level, discount_value) مرتبة حسب القاعدة ثم minimum_quantity.
+    """
+    Level = models.PriceTierRuleLevel
+    return list(db.execute(
+        select(Level.rule_id, Level.minimum_quantity, Level.price_per_unit_at_level, Level.discount_value)
+        .where(Level.rule_id.in_(rule_ids))
+        .order_by(Level.rule_id, Level.minimum_quantity, Level.level_id)
+    ).all())
+
 def update_price_tier_rule_assignment(db: Session, db_assignment: models.ProductPackagingPriceTierRuleAssignment, assignment_in: schemas.ProductPackagingPriceTierRuleAssignmentUpdate) -> models.ProductPackagingPriceTierRuleAssignment:
     """
     يحدث بيانات إسناد قاعدة شريحة سعر موجود.
@@ -235,3 +235,33 @@ class ProductPackagingPriceTierRuleAssignmentRead(ProductPackagingPriceTierRuleA
     created_at: datetime
     updated_at: datetime
     model_config = ConfigDict(from_attributes=True)
+
+# ==========================================================
+# --- Schemas لتسعير السلال (Price Quotation) ---
+#    (بدون جدول: أسعار محسوبة من جداول الأسعار المجمّعة)
+# ==========================================================
+class PriceQuoteItem(BaseModel):
+    """بند واحد في طلب تسعير: خيار تعبئة وكميته."""
+    packaging_option_id: int = Field(..., description="معرف خيار التعبئة.")
+    quantity: float = Field(..., gt=0, description="الكمية المطلوبة من خيار التعبئة.")
+
+class PriceQuoteRequest(BaseModel):
+    """
+    نموذج بيانات طلب تسعير سلة كاملة دفعة واحدة.
+    يمكن أن يتكرر خيار التعبئة في أكثر من بند (كل بند يُسعّر بكميته).
+    """
+    items: List[PriceQuoteItem] = Field(..., min_length=1, description="بنود السلة المراد تسعيرها.")
+
+class PriceQuoteLine(BaseModel):
+    """سعر بند واحد: السعر الأساسي، وسعر الوحدة الفعال بعد شرائح الأسعار، وإجمالي البند."""
+    packaging_option_id: int
+    quantity: float
+    base_unit_price: float
+    unit_price: float
+    line_total: float
+    rule_id: Optional[int] = Field(None, description="قاعدة شرائح الأسعار المطبقة (إن وجدت).")
+
+class PriceQuoteRead(BaseModel):
+    """نتيجة تسعير السلة: أسعار البنود بنفس ترتيب الطلب والإجمالي."""
+    lines: List[PriceQuoteLine]
+    total: float
@@ -0,0 +1,230 @@
+# backend\src\pricing\services\price_tables.py
+# ----------------------------------------------------------------------------------------------------
+# جداول أسعار مجمّعة لكل خيار تعبئة (Compiled Price Tables) لحساب السعر الفعال دون قاعدة البيانات.
+# - الجداول الناقصة لدفعة خيارات (سلة أو طلب) تُبنى معًا باستعلامين: المصادر (LEFT JOIN) ثم مستويات القواعد النشطة.
+# - الجدول يُبنى مرة من السعر الأساسي والإسناد النشط ومستويات قاعدته: حدود الكميات مرتبة في مصفوفة، وسعر الوحدة
+#   لكل مستوى محسوب مسبقًا بحسب discount_type (NEW_PRICE / PERCENTAGE / FIXED_AMOUNT)، فالبحث bisect بزمن O(log n).
+# - صلاحية الجدول محدودة زمنيًا بالإسنادات: ينتهي عند end_date للإسناد الحالي أو عند start_date لأول إسناد
+#   مستقبلي (أيهما أقرب)، فيعاد بناؤه تلقائيًا عند تغير القاعدة المطبقة.
+# - يُبطل من خدمات القواعد والمستويات والإسنادات (pricing_service) ومن تعديل خيار التعبئة (packaging_service).
+#   الإبطال محلي لكل عملية؛ PRICE_TABLE_CACHE_TTL_SECONDS حد أقصى لعمر الجدول في العمليات الأخرى.
+# ----------------------------------------------------------------------------------------------------
+
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.exceptions import NotFoundException
+from src.pricing.crud import pricing_crud
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """التواريخ بدون منطقة زمنية (مثلاً من SQLite) تُعتبر UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _level_price(discount_type: Optional[str], base_price: Decimal, level) -> Decimal:
+    """سعر الوحدة في مستوى واحد بنفس قواعد get_active_price (الحقل الفارغ أو النوع غير المعروف = السعر الأساسي)."""
+    if discount_type == 'NEW_PRICE' and level.price_per_unit_at_level is not None:
+        return level.price_per_unit_at_level
+    if discount_type == 'PERCENTAGE' and level.discount_value is not None:
+        return base_price * (1 - level.discount_value / 100)
+    if discount_type == 'FIXED_AMOUNT' and level.discount_value is not None:
+        return max(base_price - level.discount_value, 0) # منع السعر السالب
+    return base_price
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    """جدول أسعار غير قابل للتعديل لخيار تعبئة واحد، صالح حتى expires_at (None = حتى الإبطال أو TTL)."""
+    packaging_option_id: int
+    base_price: Decimal
+    rule_id: Optional[int]
+    discount_type: Optional[str]
+    thresholds: Tuple[Decimal, ...]
+    unit_prices: Tuple[Decimal, ...]
+    expires_at: Optional[datetime]
+    loaded_at: float
+
+    def price(self, quantity) -> float:
+        """سعر الوحدة الفعال للكمية: آخر مستوى حده الأدنى <= الكمية، أو السعر الأساسي إن كانت أقل من كل المستويات."""
+        index = bisect_right(self.thresholds, quantity) - 1
+        return float(self.unit_prices[index] if index >= 0 else self.base_price)
+
+    def covers(self, now: datetime) -> bool:
+        return self.expires_at is None or now < self.expires_at
+
+
+def active_window(windows: Iterable[Any], now: datetime) -> Tuple[Optional[Any], Optional[datetime]]:
+    """
+    يختار الإسناد النشط في اللحظة now من صفوف الإسنادات غير المنتهية (مرتبة حسب start_date)،
+    ويحسب لحظة انتهاء صلاحية الجدول: end_date للإسناد النشط أو start_date لأول إسناد مستقبلي، أيهما أقرب.
+
+    Returns:
+        Tuple: (صف الإسناد النشط أو None، لحظة انتهاء الصلاحية أو None).
+    """
+    active = None
+    expires_at: Optional[datetime] = None
+    for window in windows:
+        start = _aware(window.start_date)
+        if start <= now:
+            if active is None: # أول إسناد نشط (التداخل ممنوع عند الإنشاء والتحديث)
+                active = window
+        elif expires_at is None or start < expires_at:
+            expires_at = start
+    if active is not None and active.end_date is not None:
+        # end_date شامل: الإسناد نشط حتى لحظة انتهائه
+        end = _aware(active.end_date) + timedelta(microseconds=1)
+        expires_at = end if expires_at is None else min(expires_at, end)
+    return active, expires_at
+
+
+def compile_price_table(packaging_option_id: int, base_price: Decimal, active: Optional[Any], levels: Iterable[Any], expires_at: Optional[datetime]) -> PriceTable:
+    """
+    يبني جدول خيار التعبئة من إسناده النشط (صف فيه rule_id و discount_type، أو None) ومستويات قاعدته
+    مرتبة حسب minimum_quantity.
+    """
+    levels = list(levels) if active is not None else []
+    return PriceTable(
+        packaging_option_id=packaging_option_id,
+        base_price=base_price,
+        rule_id=active.rule_id if active is not None else None,
+        discount_type=active.discount_type if active is not None else None,
+        thresholds=tuple(level.minimum_quantity for level in levels),
+        unit_prices=tuple(_level_price(active.discount_type, base_price, level) for level in levels),
+        expires_at=expires_at,
+        loaded_at=time.monotonic(),
+    )
+
+
+class PriceTableCache:
+    """يحتفظ بجداول الأسعار المجمّعة لكل خيار تعبئة مع TTL وحد أقصى للعدد، آمن للاستخدام من عدة خيوط."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(max_entries, 1)
+        self._tables: Dict[int, PriceTable] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.expired = 0
+        self.evicted = 0
+        self.invalidations = 0
+
+    def get(self, db: Session, packaging_option_id: int, now: Optional[datetime] = None) -> PriceTable:
+        """
+        يعيد جدول خيار التعبئة من الذاكرة، ويبنيه من قاعدة البيانات إذا لم يوجد أو انتهت صلاحيته.
+
+        Raises:
+            NotFoundException: إذا لم يتم العثور على خيار التعبئة.
+        """
+        return self.get_many(db, [packaging_option_id], now=now)[packaging_option_id]
+
+    def get_many(self, db: Session, packaging_option_ids: Iterable[int], now: Optional[datetime] = None) -> Dict[int, PriceTable]:
+        """
+        يعيد جداول مجموعة خيارات تعبئة: الموجودة في الذاكرة بدون قاعدة البيانات، والناقصة أو المنتهية تُبنى معًا
+        باستعلامين على الأكثر مهما كان عددها (المصادر، ثم مستويات القواعد النشطة).
+
+        Raises:
+            NotFoundException: إذا لم يتم العثور على أي من خيارات التعبئة.
+        """
+        now = now or datetime.now(timezone.utc)
+        tables: Dict[int, PriceTable] = {}
+        missing = []
+        with self._lock:
+            for packaging_option_id in dict.fromkeys(packaging_option_ids):
+                table = self._tables.get(packaging_option_id)
+                if table is not None:
+                    if table.covers(now) and time.monotonic() - table.loaded_at < self.ttl_seconds:
+                        self.hits += 1
+                        tables[packaging_option_id] = table
+                        continue
+                    self.expired += 1
+                missing.append(packaging_option_id)
+        if missing:
+            tables.update(self._load_many(db, missing, now))
+        return tables
+
+    def _load_many(self, db: Session, packaging_option_ids: List[int], now: datetime) -> Dict[int, PriceTable]:
+        sources: Dict[int, Tuple[Decimal, List[Any]]] = {}
+        for row in pricing_crud.get_price_table_sources(db, packaging_option_ids, current_timestamp=now):
+            _, windows = sources.setdefault(row.packaging_option_id, (row.base_price, []))
+            if row.assignment_id is not None:
+                windows.append(row)
+        not_found = [packaging_option_id for packaging_option_id in packaging_option_ids if packaging_option_id not in sources]
+        if not_found:
+            ids = ", ".join(str(packaging_option_id) for packaging_option_id in not_found)
+            raise NotFoundException(detail=f"Packaging option with ID {ids} not found.")
+
+        selected = {packaging_option_id: active_window(windows, now) for packaging_option_id, (_, windows) in sources.items()}
+        rule_ids = {active.rule_id for active, _ in selected.values() if active is not None}
+        levels: Dict[int, List[Any]] = {}
+        if rule_ids:
+            for level in pricing_crud.get_price_levels_for_rules(db, list(rule_ids)):
+                levels.setdefault(level.rule_id, []).append(level)
+
+        tables = {
+            packaging_option_id: compile_price_table(
+                packaging_option_id, sources[packaging_option_id][0], active,
+                levels.get(active.rule_id, []) if active is not None else [], expires_at,
+            )
+            for packaging_option_id, (active, expires_at) in selected.items()
+        }
+        with self._lock:
+            for packaging_option_id, table in tables.items():
+                if packaging_option_id not in self._tables and len(self._tables) >= self.max_entries:
+                    # إخراج أقدم جدول أُضيف (ترتيب إدراج القاموس)
+                    self._tables.pop(next(iter(self._tables)))
+                    self.evicted += 1
+                self._tables[packaging_option_id] = table
+            self.loads += len(tables)
+        return tables
+
+    def invalidate(self, packaging_option_id: Optional[int] = None) -> None:
+        """يبطل جدول خيار تعبئة (عند تعديل سعره الأساسي أو إسناداته)، أو كل الجداول إذا لم يُحدد."""
+        with self._lock:
+            if packaging_option_id is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(packaging_option_id, None)
+            self.invalidations += 1
+
+    def invalidate_rule(self, rule_id: int) -> None:
+        """
+        يبطل جداول خيارات التعبئة المبنية على قاعدة (عند تعديل القاعدة أو مستوياتها).
+        الجداول التي ستطبق القاعدة مستقبلاً لا تحتاج إبطالاً: صلاحيتها تنتهي عند start_date لإسنادها.
+        """
+        with self._lock:
+            for packaging_option_id in [key for key, table in self._tables.items() if table.rule_id == rule_id]:
+                del self._tables[packaging_option_id]
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "tables": len(self._tables),
+                "tables_with_rule": sum(1 for table in self._tables.values() if table.rule_id is not None),
+                "hits": self.hits,
+                "loads": self.loads,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "invalidations": self.invalidations,
+            }
+
+
+# نسخة واحدة مشتركة على مستوى العملية
+price_tables = PriceTableCache(
+    ttl_seconds=settings.PRICE_TABLE_CACHE_TTL_SECONDS,
+    max_entries=settings.PRICE_TABLE_CACHE_MAX_ENTRIES,
+)
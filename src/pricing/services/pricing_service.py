@@ -1,7 +1,7 @@
 # backend\src\pricing\services\pricing_service.py
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime, timezone # استخدام timezone لجعل التواريخ aware
 
@@ -15,10 +15,13 @@ from src.pricing.crud import pricing_crud
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
 from src.products.services.packaging_service import get_packaging_option_details # للتحقق من خيار التعبئة
+from src.pricing.services.price_tables import price_tables # جداول الأسعار المجمّعة لكل خيار تعبئة
+from src.core.config import settings # حد بنود التسعير الدفعي
 
 # ==========================================================
 # --- خدمات قواعد شرائح الأسعار (PriceTierRule) ---
@@ -151,7 +154,7 @@ def update_price_tier_rule(db: Session, rule_id: int, rule_in: schemas.PriceTier
 
     # 1. التحقق من الصلاحيات: يجب أن يكون مالك القاعدة أو مسؤولاً عن إدارة قواعد التسعير.
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث قاعدة السعر هذه.")
 
     # 2. التحقق من تفرد المفتاح إذا تم تحديث rule_name_key.
@@ -176,7 +179,9 @@ def update_price_tier_rule(db: Session, rule_id: int, rule_in: schemas.PriceTier
                 raise BadRequestException(detail=f"نوع الخصم '{new_discount_type}' غير صالح. الأنواع المدعومة هي: 'PERCENTAGE', 'FIXED_AMOUNT', 'NEW_PRICE'.")
     # TODO: منطق عمل: إذا لم يتم تحديث discount_type، ولكن تم تحديث المستويات لاحقاً، يجب التحقق من التناسق هناك أيضاً.
 
-    return pricing_crud.update_price_tier_rule(db=db, db_rule=db_rule, rule_in=rule_in)
+    updated_rule = pricing_crud.update_price_tier_rule(db=db, db_rule=db_rule, rule_in=rule_in)
+    price_tables.invalidate_rule(rule_id)
+    return updated_rule
 
 def delete_price_tier_rule(db: Session, rule_id: int, current_user: User):
     """
@@ -200,7 +205,7 @@ def delete_price_tier_rule(db: Session, rule_id: int, current_user: User):
 
     # 1. التحقق من الصلاحيات.
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف قاعدة السعر هذه.")
 
     # 2. التحقق من عدم وجود مستويات مرتبطة (قبل الحذف الصارم للقاعدة).
@@ -244,7 +249,7 @@ def create_price_tier_rule_translation(db: Session, rule_id: int, trans_in: sche
     # 1. التحقق من وجود القاعدة الأم وصلاحية المستخدم.
     db_rule = get_price_tier_rule_details(db, rule_id)
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإضافة ترجمة لهذه القاعدة.")
 
     # 2. التحقق من عدم وجود ترجمة بنفس اللغة للقاعدة.
@@ -297,7 +302,7 @@ def update_price_tier_rule_translation(db: Session, rule_id: int, language_code:
     # التحقق من ملكية المستخدم للقاعدة الأم
     db_rule = get_price_tier_rule_details(db, rule_id)
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث ترجمة هذه القاعدة.")
 
     return pricing_crud.update_price_tier_rule_translation(db=db, db_translation=db_translation, trans_in=trans_in)
@@ -325,7 +330,7 @@ def delete_price_tier_rule_translation(db: Session, rule_id: int, language_code:
     # التحقق من ملكية المستخدم للقاعدة الأم
     db_rule = get_price_tier_rule_details(db, rule_id)
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف ترجمة هذه القاعدة.")
 
     pricing_crud.delete_price_tier_rule_translation(db=db, db_translation=db_translation)
@@ -356,7 +361,7 @@ def create_price_tier_rule_level(db: Session, level_in: schemas.PriceTierRuleLev
     # 1. التحقق من وجود القاعدة الأم وصلاحية المستخدم
     db_rule = get_price_tier_rule_details(db, level_in.rule_id)
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإضافة مستوى لهذه القاعدة.")
 
     # 2. منطق عمل: التحقق من توافق حقول السعر/الخصم مع discount_type للقاعدة الأم
@@ -374,7 +379,9 @@ def create_price_tier_rule_level(db: Session, level_in: schemas.PriceTierRuleLev
     #            if existing_level.minimum_quantity == level_in.minimum_quantity:
     #                raise ConflictException(...)
 
-    return pricing_crud.create_price_tier_rule_level(db=db, level_in=level_in)
+    db_level = pricing_crud.create_price_tier_rule_level(db=db, level_in=level_in)
+    price_tables.invalidate_rule(level_in.rule_id)
+    return db_level
 
 def get_price_tier_rule_level_details(db: Session, level_id: int) -> models.PriceTierRuleLevel:
     """
@@ -434,7 +441,7 @@ def update_price_tier_rule_level(db: Session, level_id: int, level_in: schemas.P
     # التحقق من ملكية المستخدم للقاعدة الأم
     db_rule = get_price_tier_rule_details(db, db_level.rule_id)
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث مستوى قاعدة السعر هذه.")
 
     # منطق عمل: التحقق من تناسق حقول السعر/الخصم مع discount_type للقاعدة الأم
@@ -452,7 +459,9 @@ def update_price_tier_rule_level(db: Session, level_id: int, level_in: schemas.P
         # وأن الترتيب التصاعدي لا يزال صحيحًا.
         pass # placeholder for complex validation
 
-    return pricing_crud.update_price_tier_rule_level(db=db, db_level=db_level, level_in=level_in)
+    updated_level = pricing_crud.update_price_tier_rule_level(db=db, db_level=db_level, level_in=level_in)
+    price_tables.invalidate_rule(db_rule.rule_id)
+    return updated_level
 
 def delete_price_tier_rule_level(db: Session, level_id: int, current_user: User):
     """
@@ -476,7 +485,7 @@ def delete_price_tier_rule_level(db: Session, level_id: int, current_user: User)
     # التحقق من ملكية المستخدم للقاعدة الأم
     db_rule = get_price_tier_rule_details(db, db_level.rule_id)
     if db_rule.created_by_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بحذف مستوى قاعدة السعر هذه.")
 
     # TODO: منطق عمل: يمكن التحقق هنا إذا كان المستوى مستخدمًا في أي مكان بشكل حيوي،
@@ -485,6 +494,7 @@ def delete_price_tier_rule_level(db: Session, level_id: int, current_user: User)
     #       فقد يكون من الأفضل عدم السماح بالحذف الصارم أو تحويله إلى حذف ناعم إذا كان المودل يدعمه.
 
     pricing_crud.delete_price_tier_rule_level(db=db, db_level=db_level)
+    price_tables.invalidate_rule(db_rule.rule_id)
     return {"message": "تم حذف مستوى القاعدة بنجاح."}
 
 # ==========================================================
@@ -533,7 +543,7 @@ def create_price_tier_rule_assignment(db: Session, assignment_in: schemas.Produc
     #    - الخيار هنا هو أن مالك المنتج هو من يحدد قواعد التسعير التي تطبق على منتجاته.
     if db_rule.created_by_user_id != current_user.user_id and \
        db_packaging_option.product.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإسناد قاعدة السعر هذه لخيار التعبئة.")
 
     # 4. منطق عمل: التحقق من أن start_date قبل end_date إذا كان كلاهما موجودًا
@@ -562,7 +572,9 @@ def create_price_tier_rule_assignment(db: Session, assignment_in: schemas.Produc
         if (new_start <= existing_end and new_end >= existing_start):
             raise ConflictException(detail=f"يوجد بالفعل إسناد سعر نشط متداخل ({existing_assignment.assignment_id}) لخيار التعبئة هذا في الفترة الزمنية المحددة.")
         
-    return pricing_crud.create_price_tier_rule_assignment(db=db, assignment_in=assignment_in)
+    db_assignment = pricing_crud.create_price_tier_rule_assignment(db=db, assignment_in=assignment_in)
+    price_tables.invalidate(assignment_in.packaging_option_id)
+    return db_assignment
 
 def get_price_tier_rule_assignment_details(db: Session, assignment_id: int) -> models.ProductPackagingPriceTierRuleAssignment:
     """
@@ -587,6 +599,8 @@ def get_active_price(db: Session, packaging_option_id: int, quantity: float) ->
     """
     خدمة لحساب وإرجاع السعر الفعال (Effective Price) لوحدة خيار تعبئة معين
     بناءً على الكمية المطلوبة وأي قواعد تسعير متدرجة نشطة.
+    السعر يُحسب من جدول الأسعار المجمّع لخيار التعبئة (price_tables): بحث ثنائي في حدود الكميات
+    وأسعار المستويات المحسوبة مسبقًا، دون قاعدة البيانات إلا عند بناء الجدول أو انتهاء صلاحيته.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
@@ -600,48 +614,68 @@ def get_active_price(db: Session, packaging_option_id: int, quantity: float) ->
         NotFoundException: إذا لم يتم العثور على خيار التعبئة.
         BadRequestException: إذا كانت الكمية سالبة.
     """
-    # 1. التحقق من وجود خيار التعبئة.
-    db_packaging_option = get_packaging_option_details(db, packaging_option_id)
+    # 1. جدول أسعار خيار التعبئة (يتحقق أيضًا من وجود الخيار عند بنائه).
+    #    - الجدول يعكس الإسناد النشط الآن، ويعاد بناؤه عند بدء أو انتهاء أي إسناد أو تعديل القاعدة ومستوياتها.
+    table = price_tables.get(db, packaging_option_id)
 
     if quantity <= 0:
         raise BadRequestException(detail="الكمية المطلوبة يجب أن تكون أكبر من صفر لحساب السعر.")
 
-    # 2. جلب جميع الإسنادات النشطة حاليًا لخيار التعبئة هذا.
-    #    - يفترض أن هناك إسنادًا واحدًا نشطًا فقط في أي وقت محدد.
-    active_assignments = pricing_crud.get_active_assignments_for_packaging_option(db, packaging_option_id, current_timestamp=datetime.now(timezone.utc))
+    # 2. آخر مستوى حده الأدنى <= الكمية، أو السعر الأساسي إن كانت الكمية أقل من كل المستويات.
+    # TODO: يمكن إضافة المزيد من أنواع الخصم (مثلاً BOGO - Buy One Get One) في compile_price_table.
+    return table.price(quantity)
 
-    effective_price_per_unit = db_packaging_option.base_price # السعر الأساسي كافتراضي
+def price_many(db: Session, items: Sequence[Tuple[int, float]]) -> List[schemas.PriceQuoteLine]:
+    """
+    خدمة لتسعير مجموعة بنود (سلة أو طلب) دفعة واحدة: (packaging_option_id, quantity) لكل بند.
+    جداول أسعار كل خيارات التعبئة تُجلب معًا (price_tables.get_many): من الذاكرة، والناقص منها يُبنى
+    باستعلامين على الأكثر مهما كان عدد البنود، فتكلفة السلة ثابتة بعدد الرحلات إلى قاعدة البيانات.
 
-    if active_assignments:
-        # TODO: منطق عمل: حاليًا، نأخذ أول إسناد نشط. إذا كان هناك احتمال لتداخل، يجب تحديد الأولوية.
-        #       لكن تصميم assignment_in يمنع التداخل حاليًا.
-        active_assignment = active_assignments[0] 
-        db_rule = active_assignment.rule # القاعدة مرتبطة وجاهزة مع مستوياتها
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        items (Sequence[Tuple[int, float]]): بنود التسعير بترتيبها.
 
-        # 3. تحديد مستوى السعر المناسب بناءً على الكمية المطلوبة.
-        applicable_level = None
-        # يتم جلب المستويات مرتبة تصاعديًا بواسطة minimum_quantity
-        for level in sorted(db_rule.levels, key=lambda l: l.minimum_quantity):
-            if quantity >= level.minimum_quantity:
-                applicable_level = level
-            else:
-                # بمجرد أن تكون الكمية أقل من الحد الأدنى للمستوى الحالي، يعني أن المستوى السابق هو الأنسب
-                break
-        
-        if applicable_level:
-            # 4. حساب السعر الفعال بناءً على discount_type و applicable_level
-            if db_rule.discount_type == 'NEW_PRICE' and applicable_level.price_per_unit_at_level is not None:
-                effective_price_per_unit = applicable_level.price_per_unit_at_level
-            elif db_rule.discount_type == 'PERCENTAGE' and applicable_level.discount_value is not None:
-                effective_price_per_unit = db_packaging_option.base_price * (1 - applicable_level.discount_value / 100)
-            elif db_rule.discount_type == 'FIXED_AMOUNT' and applicable_level.discount_value is not None:
-                effective_price_per_unit = db_packaging_option.base_price - applicable_level.discount_value
-                if effective_price_per_unit < 0: effective_price_per_unit = 0 # منع السعر السالب
-            # TODO: يمكن إضافة المزيد من أنواع الخصم (مثلاً BOGO - Buy One Get One)
-            # TODO: يجب التأكد من أن price_per_unit_at_level و discount_value لا يتم تعيينهما في نفس الوقت بشكل خاطئ.
-        # else: الكمية أقل من الحد الأدنى لأي مستوى، نستخدم السعر الأساسي (وهو الافتراضي)
-
-    return float(effective_price_per_unit) # التأكد من أن القيمة المعادة هي float
+    Returns:
+        List[schemas.PriceQuoteLine]: سعر كل بند بنفس ترتيب items.
+
+    Raises:
+        NotFoundException: إذا لم يتم العثور على أي من خيارات التعبئة.
+        BadRequestException: إذا كانت أي كمية غير موجبة.
+    """
+    for packaging_option_id, quantity in items:
+        if quantity <= 0:
+            raise BadRequestException(detail=f"الكمية المطلوبة لخيار التعبئة {packaging_option_id} يجب أن تكون أكبر من صفر لحساب السعر.")
+
+    tables = price_tables.get_many(db, [packaging_option_id for packaging_option_id, _ in items])
+    lines = []
+    for packaging_option_id, quantity in items:
+        table = tables[packaging_option_id]
+        unit_price = table.price(quantity)
+        lines.append(schemas.PriceQuoteLine(
+            packaging_option_id=packaging_option_id,
+            quantity=quantity,
+            base_unit_price=float(table.base_price),
+            unit_price=unit_price,
+            line_total=unit_price * float(quantity),
+            rule_id=table.rule_id,
+        ))
+    return lines
+
+def quote_prices(db: Session, quote_in: schemas.PriceQuoteRequest) -> schemas.PriceQuoteRead:
+    """
+    خدمة لتسعير سلة كاملة (POST /pricing/quote) عبر price_many.
+
+    Returns:
+        schemas.PriceQuoteRead: أسعار البنود بنفس ترتيب الطلب وإجماليها.
+
+    Raises:
+        NotFoundException: إذا لم يتم العثور على أي من خيارات التعبئة.
+        BadRequestException: إذا كان عدد البنود أكبر من PRICE_QUOTE_MAX_LINES.
+    """
+    if len(quote_in.items) > settings.PRICE_QUOTE_MAX_LINES:
+        raise BadRequestException(detail=f"عدد البنود ({len(quote_in.items)}) أكبر من الحد المسموح به للتسعير ({settings.PRICE_QUOTE_MAX_LINES}).")
+    lines = price_many(db, [(item.packaging_option_id, item.quantity) for item in quote_in.items])
+    return schemas.PriceQuoteRead(lines=lines, total=sum(line.line_total for line in lines))
 
 def update_price_tier_rule_assignment(db: Session, assignment_id: int, assignment_in: schemas.ProductPackagingPriceTierRuleAssignmentUpdate, current_user: User) -> models.ProductPackagingPriceTierRuleAssignment:
     """
@@ -671,7 +705,7 @@ def update_price_tier_rule_assignment(db: Session, assignment_id: int, assignmen
 
     if db_rule.created_by_user_id != current_user.user_id and \
        db_packaging_option.product.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بتحديث إسناد قاعدة السعر هذه.")
 
     # 2. منطق عمل: التحقق من أن start_date قبل end_date إذا تم تحديثهما
@@ -696,7 +730,9 @@ def update_price_tier_rule_assignment(db: Session, assignment_id: int, assignmen
             if (updated_start <= existing_end and updated_end >= existing_start):
                 raise ConflictException(detail=f"يوجد بالفعل إسناد سعر نشط متداخل ({existing_assignment.assignment_id}) لخيار التعبئة هذا في الفترة الزمنية المحددة بعد التحديث.")
 
-    return pricing_crud.update_price_tier_rule_assignment(db=db, db_assignment=db_assignment, assignment_in=assignment_in)
+    updated_assignment = pricing_crud.update_price_tier_rule_assignment(db=db, db_assignment=db_assignment, assignment_in=assignment_in)
+    price_tables.invalidate(updated_assignment.packaging_option_id)
+    return updated_assignment
 
 def soft_delete_price_tier_rule_assignment(db: Session, assignment_id: int, current_user: User) -> models.ProductPackagingPriceTierRuleAssignment:
     """
@@ -724,7 +760,7 @@ def soft_delete_price_tier_rule_assignment(db: Session, assignment_id: int, curr
 
     if db_rule.created_by_user_id != current_user.user_id and \
        db_packaging_option.product.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRICING_RULE_MANAGE_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRICING_RULE_MANAGE_ANY"):
         raise ForbiddenException(detail="غير مصرح لك بإلغاء تفعيل إسناد قاعدة السعر هذه.")
 
     if not db_assignment.is_active:
@@ -733,5 +769,7 @@ def soft_delete_price_tier_rule_assignment(db: Session, assignment_id: int, curr
     # TODO: منطق عمل: التحقق من عدم وجود طلبات معلقة (pending orders) تعتمد على هذا الإسناد
     #       إذا كان هناك طلب يعتمد عليه، قد تحتاج إلى منع الحذف الناعم أو التعامل معه بطريقة خاصة (مثل تجميد الطلب).
 
-    return pricing_crud.soft_delete_price_tier_rule_assignment(db=db, db_assignment=db_assignment)
+    deactivated_assignment = pricing_crud.soft_delete_price_tier_rule_assignment(db=db, db_assignment=db_assignment)
+    price_tables.invalidate(deactivated_assignment.packaging_option_id)
+    return deactivated_assignment
 
@@ -0,0 +1,53 @@
+# backend/src/products/crud/async_product_crud.py
+# ----------------------------------------------------------------------------------------------------
+# نسخ غير متزامنة (AsyncSession) من دوال CRUD لقراءة المنتجات العامة.
+# ----------------------------------------------------------------------------------------------------
+
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.products.models import products_models as models
+from src.products.models.units_models import ProductPackagingOption
+from src.products.models.categories_models import ProductCategory
+from src.lookups.models.lookups_models import ProductStatus
+
+
+def product_read_options() -> list:
+    """
+    خيارات التحميل اللازمة لتسلسل ProductRead بالكامل دون أي تحميل كسول.
+    المجموعات تُحمّل بـ selectinload حتى لا تتضاعف الصفوف مع offset/limit.
+    """
+    return [
+        joinedload(models.Product.category).selectinload(ProductCategory.translations),
+        joinedload(models.Product.status),
+        joinedload(models.Product.unit_of_measure),
+        selectinload(models.Product.translations),
+        selectinload(models.Product.packaging_options).joinedload(ProductPackagingOption.unit_of_measure),
+        selectinload(models.Product.packaging_options).selectinload(ProductPackagingOption.translations),
+    ]
+
+
+async def get_product_status_by_key(db: AsyncSession, status_name_key: str) -> Optional[ProductStatus]:
+    """يجلب حالة منتج بمفتاحها."""
+    result = await db.execute(select(ProductStatus).where(ProductStatus.status_name_key == status_name_key))
+    return result.scalars().first()
+
+
+async def get_all_active_products(db: AsyncSession, status_id: int, skip: int = 0, limit: int = 100) -> List[models.Product]:
+    """
+    جلب جميع المنتجات النشطة مع علاقاتها اللازمة لـ ProductRead.
+    """
+    result = await db.execute(
+        select(models.Product).options(*product_read_options()).join(
+            ProductStatus, models.Product.product_status_id == ProductStatus.product_status_id
+        ).where(
+            models.Product.product_status_id == status_id
+        ).offset(skip).limit(limit)
+    )
+    products = result.scalars().all()
+
+    # Filter out any products with None status (data integrity issue)
+    return [p for p in products if p.status is not None]
@@ -1,9 +1,10 @@
 # backend\src\products\crud\inventory_crud.py
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_
+from sqlalchemy import exists, and_, case, func, insert, select, tuple_, update
+from datetime import datetime
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from src.products.models import inventory_models as models # استيراد المودلز الخاصة بـ InventoryItem و InventoryTransaction
 # تصحيح الاستيرادات: جداول الحالات والأنواع موجودة في lookups.models.py
@@ -14,6 +15,7 @@ from src.lookups.models import ( # <-- تم تصحيح هذا المسار
     InventoryTransactionTypeTranslation
 )
 from src.products.schemas import inventory_schemas as schemas # استيراد الـ Schemas
+from src.db.ids import reserve_ids
 
 # ==========================================================
 # --- CRUD Functions for InventoryItem ---
@@ -49,6 +51,138 @@ def get_or_create_inventory_item(db: Session, packaging_option_id: int, seller_i
         
     return db_item
 
+def get_inventory_item_ids(db: Session, keys: Iterable[Tuple[int, UUID]]) -> Dict[Tuple[int, UUID], int]:
+    """
+    يجلب معرفات بنود المخزون لمجموعة أزواج (خيار التعبئة، البائع) باستعلام واحد (بدون قفل).
+    الأزواج التي ليس لها بند مخزون لا تظهر في النتيجة.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    rows = db.execute(
+        select(models.InventoryItem.product_packaging_option_id, models.InventoryItem.seller_user_id, models.InventoryItem.inventory_item_id)
+        .where(tuple_(models.InventoryItem.product_packaging_option_id, models.InventoryItem.seller_user_id).in_(keys))
+    ).all()
+    return {(row.product_packaging_option_id, row.seller_user_id): row.inventory_item_id for row in rows}
+
+def reserve_inventory_quantities(db: Session, quantities: Dict[int, Any]) -> List[Any]:
+    """
+    يحجز كميات دفعة بنود مخزون بعبارة UPDATE شرطية واحدة (بدون commit):
+        UPDATE inventory_items SET available_quantity = available_quantity - q, reserved_quantity = reserved_quantity + q
+        WHERE inventory_item_id IN (...) AND available_quantity >= q RETURNING ...
+    (q لكل بند عبر CASE على inventory_item_id). الفحص والخصم في نفس العبارة على الصف المقفل، فلا يمكن لطلبين
+    متزامنين حجز نفس الوحدات؛ والبنود التي لا تكفي كميتها لا تُعدل ولا تظهر في النتيجة.
+    الصفوف تُقفل أولاً بترتيب inventory_item_id (lock_inventory_items_in_order)، فلا يحدث جمود بين طلبين يتشاركان بنودًا.
+
+    Args:
+        quantities (Dict[int, Any]): الكمية المطلوبة لكل inventory_item_id.
+
+    Returns:
+        List[Row]: صفوف البنود المحجوزة (inventory_item_id, available_quantity, reserved_quantity) بعد الحجز.
+    """
+    return _shift_reserved_quantities(db, quantities, reserve=True)
+
+def unreserve_inventory_quantities(db: Session, quantities: Dict[int, Any]) -> List[Any]:
+    """
+    يعكس reserve_inventory_quantities لدفعة بنود (من المحجوز إلى المتاح) بعبارة UPDATE شرطية واحدة (بدون commit).
+    البنود التي محجوزها أقل من الكمية لا تُعدل ولا تظهر في النتيجة.
+    """
+    return _shift_reserved_quantities(db, quantities, reserve=False)
+
+def lock_inventory_items_in_order(db: Session, inventory_item_ids: Iterable[int]) -> None:
+    """
+    يقفل صفوف بنود المخزون (SELECT ... ORDER BY inventory_item_id FOR UPDATE) قبل تعديلها بعبارة UPDATE متعددة الصفوف
+    في نفس المعاملة. عبارة UPDATE ... WHERE inventory_item_id IN (...) تقفل الصفوف بترتيب خطة التنفيذ لا بترتيب القائمة،
+    فقد يقفل طلبان يتشاركان بنودًا نفس الصفوف بترتيب معاكس ويحدث جمود (Deadlock)؛ القفل المسبق بترتيب ثابت يمنع ذلك.
+    SQLite يتجاهل FOR UPDATE (الكتابة فيه متسلسلة أصلاً).
+    """
+    inventory_item_ids = sorted(set(inventory_item_ids))
+    if not inventory_item_ids:
+        return
+    db.execute(
+        select(models.InventoryItem.inventory_item_id)
+        .where(models.InventoryItem.inventory_item_id.in_(inventory_item_ids))
+        .order_by(models.InventoryItem.inventory_item_id)
+        .with_for_update()
+    ).all()
+
+def _shift_reserved_quantities(db: Session, quantities: Dict[int, Any], reserve: bool) -> List[Any]:
+    if not quantities:
+        return []
+    lock_inventory_items_in_order(db, quantities)
+    item = models.InventoryItem
+    quantity = case(quantities, value=item.inventory_item_id)
+    if reserve:
+        condition, values = item.available_quantity >= quantity, {"available_quantity": item.available_quantity - quantity, "reserved_quantity": item.reserved_quantity + quantity}
+    else:
+        condition, values = item.reserved_quantity >= quantity, {"available_quantity": item.available_quantity + quantity, "reserved_quantity": item.reserved_quantity - quantity}
+    return list(db.execute(
+        update(item)
+        .where(item.inventory_item_id.in_(sorted(quantities)), condition)
+        .values(**values)
+        .returning(item.inventory_item_id, item.available_quantity, item.reserved_quantity)
+        .execution_options(synchronize_session=False)
+    ).all())
+
+def adjust_inventory_quantity(db: Session, inventory_item_id: int, change_in_quantity: Any) -> Optional[Any]:
+    """
+    يضيف change_in_quantity (موجبة أو سالبة) إلى الكمية الفعلية والمتاحة لبند مخزون بعبارة UPDATE شرطية واحدة (بدون commit)،
+    بشرط ألا تصبح أي منهما سالبة.
+
+    Returns:
+        Optional[Row]: (available_quantity, on_hand_quantity) بعد التعديل، أو None إذا كان التعديل سيجعل الكمية سالبة.
+    """
+    item = models.InventoryItem
+    return db.execute(
+        update(item)
+        .where(
+            item.inventory_item_id == inventory_item_id,
+            item.on_hand_quantity + change_in_quantity >= 0,
+            item.available_quantity + change_in_quantity >= 0,
+        )
+        .values(on_hand_quantity=item.on_hand_quantity + change_in_quantity, available_quantity=item.available_quantity + change_in_quantity)
+        .returning(item.available_quantity, item.on_hand_quantity)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+def restock_inventory_quantities(db: Session, quantities: Dict[int, Any]) -> List[Any]:
+    """
+    يعكس consume_reserved_quantities لدفعة بنود عند إلغاء طلب مدفوع بعبارة UPDATE واحدة (بدون commit):
+        on_hand_quantity += q, available_quantity += q
+    الصفوف تُقفل أولاً بترتيب inventory_item_id (lock_inventory_items_in_order).
+    """
+    if not quantities:
+        return []
+    lock_inventory_items_in_order(db, quantities)
+    item = models.InventoryItem
+    quantity = case(quantities, value=item.inventory_item_id)
+    return list(db.execute(
+        update(item)
+        .where(item.inventory_item_id.in_(sorted(quantities)))
+        .values(on_hand_quantity=item.on_hand_quantity + quantity, available_quantity=item.available_quantity + quantity)
+        .returning(item.inventory_item_id, item.available_quantity, item.on_hand_quantity)
+        .execution_options(synchronize_session=False)
+    ).all())
+
+def consume_reserved_quantities(db: Session, quantities: Dict[int, Any]) -> List[Any]:
+    """
+    يخصم كميات محجوزة من المخزون الفعلي لدفعة بنود عند تأكيد الطلب بعبارة UPDATE شرطية واحدة (بدون commit):
+        reserved_quantity -= q, on_hand_quantity -= q  WHERE reserved_quantity >= q AND on_hand_quantity >= q
+    البنود التي لا تكفي كميتها لا تُعدل ولا تظهر في النتيجة. الصفوف تُقفل أولاً بترتيب inventory_item_id (lock_inventory_items_in_order).
+    """
+    if not quantities:
+        return []
+    lock_inventory_items_in_order(db, quantities)
+    item = models.InventoryItem
+    quantity = case(quantities, value=item.inventory_item_id)
+    return list(db.execute(
+        update(item)
+        .where(item.inventory_item_id.in_(sorted(quantities)), item.reserved_quantity >= quantity, item.on_hand_quantity >= quantity)
+        .values(reserved_quantity=item.reserved_quantity - quantity, on_hand_quantity=item.on_hand_quantity - quantity)
+        .returning(item.inventory_item_id, item.reserved_quantity, item.on_hand_quantity)
+        .execution_options(synchronize_session=False)
+    ).all())
+
 def get_inventory_item(db: Session, inventory_item_id: int) -> Optional[models.InventoryItem]:
     """
     يجلب بند مخزون واحد بالـ ID الخاص به، مع الحالة والحركات.
@@ -105,6 +239,86 @@ def create_inventory_transaction(db: Session, inventory_item_id: int, transactio
     db.flush() # استخدم flush للحصول على ID إذا لزم الأمر
     return db_transaction
 
+def bulk_create_inventory_transactions(db: Session, transactions: List[Dict[str, Any]]) -> None:
+    """
+    يضيف دفعة حركات مخزون بعبارة INSERT واحدة (بدون commit)، لتُحفظ مع تحديث الكميات في نفس المعاملة.
+    """
+    if not transactions:
+        return
+    ids = reserve_ids(db, models.InventoryTransaction.transaction_id, len(transactions))
+    if ids:
+        transactions = [dict(transaction, transaction_id=transaction_id) for transaction, transaction_id in zip(transactions, ids)]
+    db.execute(insert(models.InventoryTransaction), transactions)
+
+# ==========================================================
+# --- CRUD Functions for InventoryReservation ---
+# ==========================================================
+
+def bulk_create_inventory_reservations(db: Session, reservations: List[Dict[str, Any]]) -> None:
+    """
+    يضيف دفعة حجوزات مخزون بعبارة INSERT واحدة (بدون commit). المعرفات (reservation_id) تُولد من طبقة الخدمة.
+    """
+    if reservations:
+        db.execute(insert(models.InventoryReservation), reservations)
+
+def transition_inventory_reservations(
+    db: Session,
+    from_status: str,
+    to_status: str,
+    order_ids: Optional[Iterable[UUID]] = None,
+    reservation_ids: Optional[Iterable[UUID]] = None,
+    expired_before: Optional[datetime] = None,
+    valid_at: Optional[datetime] = None,
+) -> List[Any]:
+    """
+    ينقل حالة دفعة حجوزات بعبارة UPDATE شرطية واحدة (بدون commit): فقط الحجوزات التي ما زالت في from_status
+    (وانتهت مهلتها عند expired_before، أو لم تنتهِ بعد عند valid_at، إن حُدد) تنتقل، فلا يمكن تحرير أو تأكيد
+    نفس الحجز مرتين من عمليتين متزامنتين.
+
+    Returns:
+        List[Row]: الحجوزات التي انتقلت فعلاً (reservation_id, inventory_item_id, order_id, quantity, expires_at).
+    """
+    reservation = models.InventoryReservation
+    conditions = [reservation.status == from_status]
+    if order_ids is not None:
+        conditions.append(reservation.order_id.in_(list(order_ids)))
+    if reservation_ids is not None:
+        conditions.append(reservation.reservation_id.in_(list(reservation_ids)))
+    if expired_before is not None:
+        conditions.append(reservation.expires_at <= expired_before)
+    if valid_at is not None:
+        conditions.append(reservation.expires_at > valid_at)
+    return list(db.execute(
+        update(reservation)
+        .where(*conditions)
+        .values(status=to_status, updated_at=func.now())
+        .returning(reservation.reservation_id, reservation.inventory_item_id, reservation.order_id, reservation.quantity, reservation.expires_at)
+        .execution_options(synchronize_session=False)
+    ).all())
+
+def get_order_reservation_statuses(db: Session, order_id: UUID) -> Dict[str, int]:
+    """يعد حجوزات طلب حسب حالتها باستعلام واحد."""
+    reservation = models.InventoryReservation
+    rows = db.execute(
+        select(reservation.status, func.count()).where(reservation.order_id == order_id).group_by(reservation.status)
+    ).all()
+    return {status: count for status, count in rows}
+
+def get_held_reservations_expiring_before(db: Session, before: datetime, limit: Optional[int] = None) -> List[Any]:
+    """
+    يجلب الحجوزات المعلقة (HELD) التي تنتهي مهلتها قبل before، مرتبة بموعد الانتهاء
+    (فهرس ix_inventory_reservations_status_expires_at، فالتكلفة بعدد الحجوزات القريبة لا بحجم الجدول).
+    """
+    reservation = models.InventoryReservation
+    query = (
+        select(reservation.reservation_id, reservation.expires_at)
+        .where(reservation.status == "HELD", reservation.expires_at < before)
+        .order_by(reservation.expires_at)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return list(db.execute(query).all())
+
 def get_inventory_transaction(db: Session, transaction_id: int) -> Optional[models.InventoryTransaction]:
     """
     يجلب سجل حركة مخزون واحد بالـ ID الخاص به.
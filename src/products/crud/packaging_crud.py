@@ -1,8 +1,8 @@
 # backend\src\products\crud\packaging_crud.py
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, and_
-from typing import List, Optional
+from sqlalchemy import exists, and_, select
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
 from src.products.models import units_models as models # استيراد المودلز (ProductPackagingOption و ProductPackagingOptionTranslation موجودة هنا)
@@ -54,6 +54,16 @@ def get_packaging_option(db: Session, packaging_option_id: int) -> Optional[mode
         joinedload(models.ProductPackagingOption.unit_of_measure) # تحميل وحدة القياس المرتبطة
     ).filter(models.ProductPackagingOption.packaging_option_id == packaging_option_id).first()
 
+def get_packaging_option_names(db: Session, packaging_option_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    يجلب مفاتيح أسماء مجموعة خيارات تعبئة باستعلام واحد (بدون تحميل الكائنات وعلاقاتها).
+    الخيارات غير الموجودة لا تظهر في النتيجة.
+    """
+    return dict(db.execute(
+        select(models.ProductPackagingOption.packaging_option_id, models.ProductPackagingOption.packaging_option_name_key)
+        .where(models.ProductPackagingOption.packaging_option_id.in_(list(packaging_option_ids)))
+    ).all())
+
 def get_all_packaging_options_for_product(db: Session, product_id: UUID, skip: int = 0, limit: int = 100, include_inactive: bool = False) -> List[models.ProductPackagingOption]:
     """
     يجلب قائمة بخيارات التعبئة لمنتج معين، مع خيار لتضمين غير النشطة.
@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Integer, String, Text, BigInteger,
-    func, TIMESTAMP, text, ForeignKey, CheckConstraint
+    func, TIMESTAMP, text, ForeignKey, CheckConstraint, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -55,4 +55,29 @@ class InventoryTransaction(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     inventory_item: Mapped["InventoryItem"] = relationship(
         "InventoryItem", back_populates="transactions"
-    )
\ No newline at end of file
+    )
+
+
+class InventoryReservation(Base):
+    """
+    حجوزات المخزون المؤقتة لبنود الطلبات: الكمية تنتقل من المتاح إلى المحجوز عند إنشاء الطلب (HELD)،
+    ثم تُخصم من المخزون الفعلي عند الدفع (CONFIRMED)، أو تعود إلى المتاح عند الإلغاء (RELEASED) أو انتهاء المهلة (EXPIRED).
+    """
+    __tablename__ = 'inventory_reservations'
+    reservation_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    inventory_item_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('inventory_items.inventory_item_id'), nullable=False)
+    order_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('orders.order_id', ondelete="CASCADE"), nullable=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, server_default=text("'HELD'"))
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    created_by_user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.user_id'), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint('quantity > 0', name='chk_inventory_reservation_quantity_positive'),
+        CheckConstraint("status IN ('HELD', 'CONFIRMED', 'RELEASED', 'EXPIRED')", name='chk_inventory_reservation_status'),
+        # كنّاس الحجوزات المنتهية: الحجوزات المعلقة مرتبة بموعد انتهائها
+        Index('ix_inventory_reservations_status_expires_at', 'status', 'expires_at'),
+        Index('ix_inventory_reservations_order_id', 'order_id'),
+    )
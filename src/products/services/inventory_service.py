@@ -2,7 +2,7 @@
 
 from sqlalchemy.orm import Session
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 # استيراد المودلز (للتعريفات والـ Type Hinting)
@@ -25,6 +25,7 @@ from src.products.services.product_service import get_product_by_id_for_user # 
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 
 # ==========================================================
@@ -66,17 +67,13 @@ def adjust_stock_level(db: Session, adjustment: inventory_schemas.StockAdjustmen
     inventory_item = inventory_crud.get_or_create_inventory_item(db, packaging_option_id=adjustment.product_packaging_option_id, seller_id=current_user.user_id)
 
     # 3. تحديث الكميات في بند المخزون.
-    #    - يتم استخدام Decimal لضمان دقة الحسابات المالية وتجنب الأخطاء الشائعة في الفلوت (Floating Point).
-    change_in_quantity_decimal = Decimal(str(adjustment.change_in_quantity))
-    new_on_hand_quantity = Decimal(str(inventory_item.on_hand_quantity)) + change_in_quantity_decimal
-    
-    #    - تحقق لمنع الكمية السالبة بعد التعديل.
-    if new_on_hand_quantity < 0:
+    #    - عبارة UPDATE شرطية واحدة تضيف التعديل إلى الكمية الفعلية والمتاحة في قاعدة البيانات (بدلاً من القراءة ثم الكتابة من Python)،
+    #      فلا يضيع تعديل متزامن على نفس البند. الكمية المحجوزة (reserved_quantity) يتم التعامل معها في عمليات الطلبات.
+    adjusted_quantities = inventory_crud.adjust_inventory_quantity(db, inventory_item.inventory_item_id, float(adjustment.change_in_quantity))
+
+    #    - الشرط في نفس العبارة يمنع الكمية السالبة بعد التعديل.
+    if adjusted_quantities is None:
         raise BadRequestException(detail="Stock quantity cannot be negative.")
-        
-    #    - تحديث الكميات الفعلية والمتاحة. الكمية المحجوزة (reserved_quantity) يتم التعامل معها في عمليات الطلبات.
-    inventory_item.on_hand_quantity = float(new_on_hand_quantity)
-    inventory_item.available_quantity = float(new_on_hand_quantity) - inventory_item.reserved_quantity
 
     # 4. تحديد نوع حركة المخزون وتسجيلها في جدول سجلات الحركات (InventoryTransaction).
     #    - يتم تحديد نوع الحركة بناءً على ما إذا كانت إضافة أو خصم.
@@ -107,7 +104,7 @@ def adjust_stock_level(db: Session, adjustment: inventory_schemas.StockAdjustmen
         db, 
         inventory_item_id=inventory_item.inventory_item_id, 
         transaction_in=transaction_read_schema,
-        current_balance=inventory_item.available_quantity # يتم تسجيل الرصيد المتاح بعد الحركة
+        current_balance=adjusted_quantities.available_quantity # يتم تسجيل الرصيد المتاح بعد الحركة
     )
     
     # 5. حفظ كل التغييرات في قاعدة البيانات.
@@ -145,7 +142,7 @@ def get_inventory_item_by_id(db: Session, inventory_item_id: int, current_user:
     # 3. التحقق من صلاحيات المستخدم: يجب أن يكون المالك (البائع) أو مسؤولاً عاماً.
     #    - 'ADMIN_PRODUCT_VIEW_ANY' هي صلاحية افتراضية للمسؤول تسمح له برؤية أي منتج/مخزون.
     if inventory_item.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRODUCT_VIEW_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRODUCT_VIEW_ANY"):
         raise ForbiddenException(detail="Not authorized to view this inventory item.")
     
     return inventory_item
@@ -252,17 +249,13 @@ def adjust_stock_level(db: Session, adjustment: inventory_schemas.StockAdjustmen
     inventory_item = inventory_crud.get_or_create_inventory_item(db, packaging_option_id=adjustment.product_packaging_option_id, seller_id=current_user.user_id)
 
     # 3. تحديث الكميات في بند المخزون.
-    #    - يتم استخدام Decimal لضمان دقة الحسابات المالية وتجنب الأخطاء الشائعة في الفلوت (Floating Point).
-    change_in_quantity_decimal = Decimal(str(adjustment.change_in_quantity))
-    new_on_hand_quantity = Decimal(str(inventory_item.on_hand_quantity)) + change_in_quantity_decimal
-    
-    #    - تحقق لمنع الكمية السالبة بعد التعديل.
-    if new_on_hand_quantity < 0:
+    #    - عبارة UPDATE شرطية واحدة تضيف التعديل إلى الكمية الفعلية والمتاحة في قاعدة البيانات (بدلاً من القراءة ثم الكتابة من Python)،
+    #      فلا يضيع تعديل متزامن على نفس البند. الكمية المحجوزة (reserved_quantity) يتم التعامل معها في عمليات الطلبات.
+    adjusted_quantities = inventory_crud.adjust_inventory_quantity(db, inventory_item.inventory_item_id, float(adjustment.change_in_quantity))
+
+    #    - الشرط في نفس العبارة يمنع الكمية السالبة بعد التعديل.
+    if adjusted_quantities is None:
         raise BadRequestException(detail="Stock quantity cannot be negative.")
-        
-    #    - تحديث الكميات الفعلية والمتاحة. الكمية المحجوزة (reserved_quantity) يتم التعامل معها في عمليات الطلبات.
-    inventory_item.on_hand_quantity = float(new_on_hand_quantity)
-    inventory_item.available_quantity = float(new_on_hand_quantity) - inventory_item.reserved_quantity
 
     # 4. تحديد نوع حركة المخزون وتسجيلها في جدول سجلات الحركات (InventoryTransaction).
     #    - يتم تحديد نوع الحركة بناءً على ما إذا كانت إضافة أو خصم.
@@ -293,7 +286,7 @@ def adjust_stock_level(db: Session, adjustment: inventory_schemas.StockAdjustmen
         db, 
         inventory_item_id=inventory_item.inventory_item_id, 
         transaction_in=transaction_read_schema,
-        current_balance=inventory_item.available_quantity # يتم تسجيل الرصيد المتاح بعد الحركة
+        current_balance=adjusted_quantities.available_quantity # يتم تسجيل الرصيد المتاح بعد الحركة
     )
     
     # 5. حفظ كل التغييرات في قاعدة البيانات.
@@ -305,6 +298,69 @@ def adjust_stock_level(db: Session, adjustment: inventory_schemas.StockAdjustmen
     
     return inventory_item
 
+def reserve_stock(
+    db: Session,
+    quantities: Dict[Tuple[int, UUID], Decimal],
+    transaction_type_key: str,
+    created_by_user_id: Optional[UUID] = None,
+    reason_notes: Optional[str] = None,
+    labels: Optional[Dict[int, str]] = None,
+) -> Dict[Tuple[int, UUID], Any]:
+    """
+    يحجز ذريًا كميات دفعة بنود مخزون ويسجل حركاتها في نفس المعاملة (بدون commit).
+    - الحجز عبارة UPDATE شرطية واحدة لكل البنود (inventory_crud.reserve_inventory_quantities): لا قراءة مسبقة للكميات،
+      والتحقق من الكفاية يتم على الصف نفسه لحظة تعديله، فلا يمكن بيع نفس الوحدات مرتين. تسبقها قراءة تقفل الصفوف
+      بترتيب inventory_item_id (SELECT ... FOR UPDATE)، فلا يحدث جمود بين طلبين متعددي البنود يتشاركان بنودًا.
+    - الحركات (كمية سالبة، والرصيد المتاح بعد الحجز من RETURNING) تُضاف بعبارة INSERT واحدة.
+    - الكل أو لا شيء: إذا لم تكفِ كمية أي بند، تُعاد البنود التي حُجزت في نفس الدفعة بعبارة عكسية واحدة.
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        quantities (Dict[Tuple[int, UUID], Decimal]): الكمية المطلوبة لكل (product_packaging_option_id, seller_user_id).
+        transaction_type_key (str): مفتاح نوع حركة المخزون (مثلاً "SALE_DEDUCTION").
+        created_by_user_id (Optional[UUID]): المستخدم المسجل في الحركات.
+        reason_notes (Optional[str]): ملاحظات الحركات (مثلاً رقم الطلب).
+        labels (Optional[Dict[int, str]]): أسماء خيارات التعبئة لرسالة الخطأ.
+
+    Returns:
+        Dict[Tuple[int, UUID], Row]: صف البند المحجوز (inventory_item_id, available_quantity, reserved_quantity) لكل زوج.
+
+    Raises:
+        ForbiddenException: إذا كانت الكمية المطلوبة من أي بند أكبر من الكمية المتاحة (أو لا يوجد له بند مخزون).
+        ConflictException: إذا لم يتم العثور على نوع حركة المخزون.
+    """
+    trans_type = db.query(InventoryTransactionType).filter(InventoryTransactionType.transaction_type_name_key == transaction_type_key).first()
+    if not trans_type:
+        raise ConflictException(detail=f"Transaction type '{transaction_type_key}' not found in the system. Please ensure lookup data is seeded.")
+
+    item_ids = inventory_crud.get_inventory_item_ids(db, quantities)
+    requested = {item_ids[key]: float(quantity) for key, quantity in quantities.items() if key in item_ids}
+    reserved = {}
+    if len(requested) == len(quantities):
+        reserved = {row.inventory_item_id: row for row in inventory_crud.reserve_inventory_quantities(db, requested)}
+
+    shortages = [key for key in quantities if item_ids.get(key) not in reserved]
+    if shortages:
+        if reserved:
+            inventory_crud.unreserve_inventory_quantities(db, {inventory_item_id: requested[inventory_item_id] for inventory_item_id in reserved})
+        packaging_option_id, _ = key = shortages[0]
+        available_quantity = db.get(InventoryItem, item_ids[key]).available_quantity if key in item_ids else 0
+        label = (labels or {}).get(packaging_option_id, packaging_option_id)
+        raise ForbiddenException(detail=f"الكمية المطلوبة من المنتج '{label}' ({quantities[key]}) أكبر من الكمية المتاحة في المخزون ({available_quantity}).")
+
+    inventory_crud.bulk_create_inventory_transactions(db, [
+        {
+            "inventory_item_id": inventory_item_id,
+            "transaction_type_id": trans_type.transaction_type_id,
+            "quantity_changed": -requested[inventory_item_id],
+            "balance_after_transaction": row.available_quantity, # يتم تسجيل الرصيد المتاح بعد الحركة
+            "reason_notes": reason_notes,
+            "created_by_user_id": created_by_user_id,
+        }
+        for inventory_item_id, row in reserved.items()
+    ])
+    return {key: reserved[item_ids[key]] for key in quantities}
+
 def get_inventory_item_by_id(db: Session, inventory_item_id: int, current_user: User) -> InventoryItem:
     """
     جلب تفاصيل بند مخزون واحد بالـ ID الخاص به، مع التحقق من صلاحيات المستخدم.
@@ -331,7 +387,7 @@ def get_inventory_item_by_id(db: Session, inventory_item_id: int, current_user:
     # 3. التحقق من صلاحيات المستخدم: يجب أن يكون المالك (البائع) أو مسؤولاً عاماً.
     #    - 'ADMIN_PRODUCT_VIEW_ANY' هي صلاحية افتراضية للمسؤول تسمح له برؤية أي منتج/مخزون.
     if inventory_item.seller_user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_PRODUCT_VIEW_ANY" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_PRODUCT_VIEW_ANY"):
         raise ForbiddenException(detail="Not authorized to view this inventory item.")
     
     return inventory_item
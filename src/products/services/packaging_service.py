@@ -14,10 +14,12 @@ from src.products.crud import packaging_crud
 # استيراد الخدمات الأخرى للتحقق من الوجود (مثل خدمة المنتج وخدمة وحدة القياس)
 from src.products.services.product_service import get_product_by_id_for_user # لضمان وجود المنتج وملكيته
 from src.products.services.unit_of_measure_service import get_unit_of_measure_details # لضمان وجود وحدة القياس
+from src.pricing.services.price_tables import price_tables # جداول الأسعار المجمّعة (تُبطل عند تغير السعر الأساسي)
 # استيراد الاستثناءات المخصصة
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 
 # ==========================================================
@@ -80,7 +82,7 @@ def get_all_packaging_options_for_product(db: Session, product_id: UUID, current
     # تحديد ما إذا كان يجب تضمين الخيارات غير النشطة بناءً على صلاحية المستخدم
     effective_include_inactive = include_inactive
     if current_user and (current_user.user_id == product.seller_user_id or 
-                         any(p.permission_name_key == "ADMIN_PRODUCT_VIEW_ANY" for p in current_user.default_role.permissions)):
+                         permission_registry.user_has_permission(current_user, "ADMIN_PRODUCT_VIEW_ANY")):
         effective_include_inactive = True # المالك أو المسؤول يمكنه رؤية كل شيء
     
     return packaging_crud.get_all_packaging_options_for_product(db, product_id=product_id, include_inactive=effective_include_inactive)
@@ -128,7 +130,9 @@ def update_packaging_option(db: Session, packaging_option_id: int, option_in: pa
     # TODO: منطق عمل إضافي: التحقق مما إذا كان خيار التعبئة مستخدمًا في أي طلبات نشطة قبل السماح بتغييرات معينة
     # (مثلاً: منع تغيير الكمية أو السعر الأساسي إذا كان في طلب مفتوح)
 
-    return packaging_crud.update_packaging_option(db=db, db_option=db_option, option_in=option_in)
+    updated_option = packaging_crud.update_packaging_option(db=db, db_option=db_option, option_in=option_in)
+    price_tables.invalidate(packaging_option_id)
+    return updated_option
 
 def soft_delete_packaging_option(db: Session, packaging_option_id: int, current_user: User) -> ProductPackagingOption:
     """
@@ -154,7 +158,9 @@ def soft_delete_packaging_option(db: Session, packaging_option_id: int, current_
         # أو يمكن تركها بدون خيار افتراضي إذا كان هذا مقبولاً في منطق العمل
         pass # for now, just deactivate it
 
-    return packaging_crud.soft_delete_packaging_option(db=db, db_option=db_option)
+    deactivated_option = packaging_crud.soft_delete_packaging_option(db=db, db_option=db_option)
+    price_tables.invalidate(packaging_option_id)
+    return deactivated_option
 
 # ==========================================================
 # --- خدمات ترجمات خيارات التعبئة (ProductPackagingOption Translation) ---
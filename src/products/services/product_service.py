@@ -1,6 +1,7 @@
 # backend/src/products/services/product_service.py
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import List, Optional
 from uuid import UUID
@@ -8,6 +9,7 @@ from uuid import UUID
 # --- الاستيرادات ---
 # تم إزالة 'from src.db import base' لتجنب مشاكل الاستيراد الدائرية
 from src.products.crud import product_crud # لـ product_crud CRUDs
+from src.products.crud import async_product_crud # نسخ AsyncSession للقراءات العامة
 from src.products.schemas import product_schemas # لـ product_schemas
 
 # استيراد المودلات مباشرة من ملفاتها التعريفية
@@ -60,6 +62,14 @@ def get_public_active_products(db: Session, skip: int = 0, limit: int = 100) ->
     # Get all products with ACTIVE status
     return product_crud.get_all_active_products(db, status_id=active_status.product_status_id, skip=skip, limit=limit)
 
+async def get_public_active_products_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Product]:
+    """النسخة غير المتزامنة من get_public_active_products."""
+    active_status = await async_product_crud.get_product_status_by_key(db, "ACTIVE")
+    if not active_status:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Active status not configured.")
+
+    return await async_product_crud.get_all_active_products(db, status_id=active_status.product_status_id, skip=skip, limit=limit)
+
 def get_product_by_id_for_user(db: Session, product_id: UUID, user: Optional[User]) -> Product: # <-- تم التعديل هنا: Product بدلاً من base.Product
     """
     خدمة لجلب منتج واحد بناءً على صلاحيات المستخدم.
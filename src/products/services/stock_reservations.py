@@ -0,0 +1,308 @@
+# backend\src\products\services\stock_reservations.py
+# ----------------------------------------------------------------------------------------------------
+# حجوزات المخزون المؤقتة للطلبات (inventory_reservations):
+# - الإنشاء (hold_stock): الكميات تنتقل من المتاح إلى المحجوز (reserve_stock) ويُسجل لكل بند مخزون حجز HELD
+#   ينتهي بعد STOCK_RESERVATION_TTL_SECONDS، في نفس معاملة الطلب.
+# - الدفع (confirm_holds): الحجوزات HELD غير المنتهية تصبح CONFIRMED وتُخصم كمياتها من المحجوز والمخزون الفعلي.
+# - الإلغاء أو انتهاء المهلة (release_holds): الحجوزات HELD تصبح RELEASED أو EXPIRED وتعود كمياتها إلى المتاح
+#   مع حركة RETURN_TO_STOCK، بعبارة UPDATE واحدة للحجوزات وأخرى لبنود المخزون لكل دفعة.
+# - إلغاء طلب مدفوع (return_confirmed_holds): الحجوزات CONFIRMED تصبح RELEASED وتعود كمياتها إلى المخزون الفعلي
+#   والمتاح مع حركة RETURN_TO_STOCK.
+# - الكنّاس (اختياري - STOCK_RESERVATION_SWEEPER_ENABLED): كومة (heap) بمواعيد انتهاء الحجوزات القريبة فقط
+#   (STOCK_RESERVATION_HORIZON_SECONDS)، تُعاد قراءتها كل STOCK_RESERVATION_REFRESH_SECONDS عبر فهرس (status, expires_at)،
+#   وخيط ينام حتى أقرب موعد ثم يحرر كل ما انتهى على دفعات (STOCK_RESERVATION_BATCH_SIZE)؛ الكومة والخيط من DeadlineScheduler.
+#   مهمة Celery الدورية (release_expired_stock_reservations) تغطي ما فات الكنّاس أو العمليات التي لا تشغله.
+# - التكرار آمن: كل انتقال مشروط بأن الحجز ما زال HELD، فلا يُحرر أو يُؤكد حجز مرتين مهما تعددت النسخ.
+# ----------------------------------------------------------------------------------------------------
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.deadline_scheduler import DeadlineScheduler
+from src.db.session import SessionLocal
+from src.exceptions import ConflictException
+from src.lookups.models import InventoryTransactionType
+from src.products.crud import inventory_crud
+from src.products.services.inventory_service import reserve_stock
+
+logger = logging.getLogger(__name__)
+
+HELD = "HELD"
+CONFIRMED = "CONFIRMED"
+RELEASED = "RELEASED"
+EXPIRED = "EXPIRED"
+
+
+def hold_stock(
+    db: Session,
+    order_id: UUID,
+    quantities: Dict[Tuple[int, UUID], Decimal],
+    created_by_user_id: Optional[UUID] = None,
+    reason_notes: Optional[str] = None,
+    labels: Optional[Dict[int, str]] = None,
+    ttl_seconds: Optional[float] = None,
+) -> datetime:
+    """
+    يحجز كميات الطلب ذريًا (كل أو لا شيء) ويسجل حجزًا HELD لكل بند مخزون حتى الدفع (بدون commit).
+
+    Returns:
+        datetime: موعد انتهاء الحجوزات.
+
+    Raises:
+        ForbiddenException: إذا كانت الكمية المطلوبة من أي بند أكبر من الكمية المتاحة.
+        ConflictException: إذا لم يتم العثور على نوع حركة المخزون.
+    """
+    reserved = reserve_stock(
+        db, quantities, transaction_type_key="SALE_DEDUCTION", created_by_user_id=created_by_user_id,
+        reason_notes=reason_notes, labels=labels
+    )
+    ttl = settings.STOCK_RESERVATION_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+    reservations = [
+        {
+            "reservation_id": uuid4(),
+            "inventory_item_id": row.inventory_item_id,
+            "order_id": order_id,
+            "quantity": float(quantities[key]),
+            "status": HELD,
+            "expires_at": expires_at,
+            "created_by_user_id": created_by_user_id,
+        }
+        for key, row in reserved.items()
+    ]
+    inventory_crud.bulk_create_inventory_reservations(db, reservations)
+    # الكومة تُحدَّث قبل commit: الحجز الذي لم يُحفظ لا يتأثر بالتحرير الشرطي (status = HELD)
+    for reservation in reservations:
+        stock_reservation_sweeper.schedule(reservation["reservation_id"], expires_at)
+    return expires_at
+
+
+def confirm_holds(db: Session, order_id: UUID) -> int:
+    """
+    يؤكد حجوزات الطلب عند الدفع (بدون commit): الحجوزات HELD غير المنتهية تصبح CONFIRMED، وكمياتها تُخصم
+    من المحجوز والمخزون الفعلي بعبارة UPDATE شرطية واحدة. الطلبات التي ليس لها حجوزات (قبل هذه الآلية) لا تتأثر.
+
+    Returns:
+        int: عدد الحجوزات التي تم تأكيدها.
+
+    Raises:
+        ConflictException: إذا كانت حجوزات الطلب قد حُررت أو انتهت مهلتها (الكميات لم تعد محجوزة للطلب).
+    """
+    statuses = inventory_crud.get_order_reservation_statuses(db, order_id)
+    held = statuses.get(HELD, 0)
+    confirmed = inventory_crud.transition_inventory_reservations(
+        db, HELD, CONFIRMED, order_ids=[order_id], valid_at=datetime.now(timezone.utc)
+    ) if held else []
+    if statuses.get(RELEASED) or statuses.get(EXPIRED) or len(confirmed) != held:
+        raise ConflictException(detail="انتهت مهلة حجز كميات هذا الطلب أو تم تحريرها؛ يجب إعادة إنشاء الطلب.")
+
+    quantities = _sum_quantities(confirmed)
+    consumed = inventory_crud.consume_reserved_quantities(db, quantities)
+    if len(consumed) != len(quantities):
+        raise ConflictException(detail="الكميات المحجوزة لهذا الطلب غير متطابقة مع المخزون.")
+    for reservation in confirmed:
+        stock_reservation_sweeper.discard(reservation.reservation_id)
+    return len(confirmed)
+
+
+def release_holds(
+    db: Session,
+    order_ids: Optional[Iterable[UUID]] = None,
+    reservation_ids: Optional[Iterable[UUID]] = None,
+    expired_before: Optional[datetime] = None,
+    to_status: str = RELEASED,
+    created_by_user_id: Optional[UUID] = None,
+    reason_notes: Optional[str] = None,
+) -> int:
+    """
+    يحرر حجوزات HELD (لطلبات، أو لمعرفات محددة، أو المنتهية قبل expired_before) ويعيد كمياتها إلى المتاح
+    مع حركة RETURN_TO_STOCK لكل بند مخزون (بدون commit). عبارة UPDATE واحدة للحجوزات وأخرى لبنود المخزون
+    وINSERT واحدة للحركات مهما كان عدد الحجوزات.
+
+    Returns:
+        int: عدد الحجوزات التي تم تحريرها فعلاً.
+
+    Raises:
+        ConflictException: إذا لم يتم العثور على نوع حركة المخزون RETURN_TO_STOCK.
+    """
+    trans_type_id = _return_to_stock_type_id(db)
+    released = inventory_crud.transition_inventory_reservations(
+        db, HELD, to_status, order_ids=order_ids, reservation_ids=reservation_ids, expired_before=expired_before
+    )
+    if not released:
+        return 0
+    quantities = _sum_quantities(released)
+    items = {row.inventory_item_id: row for row in inventory_crud.unreserve_inventory_quantities(db, quantities)}
+    if len(items) != len(quantities):
+        logger.warning("Reserved quantity lower than held reservations for inventory items %s", sorted(quantities.keys() - items.keys()))
+
+    _record_returns(
+        db, trans_type_id, quantities, items, created_by_user_id,
+        reason_notes or ("انتهاء مهلة حجز الطلب" if to_status == EXPIRED else "تحرير حجز الطلب"),
+    )
+    for reservation in released:
+        stock_reservation_sweeper.discard(reservation.reservation_id)
+    return len(released)
+
+
+def return_confirmed_holds(
+    db: Session,
+    order_id: UUID,
+    created_by_user_id: Optional[UUID] = None,
+    reason_notes: Optional[str] = None,
+) -> int:
+    """
+    يعيد كميات حجوزات طلب مدفوع ملغى إلى المخزون (بدون commit): الحجوزات CONFIRMED تصبح RELEASED، وكمياتها
+    تُضاف إلى المخزون الفعلي والمتاح (عكس confirm_holds) مع حركة RETURN_TO_STOCK لكل بند مخزون.
+    الانتقال الشرطي يمنع إعادة نفس الكميات مرتين.
+
+    Returns:
+        int: عدد الحجوزات التي أُعيدت كمياتها.
+
+    Raises:
+        ConflictException: إذا لم يتم العثور على نوع حركة المخزون RETURN_TO_STOCK.
+    """
+    trans_type_id = _return_to_stock_type_id(db)
+    returned = inventory_crud.transition_inventory_reservations(db, CONFIRMED, RELEASED, order_ids=[order_id])
+    if not returned:
+        return 0
+    quantities = _sum_quantities(returned)
+    items = {row.inventory_item_id: row for row in inventory_crud.restock_inventory_quantities(db, quantities)}
+    _record_returns(db, trans_type_id, quantities, items, created_by_user_id, reason_notes or "إعادة كميات طلب مدفوع ملغى")
+    return len(returned)
+
+
+def _return_to_stock_type_id(db: Session) -> int:
+    trans_type = db.query(InventoryTransactionType).filter(InventoryTransactionType.transaction_type_name_key == "RETURN_TO_STOCK").first()
+    if not trans_type:
+        raise ConflictException(detail="Transaction type 'RETURN_TO_STOCK' not found in the system. Please ensure lookup data is seeded.")
+    return trans_type.transaction_type_id
+
+
+def _sum_quantities(reservations: Iterable[Any]) -> Dict[int, float]:
+    quantities: Dict[int, float] = {}
+    for row in reservations:
+        quantities[row.inventory_item_id] = quantities.get(row.inventory_item_id, 0) + row.quantity
+    return quantities
+
+
+def _record_returns(
+    db: Session, trans_type_id: int, quantities: Dict[int, float], items: Dict[int, Any],
+    created_by_user_id: Optional[UUID], reason_notes: str,
+) -> None:
+    """حركة RETURN_TO_STOCK واحدة لكل بند مخزون (INSERT واحدة للدفعة)."""
+    inventory_crud.bulk_create_inventory_transactions(db, [
+        {
+            "inventory_item_id": inventory_item_id,
+            "transaction_type_id": trans_type_id,
+            "quantity_changed": quantities[inventory_item_id],
+            "balance_after_transaction": row.available_quantity,
+            "reason_notes": reason_notes,
+            "created_by_user_id": created_by_user_id,
+        }
+        for inventory_item_id, row in items.items()
+    ])
+
+
+def release_expired_holds(db: Session, batch_size: Optional[int] = None, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    يحرر كل الحجوزات المنتهية على دفعات بحجم batch_size، مع commit لكل دفعة (للمهمة الدورية وأدوات الإدارة).
+
+    Returns:
+        Dict[str, int]: {"expired": عدد الحجوزات المحررة، "batches": عدد الدفعات}.
+    """
+    batch_size = max(batch_size or settings.STOCK_RESERVATION_BATCH_SIZE, 1)
+    now = now or datetime.now(timezone.utc)
+    report = {"expired": 0, "batches": 0}
+    while True:
+        due = inventory_crud.get_held_reservations_expiring_before(db, now + timedelta(microseconds=1), limit=batch_size)
+        if not due:
+            return report
+        report["expired"] += release_holds(db, reservation_ids=[row.reservation_id for row in due], expired_before=now, to_status=EXPIRED)
+        report["batches"] += 1
+        db.commit()
+        if len(due) < batch_size:
+            return report
+
+
+class StockReservationSweeper(DeadlineScheduler):
+    """
+    مواعيد انتهاء الحجوزات القريبة مفهرسة بمعرف الحجز؛ الحجوزات التي أُكدت أو حُررت قبل موعدها تُلغى
+    مواعيدها وتُتجاهل مدخلاتها عند خروجها من الكومة.
+    """
+
+    label = "Stock reservation sweeper"
+    thread_name = "stock-reservation-sweeper"
+
+    def __init__(self, horizon_seconds: float, refresh_seconds: float, batch_size: int):
+        super().__init__(horizon_seconds, refresh_seconds, batch_size)
+        self.expired = 0
+        self.skipped = 0
+
+    # --- الجدولة ---
+
+    def schedule(self, reservation_id: UUID, expires_at: datetime) -> None:
+        """يضيف موعد انتهاء حجز (من أي خيط). لا شيء إذا كان الكنّاس متوقفًا أو الموعد خارج النافذة."""
+        if self.running:
+            self.add_deadline(reservation_id, expires_at)
+
+    def discard(self, reservation_id: UUID) -> None:
+        """يلغي موعد حجز أُكد أو حُرر (مدخله في الكومة يُتجاهل عند خروجه)."""
+        if self.running:
+            super().discard(reservation_id)
+
+    def refresh(self, now: Optional[float] = None) -> int:
+        """يقرأ الحجوزات HELD التي تنتهي قبل نهاية النافذة (بما فيها المتأخرة) ويضيفها إلى الكومة."""
+        now = time.time() if now is None else now
+        db = SessionLocal()
+        try:
+            due = inventory_crud.get_held_reservations_expiring_before(db, datetime.fromtimestamp(now + self.horizon_seconds, timezone.utc))
+        finally:
+            db.close()
+        for row in due:
+            self.schedule(row.reservation_id, row.expires_at)
+        self.count("loaded", len(due))
+        return len(due)
+
+    # --- التحرير ---
+
+    def fire(self, reservation_ids: List[UUID], now: float) -> int:
+        """يحرر دفعة حجوزات انتهت مهلتها. يعيد عدد الحجوزات التي حُررت فعلاً."""
+        db = SessionLocal()
+        try:
+            expired = release_holds(db, reservation_ids=reservation_ids, expired_before=datetime.fromtimestamp(now, timezone.utc), to_status=EXPIRED)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        self.count("expired", expired)
+        self.count("skipped", len(reservation_ids) - expired) # أُكدت أو حُررت في عملية أخرى
+        return expired
+
+    # --- القياسات ---
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.STOCK_RESERVATION_SWEEPER_ENABLED,
+            "ttl_seconds": settings.STOCK_RESERVATION_TTL_SECONDS,
+            **super().stats(),
+            "expired": self.expired,
+            "skipped": self.skipped,
+        }
+
+
+# نسخة واحدة مشتركة على مستوى العملية (تبدأ عند بدء التطبيق إذا كان STOCK_RESERVATION_SWEEPER_ENABLED مفعلاً)
+stock_reservation_sweeper = StockReservationSweeper(
+    horizon_seconds=settings.STOCK_RESERVATION_HORIZON_SECONDS,
+    refresh_seconds=settings.STOCK_RESERVATION_REFRESH_SECONDS,
+    batch_size=settings.STOCK_RESERVATION_BATCH_SIZE,
+)
@@ -0,0 +1,21 @@
+# backend/src/products/tasks.py
+
+from src.core.celery_app import celery
+from src.db.session import SessionLocal
+from src.products.services.stock_reservations import release_expired_holds
+from datetime import datetime, timezone
+
+# مسح دوري لحجوزات المخزون المنتهية (ما فات كنّاس الحجوزات أو العمليات التي لا تشغله).
+@celery.task
+def release_expired_stock_reservations():
+    """
+    مهمة Celery دورية تحرر حجوزات الطلبات غير المدفوعة التي انتهت مهلتها وتعيد كمياتها إلى المخزون المتاح على دفعات.
+    """
+    db = SessionLocal()
+    try:
+        report = release_expired_holds(db)
+
+        print(f"[{datetime.now(timezone.utc)}] Stock reservation sweep: Released {report['expired']} expired reservations in {report['batches']} batches.")
+        return f"Released {report['expired']} reservations."
+    finally:
+        db.close()
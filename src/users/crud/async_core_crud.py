@@ -0,0 +1,65 @@
+# backend/src/users/crud/async_core_crud.py
+# ----------------------------------------------------------------------------------------------------
+# نسخ غير متزامنة (AsyncSession) من دوال CRUD المستخدمة في مسار المصادقة وتسجيل الدخول.
+# تستخدم نفس ملفات التحميل المعرفة في core_crud (USER_LOADER_PROFILES)، مع ملاحظة أن
+# التحميل الكسول (Lazy Loading) غير ممكن في AsyncSession، لذا يجب تحميل كل علاقة مطلوبة صراحةً.
+# ----------------------------------------------------------------------------------------------------
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.users.models import core_models as models
+from src.users.models.roles_models import Role
+from src.users.models.verification_models import UserVerificationStatus
+from src.users.crud.core_crud import user_loader_options
+
+
+def user_read_options() -> list:
+    """
+    خيارات التحميل اللازمة لتسلسل UserRead بالكامل داخل AsyncSession:
+    جداول البحث (ملف "profile") مع ترجماتها.
+    """
+    return [
+        joinedload(models.User.account_status).selectinload(models.AccountStatus.translations),
+        joinedload(models.User.user_type).selectinload(models.UserType.translations),
+        joinedload(models.User.default_role).selectinload(Role.translations),
+        joinedload(models.User.user_verification_status).selectinload(UserVerificationStatus.translations),
+        joinedload(models.User.preferred_language),
+    ]
+
+
+async def get_user_by_phone_number(db: AsyncSession, phone_number: str) -> Optional[models.User]:
+    """
+    يبحث عن مستخدم عن طريق رقم الجوال، مع تحميل حالة الحساب والدور الأساسي (ملف "auth").
+    """
+    result = await db.execute(
+        select(models.User).options(*user_loader_options("auth")).where(models.User.phone_number == phone_number)
+    )
+    return result.scalars().first()
+
+
+async def get_user_for_auth(db: AsyncSession, user_id: UUID) -> Optional[models.User]:
+    """
+    يجلب المستخدم بمفتاحه الأساسي مع ملف التحميل "auth".
+    """
+    if not isinstance(user_id, UUID):
+        user_id = UUID(str(user_id))
+    result = await db.execute(
+        select(models.User).options(*user_loader_options("auth")).where(models.User.user_id == user_id)
+    )
+    return result.scalars().first()
+
+
+async def update_last_login(db: AsyncSession, db_user: models.User, login_time: datetime) -> models.User:
+    """
+    يحدّث وقت آخر تسجيل دخول للمستخدم ويحفظ التغيير.
+    """
+    db_user.last_login_timestamp = login_time
+    db.add(db_user)
+    await db.commit()
+    return db_user
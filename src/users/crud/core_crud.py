@@ -1,8 +1,8 @@
 # backend\src\users\crud\core_crud.py
 
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import exists, and_
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload, lazyload
+from sqlalchemy import exists, and_, select
+from typing import Iterable, List, Optional, Set
 from uuid import UUID
 from datetime import datetime
 
@@ -12,6 +12,57 @@ from src.users.models.roles_models import Role, RolePermission, Permission
 # استيراد Schemas
 from src.users.schemas import core_schemas as schemas # User, UserPreference, AccountStatusHistory
 
+# ==========================================================
+# --- ملفات تحميل المستخدم (User Loader Profiles) ---
+# ==========================================================
+# كل ملف يحدد بدقة العلاقات التي تُحمّل مع كائن User عبر خيارات الاستعلام (Query Options).
+# المجموعات الثقيلة معرّفة في المودل بـ lazy="raise"، ولا تُحمّل إلا إذا طلبها الملف صراحةً.
+#   - "auth": للمصادقة فقط (حالة الحساب والدور الأساسي) في استعلام واحد.
+#   - "profile": العلاقات المرجعية التي يعرضها UserRead.
+#   - "admin_detail": ملف "profile" مع مجموعات المستخدم المحدودة (عناوين، تراخيص، أدوار، تفضيلات، تاريخ الحالة).
+#   - "embedded_ref": مستخدم مضمّن داخل كائن آخر (مثل Bid.bidder أو Auction.seller) بدون أي علاقات.
+
+_USER_LOOKUP_RELATIONSHIPS = (
+    models.User.account_status,
+    models.User.user_type,
+    models.User.default_role,
+    models.User.user_verification_status,
+    models.User.preferred_language,
+)
+
+USER_LOADER_PROFILES = {
+    "auth": lambda: [
+        joinedload(models.User.account_status),
+        joinedload(models.User.default_role),
+        lazyload(models.User.user_type),
+        lazyload(models.User.user_verification_status),
+        lazyload(models.User.preferred_language),
+    ],
+    "profile": lambda: [joinedload(rel) for rel in _USER_LOOKUP_RELATIONSHIPS],
+    "admin_detail": lambda: [joinedload(rel) for rel in _USER_LOOKUP_RELATIONSHIPS] + [
+        selectinload(models.User.addresses),
+        selectinload(models.User.licenses),
+        selectinload(models.User.user_roles),
+        selectinload(models.User.user_preferences),
+        selectinload(models.User.account_status_history),
+    ],
+    "embedded_ref": lambda: [lazyload("*")],
+}
+
+def user_loader_options(profile: str) -> list:
+    """
+    يعيد قائمة خيارات الاستعلام لملف التحميل المطلوب.
+    يمكن تمريرها إلى Query.options() مباشرةً، أو كخيارات فرعية لعلاقة تشير إلى User
+    (مثال: joinedload(Bid.bidder).options(*user_loader_options("embedded_ref"))).
+
+    Raises:
+        ValueError: إذا كان اسم الملف غير معروف.
+    """
+    try:
+        return USER_LOADER_PROFILES[profile]()
+    except KeyError:
+        raise ValueError(f"ملف تحميل المستخدم '{profile}' غير معروف.")
+
 # ==========================================================
 # --- CRUD Functions for User (المستخدمون) ---
 # ==========================================================
@@ -39,12 +90,7 @@ def get_user_by_id(db: Session, user_id: UUID) -> Optional[models.User]:
         user_id = UUID(str(user_id))
     
     user = db.query(models.User).options(
-        joinedload(models.User.account_status), # حالة الحساب
-        joinedload(models.User.user_type),     # نوع المستخدم
-        joinedload(models.User.default_role),  # الدور الأساسي
-        joinedload(models.User.user_verification_status), # حالة التحقق
-        joinedload(models.User.preferred_language) # اللغة المفضلة
-        # TODO: يمكن إضافة المزيد من التحميلات الفورية حسب الحاجة (مثل Addresses, UserPreferences)
+        *user_loader_options("profile") # حالة الحساب، نوع المستخدم، الدور الأساسي، حالة التحقق، اللغة المفضلة
     ).filter(models.User.user_id == user_id).first()
     
     # Load permissions separately if role exists (to avoid SQLAlchemy string path issues)
@@ -60,6 +106,22 @@ def get_user_by_id(db: Session, user_id: UUID) -> Optional[models.User]:
     
     return user
 
+def get_existing_user_ids(db: Session, user_ids: Iterable[UUID]) -> Set[UUID]:
+    """
+    يعيد معرفات المستخدمين الموجودين من مجموعة معرفات باستعلام واحد على المفتاح الأساسي فقط،
+    للتحقق من الوجود بدون تحميل الملف الشخصي وعلاقاته كما في get_user_by_id.
+    """
+    return set(db.scalars(select(models.User.user_id).where(models.User.user_id.in_(list(user_ids)))).all())
+
+def get_user_for_auth(db: Session, user_id: UUID) -> Optional[models.User]:
+    """
+    يجلب المستخدم بمفتاحه الأساسي فقط لاستخدامه في تابع المصادقة.
+    لا يعيد تحميل الدور مع صلاحياته، إذ تُقرأ الصلاحيات من ذاكرة لقطات الهوية (principal_cache).
+    """
+    if not isinstance(user_id, UUID):
+        user_id = UUID(str(user_id))
+    return db.query(models.User).options(*user_loader_options("auth")).filter(models.User.user_id == user_id).first()
+
 def get_all_users(db: Session, skip: int = 0, limit: int = 100, include_deleted: bool = False) -> List[models.User]:
     """
     جلب قائمة بجميع المستخدمين مع تحميل العلاقات الأساسية.
@@ -73,13 +135,7 @@ def get_all_users(db: Session, skip: int = 0, limit: int = 100, include_deleted:
     Returns:
         List[models.User]: قائمة بجميع المستخدمين.
     """
-    query = db.query(models.User).options(
-        joinedload(models.User.account_status), # حالة الحساب
-        joinedload(models.User.user_type),     # نوع المستخدم
-        joinedload(models.User.default_role),  # الدور الأساسي
-        joinedload(models.User.user_verification_status), # حالة التحقق
-        joinedload(models.User.preferred_language) # اللغة المفضلة
-    )
+    query = db.query(models.User).options(*user_loader_options("profile"))
     
     if not include_deleted:
         query = query.filter(models.User.is_deleted == False)
@@ -225,6 +225,23 @@ def remove_permission_from_role(db: Session, role: models.Role, permission: mode
         db.commit()
     return
 
+def get_permission_keys_for_role(db: Session, role_id: int) -> List[str]:
+    """
+    يجلب مفاتيح الصلاحيات المسندة لدور معين باستعلام واحد على الأعمدة فقط
+    (بدون إنشاء كائنات ORM للدور أو الصلاحيات).
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        role_id (int): معرف الدور.
+
+    Returns:
+        List[str]: قائمة بمفاتيح الصلاحيات.
+    """
+    rows = db.query(models.Permission.permission_name_key).join(
+        models.RolePermission, models.RolePermission.permission_id == models.Permission.permission_id
+    ).filter(models.RolePermission.role_id == role_id).all()
+    return [row[0] for row in rows]
+
 def get_role_permission_association(db: Session, role_id: int, permission_id: int) -> Optional[models.RolePermission]:
     """
     يجلب سجل ربط معين بين دور وصلاحية.
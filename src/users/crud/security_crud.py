@@ -1,7 +1,7 @@
 # backend\src\users\crud\security_crud.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import exists, and_
+from sqlalchemy import exists, and_, case, update
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timezone
@@ -10,6 +10,9 @@ from datetime import datetime, timezone
 from src.users.models import security_models as models # PasswordResetToken, PhoneChangeRequest, UserSession
 # استيراد Schemas (إذا لزم الأمر لـ Type Hinting)
 from src.users.schemas import security_schemas as schemas
+# ذاكرة التوكنات المفكوكة وقائمة الإبطال: تُحدَّثان عند إلغاء تنشيط الجلسات
+from src.core.token_cache import token_cache
+from src.core.session_revocation import session_revocations
 
 
 # ==========================================================
@@ -89,6 +92,30 @@ def mark_password_reset_token_as_used(db: Session, db_token: models.PasswordRese
     db.refresh(db_token)
     return db_token
 
+def claim_password_reset_attempt(db: Session, token_id: int, max_attempts: int) -> Optional[int]:
+    """
+    يحجز محاولة تحقق من رمز إعادة تعيين كلمة المرور بعبارة UPDATE شرطية واحدة (مع commit) قبل مقارنة الرمز،
+    فلا تتجاوز المحاولات المتزامنة الحد. المحاولة الأخيرة المسموح بها تُبطل الرمز (is_used).
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        token_id (int): معرف الرمز.
+        max_attempts (int): الحد الأقصى لمحاولات التحقق.
+
+    Returns:
+        Optional[int]: رقم المحاولة المحجوزة، أو None إذا كان الرمز مستخدمًا أو استُنفدت محاولاته.
+    """
+    token = models.PasswordResetToken
+    attempt = db.execute(
+        update(token)
+        .where(token.token_id == token_id, token.is_used == False, token.verification_attempts < max_attempts)
+        .values(verification_attempts=token.verification_attempts + 1, is_used=token.verification_attempts >= max_attempts - 1)
+        .returning(token.verification_attempts)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    return attempt
+
 # لا يوجد delete_password_reset_token مباشر، بل يتم الاعتماد على is_used وتاريخ الانتهاء لتنظيف دوري.
 
 
@@ -157,6 +184,36 @@ def update_phone_change_request(db: Session, db_request: models.PhoneChangeReque
     db.refresh(db_request)
     return db_request
 
+def claim_phone_change_attempt(db: Session, request_id: int, request_status: str, max_attempts: int) -> Optional[int]:
+    """
+    يحجز محاولة تحقق من رمز OTP لطلب تغيير رقم الجوال بعبارة UPDATE شرطية واحدة (مع commit) قبل مقارنة الرمز،
+    بشرط أن يكون الطلب ما زال في request_status. المحاولة الأخيرة المسموح بها تنقل الطلب إلى 'FAILED_MAX_ATTEMPTS'
+    (إلا إذا نجحت وانتقل الطلب للمرحلة التالية).
+
+    Args:
+        db (Session): جلسة قاعدة البيانات.
+        request_id (int): معرف الطلب.
+        request_status (str): حالة الطلب المتوقعة (مرحلة التحقق الحالية).
+        max_attempts (int): الحد الأقصى لمحاولات التحقق في المرحلة.
+
+    Returns:
+        Optional[int]: رقم المحاولة المحجوزة، أو None إذا تغيرت حالة الطلب أو استُنفدت محاولاته.
+    """
+    request = models.PhoneChangeRequest
+    attempt = db.execute(
+        update(request)
+        .where(request.request_id == request_id, request.request_status == request_status, request.verification_attempts < max_attempts)
+        .values(
+            verification_attempts=request.verification_attempts + 1,
+            last_attempt_timestamp=datetime.now(timezone.utc),
+            request_status=case((request.verification_attempts >= max_attempts - 1, 'FAILED_MAX_ATTEMPTS'), else_=request_status),
+        )
+        .returning(request.verification_attempts)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    return attempt
+
 # لا يوجد delete_phone_change_request مباشر، يتم إدارة الحالة عبر request_status.
 
 
@@ -207,6 +264,17 @@ def get_user_session_by_id(db: Session, session_id: UUID) -> Optional[models.Use
     """
     return db.query(models.UserSession).filter(models.UserSession.session_id == session_id).first()
 
+def is_user_session_active(db: Session, session_id: UUID) -> bool:
+    """
+    يتحقق باستعلام EXISTS واحد من أن الجلسة نشطة ولم تنتهِ صلاحيتها
+    (يُستخدم للتحقق من sid في التوكن دون تحميل كائن الجلسة).
+    """
+    return db.query(exists().where(
+        models.UserSession.session_id == session_id,
+        models.UserSession.is_active == True,
+        models.UserSession.expiry_timestamp > datetime.now(timezone.utc)
+    )).scalar()
+
 def get_user_session_by_refresh_token_hash(db: Session, refresh_token_hash: str) -> Optional[models.UserSession]:
     """
     يجلب جلسة مستخدم عن طريق تجزئة الـ Refresh Token.
@@ -254,6 +322,8 @@ def deactivate_user_session(db: Session, db_session: models.UserSession) -> mode
     db.add(db_session)
     db.commit()
     db.refresh(db_session)
+    token_cache.invalidate_session(db_session.session_id)
+    session_revocations.revoke([db_session.session_id])
     return db_session
 
 def deactivate_all_active_sessions_for_user(db: Session, user_id: UUID) -> int:
@@ -268,18 +338,21 @@ def deactivate_all_active_sessions_for_user(db: Session, user_id: UUID) -> int:
         int: عدد الجلسات التي تم إلغاؤها.
     """
     # عملية تحديث مجمعة وأكثر كفاءة من جلب كل الجلسات وتحديثها في حلقة
-    num_deactivated = db.query(models.UserSession).filter(
-        models.UserSession.user_id == user_id,
-        models.UserSession.is_active == True
-    ).update(
-        {
-            models.UserSession.is_active: False,
-            models.UserSession.logout_timestamp: datetime.now(timezone.utc)
-        },
-        synchronize_session=False # ضروري للأداء في التحديث المجمع
-    )
+    # RETURNING يعيد معرفات الجلسات الملغاة في نفس الاستعلام لإضافتها إلى قائمة الإبطال
+    revoked_ids = db.execute(
+        update(models.UserSession)
+        .where(
+            models.UserSession.user_id == user_id,
+            models.UserSession.is_active == True
+        )
+        .values(is_active=False, logout_timestamp=datetime.now(timezone.utc))
+        .returning(models.UserSession.session_id)
+        .execution_options(synchronize_session=False) # ضروري للأداء في التحديث المجمع
+    ).scalars().all()
     db.commit()
-    return num_deactivated
+    token_cache.invalidate_user(user_id)
+    session_revocations.revoke(revoked_ids)
+    return len(revoked_ids)
 
 def deactivate_inactive_sessions_older_than(db: Session, inactive_before: datetime) -> int:
     """
@@ -292,15 +365,16 @@ def deactivate_inactive_sessions_older_than(db: Session, inactive_before: dateti
     Returns:
         int: عدد الجلسات التي تم إلغاء تنشيطها.
     """
-    num_deactivated = db.query(models.UserSession).filter(
-        models.UserSession.is_active == True,
-        models.UserSession.last_activity_timestamp < inactive_before
-    ).update(
-        {
-            models.UserSession.is_active: False,
-            models.UserSession.logout_timestamp: datetime.now(timezone.utc)
-        },
-        synchronize_session=False
-    )
+    revoked_ids = db.execute(
+        update(models.UserSession)
+        .where(
+            models.UserSession.is_active == True,
+            models.UserSession.last_activity_timestamp < inactive_before
+        )
+        .values(is_active=False, logout_timestamp=datetime.now(timezone.utc))
+        .returning(models.UserSession.session_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
     db.commit()
-    return num_deactivated
\ No newline at end of file
+    session_revocations.revoke(revoked_ids)
+    return len(revoked_ids)
\ No newline at end of file
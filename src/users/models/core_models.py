@@ -79,56 +79,60 @@ class User(Base):
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
     profile_picture_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    # --- ملاحظة حول التحميل ---
+    # المجموعات الثقيلة (السجلات، الجلسات، الرموز، العناوين، التراخيص...) معرّفة بـ lazy="raise":
+    # لا تُحمّل أبدًا ضمنيًا، ويجب طلبها صراحةً عبر ملفات التحميل في core_crud (USER_LOADER_PROFILES)
+    # أو عبر استعلام مستقل. هذا يمنع تحميل آلاف الصفوف مع كل جلب للمستخدم.
     reviews_given: Mapped[List["Review"]] = relationship("Review", back_populates="reviewer_user", lazy="select")
     review_responses_given: Mapped[List["ReviewResponse"]] = relationship(
         "ReviewResponse",
         back_populates="responder_user",
         foreign_keys=[ReviewResponse.responder_user_id],
-        lazy="selectin"
+        lazy="raise"
     )
     review_responses_approved: Mapped[List["ReviewResponse"]] = relationship(
         "ReviewResponse",
         back_populates="approved_by_user",
         foreign_keys=[ReviewResponse.approved_by_user_id],
-        lazy="selectin"
+        lazy="raise"
     )
 
     review_reports_made: Mapped[List["ReviewReport"]] = relationship(
         "ReviewReport",
         back_populates="reporter_user",
         foreign_keys=[ReviewReport.reporter_user_id],
-        lazy="selectin"
+        lazy="raise"
     )
 
     review_reports_resolved: Mapped[List["ReviewReport"]] = relationship(
         "ReviewReport",
         back_populates="resolved_by_user",
         foreign_keys=[ReviewReport.resolved_by_user_id],
-        lazy="selectin"
+        lazy="raise"
     )
 
     system_audit_logs: Mapped[List["SystemAuditLog"]] = relationship(
         "SystemAuditLog",
         back_populates="user",
-        lazy="selectin"
+        lazy="raise"
     )
 
-    user_activity_logs: Mapped[List["UserActivityLog"]] = relationship("UserActivityLog", back_populates="user", lazy="selectin")
-    search_logs: Mapped[List["SearchLog"]] = relationship("SearchLog", back_populates="user", lazy="selectin")
+    user_activity_logs: Mapped[List["UserActivityLog"]] = relationship("UserActivityLog", back_populates="user", lazy="raise")
+    search_logs: Mapped[List["SearchLog"]] = relationship("SearchLog", back_populates="user", lazy="raise")
     security_event_logs: Mapped[List["SecurityEventLog"]] = relationship(
         "SecurityEventLog",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
         foreign_keys="[SecurityEventLog.user_id]"
     )
 # Optionally, add this if you want a reverse relation for target_user_id:
     targeted_security_event_logs: Mapped[List["SecurityEventLog"]] = relationship(
         "SecurityEventLog",
         foreign_keys="[SecurityEventLog.target_user_id]",
-        lazy="selectin",
+        lazy="raise",
         overlaps="target_user"
     )
-    data_change_audit_logs: Mapped[List["DataChangeAuditLog"]] = relationship("DataChangeAuditLog", back_populates="changed_by_user", lazy="selectin")
+    data_change_audit_logs: Mapped[List["DataChangeAuditLog"]] = relationship("DataChangeAuditLog", back_populates="changed_by_user", lazy="raise")
 
 
 
@@ -155,7 +159,7 @@ class User(Base):
     default_role: Mapped[Optional["Role"]] = relationship("Role", foreign_keys=[default_user_role_id], back_populates="users_with_default_role", lazy="selectin") # <-- تم التعديل هنا
     user_verification_status: Mapped[Optional["UserVerificationStatus"]] = relationship("UserVerificationStatus", back_populates="users", foreign_keys=[user_verification_status_id], lazy="selectin") # <-- تم التعديل هنا
     preferred_language: Mapped["Language"] = relationship("Language", back_populates="users", foreign_keys=[preferred_language_code], lazy="selectin") # <-- تم التعديل هنا
-    updater: Mapped[Optional["User"]] = relationship("User", foreign_keys=[updated_by_user_id], remote_side=lambda: User.user_id, lazy="selectin") # <-- تم التعديل هنا: remote_side أيضاً يصبح نصياً
+    updater: Mapped[Optional["User"]] = relationship("User", foreign_keys=[updated_by_user_id], remote_side=lambda: User.user_id, lazy="select") # <-- تم التعديل هنا: remote_side أيضاً يصبح نصياً
 
     # علاقات عكسية مع مودلات من مجموعات أخرى (Products, Market, Auctions)
     products_sold: Mapped[List["Product"]] = relationship("Product", foreign_keys=lambda: [Product.seller_user_id], back_populates="seller")
@@ -181,29 +185,29 @@ class User(Base):
     auction_settlements_as_seller: Mapped[List["AuctionSettlement"]] = relationship("AuctionSettlement", back_populates="seller_user", foreign_keys=lambda: [AuctionSettlement.seller_user_id])
 
     # علاقات مع مودلات من Group 1 (Users module)
-    addresses: Mapped[List["Address"]] = relationship("Address", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
-    password_reset_tokens: Mapped[List["PasswordResetToken"]] = relationship("PasswordResetToken", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
-    phone_change_requests: Mapped[List["PhoneChangeRequest"]] = relationship("PhoneChangeRequest", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
-    user_sessions: Mapped[List["UserSession"]] = relationship("UserSession", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
-    licenses: Mapped[List["License"]] = relationship("License", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
+    addresses: Mapped[List["Address"]] = relationship("Address", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    password_reset_tokens: Mapped[List["PasswordResetToken"]] = relationship("PasswordResetToken", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    phone_change_requests: Mapped[List["PhoneChangeRequest"]] = relationship("PhoneChangeRequest", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    user_sessions: Mapped[List["UserSession"]] = relationship("UserSession", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    licenses: Mapped[List["License"]] = relationship("License", back_populates="user", cascade="all, delete-orphan", lazy="raise")
     user_verification_history: Mapped[List["UserVerificationHistory"]] = relationship(
         "UserVerificationHistory",
         back_populates="user",
         foreign_keys=lambda: [__import__('src.users.models.verification_models', fromlist=['UserVerificationHistory']).UserVerificationHistory.user_id],# Explicitly specify the FK here
-        lazy="selectin"
+        lazy="raise"
     )
 # <-- تم التعديل هنا
     manual_verification_logs_as_reviewer: Mapped[List["ManualVerificationLog"]] = relationship(
         "ManualVerificationLog",
         foreign_keys=lambda: [__import__('src.users.models.verification_models', fromlist=['ManualVerificationLog']).ManualVerificationLog.reviewer_user_id],
-        back_populates="reviewer_user", lazy="selectin") # <-- تم التعديل هنا
+        back_populates="reviewer_user", lazy="raise") # <-- تم التعديل هنا
     
     # علاقات RBAC (إدارة الأدوار والصلاحيات)
     user_roles: Mapped[List["UserRole"]] = relationship(
         "UserRole",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
         foreign_keys=lambda: [__import__('src.users.models.roles_models', fromlist=['UserRole']).UserRole.user_id]
     )
 
@@ -211,14 +215,14 @@ class User(Base):
         "AccountStatusHistory",
         back_populates="user",
         foreign_keys=lambda: [AccountStatusHistory.user_id],
-        lazy="selectin"
+        lazy="raise"
     )
 
     user_preferences: Mapped[List["UserPreference"]] = relationship(
         "UserPreference",
         back_populates="user",
         foreign_keys=lambda: [UserPreference.user_id],
-        lazy="selectin"
+        lazy="select"
     )
 
 
@@ -304,8 +308,8 @@ class AccountStatus(Base):
     translations: Mapped[List["AccountStatusTranslation"]] = relationship(
         back_populates="status", cascade="all, delete-orphan" # ترجمات حالة الحساب
     )
-    account_status_history_old_status: Mapped[List["AccountStatusHistory"]] = relationship("AccountStatusHistory", foreign_keys=lambda: [AccountStatusHistory.old_account_status_id], lazy="selectin", overlaps="old_account_status")
-    account_status_history_new_status: Mapped[List["AccountStatusHistory"]] = relationship("AccountStatusHistory", foreign_keys=lambda: [AccountStatusHistory.new_account_status_id], lazy="selectin", overlaps="new_account_status")
+    account_status_history_old_status: Mapped[List["AccountStatusHistory"]] = relationship("AccountStatusHistory", foreign_keys=lambda: [AccountStatusHistory.old_account_status_id], lazy="raise", overlaps="old_account_status")
+    account_status_history_new_status: Mapped[List["AccountStatusHistory"]] = relationship("AccountStatusHistory", foreign_keys=lambda: [AccountStatusHistory.new_account_status_id], lazy="raise", overlaps="new_account_status")
 
 class AccountStatusTranslation(Base):
     """(1.أ.5) جدول ترجمات حالات الحساب التشغيلية."""
@@ -34,7 +34,7 @@ class Role(Base):
     )
 
     # علاقة عكسية بالمستخدمين الذين لديهم هذا الدور كدور افتراضي (من جدول User)
-    users_with_default_role: Mapped[List["User"]] = relationship("User", foreign_keys="[User.default_user_role_id]", back_populates="default_role", lazy="selectin")
+    users_with_default_role: Mapped[List["User"]] = relationship("User", foreign_keys="[User.default_user_role_id]", back_populates="default_role", lazy="raise") # مجموعة غير محدودة: لا تُحمّل ضمنيًا مع الدور
     
     # علاقة مع جدول UserRole (جدول الربط) للمستخدمين الذين لديهم هذا الدور كدور إضافي
     user_role_associations: Mapped[List["UserRole"]] = relationship(back_populates="role", cascade="all, delete-orphan")
@@ -17,6 +17,7 @@ class PasswordResetToken(Base):
     token_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     expiry_timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
     is_used: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
+    verification_attempts: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default=text("0"))
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
 
     # --- SQLAlchemy Relationships ---
@@ -29,8 +30,8 @@ class PhoneChangeRequest(Base):
     user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.user_id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False)
     old_phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
     new_phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
-    old_phone_otp_code: Mapped[str] = mapped_column(String(10), nullable=True)
-    new_phone_otp_code: Mapped[str] = mapped_column(String(10), nullable=True)
+    old_phone_otp_code: Mapped[str] = mapped_column(String(255), nullable=True) # تجزئة الرمز (وليس الرمز نفسه)
+    new_phone_otp_code: Mapped[str] = mapped_column(String(255), nullable=True) # تجزئة الرمز (وليس الرمز نفسه)
     request_status: Mapped[str] = mapped_column(String(50), nullable=False, server_default=text("'PENDING_OLD_PHONE_VERIFICATION'"))
     request_timestamp: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
     verification_attempts: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default=text("0"))
@@ -16,6 +16,7 @@ from src.users.schemas import address_schemas as schemas # Address
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 from src.users.models.core_models import User # لاستخدام User في التحقق من الصلاحيات
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
@@ -111,7 +112,7 @@ def get_address_by_id(db: Session, address_id: int, current_user: Optional[User]
     # التحقق من الملكية إذا تم توفير المستخدم
     if current_user:
         if db_address.user_id != current_user.user_id and \
-           not any(p.permission_name_key == "ADMIN_ADDRESS_VIEW_ANY" for p in current_user.default_role.permissions): # TODO: صلاحية ADMIN_ADDRESS_VIEW_ANY
+           not permission_registry.user_has_permission(current_user, "ADMIN_ADDRESS_VIEW_ANY"): # TODO: صلاحية ADMIN_ADDRESS_VIEW_ANY
             raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل هذا العنوان.")
     
     return db_address
@@ -1,6 +1,7 @@
 # backend\src\users\services\core_service.py
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import List, Dict, Any, Optional
 from uuid import UUID
@@ -14,13 +15,15 @@ from src.users.models.security_models import UserSession # UserSession
 from src.users.crud import core_crud # لـ User, UserPreference, AccountStatusHistory CRUDs
 from src.users.crud import user_lookups_crud # لـ AccountStatus, UserType CRUDs
 from src.users.crud import security_crud # لـ UserSession (لإبطال الجلسات)
+from src.users.crud import async_core_crud # نسخ AsyncSession لمسار تسجيل الدخول
 
 # استيراد Schemas
 from src.users.schemas import core_schemas as schemas # User, UserPreference, AccountStatusHistory
 from src.users.schemas.management_schemas import AdminUserStatusUpdate # لـ AdminUserStatusUpdate (تم نقله إلى هنا)
 
 # استيراد أدوات الأمان
-from src.core.security import get_password_hash, verify_password
+from src.core.security import verify_password, verify_and_update_password
+from src.core.password_hasher import password_hasher # منفذ bcrypt المحدود (خارج حلقة الأحداث)
 from src.core import security # لـ create_access_token, create_refresh_token
 from src.core.config import settings # لإعدادات الجلسة والقفل
 # from src.db.redis_client import redis_client # لآلية حماية القوة الغاشمة - تم تعطيله
@@ -29,6 +32,7 @@ from src.core.config import settings # لإعدادات الجلسة والقف
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
 # TODO: يجب إضافة خدمات للتحقق من وجود اللغات والعناوين والأدوار وحالة التحقق
@@ -82,7 +86,7 @@ def refresh_access_token(db: Session, refresh_token: str) -> str:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not active")
 
     # الخطوة 5: كل شيء صحيح، قم بإنشاء وإرجاع Access Token جديد
-    new_access_token = security.create_access_token(user_id=user.user_id)
+    new_access_token = security.create_access_token(user_id=user.user_id, session_id=db_session.session_id)
     return new_access_token
 
 
@@ -98,12 +102,13 @@ def refresh_access_token(db: Session, refresh_token: str) -> str:
 # --- خدمات المستخدمين (User) ---
 # ==========================================================
 
-def register_new_user(db: Session, user_in: schemas.UserCreate, user_type_key: str, default_role_key: str = "BASE_USER") -> models.User:
+async def register_new_user(db: Session, user_in: schemas.UserCreate, user_type_key: str, default_role_key: str = "BASE_USER") -> models.User:
     """
     خدمة لتنفيذ منطق عمل تسجيل مستخدم جديد.
     [REQ-FUN-001, REQ-FUN-002, REQ-FUN-003, REQ-FUN-004, REQ-FUN-005, REQ-FUN-006, REQ-FUN-007, REQ-FUN-012]
     تتضمن التحقق من تفرد رقم الجوال والبريد الإلكتروني، وتجزئة كلمة المرور،
     وتعيين الدور وحالة الحساب الأولية.
+    التجزئة (bcrypt) تعمل في منفذ التجزئة المحدود حتى لا تحجب حلقة الأحداث، ويطلق 429 إذا كان المنفذ مشبعًا.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
@@ -131,7 +136,7 @@ def register_new_user(db: Session, user_in: schemas.UserCreate, user_type_key: s
             raise ConflictException(detail="البريد الإلكتروني مسجل بالفعل.")
 
     # 3. تجزئة كلمة المرور (REQ-FUN-005, REQ-FUN-006)
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await password_hasher.hash(user_in.password)
     
     # 4. تجهيز بيانات المستخدم للحفظ
     user_data_to_save = user_in.model_dump(exclude={"password", "user_type_key", "default_role_key", "translations"}) # استبعاد كلمة المرور والحقول غير المطلوبة
@@ -197,7 +202,10 @@ def authenticate_user(db: Session, phone_number: str, password: str) -> Dict[str
     user = core_crud.get_user_by_phone_number(db, phone_number=phone_number)
     
     # 2. التحقق من بيانات الاعتماد
-    if not user or not verify_password(password, user.password_hash): # REQ-FUN-016
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="رقم الجوال أو كلمة المرور غير صحيحة. يرجى المحاولة مرة أخرى.")
+    is_valid, new_password_hash = verify_and_update_password(password, user.password_hash)
+    if not is_valid: # REQ-FUN-016
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="رقم الجوال أو كلمة المرور غير صحيحة. يرجى المحاولة مرة أخرى.")
 
     # 3. التحقق من حالة الحساب (REQ-FUN-019)
@@ -205,7 +213,9 @@ def authenticate_user(db: Session, phone_number: str, password: str) -> Dict[str
         # TODO: يمكن تخصيص الرسالة بناءً على status_name_key
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"حسابك في حالة '{user.account_status.status_name_key}'. يرجى التواصل مع فريق الدعم الفني.")
 
-    # 6. تحديث وقت آخر تسجيل دخول (REQ-FUN-018)
+    # 6. تحديث وقت آخر تسجيل دخول (REQ-FUN-018)، وإعادة تجزئة كلمة المرور إذا تغيرت إعدادات bcrypt
+    if new_password_hash:
+        user.password_hash = new_password_hash
     user.last_login_timestamp = datetime.now(timezone.utc)
     db.add(user)
     db.commit()
@@ -224,6 +234,42 @@ def authenticate_user(db: Session, phone_number: str, password: str) -> Dict[str
         "token_type": "bearer"
     }
 
+async def authenticate_user_async(db: AsyncSession, phone_number: str, password: str) -> Dict[str, Any]:
+    """
+    النسخة غير المتزامنة من authenticate_user (نفس القواعد ونفس الاستجابة).
+    استعلامات قاعدة البيانات تتم عبر AsyncSession، والتحقق من كلمة المرور (bcrypt) يعمل في منفذ التجزئة
+    المحدود حتى لا يحجب حلقة الأحداث (Event Loop)، ويطلق 429 إذا كان المنفذ مشبعًا.
+    """
+    # 1. جلب المستخدم
+    user = await async_core_crud.get_user_by_phone_number(db, phone_number=phone_number)
+
+    # 2. التحقق من بيانات الاعتماد
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="رقم الجوال أو كلمة المرور غير صحيحة. يرجى المحاولة مرة أخرى.")
+    is_valid, new_password_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not is_valid: # REQ-FUN-016
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="رقم الجوال أو كلمة المرور غير صحيحة. يرجى المحاولة مرة أخرى.")
+
+    # 3. التحقق من حالة الحساب (REQ-FUN-019)
+    if user.account_status.status_name_key != "ACTIVE":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"حسابك في حالة '{user.account_status.status_name_key}'. يرجى التواصل مع فريق الدعم الفني.")
+
+    # 4. تحديث وقت آخر تسجيل دخول (REQ-FUN-018)، وإعادة تجزئة كلمة المرور إذا تغيرت إعدادات bcrypt
+    if new_password_hash:
+        user.password_hash = new_password_hash
+    await async_core_crud.update_last_login(db, user, datetime.now(timezone.utc))
+
+    # 5. إنشاء التوكنات (Access Token و Refresh Token)
+    access_token = security.create_access_token(user_id=user.user_id)
+    # مؤقتاً: إنشاء refresh token بسيط بدون session_id
+    refresh_token = f"refresh_{user.user_id}_{datetime.now(timezone.utc).timestamp()}"
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
 def get_user_profile(db: Session, user_id: UUID) -> models.User:
     """
     خدمة لجلب الملف الشخصي لمستخدم معين.
@@ -278,10 +324,11 @@ def update_user_profile(db: Session, db_user: models.User, user_in: schemas.User
 
     return core_crud.update_user(db=db, db_user=db_user, user_in=user_in)
 
-def change_user_password(db: Session, user: models.User, password_data: schemas.UserChangePassword) -> Dict[str, str]:
+async def change_user_password(db: Session, user: models.User, password_data: schemas.UserChangePassword) -> Dict[str, str]:
     """
     خدمة لتغيير كلمة مرور المستخدم المسجل دخوله.
     [REQ-FUN-025, REQ-FUN-027]: توفير آلية آمنة لتغيير كلمات المرور، وطلب كلمة المرور الحالية.
+    التحقق والتجزئة (bcrypt) يعملان في منفذ التجزئة المحدود حتى لا يحجبا حلقة الأحداث.
 
     Args:
         db (Session): جلسة قاعدة البيانات.
@@ -295,11 +342,11 @@ def change_user_password(db: Session, user: models.User, password_data: schemas.
         BadRequestException: إذا كانت كلمة المرور الحالية غير صحيحة، أو الجديدة لا تفي بالمعايير، أو غير متطابقة.
     """
     # 1. التحقق من أن كلمة المرور الحالية صحيحة (REQ-FUN-027)
-    if not verify_password(password_data.current_password, user.password_hash):
+    if not await password_hasher.verify(password_data.current_password, user.password_hash):
         raise BadRequestException(detail="كلمة المرور الحالية غير صحيحة.")
 
     # 2. تجزئة كلمة المرور الجديدة
-    new_password_hash = get_password_hash(password_data.new_password)
+    new_password_hash = await password_hasher.hash(password_data.new_password)
 
     # 3. تحديث كلمة المرور في قاعدة البيانات
     user.password_hash = new_password_hash
@@ -335,7 +382,7 @@ def soft_delete_user_account(db: Session, user_id: UUID, current_user: User, rea
 
     # 1. التحقق من الصلاحيات: المستخدم نفسه أو مسؤول
     if db_user.user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_MANAGE_USERS" for p in current_user.default_role.permissions): # TODO: صلاحية ADMIN_USER_DELETE
+       not permission_registry.user_has_permission(current_user, "ADMIN_MANAGE_USERS"): # TODO: صلاحية ADMIN_USER_DELETE
         raise ForbiddenException(detail="غير مصرح لك بحذف هذا الحساب.")
 
     # 2. جلب حالة الحساب "المحذوف"
@@ -347,7 +394,7 @@ def soft_delete_user_account(db: Session, user_id: UUID, current_user: User, rea
         raise ConflictException(detail="'DELETED' or 'DELETED_BY_USER' status not found in DB. Please seed default statuses.")
     
     # 3. التحقق من أن الحساب ليس في حالة نهائية (is_terminal) بالفعل (إلا إذا كان المسؤول)
-    if db_user.account_status.is_terminal and not any(p.permission_name_key == "ADMIN_MANAGE_USERS" for p in current_user.default_role.permissions):
+    if db_user.account_status.is_terminal and not permission_registry.user_has_permission(current_user, "ADMIN_MANAGE_USERS"):
         raise BadRequestException(detail=f"لا يمكن حذف الحساب في حالته النهائية: {db_user.account_status.status_name_key}.")
 
     # حفظ الحالة القديمة قبل التحديث
@@ -440,7 +487,7 @@ def get_user_account_history(db: Session, user_id_to_view: UUID, requesting_user
     """
     # منطق التحقق من الصلاحيات
     # TODO: يجب التأكد أن صلاحية ADMIN_VIEW_USERS هي الصلاحية الصحيحة هنا (أو صلاحية أكثر تحديداً).
-    if user_id_to_view != requesting_user.user_id and not any(p.permission_name_key == "ADMIN_VIEW_USERS" for p in requesting_user.default_role.permissions):
+    if user_id_to_view != requesting_user.user_id and not permission_registry.user_has_permission(requesting_user, "ADMIN_VIEW_USERS"):
         raise ForbiddenException(detail="غير مصرح لك برؤية سجل حالة هذا المستخدم.")
 
     history = core_crud.get_account_status_history_for_user(db, user_id=user_id_to_view)
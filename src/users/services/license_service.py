@@ -20,6 +20,7 @@ from src.users.schemas import verification_lookups_schemas as schemas_lookups #
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
 )
+from src.core.permission_registry import permission_registry # للتحقق من الصلاحيات عبر أقنعة البتات
 
 # استيراد خدمات من مجموعات أخرى للتحقق من الوجود (تجنب التبعيات الدائرية بالاستيراد المحلي إذا لزم الأمر)
 from src.users.services.core_service import get_user_profile # للتحقق من وجود المستخدم
@@ -132,7 +133,7 @@ def get_licenses_for_user(db: Session, user_id: UUID, current_user: User) -> Lis
     """
     # التحقق من الصلاحيات: المستخدم نفسه أو مسؤول
     if user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_VIEW_USER_LICENSES" for p in current_user.default_role.permissions): # TODO: صلاحية ADMIN_VIEW_USER_LICENSES
+       not permission_registry.user_has_permission(current_user, "ADMIN_VIEW_USER_LICENSES"): # TODO: صلاحية ADMIN_VIEW_USER_LICENSES
         raise ForbiddenException(detail="غير مصرح لك برؤية تراخيص هذا المستخدم.")
 
     # التحقق من وجود المستخدم (يمكن جلب المستخدم هنا أو في الراوتر)
@@ -162,7 +163,7 @@ def get_license_details(db: Session, license_id: int, current_user: User) -> mod
 
     # التحقق من الملكية
     if db_license.user_id != current_user.user_id and \
-       not any(p.permission_name_key == "ADMIN_VIEW_USER_LICENSES" for p in current_user.default_role.permissions):
+       not permission_registry.user_has_permission(current_user, "ADMIN_VIEW_USER_LICENSES"):
         raise ForbiddenException(detail="غير مصرح لك برؤية تفاصيل هذا الترخيص.")
     
     return db_license
@@ -301,7 +302,7 @@ def verify_license_as_admin(
         raise NotFoundException(detail=f"الترخيص بمعرف {license_id} غير موجود.")
     
     # 1. التحقق من صلاحية المسؤول (يتم التحقق في الراوتر أيضاً، لكن هنا لضمان منطق الخدمة)
-    if not any(p.permission_name_key == "ADMIN_MANAGE_LICENSES" for p in admin_user.default_role.permissions): # TODO: صلاحية ADMIN_MANAGE_LICENSES
+    if not permission_registry.user_has_permission(admin_user, "ADMIN_MANAGE_LICENSES"): # TODO: صلاحية ADMIN_MANAGE_LICENSES
         raise ForbiddenException(detail="غير مصرح لك بتغيير حالة التحقق لهذا الترخيص.")
 
     # 2. جلب الحالة الجديدة
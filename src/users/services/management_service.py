@@ -15,6 +15,8 @@ from src.users.crud import verification_history_log_crud # لـ AccountStatusHis
 
 # استيراد Schemas
 from src.users.schemas.management_schemas import AdminUserStatusUpdate # الـ Schema الرئيسي لهذا الملف
+# ذاكرة لقطات الهوية (يجب إبطالها عند تغيير حالة الحساب)
+from src.core.principal_cache import principal_cache
 
 # استيراد Schemas الأخرى (لأنها قد تُستخدم في دوال هذا الملف)
 from src.users.schemas import core_schemas as schemas_core # لـ UserTypeCreate/Update/Read, AccountStatusCreate/Update/Read
@@ -108,6 +110,7 @@ def change_user_status_by_admin(
 
     db.commit() # تنفيذ كل التغييرات كوحدة واحدة (transaction)
     db.refresh(target_user)
+    principal_cache.invalidate_user(target_user.user_id) # لتطبيق الحالة الجديدة فورًا على الطلبات التالية
 
     # TODO: إخطار المستخدم المتأثر بتغيير حالة حسابه (وحدة الإشعارات - Module 11).
 
@@ -18,8 +18,8 @@ from src.users.schemas import security_schemas as schemas # PhoneChangeRequest S
 from src.users.schemas import core_schemas as user_schemas # لـ UserRead
 
 # استيراد أدوات الأمان
-from src.core.security import get_password_hash, verify_password
 from src.core.config import settings # لإعدادات OTP (مدة الصلاحية، عدد المحاولات)
+from src.core.token_hashing import hash_token, verify_token, PURPOSE_PHONE_CHANGE # تجزئة HMAC لرموز OTP
 
 # استيراد الاستثناءات المخصصة
 from src.exceptions import (
@@ -35,6 +35,11 @@ def _generate_otp(length: int = 6) -> str:
     """يولد رمز تحقق عشوائي (OTP) مكون من أرقام فقط."""
     return ''.join(secrets.choice(string.digits) for _ in range(length))
 
+def _claim_attempt(db: Session, req: models.PhoneChangeRequest) -> None:
+    """يحجز محاولة تحقق في المرحلة الحالية للطلب، ويرفض إذا استُنفدت محاولاتها (يجب بدء طلب جديد)."""
+    if security_crud.claim_phone_change_attempt(db, req.request_id, req.request_status, settings.OTP_MAX_VERIFICATION_ATTEMPTS) is None:
+        raise BadRequestException(detail="تم تجاوز الحد الأقصى لمحاولات التحقق. الرجاء بدء طلب تغيير رقم جوال جديد.")
+
 def initiate_phone_change(db: Session, user: models.User, request_in: schemas.PhoneChangeRequestCreate) -> models.PhoneChangeRequest:
     """
     خدمة لبدء طلب تغيير رقم الجوال للمستخدم.
@@ -72,7 +77,7 @@ def initiate_phone_change(db: Session, user: models.User, request_in: schemas.Ph
 
     # 3. توليد رمز OTP للرقم القديم وتجزئته
     old_phone_otp = _generate_otp()
-    old_phone_otp_hash = get_password_hash(old_phone_otp)
+    old_phone_otp_hash = hash_token(old_phone_otp, PURPOSE_PHONE_CHANGE)
 
     # 4. تجهيز بيانات الطلب
     request_data = {
@@ -122,17 +127,14 @@ def verify_old_phone_and_send_new_otp(db: Session, user: models.User, verificati
     if req.request_status != 'PENDING_OLD_PHONE_VERIFICATION':
         raise BadRequestException(detail="حالة طلب تغيير رقم الجوال غير صالحة للتحقق من الرقم القديم.")
 
-    # 3. التحقق من رمز OTP القديم
-    if not verify_password(verification_in.otp_code, req.old_phone_otp_code):
-        # TODO: يمكن إضافة منطق لعد المحاولات الفاشلة هنا قبل قفل الطلب مؤقتاً.
-        req.verification_attempts += 1
-        req.last_attempt_timestamp = datetime.now(timezone.utc)
-        security_crud.update_phone_change_request(db, req, {"verification_attempts": req.verification_attempts, "last_attempt_timestamp": req.last_attempt_timestamp})
+    # 3. حجز محاولة (حد أقصى OTP_MAX_VERIFICATION_ATTEMPTS، الأخيرة تُفشل الطلب) ثم التحقق من رمز OTP القديم
+    _claim_attempt(db, req)
+    if not verify_token(verification_in.otp_code, req.old_phone_otp_code, PURPOSE_PHONE_CHANGE):
         raise BadRequestException(detail="رمز التحقق غير صحيح. الرجاء المحاولة مرة أخرى.")
 
     # 4. توليد رمز OTP للرقم الجديد وتجزئته
     new_otp = _generate_otp()
-    new_otp_hash = get_password_hash(new_otp)
+    new_otp_hash = hash_token(new_otp, PURPOSE_PHONE_CHANGE)
 
     # 5. تحديث حالة الطلب وإضافة الرمز الجديد
     security_crud.update_phone_change_request(db, req, {
@@ -177,12 +179,9 @@ def finalize_phone_change(db: Session, user: models.User, verification_in: schem
     if req.request_status != 'PENDING_NEW_PHONE_VERIFICATION':
         raise BadRequestException(detail="حالة طلب تغيير رقم الجوال غير صالحة للتحقق النهائي.")
         
-    # 3. التحقق من رمز OTP الجديد
-    if not verify_password(verification_in.otp_code, req.new_phone_otp_code):
-        # TODO: يمكن إضافة منطق لعد المحاولات الفاشلة هنا.
-        req.verification_attempts += 1
-        req.last_attempt_timestamp = datetime.now(timezone.utc)
-        security_crud.update_phone_change_request(db, req, {"verification_attempts": req.verification_attempts, "last_attempt_timestamp": req.last_attempt_timestamp})
+    # 3. حجز محاولة ثم التحقق من رمز OTP الجديد
+    _claim_attempt(db, req)
+    if not verify_token(verification_in.otp_code, req.new_phone_otp_code, PURPOSE_PHONE_CHANGE):
         raise BadRequestException(detail="رمز التحقق غير صحيح.")
 
     # 4. التحقق من أن الرقم الجديد لم يصبح مستخدمًا في هذه الأثناء
@@ -15,6 +15,10 @@ from src.users.crud import rbac_crud
 from src.users.crud import core_crud # لـ User
 # استيراد Schemas
 from src.users.schemas import rbac_schemas as schemas
+# ذاكرة لقطات الهوية (يجب إبطالها عند تعديل صلاحيات الأدوار)
+from src.core.principal_cache import principal_cache
+# سجل أقنعة الصلاحيات (يُحدّث تدريجيًا عند تعديل الأدوار أو الصلاحيات)
+from src.core.permission_registry import permission_registry
 # استيراد الاستثناءات المخصصة
 from src.exceptions import (
     NotFoundException, ConflictException, BadRequestException, ForbiddenException
@@ -107,7 +111,9 @@ def update_existing_role(db: Session, role_id: int, role_in: schemas.RoleUpdate)
         if existing_role_by_key and existing_role_by_key.role_id != role_id:
             raise ConflictException(detail=f"الدور بمفتاح '{role_in.role_name_key}' موجود بالفعل.")
 
-    return rbac_crud.update_role(db, db_role=db_role, role_in=role_in)
+    updated_role = rbac_crud.update_role(db, db_role=db_role, role_in=role_in)
+    principal_cache.invalidate_role(role_id) # اللقطات تحمل مفتاح الدور (مثل SUPER_ADMIN)، لذا نبطلها عند تعديله
+    return updated_role
 
 def delete_role_by_id(db: Session, role_id_to_delete: int):
     """
@@ -160,6 +166,7 @@ def delete_role_by_id(db: Session, role_id_to_delete: int):
     else: # حذف صارم إذا لم يكن هناك is_active
         rbac_crud.delete_role(db, db_role=db_role_to_delete)
         db.commit()
+        permission_registry.drop_role(role_id_to_delete)
         return {"message": f"تم حذف الدور '{db_role_to_delete.role_name_key}' بشكل دائم وإعادة إسناد المستخدمين المرتبطين إلى الدور الافتراضي."}
 
 
@@ -285,7 +292,9 @@ def create_new_permission(db: Session, permission_in: schemas.PermissionCreate)
     if existing_permission:
         raise ConflictException(detail=f"الصلاحية بمفتاح '{permission_in.permission_name_key}' موجودة بالفعل.")
 
-    return rbac_crud.create_permission(db=db, permission_in=permission_in)
+    db_permission = rbac_crud.create_permission(db=db, permission_in=permission_in)
+    permission_registry.register_permission(db_permission.permission_name_key) # إسناد رقم بت للصلاحية الجديدة
+    return db_permission
 
 def get_all_permissions_service(db: Session, include_inactive: bool = False) -> List[Permission]:
     """
@@ -327,7 +336,12 @@ def update_permission(db: Session, permission_id: int, permission_in: schemas.Pe
         if existing_permission_by_key and existing_permission_by_key.permission_id != permission_id:
             raise ConflictException(detail=f"الصلاحية بمفتاح '{permission_in.permission_name_key}' موجودة بالفعل.")
 
-    return rbac_crud.update_permission(db, db_permission=db_permission, permission_in=permission_in)
+    old_permission_key = db_permission.permission_name_key
+    updated_permission = rbac_crud.update_permission(db, db_permission=db_permission, permission_in=permission_in)
+    if updated_permission.permission_name_key != old_permission_key:
+        permission_registry.rename_permission(old_permission_key, updated_permission.permission_name_key)
+    principal_cache.clear() # قد يتغير مفتاح الصلاحية، لذا نبطل جميع اللقطات
+    return updated_permission
 
 def delete_permission_by_id(db: Session, permission_id: int):
     """
@@ -346,6 +360,7 @@ def delete_permission_by_id(db: Session, permission_id: int):
         ConflictException: إذا كانت الصلاحية مرتبطة بأدوار.
     """
     db_permission_to_delete = get_permission_by_id_service(db, permission_id) # استخدام دالة الخدمة للتحقق
+    permission_key = db_permission_to_delete.permission_name_key
 
     # التحقق من عدم وجود ارتباطات بأدوار
     if db_permission_to_delete.role_associations: # إذا كان هناك أدوار مرتبطة بها
@@ -355,10 +370,14 @@ def delete_permission_by_id(db: Session, permission_id: int):
     if db_permission_to_delete.is_active is not None: # يفترض أن هذا الحقل موجود في المودل
         rbac_crud.soft_delete_permission(db, db_permission=db_permission_to_delete)
         db.commit()
+        permission_registry.drop_permission(permission_key)
+        principal_cache.clear() # قد تكون الصلاحية في لقطات أي دور
         return {"message": f"تم تعطيل الصلاحية '{db_permission_to_delete.permission_name_key}' بنجاح."}
     else: # حذف صارم إذا لم يكن هناك is_active
         rbac_crud.delete_permission(db, db_permission=db_permission_to_delete)
         db.commit()
+        permission_registry.drop_permission(permission_key)
+        principal_cache.clear() # قد تكون الصلاحية في لقطات أي دور
         return {"message": f"تم حذف الصلاحية '{db_permission_to_delete.permission_name_key}' بشكل دائم."}
 
 
@@ -390,7 +409,10 @@ def assign_permission_to_role(db: Session, role_id: int, permission_id: int) ->
     if db_permission in db_role.permissions: # تستخدم association_proxy
         raise ConflictException(detail=f"الصلاحية '{db_permission.permission_name_key}' مسندة بالفعل للدور '{db_role.role_name_key}'.")
 
-    return rbac_crud.add_permission_to_role(db, role=db_role, permission=db_permission)
+    updated_role = rbac_crud.add_permission_to_role(db, role=db_role, permission=db_permission)
+    permission_registry.refresh_role(db, role_id) # إعادة بناء قناع هذا الدور فقط
+    principal_cache.invalidate_role(role_id) # إبطال لقطات المستخدمين المرتبطين بهذا الدور
+    return updated_role
 
 def revoke_permission_from_role(db: Session, role_id: int, permission_id: int):
     """
@@ -415,6 +437,8 @@ def revoke_permission_from_role(db: Session, role_id: int, permission_id: int):
         raise NotFoundException(detail=f"الصلاحية '{db_permission.permission_name_key}' ليست مسندة للدور '{db_role.role_name_key}'.")
 
     rbac_crud.remove_permission_from_role(db, role=db_role, permission=db_permission)
+    permission_registry.refresh_role(db, role_id) # إعادة بناء قناع هذا الدور فقط
+    principal_cache.invalidate_role(role_id) # إبطال لقطات المستخدمين المرتبطين بهذا الدور
     return {"message": "تم سحب الصلاحية من الدور بنجاح."}
 
 
@@ -2,6 +2,8 @@
 
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+import secrets
+import string
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
@@ -22,6 +24,7 @@ from src.users.schemas import core_schemas as user_schemas # لـ UserChangePass
 from src.core.security import get_password_hash, verify_password
 from src.core import security # لـ create_access_token, create_refresh_token, decode_access_token
 from src.core.config import settings # لإعدادات الجلسة والقفل
+from src.core.token_hashing import hash_token, verify_token, PURPOSE_PASSWORD_RESET # تجزئة HMAC لرموز OTP
 # from src.db.redis_client import redis_client # لآلية حماية القوة الغاشمة - تم تعطيله
 
 # استيراد الاستثناءات المخصصة
@@ -60,8 +63,8 @@ def request_password_reset(db: Session, phone_number: str) -> dict:
     # 1. إنشاء رمز OTP عشوائي وآمن
     otp = ''.join(secrets.choice(string.digits) for _ in range(6))
     
-    # 2. تجزئة الرمز قبل حفظه
-    token_hash = get_password_hash(otp)
+    # 2. تجزئة الرمز قبل حفظه (HMAC مع مفتاح سري، الرمز قصير العمر ولا يحتاج bcrypt)
+    token_hash = hash_token(otp, PURPOSE_PASSWORD_RESET)
     
     # 3. تحديد تاريخ انتهاء الصلاحية (مثلاً 10 دقائق)
     expiry_date = datetime.now(timezone.utc) + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
@@ -94,7 +97,8 @@ def confirm_password_reset(db: Session, phone_number: str, token: str, new_passw
 
     Raises:
         NotFoundException: إذا لم يتم العثور على المستخدم.
-        BadRequestException: إذا كان الرمز غير صالح أو منتهي الصلاحية أو تم استخدامه، أو كلمة المرور ضعيفة.
+        BadRequestException: إذا كان الرمز غير صالح أو منتهي الصلاحية أو تم استخدامه، أو استُنفدت محاولاته،
+            أو كلمة المرور ضعيفة.
     """
     user = core_crud.get_user_by_phone_number(db, phone_number=phone_number)
     if not user:
@@ -106,9 +110,10 @@ def confirm_password_reset(db: Session, phone_number: str, token: str, new_passw
     if not db_token or db_token.is_used or datetime.now(timezone.utc) > db_token.expiry_timestamp:
         raise BadRequestException(detail="رمز إعادة التعيين غير صالح أو منتهي الصلاحية.")
 
-    # 2. التحقق من تطابق الرمز
-    if not verify_password(token, db_token.token_hash):
-        # يمكن إضافة منطق لعد المحاولات الفاشلة هنا
+    # 2. حجز محاولة (حد أقصى OTP_MAX_VERIFICATION_ATTEMPTS، الأخيرة تُبطل الرمز) ثم التحقق من تطابق الرمز
+    if security_crud.claim_password_reset_attempt(db, db_token.token_id, settings.OTP_MAX_VERIFICATION_ATTEMPTS) is None:
+        raise BadRequestException(detail="تم تجاوز الحد الأقصى لمحاولات إدخال الرمز. الرجاء طلب رمز جديد.")
+    if not verify_token(token, db_token.token_hash, PURPOSE_PASSWORD_RESET):
         raise BadRequestException(detail="رمز إعادة التعيين غير صحيح.")
 
     # 3. التحقق من تعقيد كلمة المرور الجديدة (REQ-FUN-005)
@@ -216,7 +221,7 @@ def refresh_access_token(db: Session, refresh_token: str) -> str:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="المستخدم غير نشط أو غير موجود.")
 
     # 5. كل شيء صحيح، قم بإنشاء وإرجاع Access Token جديد
-    new_access_token = security.create_access_token(user_id=user.user_id)
+    new_access_token = security.create_access_token(user_id=user.user_id, session_id=db_session.session_id)
     
     # 6. تحديث وقت آخر نشاط للجلسة (لأغراض انتهاء الصلاحية الآلي - REQ-FUN-039)
     db_session.last_activity_timestamp = datetime.now(timezone.utc)
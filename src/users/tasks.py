@@ -16,10 +16,11 @@ def cleanup_inactive_sessions():
     try:
         inactive_threshold = datetime.now(timezone.utc) - timedelta(minutes=settings.INACTIVE_SESSION_MINUTES)
 
-        num_revoked = security_crud.revoke_inactive_sessions(
+        # الجلسات الملغاة تُضاف إلى قائمة الإبطال داخل دالة CRUD (تصل إلى عمليات API عبر Redis)
+        num_revoked = security_crud.deactivate_inactive_sessions_older_than(
             db=db,
             inactive_before=inactive_threshold
-)
+        )
 
         print(f"[{datetime.now(timezone.utc)}] Inactive session cleanup: Revoked {num_revoked} sessions.")
         return f"Revoked {num_revoked} sessions."